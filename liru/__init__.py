@@ -1,7 +1,8 @@
 """liru - High-performance Python wrapper for Spout 2.007 GPU texture sharing.
 
 liru provides zero-copy GPU texture sharing between Python processes using
-Spout 2.007's DirectX shared texture mechanism.
+Spout 2.007's DirectX shared texture mechanism. On platforms without Spout,
+a memory-mapped shared-memory backend shares CPU frames with the same API.
 
 Example:
     >>> import moderngl
@@ -12,18 +13,51 @@ Example:
     >>> sender.send_texture(texture.glo)
 """
 
-import sys
-
-# Platform check: liru requires Windows (Spout uses DirectX 11)
-if sys.platform != "win32":
-    raise ImportError(
-        f"liru is only supported on Windows (current platform: {sys.platform}). "
-        "liru requires Spout 2.007 which depends on DirectX 11. "
-        "For macOS, consider using Syphon instead."
-    )
-
+from liru import bridge, monitor
 from liru.__version__ import __version__
+from liru.backends import available_backends, default_backend
+from liru.directory import SenderDirectory, SenderInfo
+from liru.formats import PixelFormat
+from liru.frame import Frame, FrameMetadata
+from liru.group import GroupSendResult, ReceiverGroup, SenderGroup
+from liru.monitor import StatsBlock
+from liru.player import Player
+from liru.pool import FramePool, PooledBuffer, PooledTexture, PoolStats
 from liru.receiver import Receiver
+from liru.recorder import Recorder, RecorderStats, Recording
 from liru.sender import Sender
+from liru.stats import FrameStats
+from liru.stream import FrameStream
+from liru.tiles import DirtyTiles
+from liru.transfer import Transfer
 
-__all__ = ["Sender", "Receiver", "__version__"]
+__all__ = [
+    "Sender",
+    "SenderGroup",
+    "GroupSendResult",
+    "Receiver",
+    "ReceiverGroup",
+    "Frame",
+    "FrameMetadata",
+    "FrameStream",
+    "FrameStats",
+    "FramePool",
+    "PooledBuffer",
+    "PooledTexture",
+    "PoolStats",
+    "Recorder",
+    "RecorderStats",
+    "Recording",
+    "Player",
+    "PixelFormat",
+    "Transfer",
+    "DirtyTiles",
+    "StatsBlock",
+    "SenderDirectory",
+    "SenderInfo",
+    "bridge",
+    "monitor",
+    "available_backends",
+    "default_backend",
+    "__version__",
+]
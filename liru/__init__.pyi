@@ -1,16 +1,88 @@
 """Type stubs for liru package."""
 
+import queue
 import types
+from collections.abc import Buffer, Callable
+from typing import NamedTuple, overload
+
+from liru import bridge as bridge
+from liru import monitor as monitor
+from liru.directory import SenderDirectory as SenderDirectory
+from liru.directory import SenderInfo as SenderInfo
+from liru.formats import PixelFormat as PixelFormat
+from liru.group import GroupSendResult as GroupSendResult
+from liru.group import ReceiverGroup as ReceiverGroup
+from liru.group import SenderGroup as SenderGroup
+from liru.monitor import StatsBlock as StatsBlock
+from liru.player import Player as Player
+from liru.pool import FramePool as FramePool
+from liru.pool import PooledBuffer as PooledBuffer
+from liru.pool import PooledTexture as PooledTexture
+from liru.pool import PoolStats as PoolStats
+from liru.recorder import Recorder as Recorder
+from liru.recorder import RecorderStats as RecorderStats
+from liru.recorder import Recording as Recording
+from liru.tiles import DirtyTiles as DirtyTiles
+from liru.transfer import Transfer as Transfer
 
 __version__: str
 
 class Sender:
     """Spout sender for sharing GPU textures."""
 
-    def __init__(self, name: str, width: int, height: int) -> None: ...
-    def send_texture(self, texture_id: int) -> None: ...
+    def __init__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        *,
+        slots: int = 1,
+        backend: str | None = None,
+        publish_stats: bool | None = None,
+        target_fps: float | None = None,
+        warmup: bool = False,
+        format: int = ...,
+        dirty_tiles: bool = False,
+    ) -> None: ...
+    def warmup(self) -> None: ...
+    def resize(self, width: int, height: int, *, format: int | None = None) -> None: ...
+    def send_texture(
+        self,
+        texture_id: int,
+        *,
+        timestamp_ns: int | None = None,
+        payload: Buffer | None = None,
+        transfer: int = ...,
+    ) -> None: ...
+    def send_buffer(
+        self,
+        buffer: Buffer,
+        *,
+        timestamp_ns: int | None = None,
+        payload: Buffer | None = None,
+        transfer: int = ...,
+    ) -> bool: ...
+    def enable_frame_sync(self, enabled: bool = True) -> None: ...
+    def pace(self) -> bool: ...
+    @property
+    def target_fps(self) -> float | None: ...
+    @target_fps.setter
+    def target_fps(self, fps: float | None) -> None: ...
+    @property
+    def missed_deadlines(self) -> int: ...
     def release(self) -> None: ...
     def get_fps(self) -> float: ...
+    def stats(self, deadline_ms: float | None = None) -> FrameStats: ...
+    @property
+    def stats_block(self) -> StatsBlock | None: ...
+    @property
+    def backend(self) -> str: ...
+    @property
+    def frame_sync(self) -> bool: ...
+    @property
+    def generation(self) -> int: ...
+    @property
+    def slots(self) -> int: ...
     @property
     def name(self) -> str: ...
     @property
@@ -18,7 +90,11 @@ class Sender:
     @property
     def height(self) -> int: ...
     @property
+    def format(self) -> PixelFormat: ...
+    @property
     def last_send_time_ms(self) -> float: ...
+    @property
+    def changed_tiles(self) -> DirtyTiles | None: ...
     def __enter__(self) -> Sender: ...
     def __exit__(
         self,
@@ -28,14 +104,138 @@ class Sender:
     ) -> None: ...
     def __repr__(self) -> str: ...
 
+class FrameMetadata(NamedTuple):
+    """Metadata a sender attached to a frame."""
+
+    frame: int
+    timestamp_ns: int
+    payload: bytes
+
+    def age_ms(self, now_ns: int | None = None) -> float: ...
+
+class Frame:
+    """A received frame borrowed from the sender without copying."""
+
+    @property
+    def data(self) -> memoryview: ...
+    @property
+    def frame_number(self) -> int: ...
+    @property
+    def metadata(self) -> FrameMetadata: ...
+    @property
+    def format(self) -> int: ...
+    @property
+    def width(self) -> int: ...
+    @property
+    def height(self) -> int: ...
+    @property
+    def released(self) -> bool: ...
+    def release(self) -> None: ...
+    def __enter__(self) -> Frame: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None: ...
+    def __repr__(self) -> str: ...
+
+class FrameStats(NamedTuple):
+    """Statistics of the last 256 frames sent or received."""
+
+    frames: int
+    window: int
+    fps: float
+    latency_mean_ms: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    jitter_ms: float
+    deadline_misses: int
+    dropped: int
+
+class FrameStream:
+    """Asynchronous iterator over new frames from a receiver."""
+
+    def __aiter__(self) -> FrameStream: ...
+    async def __anext__(self) -> Frame: ...
+    def close(self) -> None: ...
+    async def aclose(self) -> None: ...
+    @property
+    def dropped(self) -> int: ...
+    @property
+    def queue_size(self) -> int: ...
+    @property
+    def closed(self) -> bool: ...
+    async def __aenter__(self) -> FrameStream: ...
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None: ...
+    def __repr__(self) -> str: ...
+
 class Receiver:
     """Spout receiver for receiving GPU textures."""
 
-    def __init__(self, sender_name: str = "") -> None: ...
-    def receive_texture(self, texture_id: int) -> tuple[int, int]: ...
+    def __init__(
+        self,
+        sender_name: str | None = None,
+        *,
+        backend: str | None = None,
+        publish_stats: bool | None = None,
+        connect_timeout: float | None = None,
+    ) -> None: ...
+    def connect(self, timeout: float | None = None) -> bool: ...
+    @overload
+    def receive_texture(
+        self,
+        texture_id: int,
+        *,
+        transfer: int = ...,
+        region: tuple[int, int, int, int] | None = ...,
+    ) -> tuple[int, int]: ...
+    @overload
+    def receive_texture(
+        self,
+        texture_id: FramePool,
+        *,
+        transfer: int = ...,
+        region: tuple[int, int, int, int] | None = ...,
+    ) -> PooledTexture: ...
+    @overload
+    def receive_into(
+        self,
+        buffer: FramePool,
+        *,
+        transfer: int = ...,
+        region: tuple[int, int, int, int] | None = ...,
+        scale: tuple[int, int] | None = ...,
+    ) -> PooledBuffer: ...
+    @overload
+    def receive_into(
+        self,
+        buffer: Buffer,
+        *,
+        transfer: int = ...,
+        region: tuple[int, int, int, int] | None = ...,
+        scale: tuple[int, int] | None = ...,
+    ) -> tuple[int, int]: ...
+    def acquire_frame(self) -> Frame: ...
     def is_updated(self) -> bool: ...
+    def wait_for_frame(self, timeout: float | None = None) -> bool: ...
+    def frames(self, *, queue_size: int = 1) -> FrameStream: ...
+    async def next_frame(self, timeout: float | None = None) -> Frame: ...
+    def start_capture(self, target: Callable[[Frame], object] | queue.Queue[Frame]) -> None: ...
+    def stop_capture(self) -> None: ...
+    @property
+    def capturing(self) -> bool: ...
     def select_sender(self, name: str) -> None: ...
     def get_sender_list(self) -> list[str]: ...
+    def stats(self, deadline_ms: float | None = None) -> FrameStats: ...
+    @property
+    def backend(self) -> str: ...
     @property
     def active_sender(self) -> str: ...
     @property
@@ -43,6 +243,15 @@ class Receiver:
     @property
     def height(self) -> int: ...
     @property
+    def format(self) -> int: ...
+    @property
+    def generation(self) -> int: ...
+    @property
+    def metadata(self) -> FrameMetadata: ...
+    @property
+    def stats_block(self) -> StatsBlock | None: ...
+    def changed_tiles(self) -> DirtyTiles | None: ...
+    @property
     def last_receive_time_ms(self) -> float: ...
     def __enter__(self) -> Receiver: ...
     def __exit__(
@@ -53,4 +262,36 @@ class Receiver:
     ) -> None: ...
     def __repr__(self) -> str: ...
 
-__all__ = ["Sender", "Receiver", "__version__"]
+def available_backends() -> list[str]: ...
+def default_backend() -> str: ...
+
+__all__ = [
+    "Sender",
+    "SenderGroup",
+    "GroupSendResult",
+    "Receiver",
+    "ReceiverGroup",
+    "Frame",
+    "FrameMetadata",
+    "FrameStream",
+    "FrameStats",
+    "FramePool",
+    "PooledBuffer",
+    "PooledTexture",
+    "PoolStats",
+    "Recorder",
+    "RecorderStats",
+    "Recording",
+    "Player",
+    "PixelFormat",
+    "Transfer",
+    "DirtyTiles",
+    "StatsBlock",
+    "SenderDirectory",
+    "SenderInfo",
+    "bridge",
+    "monitor",
+    "available_backends",
+    "default_backend",
+    "__version__",
+]
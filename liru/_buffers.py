@@ -0,0 +1,120 @@
+"""Validation of CPU frame buffers passed to send_buffer() and receive_into()."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from liru.formats import PixelFormat, check_format
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+
+def frame_view(
+    buffer: Buffer,
+    width: int,
+    height: int,
+    *,
+    writable: bool,
+    format: int = PixelFormat.RGBA8,
+) -> memoryview:
+    """Check a buffer holds exactly one frame and return a flat byte view.
+
+    Accepts any C-contiguous buffer-protocol object whose size matches the
+    frame, with 1-byte items or items of the format's component type:
+    bytes, bytearray, memoryview, or a NumPy array shaped
+    (height, width, components) or flat.
+
+    Args:
+        buffer: Buffer-protocol object
+        width: Frame width in pixels
+        height: Frame height in pixels
+        writable: Whether the buffer will be written to
+        format: Pixel format of the frame
+
+    Returns:
+        One-dimensional unsigned-byte memoryview of the buffer
+
+    Raises:
+        TypeError: If buffer does not support the buffer protocol
+        ValueError: If the buffer layout, size or writability is wrong, or
+            the format is not supported
+    """
+    fmt = check_format(format)
+    view = _checked_view(buffer, fmt)
+
+    expected = width * height * fmt.bytes_per_pixel
+    shape = (height, width, fmt.components)
+    if view.ndim == 3 and view.shape != shape:
+        raise ValueError(f"Frame buffer shape {view.shape} does not match {shape}")
+    if view.nbytes != expected:
+        raise ValueError(
+            f"Frame buffer is {view.nbytes} bytes, expected {expected} "
+            f"({width}x{height} {fmt.name})"
+        )
+    return _byte_view(view, writable)
+
+
+def byte_view(buffer: Buffer, *, writable: bool, format: int = PixelFormat.RGBA8) -> memoryview:
+    """Check a buffer's layout suits frames of a format and return a flat byte view.
+
+    Like frame_view(), but leaves the size to the backend, for batched calls
+    that report a wrong-sized member instead of raising.
+
+    Args:
+        buffer: Buffer-protocol object
+        writable: Whether the buffer will be written to
+        format: Pixel format of the frame
+
+    Returns:
+        One-dimensional unsigned-byte memoryview of the buffer
+
+    Raises:
+        TypeError: If buffer does not support the buffer protocol
+        ValueError: If the buffer layout or writability is wrong, or the
+            format is not supported
+    """
+    return _byte_view(_checked_view(buffer, check_format(format)), writable)
+
+
+def _checked_view(buffer: Buffer, fmt: PixelFormat) -> memoryview:
+    """View a buffer, checking it is C-contiguous with items of the format."""
+    try:
+        view = memoryview(buffer)
+    except TypeError as e:
+        raise TypeError(f"Expected a buffer-protocol object, got {type(buffer).__name__}") from e
+
+    if not view.c_contiguous:
+        raise ValueError("Frame buffer must be C-contiguous")
+    item_size = fmt.bytes_per_pixel // fmt.components
+    if view.itemsize not in (1, item_size):
+        sizes = "1-byte" if item_size == 1 else f"1-byte or {item_size}-byte"
+        raise ValueError(f"Frame buffer must have {sizes} items, got format {view.format!r}")
+    return view
+
+
+def _byte_view(view: memoryview, writable: bool) -> memoryview:
+    """Check writability and flatten a checked view to unsigned bytes."""
+    if writable and view.readonly:
+        raise ValueError("Frame buffer is read-only")
+    if view.ndim != 1 or view.format != "B":
+        view = view.cast("B")
+    return view
+
+
+def pixel_view(data: memoryview, width: int, height: int, format: int) -> memoryview:
+    """Shape a flat byte view of one frame as pixels.
+
+    Args:
+        data: One-dimensional unsigned-byte view of the frame
+        width: Frame width in pixels
+        height: Frame height in pixels
+        format: Pixel format of the frame
+
+    Returns:
+        View of shape (height, width, components) with one item per component
+    """
+    fmt = check_format(format)
+    # Typeshed lists no cast() overload for a non-literal format
+    view: memoryview = data.cast(fmt.item_format, (height, width, fmt.components))  # type: ignore[call-overload]
+    return view
@@ -0,0 +1,154 @@
+"""Process-wide thread that waits for new frames on behalf of asyncio code.
+
+One daemon thread serves every FrameStream in the process, so async frame
+consumers do not cost a thread each. It sleeps on the frame signal words of
+all watched receivers at once (``futex_waitv`` on Linux, see
+``backends._futex``), and polls every millisecond while any watched receiver
+has no signal word (senders without frame sync, other platforms). Callbacks
+run on the watcher thread, so only backends whose frames can be received
+from any thread (those with ``frame_signal()``) are watched.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+from collections.abc import Callable
+
+from liru.backends import ReceiverImpl, _futex
+
+_POLL_INTERVAL_S = 0.001
+_WAIT_SLICE_S = 0.1  # Longest sleep before re-checking every receiver
+_U32 = struct.Struct("<I")
+
+
+class Watch:
+    """A watched receiver and the callbacks run on the watcher thread.
+
+    ``on_frame`` is called while the receiver reports a new frame and must
+    receive it, or it is called again at once. ``on_error`` is called once,
+    after the watch is removed, if checking the receiver raises.
+    """
+
+    __slots__ = ("impl", "on_error", "on_frame")
+
+    def __init__(
+        self,
+        impl: ReceiverImpl,
+        on_frame: Callable[[], None],
+        on_error: Callable[[BaseException], None],
+    ) -> None:
+        self.impl = impl
+        self.on_frame = on_frame
+        self.on_error = on_error
+
+
+class FrameWatcher:
+    """Waits for frames from many receivers on one thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watches: list[Watch] = []
+        self._thread: threading.Thread | None = None
+        self._changed = threading.Event()
+        # Futex word rung when the watch list changes, so a wait returns
+        self._doorbell = mmap.mmap(-1, mmap.PAGESIZE)
+        self._doorbell_address = _futex.buffer_address(self._doorbell) if _futex.AVAILABLE else 0
+
+    def watch(
+        self,
+        impl: ReceiverImpl,
+        on_frame: Callable[[], None],
+        on_error: Callable[[BaseException], None],
+    ) -> Watch:
+        """Start watching a receiver.
+
+        Args:
+            impl: Backend receiver
+            on_frame: Called on the watcher thread for each new frame
+            on_error: Called on the watcher thread if the receiver fails
+
+        Returns:
+            Handle for unwatch()
+        """
+        watch = Watch(impl, on_frame, on_error)
+        with self._lock:
+            self._watches.append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="liru-frame-watcher", daemon=True
+                )
+                self._thread.start()
+        self._ring()
+        return watch
+
+    def unwatch(self, watch: Watch) -> None:
+        """Stop watching a receiver; a no-op if it is not watched.
+
+        Args:
+            watch: Handle returned by watch()
+        """
+        with self._lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
+        self._ring()
+
+    def _ring(self) -> None:
+        self._changed.set()
+        if self._doorbell_address:
+            value = (_U32.unpack_from(self._doorbell, 0)[0] + 1) & 0xFFFFFFFF
+            _U32.pack_into(self._doorbell, 0, value)
+            _futex.wake(self._doorbell_address)
+
+    def _run(self) -> None:
+        while True:
+            self._changed.clear()
+            with self._lock:
+                watches = list(self._watches)
+            if not watches:
+                self._changed.wait()
+                continue
+
+            # Every word is read before its receiver is checked, so a frame
+            # published after the check changes the word and the wait returns
+            words = {self._doorbell_address: _U32.unpack_from(self._doorbell, 0)[0]}
+            poll = not _futex.wait_any_available()
+            fired = False
+            for watch in watches:
+                try:
+                    signal = watch.impl.frame_signal()  # type: ignore[attr-defined]
+                    if watch.impl.is_updated():
+                        watch.on_frame()
+                        fired = True
+                    elif signal is None:
+                        poll = True
+                    else:
+                        words[signal[0]] = signal[1]
+                except Exception as e:
+                    self.unwatch(watch)
+                    watch.on_error(e)
+
+            if fired:
+                continue
+            if poll or len(words) > _futex.MAX_WAIT_ANY:
+                self._changed.wait(_POLL_INTERVAL_S)
+            else:
+                _futex.wait_any(list(words.items()), _WAIT_SLICE_S)
+
+
+_watcher: FrameWatcher | None = None
+_watcher_lock = threading.Lock()
+
+
+def get_watcher() -> FrameWatcher:
+    """Get the process-wide frame watcher, creating it on first use.
+
+    Returns:
+        Shared FrameWatcher
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = FrameWatcher()
+        return _watcher
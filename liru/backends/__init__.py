@@ -0,0 +1,148 @@
+"""Transport backends for liru.
+
+A backend provides the ``SenderWrapper`` and ``ReceiverWrapper`` classes that
+``liru.Sender`` and ``liru.Receiver`` delegate to. Two backends ship with liru:
+
+- ``"spout"``: Spout 2.007 GPU texture sharing (Windows, DirectX 11)
+- ``"shm"``: memory-mapped shared-memory frames (any platform, CPU only)
+
+The default is ``"spout"`` where it is available and ``"shm"`` otherwise. It can
+be overridden with the ``LIRU_BACKEND`` environment variable.
+
+Example:
+    >>> import liru
+    >>> liru.available_backends()
+    ['shm']
+    >>> sender = liru.Sender("MySource", 1920, 1080, backend="shm")
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+from collections.abc import Callable
+
+from liru.backends.base import (
+    MAX_SLOTS,
+    Backend,
+    CaptureWorkerImpl,
+    FramePacerImpl,
+    ReceiverGroupImpl,
+    ReceiverImpl,
+    SenderGroupImpl,
+    SenderImpl,
+)
+
+BackendLoader = Callable[[], Backend]
+
+_LOADERS: dict[str, BackendLoader] = {}
+_LOADED: dict[str, Backend] = {}
+
+
+def register_backend(name: str, loader: BackendLoader) -> None:
+    """Register a transport backend.
+
+    The loader is called at most once, on first use, and may raise ImportError
+    if the backend is not usable on this system.
+
+    Args:
+        name: Backend name passed as ``backend=`` to Sender and Receiver
+        loader: Callable returning an object with ``SenderWrapper`` and
+            ``ReceiverWrapper`` attributes
+
+    Raises:
+        ValueError: If name is empty
+    """
+    if not name:
+        raise ValueError("Backend name cannot be empty")
+    _LOADERS[name] = loader
+    _LOADED.pop(name, None)
+
+
+def get_backend(name: str | None = None) -> Backend:
+    """Load a backend by name.
+
+    Args:
+        name: Backend name, or None for the default backend
+
+    Returns:
+        The loaded backend
+
+    Raises:
+        ValueError: If no backend with that name is registered
+        ImportError: If the backend is not available on this system
+    """
+    if name is None:
+        name = default_backend()
+    if name not in _LOADERS:
+        raise ValueError(f"Unknown backend: {name!r} (registered: {sorted(_LOADERS)})")
+    if name not in _LOADED:
+        _LOADED[name] = _LOADERS[name]()
+    return _LOADED[name]
+
+
+def available_backends() -> list[str]:
+    """Get names of backends that can be loaded on this system.
+
+    Returns:
+        List of backend names
+
+    Example:
+        >>> liru.available_backends()
+        ['spout', 'shm']
+    """
+    names = []
+    for name in _LOADERS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def default_backend() -> str:
+    """Get the name of the backend used when none is given.
+
+    Returns:
+        ``LIRU_BACKEND`` if set, else ``"spout"`` if it loads, else ``"shm"``
+    """
+    env = os.environ.get("LIRU_BACKEND")
+    if env:
+        return env
+    if sys.platform == "win32":
+        try:
+            get_backend("spout")
+        except ImportError:
+            pass
+        else:
+            return "spout"
+    return "shm"
+
+
+def _import_loader(module: str) -> BackendLoader:
+    def load() -> Backend:
+        backend: Backend = importlib.import_module(module)
+        return backend
+
+    return load
+
+
+register_backend("spout", _import_loader("liru.backends.spout"))
+register_backend("shm", _import_loader("liru.backends.shm"))
+
+__all__ = [
+    "MAX_SLOTS",
+    "Backend",
+    "CaptureWorkerImpl",
+    "FramePacerImpl",
+    "ReceiverGroupImpl",
+    "ReceiverImpl",
+    "SenderGroupImpl",
+    "SenderImpl",
+    "available_backends",
+    "default_backend",
+    "get_backend",
+    "register_backend",
+]
@@ -0,0 +1,185 @@
+"""Cross-process wait/wake on a 32-bit word in a shared mapping.
+
+On Linux this is a shared (non-private) futex, so a receiver sleeps in the
+kernel until the sender bumps the word and wakes it, and ctypes releases the
+GIL for the duration of the wait. ``AVAILABLE`` is False elsewhere, and
+callers fall back to polling with short sleeps.
+
+``wait_any()`` sleeps on up to ``MAX_WAIT_ANY`` words at once through
+``futex_waitv`` (Linux 5.16+); ``wait_any_available()`` reports whether the
+running kernel has it.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import platform
+import sys
+import time
+from collections.abc import Sequence
+
+# futex(2) syscall numbers per architecture
+_SYS_FUTEX = {
+    "x86_64": 202,
+    "amd64": 202,
+    "aarch64": 98,
+    "arm64": 98,
+    "riscv64": 98,
+    "i386": 240,
+    "i686": 240,
+    "armv7l": 240,
+    "ppc64le": 221,
+    "s390x": 238,
+}
+_FUTEX_WAIT = 0
+_FUTEX_WAKE = 1
+_WAKE_ALL = 0x7FFFFFFF
+_SYS_FUTEX_WAITV = 449  # Same number on every architecture
+_FUTEX2_SIZE_U32 = 0x02
+MAX_WAIT_ANY = 128
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _FutexWaitv(ctypes.Structure):
+    _fields_ = [
+        ("val", ctypes.c_uint64),
+        ("uaddr", ctypes.c_uint64),
+        ("flags", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+    ]
+
+
+class _PyBuffer(ctypes.Structure):
+    """``Py_buffer`` from the stable ABI."""
+
+    _fields_ = [
+        ("buf", ctypes.c_void_p),
+        ("obj", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+        ("itemsize", ctypes.c_ssize_t),
+        ("readonly", ctypes.c_int),
+        ("ndim", ctypes.c_int),
+        ("format", ctypes.c_char_p),
+        ("shape", ctypes.c_void_p),
+        ("strides", ctypes.c_void_p),
+        ("suboffsets", ctypes.c_void_p),
+        ("internal", ctypes.c_void_p),
+    ]
+
+
+_syscall_nr = _SYS_FUTEX.get(platform.machine().lower()) if sys.platform == "linux" else None
+if _syscall_nr is not None:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _syscall = _libc.syscall
+    _syscall.restype = ctypes.c_long
+
+AVAILABLE = _syscall_nr is not None
+_waitv_available: bool | None = None
+
+
+def buffer_address(obj: object) -> int:
+    """Get the address of the first byte of a buffer-protocol object.
+
+    Works for read-only buffers such as an ``ACCESS_READ`` mmap. The address
+    is only valid while the object stays alive and is not resized or closed.
+
+    Args:
+        obj: Buffer-protocol object
+
+    Returns:
+        Memory address
+    """
+    view = _PyBuffer()
+    ctypes.pythonapi.PyObject_GetBuffer(ctypes.py_object(obj), ctypes.byref(view), 0)
+    try:
+        return int(view.buf or 0)
+    finally:
+        ctypes.pythonapi.PyBuffer_Release(ctypes.byref(view))
+
+
+def wait(address: int, expected: int, timeout: float) -> None:
+    """Sleep while the word at address equals expected.
+
+    Returns when woken, when the word differs, on a signal, or after the
+    timeout. Callers re-check their condition afterwards.
+
+    Args:
+        address: Address of a 4-byte aligned word in shared memory
+        expected: Value the word must still hold to sleep
+        timeout: Maximum time to sleep in seconds
+    """
+    seconds = int(timeout)
+    ts = _Timespec(seconds, int((timeout - seconds) * 1e9))
+    result = _syscall(
+        _syscall_nr,
+        ctypes.c_void_p(address),
+        _FUTEX_WAIT,
+        ctypes.c_uint32(expected),
+        ctypes.byref(ts),
+        None,
+        0,
+    )
+    if result == -1:
+        err = ctypes.get_errno()
+        # EFAULT: another thread unmapped the segment meanwhile; the caller re-reads
+        if err not in (errno.EAGAIN, errno.ETIMEDOUT, errno.EINTR, errno.EFAULT):
+            raise OSError(err, os.strerror(err))
+
+
+def wake(address: int) -> None:
+    """Wake every process sleeping on the word at address.
+
+    Args:
+        address: Address of a 4-byte aligned word in shared memory
+    """
+    _syscall(_syscall_nr, ctypes.c_void_p(address), _FUTEX_WAKE, _WAKE_ALL, None, None, 0)
+
+
+def wait_any_available() -> bool:
+    """Check whether wait_any() is supported by the running kernel.
+
+    Returns:
+        True if futex_waitv is available
+    """
+    global _waitv_available
+    if _waitv_available is None:
+        _waitv_available = False
+        if AVAILABLE:
+            # An empty wait list is rejected with EINVAL where the call exists
+            _syscall(_SYS_FUTEX_WAITV, None, 0, 0, None, 0)
+            _waitv_available = ctypes.get_errno() != errno.ENOSYS
+    return _waitv_available
+
+
+def wait_any(words: Sequence[tuple[int, int]], timeout: float) -> None:
+    """Sleep while every word still holds its expected value.
+
+    Returns when any word is woken, any word differs, on a signal, or after
+    the timeout. Callers re-check their conditions afterwards.
+
+    Args:
+        words: Up to MAX_WAIT_ANY (address, expected value) pairs of 4-byte
+            aligned words in shared memory
+        timeout: Maximum time to sleep in seconds
+    """
+    waiters = (_FutexWaitv * len(words))()
+    for waiter, (address, expected) in zip(waiters, words, strict=True):
+        waiter.val = expected
+        waiter.uaddr = address
+        waiter.flags = _FUTEX2_SIZE_U32
+    deadline = time.clock_gettime(time.CLOCK_MONOTONIC) + timeout
+    seconds = int(deadline)
+    ts = _Timespec(seconds, int((deadline - seconds) * 1e9))
+    result = _syscall(
+        _SYS_FUTEX_WAITV, waiters, len(words), 0, ctypes.byref(ts), time.CLOCK_MONOTONIC
+    )
+    if result == -1:
+        err = ctypes.get_errno()
+        # EFAULT: a receiver unmapped its segment meanwhile; the caller re-reads
+        if err not in (errno.EAGAIN, errno.ETIMEDOUT, errno.EINTR, errno.EFAULT):
+            raise OSError(err, os.strerror(err))
@@ -0,0 +1,125 @@
+"""Non-blocking byte-range file locks used to fence shared-memory slots.
+
+Readers hold a shared lock on a slot while they borrow it and the writer
+needs an exclusive lock to write it. Locks are owned by the open file, so the
+kernel drops them if a process dies while holding one.
+
+On Linux these are open-file-description locks, which also conflict between
+two files opened by the same process. Other POSIX systems fall back to
+``lockf``, whose locks only conflict between processes. Windows uses
+``LockFileEx``, which locks per handle.
+"""
+
+from __future__ import annotations
+
+import sys
+
+if sys.platform == "win32":
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    class _Overlapped(ctypes.Structure):
+        _fields_ = [
+            ("Internal", ctypes.c_void_p),
+            ("InternalHigh", ctypes.c_void_p),
+            ("Offset", wintypes.DWORD),
+            ("OffsetHigh", wintypes.DWORD),
+            ("hEvent", wintypes.HANDLE),
+        ]
+
+    _kernel32 = ctypes.windll.kernel32
+    _LOCKFILE_FAIL_IMMEDIATELY = 0x1
+    _LOCKFILE_EXCLUSIVE_LOCK = 0x2
+
+    def _overlapped(start: int) -> _Overlapped:
+        overlapped = _Overlapped()
+        overlapped.Offset = start & 0xFFFFFFFF
+        overlapped.OffsetHigh = start >> 32
+        return overlapped
+
+    def try_lock(fd: int, start: int, length: int, *, shared: bool) -> bool:
+        """Try to lock a byte range without blocking.
+
+        Args:
+            fd: Open file descriptor
+            start: First byte of the range
+            length: Number of bytes
+            shared: Take a shared (read) lock instead of an exclusive one
+
+        Returns:
+            True if the lock was taken
+        """
+        flags = _LOCKFILE_FAIL_IMMEDIATELY | (0 if shared else _LOCKFILE_EXCLUSIVE_LOCK)
+        handle = msvcrt.get_osfhandle(fd)
+        overlapped = _overlapped(start)
+        return bool(
+            _kernel32.LockFileEx(
+                handle, flags, 0, length & 0xFFFFFFFF, length >> 32, ctypes.byref(overlapped)
+            )
+        )
+
+    def unlock(fd: int, start: int, length: int) -> None:
+        """Release a byte range locked with try_lock().
+
+        Args:
+            fd: Open file descriptor
+            start: First byte of the range
+            length: Number of bytes
+        """
+        handle = msvcrt.get_osfhandle(fd)
+        overlapped = _overlapped(start)
+        _kernel32.UnlockFileEx(
+            handle, 0, length & 0xFFFFFFFF, length >> 32, ctypes.byref(overlapped)
+        )
+
+else:
+    import errno
+    import fcntl
+    import os
+    import struct
+
+    _OFD_SETLK: int | None = getattr(fcntl, "F_OFD_SETLK", None)
+    _FLOCK = struct.Struct("hhqqi4x")  # struct flock on 64-bit Linux
+    _BUSY = (errno.EAGAIN, errno.EACCES)
+
+    def _set_lock(fd: int, lock_type: int, start: int, length: int) -> bool:
+        try:
+            if _OFD_SETLK is not None:
+                fcntl.fcntl(fd, _OFD_SETLK, _FLOCK.pack(lock_type, os.SEEK_SET, start, length, 0))
+            else:
+                cmd = {
+                    fcntl.F_RDLCK: fcntl.LOCK_SH | fcntl.LOCK_NB,
+                    fcntl.F_WRLCK: fcntl.LOCK_EX | fcntl.LOCK_NB,
+                    fcntl.F_UNLCK: fcntl.LOCK_UN,
+                }[lock_type]
+                fcntl.lockf(fd, cmd, length, start, os.SEEK_SET)
+        except OSError as e:
+            if e.errno in _BUSY:
+                return False
+            raise
+        return True
+
+    def try_lock(fd: int, start: int, length: int, *, shared: bool) -> bool:
+        """Try to lock a byte range without blocking.
+
+        Args:
+            fd: Open file descriptor
+            start: First byte of the range
+            length: Number of bytes
+            shared: Take a shared (read) lock instead of an exclusive one
+
+        Returns:
+            True if the lock was taken
+        """
+        return _set_lock(fd, fcntl.F_RDLCK if shared else fcntl.F_WRLCK, start, length)
+
+    def unlock(fd: int, start: int, length: int) -> None:
+        """Release a byte range locked with try_lock().
+
+        Args:
+            fd: Open file descriptor
+            start: First byte of the range
+            length: Number of bytes
+        """
+        _set_lock(fd, fcntl.F_UNLCK, start, length)
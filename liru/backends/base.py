@@ -0,0 +1,217 @@
+"""Interfaces implemented by transport backends.
+
+The method names mirror the native ``_liru_core`` classes, so the compiled
+extension module is itself a valid backend.
+
+Receivers of backends that share CPU frames may also implement
+``acquire_frame() -> liru.frame.Frame`` to lend the shared frame without a
+copy; ``liru.Receiver`` falls back to a staging copy otherwise.
+
+Senders take ``slots``, the number of buffered frames, as the fourth
+constructor argument, at most ``MAX_SLOTS``; backends raise ValueError for
+counts they cannot buffer (the Spout backend only takes 1).
+
+Receivers may also implement ``frame_signal() -> tuple[int, int] | None``,
+returning the address and current value of a shared 32-bit futex word that
+is bumped and woken after every frame, or None without one. The async frame
+watcher sleeps on all such words at once and polls receivers that return
+None. ``liru.Receiver.frames()`` only streams from receivers with this hook,
+since the watcher receives frames on its own thread; Spout receivers need the
+thread that owns their OpenGL context and do not implement it.
+
+``get_stats(deadline_ms)`` returns the fields of ``liru.FrameStats`` in
+order, as a FrameStats or a plain tuple. ``set_stats_block(buffer)`` keeps a
+writable stats block (layout in ``liru.stats``) and updates it after every
+frame until called with None; the caller keeps the buffer alive until then.
+
+Senders attach a metadata record (``liru.frame``) to every frame:
+``send_texture``/``send_buffer`` take a capture ``timestamp_ns`` (0 stamps
+the frame at the call) and a ``payload`` of at most ``MAX_PAYLOAD`` bytes.
+Receivers return the record of the last received frame from
+``get_metadata()`` as ``(frame, timestamp_ns, payload)``.
+
+Backends may provide a module-level ``query_senders()`` function listing
+every sender as ``(name, width, height, format, owner_pid, frame)`` without
+creating a receiver; ``liru.SenderDirectory`` polls it. Unknown values are 0.
+
+Backends may provide a ``FramePacer(fps)`` class with ``wait() -> bool``,
+``reset()``, ``get_fps()`` and ``get_missed()``, holding a sender loop to a
+fixed rate (see ``liru.pacing``, whose portable FramePacer is used
+otherwise).
+
+Backends may provide a ``SenderGroup(senders)`` class taking a tuple of their
+senders, whose ``send(frames, timestamp_ns, payload)`` publishes one texture
+ID (int) or CPU buffer per member (None skips it) in one call, with the same
+metadata on every frame. A member that fails does not stop the others.
+It returns the bitmask of published members as little-endian bytes, the time
+each member's send took as native doubles in a bytes-like object, and the
+time of the whole batch, in milliseconds.
+
+Backends may provide a ``ReceiverGroup(receivers)`` class taking a tuple of
+their receivers, whose ``poll_textures(texture_ids)`` and
+``poll_into(buffers)`` check every member and receive each updated one into
+its texture or buffer (0 or None skips a member) in one call. Both return
+the updated members as native int ``(index, width, height)`` triples, in a
+bytes-like object. ``liru.ReceiverGroup`` loops over the receivers otherwise.
+
+Backends may provide a ``CaptureWorker(sender_name, on_frame)`` class that
+receives every new frame on a background thread, with its own receiver, and
+calls ``on_frame(pixels, width, height, format, metadata)`` there;
+``pixels`` is a bytearray the callee may keep, ``format`` the DXGI_FORMAT
+code of its pixels and ``metadata`` the frame's
+``(frame, timestamp_ns, payload)``.
+
+Frames are in the sender's pixel format (``liru.formats``): senders take it
+as the fifth constructor argument and report it from ``get_format()``, and
+receivers report the connected sender's format from ``get_format()``.
+
+Senders take ``dirty_tiles`` as the last constructor argument and then hash
+the frames of ``send_buffer`` into a tile table (layout in ``liru.tiles``).
+``get_tile_table()`` returns a copy of it, on senders their own and on
+receivers the connected sender's, or None when tiles are not tracked.
+
+``send_texture``/``send_buffer`` and ``receive_texture``/``receive_into``
+take ``liru.transfer.Transfer`` flags as ``transfer``, applied by the copy
+itself; backends reject flags they cannot apply with ValueError.
+
+``receive_texture`` also takes a ``region`` ``(x, y, width, height)`` and
+``receive_into`` a ``region`` and a ``scale`` ``(width, height)`` it is
+shrunk to (``liru.transfer.check_region``/``check_scale``). Zero widths and
+heights stand for the whole frame and its own size. Both return the size
+delivered, which is the region's or the scale's when given.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Sequence
+
+MAX_SLOTS = 64  # Most frames a sender buffers, on every backend
+
+
+class SenderImpl(Protocol):
+    """Backend sender object wrapped by ``liru.Sender``."""
+
+    def send_texture(
+        self, texture_id: int, timestamp_ns: int = 0, payload: bytes = b"", transfer: int = 0
+    ) -> bool: ...
+    def send_buffer(
+        self, buffer: Buffer, timestamp_ns: int = 0, payload: bytes = b"", transfer: int = 0
+    ) -> bool: ...
+    def warmup(self) -> None: ...
+    def resize(self, width: int, height: int) -> None: ...
+    def release(self) -> None: ...
+    def get_fps(self) -> float: ...
+    def get_last_send_time_ms(self) -> float: ...
+    def get_stats(self, deadline_ms: float = 0.0) -> tuple[int | float, ...]: ...
+    def set_stats_block(self, block: Buffer | None) -> None: ...
+    def get_name(self) -> str: ...
+    def get_width(self) -> int: ...
+    def get_height(self) -> int: ...
+    def get_format(self) -> int: ...
+    def get_slots(self) -> int: ...
+    def get_generation(self) -> int: ...
+    def enable_frame_sync(self, enabled: bool = True) -> None: ...
+    def is_frame_sync_enabled(self) -> bool: ...
+    def get_tile_table(self) -> bytes | None: ...
+
+
+class ReceiverImpl(Protocol):
+    """Backend receiver object wrapped by ``liru.Receiver``."""
+
+    def receive_texture(
+        self, texture_id: int, transfer: int = 0, region: tuple[int, int, int, int] = (0, 0, 0, 0)
+    ) -> tuple[int, int]: ...
+    def receive_into(
+        self,
+        buffer: Buffer,
+        transfer: int = 0,
+        region: tuple[int, int, int, int] = (0, 0, 0, 0),
+        scale: tuple[int, int] = (0, 0),
+    ) -> tuple[int, int]: ...
+    def is_updated(self) -> bool: ...
+    def wait_for_frame(self, timeout_ms: float) -> bool: ...
+    def connect(self, timeout_ms: float) -> bool: ...
+    def select_sender(self, name: str) -> None: ...
+    def get_sender_list(self) -> list[str]: ...
+    def get_active_sender(self) -> str: ...
+    def get_width(self) -> int: ...
+    def get_height(self) -> int: ...
+    def get_format(self) -> int: ...
+    def get_frame(self) -> int: ...
+    def get_generation(self) -> int: ...
+    def get_metadata(self) -> tuple[int, int, bytes]: ...
+    def get_tile_table(self) -> bytes | None: ...
+    def get_last_receive_time_ms(self) -> float: ...
+    def get_stats(self, deadline_ms: float = 0.0) -> tuple[int | float, ...]: ...
+    def set_stats_block(self, block: Buffer | None) -> None: ...
+    def is_initialized(self) -> bool: ...
+    def query_sender_info(self) -> bool: ...
+
+
+class FramePacerImpl(Protocol):
+    """Backend frame clock used by ``Sender.pace()``."""
+
+    def wait(self) -> bool: ...
+    def reset(self) -> None: ...
+    def get_fps(self) -> float: ...
+    def get_missed(self) -> int: ...
+
+
+class SenderGroupImpl(Protocol):
+    """Backend batched send used by ``liru.SenderGroup``."""
+
+    def send(
+        self,
+        frames: Sequence[int | Buffer | None],
+        timestamp_ns: int = 0,
+        payload: bytes = b"",
+    ) -> tuple[bytes, Buffer, float]: ...
+
+
+class ReceiverGroupImpl(Protocol):
+    """Backend batched receive used by ``liru.ReceiverGroup``."""
+
+    def poll_textures(self, texture_ids: list[int]) -> Buffer: ...
+    def poll_into(self, buffers: Sequence[Buffer | None]) -> Buffer: ...
+
+
+class CaptureWorkerImpl(Protocol):
+    """Backend background capture started by ``Receiver.start_capture()``."""
+
+    def stop(self) -> None: ...
+    def is_running(self) -> bool: ...
+
+
+class SenderFactory(Protocol):
+    """Constructor signature of a backend's ``SenderWrapper``."""
+
+    def __call__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        slots: int = 1,
+        format: int = 28,
+        dirty_tiles: bool = False,
+    ) -> SenderImpl: ...
+
+
+class ReceiverFactory(Protocol):
+    """Constructor signature of a backend's ``ReceiverWrapper``."""
+
+    def __call__(self, sender_name: str = "") -> ReceiverImpl: ...
+
+
+class Backend(Protocol):
+    """A transport backend (usually a module)."""
+
+    NAME: str
+
+    @property
+    def SenderWrapper(self) -> SenderFactory: ...  # noqa: N802
+
+    @property
+    def ReceiverWrapper(self) -> ReceiverFactory: ...  # noqa: N802
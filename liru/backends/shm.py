@@ -0,0 +1,1199 @@
+"""Shared-memory backend (any platform, CPU frames).
+
+Each sender owns one memory-mapped segment, named after the sender, in the
+shared-memory directory: ``LIRU_SHM_DIR`` if set, else ``/dev/shm`` where it
+exists, else the system temp directory. The segment is a one-page header
+followed by a ring of frame slots, each starting on its own page. Each slot
+ends with the frame's metadata record (layout in ``liru.frame``). Senders
+tracking dirty tiles add their tile table (layout in ``liru.tiles``) after
+the last slot. Receivers in
+other processes map the same pages, so a frame is handed off without any copy
+between the processes.
+
+Header layout (little-endian):
+
+======  =======  ===============================================
+Offset  Type     Field
+======  =======  ===============================================
+0       char[4]  Magic ``b"LIRU"`` (written last on creation)
+4       uint32   Layout version
+8       uint32   Flags (bit 0: sender closed, bit 1: frame sync,
+                 bit 2: dirty tiles)
+12      uint32   Owner process ID
+16      uint32   Width in pixels
+20      uint32   Height in pixels
+24      uint32   Pixel format (DXGI_FORMAT code, see ``liru.formats``)
+28      uint32   Frame size in bytes
+32      uint32   Number of slots (1 to ``MAX_SLOTS``)
+36      uint32   Frame signal counter (bumped after every frame)
+40      uint64   Latest frame: ``frame_number << 8 | slot``, 0 before any
+48      uint32   Generation (bumped by every resize)
+64      uint64[] Sequence counter of each slot
+======  =======  ===============================================
+
+Frame numbers count up from 1. While frame *n* and its metadata are written
+into a slot, that slot's sequence counter is ``2n - 1``; once it is complete
+the counter is ``2n`` and the latest-frame word is pointed at the slot. The sender writes
+the oldest slot other than the latest one, so with two or more slots a
+receiver reading the latest frame never makes the sender wait.
+
+``receive_into()`` copies the latest slot and then re-checks its counter,
+retrying if the sender wrote over it meanwhile. ``acquire_frame()`` instead
+takes a shared byte-range lock on the slot (see ``_locks``) that the sender
+must lock exclusively to write it, so a borrowed frame is never overwritten.
+The sender skips locked slots and drops the frame only when every slot it may
+write is borrowed.
+
+``resize()`` builds a segment of the new size under a temporary name, renames
+it over the old one and then marks the old one closed, so the name never goes
+missing; receivers reattach on their next call and see the new generation.
+
+``wait_for_frame()`` sleeps on the frame signal counter. With frame sync
+enabled the sender wakes sleepers after bumping it, through a futex on Linux
+(see ``_futex``); elsewhere, or without frame sync, receivers poll instead.
+
+Senders and receivers may be shared between threads, including on
+free-threaded CPython: each one serializes its own state with a lock, so
+``release()`` waits for a send in progress and later sends raise. Separate
+senders share no state and send in parallel.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import types
+from array import array
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import quote, unquote
+
+from liru._buffers import pixel_view
+from liru.backends import _futex, _locks
+from liru.backends.base import MAX_SLOTS
+from liru.formats import check_format
+from liru.frame import (
+    MAX_PAYLOAD,
+    METADATA_SIZE,
+    Frame,
+    FrameMetadata,
+    pack_metadata,
+    unpack_metadata,
+)
+from liru.stats import FrameStats, StatsWindow, write_stats_block
+from liru.tiles import TileHasher, table_size
+from liru.transfer import check_region, check_scale, check_transfer, copy_frame
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Callable, Sequence
+
+NAME = "shm"
+
+MAGIC = b"LIRU"
+LAYOUT_VERSION = 5
+HEADER_SIZE = 4096  # Frame slots start on their own pages
+FLAG_CLOSED = 0x1
+FLAG_FRAME_SYNC = 0x2
+FLAG_DIRTY_TILES = 0x4
+FORMAT_RGBA8 = 28  # DXGI_FORMAT_R8G8B8A8_UNORM, the default format
+BYTES_PER_PIXEL = 4  # Of the default format
+
+_HEADER = struct.Struct("<4sIIIIIIII")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_FLAGS_OFFSET = 8
+_SIGNAL_OFFSET = 36
+_LATEST_OFFSET = 40
+_GENERATION_OFFSET = 48
+_SLOT_SEQ_OFFSET = 64
+_PAGE_SIZE = 4096
+_PREFIX = "liru."
+_LOCK_OFFSET = 1 << 40  # Slot lock bytes, past the end of any segment
+_READ_RETRIES = 100
+_RETRY_SLEEP_S = 0.0005
+_POLL_INTERVAL_S = 0.001  # wait_for_frame() without a futex
+_WAIT_SLICE_S = 0.1  # Longest sleep before re-checking the sender
+_CAPTURE_WAIT_MS = 50.0  # Longest capture wait before re-checking stop
+
+
+class SegmentInfo(NamedTuple):
+    """Header fields of a sender segment."""
+
+    name: str
+    width: int
+    height: int
+    format: int
+    frame_size: int
+    slots: int
+    owner_pid: int
+    frame: int
+
+
+def shm_dir() -> str:
+    """Get the directory holding shared-memory segments.
+
+    Returns:
+        Directory path
+    """
+    env = os.environ.get("LIRU_SHM_DIR")
+    if env:
+        return env
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def segment_path(name: str) -> str:
+    """Get the path of the segment for a sender name.
+
+    Args:
+        name: Sender name
+
+    Returns:
+        Segment file path
+    """
+    return os.path.join(shm_dir(), _PREFIX + quote(name, safe=""))
+
+
+def read_segment_info(name: str) -> SegmentInfo | None:
+    """Read the header of a live sender segment.
+
+    Args:
+        name: Sender name
+
+    Returns:
+        Segment header, or None if no live sender has that name
+    """
+    segment = _open_segment(segment_path(name))
+    if segment is None:
+        return None
+    try:
+        return _parse_header(name, segment.map)
+    finally:
+        segment.close()
+
+
+def list_senders() -> list[str]:
+    """Get names of live senders in the shared-memory directory.
+
+    Returns:
+        Sorted list of sender names
+    """
+    try:
+        entries = os.listdir(shm_dir())
+    except OSError:
+        return []
+    names = []
+    for entry in entries:
+        if entry.startswith(_PREFIX):
+            name = unquote(entry[len(_PREFIX) :])
+            if read_segment_info(name) is not None:
+                names.append(name)
+    return sorted(names)
+
+
+def query_senders() -> list[tuple[str, int, int, int, int, int]]:
+    """Read the headers of every live sender segment.
+
+    Returns:
+        ``(name, width, height, format, owner_pid, frame)`` per sender
+    """
+    try:
+        entries = os.listdir(shm_dir())
+    except OSError:
+        return []
+    senders = []
+    for entry in entries:
+        if entry.startswith(_PREFIX):
+            info = read_segment_info(unquote(entry[len(_PREFIX) :]))
+            if info is not None:
+                senders.append(
+                    (info.name, info.width, info.height, info.format, info.owner_pid, info.frame)
+                )
+    return senders
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a process that owns a segment is still running.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        True if the process exists
+    """
+    if pid == os.getpid():
+        return True
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def slot_stride(frame_size: int) -> int:
+    """Get the distance between frame slots, a whole number of pages.
+
+    Each slot holds the frame followed, in its last METADATA_SIZE bytes, by
+    the frame's metadata record.
+
+    Args:
+        frame_size: Frame size in bytes
+
+    Returns:
+        Slot stride in bytes
+    """
+    return -(-(frame_size + METADATA_SIZE) // _PAGE_SIZE) * _PAGE_SIZE
+
+
+def _segment_size(frame_size: int, slots: int) -> int:
+    """Get the size of a segment up to the end of its slots, where a tile table starts."""
+    return HEADER_SIZE + slots * slot_stride(frame_size)
+
+
+def _slot_views(mapping: mmap.mmap, frame_size: int, slots: int) -> list[memoryview]:
+    stride = slot_stride(frame_size)
+    whole = memoryview(mapping)
+    try:
+        return [
+            whole[HEADER_SIZE + i * stride : HEADER_SIZE + i * stride + frame_size]
+            for i in range(slots)
+        ]
+    finally:
+        whole.release()
+
+
+def _metadata_views(mapping: mmap.mmap, frame_size: int, slots: int) -> list[memoryview]:
+    stride = slot_stride(frame_size)
+    whole = memoryview(mapping)
+    try:
+        return [
+            whole[HEADER_SIZE + (i + 1) * stride - METADATA_SIZE : HEADER_SIZE + (i + 1) * stride]
+            for i in range(slots)
+        ]
+    finally:
+        whole.release()
+
+
+def _parse_header(name: str, mapping: mmap.mmap) -> SegmentInfo:
+    _, _, _, pid, width, height, fmt, frame_size, slots = _HEADER.unpack_from(mapping, 0)
+    (latest,) = _U64.unpack_from(mapping, _LATEST_OFFSET)
+    return SegmentInfo(name, width, height, fmt, frame_size, slots, pid, latest >> 8)
+
+
+def _write_header(
+    mapping: mmap.mmap,
+    width: int,
+    height: int,
+    fmt: int,
+    slots: int,
+    flags: int,
+    generation: int,
+) -> None:
+    """Fill in the header of a new segment."""
+    # Magic goes in last so receivers never see a half-written header
+    _HEADER.pack_into(
+        mapping,
+        0,
+        b"\0\0\0\0",
+        LAYOUT_VERSION,
+        flags,
+        os.getpid(),
+        width,
+        height,
+        fmt,
+        width * height * check_format(fmt).bytes_per_pixel,
+        slots,
+    )
+    _U32.pack_into(mapping, _GENERATION_OFFSET, generation)
+    mapping[0:4] = MAGIC
+
+
+class _Segment:
+    """An open, mapped segment file plus the slot locks taken through it."""
+
+    def __init__(self, fd: int, mapping: mmap.mmap) -> None:
+        self.fd = fd
+        self.map = mapping
+        self.closed = False
+
+    def try_lock_slot(self, slot: int, *, shared: bool) -> bool:
+        return not self.closed and _locks.try_lock(self.fd, _LOCK_OFFSET + slot, 1, shared=shared)
+
+    def unlock_slot(self, slot: int) -> None:
+        # A closed segment already dropped its locks, and its fd may be reused
+        if not self.closed:
+            _locks.unlock(self.fd, _LOCK_OFFSET + slot, 1)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # Borrowed frames still alias it; unmapped once they are gone
+        os.close(self.fd)
+
+
+def _open_segment(path: str) -> _Segment | None:
+    """Map a live segment read-only, or return None."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        if size < HEADER_SIZE:
+            raise ValueError("Sender is still sizing the file")
+        mapping = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        os.close(fd)
+        return None
+
+    segment = _Segment(fd, mapping)
+    magic, version, flags, pid, _, _, _, frame_size, slots = _HEADER.unpack_from(mapping, 0)
+    if (
+        magic != MAGIC
+        or version != LAYOUT_VERSION
+        or flags & FLAG_CLOSED
+        or not 1 <= slots <= MAX_SLOTS
+        or size < _segment_size(frame_size, slots)
+        or not pid_alive(pid)
+    ):
+        segment.close()
+        return None
+    return segment
+
+
+def _create_segment(name: str, path: str, size: int) -> _Segment:
+    """Create and map a new segment, replacing a stale one."""
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    try:
+        fd = os.open(path, flags, 0o600)
+    except FileExistsError:
+        stale = _open_segment(path)
+        if stale is not None:
+            stale.close()
+            raise RuntimeError(f"Sender '{name}' already exists") from None
+        try:
+            os.unlink(path)
+            fd = os.open(path, flags, 0o600)
+        except OSError as e:
+            raise RuntimeError(f"Cannot replace stale segment {path}: {e}") from e
+    try:
+        os.ftruncate(fd, size)
+        return _Segment(fd, mmap.mmap(fd, size))
+    except OSError:
+        os.close(fd)
+        raise
+
+
+class SenderWrapper:
+    """Shared-memory sender with the same interface as the native SenderWrapper."""
+
+    def __init__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        slots: int = 1,
+        format: int = FORMAT_RGBA8,
+        dirty_tiles: bool = False,
+    ) -> None:
+        self._lock = threading.Lock()  # Guards the segment and send state
+        if not name:
+            raise RuntimeError("Sender name cannot be empty")
+        if width <= 0 or height <= 0:
+            raise RuntimeError(f"Invalid dimensions: {width}x{height}")
+        if not 1 <= slots <= MAX_SLOTS:
+            raise ValueError(f"Slot count must be between 1 and {MAX_SLOTS}, got {slots}")
+
+        self._name = name
+        self._format = check_format(format)
+        self._path = segment_path(name)
+        self._segment: _Segment | None = None
+        self._frame_number = 0
+        self._dropped = 0
+        self._frame_sync = False
+        self._generation = 0
+        self._dirty_tiles = dirty_tiles
+        self._table: memoryview | None = None
+        self._tiles: TileHasher | None = None
+        segment = _create_segment(name, self._path, self._segment_size(width, height, slots))
+        flags = FLAG_DIRTY_TILES if dirty_tiles else 0
+        _write_header(segment.map, width, height, self._format, slots, flags, 0)
+        self._bind(segment, width, height, slots)
+
+        # Performance tracking
+        self._stats = StatsWindow()
+        self._stats_block: memoryview | None = None
+        self._last_send_time_ms = 0.0
+
+    def _bind(self, segment: _Segment, width: int, height: int, slots: int) -> None:
+        """Send into a segment whose header is written."""
+        self._segment = segment
+        self._map = segment.map
+        self._width = width
+        self._height = height
+        self._frame_size = width * height * self._format.bytes_per_pixel
+        self._slots = _slot_views(self._map, self._frame_size, slots)
+        self._metadata = _metadata_views(self._map, self._frame_size, slots)
+        self._slot_frames = [0] * slots  # Frame number held by each slot
+        self._latest_slot = -1
+        self._signal_address = (
+            _futex.buffer_address(self._map) + _SIGNAL_OFFSET if _futex.AVAILABLE else 0
+        )
+        if self._dirty_tiles:
+            start = _segment_size(self._frame_size, slots)
+            with memoryview(self._map) as whole:
+                self._table = whole[start : start + table_size(width, height)]
+            self._tiles = TileHasher(self._table, width, height, self._format)
+
+    def _segment_size(self, width: int, height: int, slots: int) -> int:
+        size = _segment_size(width * height * self._format.bytes_per_pixel, slots)
+        return size + table_size(width, height) if self._dirty_tiles else size
+
+    def _close_segment(self) -> None:
+        """Mark the segment closed, wake its receivers and unmap it."""
+        assert self._segment is not None
+        self._set_flag(FLAG_CLOSED, True)
+        self._signal_frame()  # Let waiting receivers see the sender is gone
+        self._tiles = None  # Drops its NumPy views of the table
+        if self._table is not None:
+            self._table.release()
+            self._table = None
+        for view in (*self._slots, *self._metadata):
+            view.release()
+        self._segment.close()
+        self._segment = None
+
+    def send_texture(
+        self, texture_id: int, timestamp_ns: int = 0, payload: bytes = b"", transfer: int = 0
+    ) -> bool:
+        if texture_id == 0:
+            raise ValueError("Invalid texture ID: 0")
+        raise RuntimeError("send_texture() needs a GPU backend; the shm backend shares CPU frames")
+
+    def send_buffer(
+        self, buffer: Buffer, timestamp_ns: int = 0, payload: bytes = b"", transfer: int = 0
+    ) -> bool:
+        """Copy one frame and its metadata into the oldest free slot and publish it.
+
+        A timestamp_ns of 0 stamps the frame with the time of the call, and
+        transfer flags are applied by the copy into the slot. Returns False,
+        without writing, when receivers borrow every slot the sender may
+        write.
+        """
+        with memoryview(buffer) as view, self._lock:
+            if self._segment is None:
+                raise RuntimeError("Sender has been released")
+            check_transfer(transfer, self._format)
+            if view.nbytes != self._frame_size:
+                raise ValueError(
+                    f"Frame buffer is {view.nbytes} bytes, expected {self._frame_size}"
+                )
+            start = time.perf_counter()
+            timestamp_ns = timestamp_ns or time.perf_counter_ns()
+            slot = self._lock_free_slot()
+            if slot < 0:
+                self._dropped += 1
+                self._stats.record_dropped()
+                return False
+            try:
+                number = self._frame_number + 1
+                seq_offset = _SLOT_SEQ_OFFSET + slot * _U64.size
+                _U64.pack_into(self._map, seq_offset, 2 * number - 1)
+                copy_frame(
+                    self._slots[slot],
+                    view.cast("B"),
+                    self._width,
+                    self._height,
+                    self._format,
+                    transfer,
+                )
+                if self._tiles is not None:
+                    self._tiles.update(self._slots[slot], number)
+                pack_metadata(self._metadata[slot], number, timestamp_ns, payload)
+                _U64.pack_into(self._map, seq_offset, 2 * number)
+                _U64.pack_into(self._map, _LATEST_OFFSET, number << 8 | slot)
+            finally:
+                self._segment.unlock_slot(slot)
+            self._frame_number = number
+            self._slot_frames[slot] = number
+            self._latest_slot = slot
+            self._signal_frame()
+            self._record_send(start)
+        return True
+
+    def warmup(self) -> None:
+        """Fault in the pages of every slot not written yet.
+
+        Writes one zero byte per page, over zeros, so the first sends do not
+        pay for page faults (or block allocation, if the directory is on
+        disk). Publishes nothing.
+        """
+        with self._lock:
+            if self._segment is None:
+                raise RuntimeError("Sender has been released")
+            stride = slot_stride(self._frame_size)
+            with memoryview(self._map) as whole:
+                for slot, number in enumerate(self._slot_frames):
+                    if number:
+                        continue  # Holds a frame, so already faulted in
+                    start = HEADER_SIZE + slot * stride
+                    with whole[start : start + stride : _PAGE_SIZE] as pages:
+                        pages[:] = bytes(len(pages))
+
+    def _signal_frame(self) -> None:
+        """Bump the frame signal counter and wake receivers sleeping on it."""
+        signal = (_U32.unpack_from(self._map, _SIGNAL_OFFSET)[0] + 1) & 0xFFFFFFFF
+        _U32.pack_into(self._map, _SIGNAL_OFFSET, signal)
+        if self._frame_sync and self._signal_address:
+            _futex.wake(self._signal_address)
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        flags = _U32.unpack_from(self._map, _FLAGS_OFFSET)[0]
+        flags = flags | flag if value else flags & ~flag
+        _U32.pack_into(self._map, _FLAGS_OFFSET, flags)
+
+    def enable_frame_sync(self, enabled: bool = True) -> None:
+        with self._lock:
+            if self._segment is None:
+                raise RuntimeError("Sender has been released")
+            self._set_flag(FLAG_FRAME_SYNC, enabled)
+            self._frame_sync = enabled
+
+    def is_frame_sync_enabled(self) -> bool:
+        return self._frame_sync
+
+    def get_tile_table(self) -> bytes | None:
+        """Copy the tile table, None if dirty tiles are not tracked."""
+        with self._lock:
+            return None if self._table is None else bytes(self._table)
+
+    def _lock_free_slot(self) -> int:
+        """Exclusively lock the oldest slot no receiver is borrowing, or return -1."""
+        assert self._segment is not None
+        if len(self._slots) == 1:
+            candidates = [0]
+        else:
+            # Never overwrite the latest frame; receivers may be reading it
+            candidates = sorted(
+                (i for i in range(len(self._slots)) if i != self._latest_slot),
+                key=self._slot_frames.__getitem__,
+            )
+        for slot in candidates:
+            if self._segment.try_lock_slot(slot, shared=False):
+                return slot
+        return -1
+
+    def _record_send(self, start: float) -> None:
+        end = time.perf_counter()
+        self._last_send_time_ms = (end - start) * 1000.0
+        self._stats.record(end, self._last_send_time_ms)
+        if self._stats_block is not None:
+            write_stats_block(
+                self._stats_block,
+                self._stats.frames,
+                self._dropped,
+                self._last_send_time_ms,
+                self._stats.fps(),
+                self._width,
+                self._height,
+            )
+
+    def set_stats_block(self, block: Buffer | None) -> None:
+        """Publish counters into a shared stats block after every send, or stop."""
+        with self._lock:
+            if self._stats_block is not None:
+                self._stats_block.release()
+            self._stats_block = None if block is None else memoryview(block)
+
+    def resize(self, width: int, height: int) -> None:
+        """Move the sender to a segment of the new size under the same name.
+
+        The new segment is complete before it replaces the old one, so
+        receivers never find the name missing. Frame numbers carry on; the
+        new segment holds no frame until the next send.
+        """
+        if width <= 0 or height <= 0:
+            raise RuntimeError(f"Invalid dimensions: {width}x{height}")
+        with self._lock:
+            if self._segment is None:
+                raise RuntimeError("Sender has been released")
+            if (width, height) == (self._width, self._height):
+                return
+            slots = len(self._slots)
+            # Hidden from list_senders() until it is renamed into place
+            temp = os.path.join(
+                os.path.dirname(self._path), f".{os.path.basename(self._path)}.{os.getpid()}"
+            )
+            segment = _create_segment(self._name, temp, self._segment_size(width, height, slots))
+            try:
+                flags = FLAG_FRAME_SYNC if self._frame_sync else 0
+                if self._dirty_tiles:
+                    flags |= FLAG_DIRTY_TILES
+                _write_header(
+                    segment.map, width, height, self._format, slots, flags, self._generation + 1
+                )
+                os.replace(temp, self._path)
+            except OSError as e:
+                segment.close()
+                try:
+                    os.unlink(temp)
+                except OSError:
+                    pass
+                raise RuntimeError(f"Cannot replace segment {self._path}: {e}") from e
+            self._close_segment()
+            self._generation += 1
+            self._bind(segment, width, height, slots)
+
+    def release(self) -> None:
+        with self._lock:
+            if self._segment is None:
+                return
+            self._close_segment()
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass  # Still mapped elsewhere (Windows); the closed flag marks it stale
+
+    def get_dropped_frames(self) -> int:
+        return self._dropped
+
+    def get_generation(self) -> int:
+        return self._generation
+
+    def get_slots(self) -> int:
+        return len(self._slots)
+
+    def get_fps(self) -> float:
+        return self._stats.fps()
+
+    def get_last_send_time_ms(self) -> float:
+        return self._last_send_time_ms
+
+    def get_stats(self, deadline_ms: float = 0.0) -> FrameStats:
+        return self._stats.snapshot(deadline_ms)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_width(self) -> int:
+        return self._width
+
+    def get_height(self) -> int:
+        return self._height
+
+    def get_format(self) -> int:
+        return self._format
+
+    def __del__(self) -> None:
+        if hasattr(self, "_segment"):
+            self.release()
+
+
+class SenderGroup:
+    """Batched send with the same interface as the native SenderGroup."""
+
+    def __init__(self, senders: tuple[SenderWrapper, ...]) -> None:
+        if not senders:
+            raise ValueError("Sender group cannot be empty")
+        self._senders = senders
+
+    def send(
+        self,
+        frames: Sequence[int | Buffer | None],
+        timestamp_ns: int = 0,
+        payload: bytes = b"",
+    ) -> tuple[bytes, array[float], float]:
+        """Send one frame per member; a failing member does not stop the others.
+
+        Returns the bitmask of published members as little-endian bytes, the
+        time each member's send took and the time of the whole batch, in ms.
+        """
+        count = len(self._senders)
+        if len(frames) != count:
+            raise ValueError(f"Expected {count} frames, got {len(frames)}")
+        if len(payload) > MAX_PAYLOAD:
+            raise ValueError(f"Payload is {len(payload)} bytes, at most {MAX_PAYLOAD} allowed")
+
+        batch_start = time.perf_counter()
+        timestamp_ns = timestamp_ns or time.perf_counter_ns()  # One moment for the batch
+        sent = 0
+        member_ms = array("d", bytes(8 * count))
+        for index, (sender, frame) in enumerate(zip(self._senders, frames, strict=True)):
+            if frame is None or (isinstance(frame, int) and not frame):
+                continue
+            start = time.perf_counter()
+            try:
+                if isinstance(frame, int):
+                    published = sender.send_texture(frame, timestamp_ns, payload)
+                else:
+                    published = sender.send_buffer(frame, timestamp_ns, payload)
+            except (RuntimeError, ValueError):
+                published = False  # Released or mismatched; reported through the bitmask
+            member_ms[index] = (time.perf_counter() - start) * 1000.0
+            if published:
+                sent |= 1 << index
+        total_ms = (time.perf_counter() - batch_start) * 1000.0
+        return sent.to_bytes((count + 7) // 8, "little"), member_ms, total_ms
+
+    def size(self) -> int:
+        return len(self._senders)
+
+
+class ReceiverWrapper:
+    """Shared-memory receiver with the same interface as the native ReceiverWrapper."""
+
+    def __init__(self, sender_name: str = "") -> None:
+        # Guards the mapping; reentrant because public methods nest
+        self._lock = threading.RLock()
+        self._active_sender = sender_name
+        self._segment: _Segment | None = None
+        self._slots: list[memoryview] = []
+        self._metadata: list[memoryview] = []
+        self._last_metadata = FrameMetadata(0, 0, b"")
+        self._signal_address = 0
+        self._width = 0
+        self._height = 0
+        self._format = 0
+        self._frame_size = 0
+        self._generation = 0
+        self._last_frame = 0
+        self._initialized = False
+        self._last_receive_time_ms = 0.0
+        self._stats = StatsWindow()
+        self._stats_block: memoryview | None = None
+
+        self.query_sender_info()
+
+    def _attach(self) -> bool:
+        """Map the active sender's segment, reattaching if it was replaced."""
+        if self._segment is not None:
+            if not _U32.unpack_from(self._segment.map, _FLAGS_OFFSET)[0] & FLAG_CLOSED:
+                return True
+            self._detach()
+        if not self._active_sender:
+            return False
+
+        segment = _open_segment(segment_path(self._active_sender))
+        if segment is None:
+            return False
+        info = _parse_header(self._active_sender, segment.map)
+        self._segment = segment
+        self._slots = _slot_views(segment.map, info.frame_size, info.slots)
+        self._metadata = _metadata_views(segment.map, info.frame_size, info.slots)
+        if _futex.AVAILABLE:
+            self._signal_address = _futex.buffer_address(segment.map) + _SIGNAL_OFFSET
+        self._width = info.width
+        self._height = info.height
+        self._format = info.format
+        self._frame_size = info.frame_size
+        self._generation = _U32.unpack_from(segment.map, _GENERATION_OFFSET)[0]
+        self._last_frame = 0
+        return True
+
+    def _detach(self) -> None:
+        with self._lock:
+            for view in (*self._slots, *self._metadata):
+                view.release()
+            self._slots = []
+            self._metadata = []
+            self._signal_address = 0
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._initialized = False
+
+    def _latest(self) -> tuple[int, int]:
+        """Get the latest frame number and the slot holding it."""
+        assert self._segment is not None
+        latest: int = _U64.unpack_from(self._segment.map, _LATEST_OFFSET)[0]
+        return latest >> 8, latest & 0xFF
+
+    def _slot_sequence(self, slot: int) -> int:
+        assert self._segment is not None
+        seq: int = _U64.unpack_from(self._segment.map, _SLOT_SEQ_OFFSET + slot * _U64.size)[0]
+        return seq
+
+    def receive_texture(
+        self, texture_id: int, transfer: int = 0, region: tuple[int, int, int, int] = (0, 0, 0, 0)
+    ) -> tuple[int, int]:
+        if texture_id == 0:
+            raise ValueError("Invalid texture ID: 0")
+        raise RuntimeError(
+            "receive_texture() needs a GPU backend; the shm backend shares CPU frames"
+        )
+
+    def receive_into(
+        self,
+        buffer: Buffer,
+        transfer: int = 0,
+        region: tuple[int, int, int, int] = (0, 0, 0, 0),
+        scale: tuple[int, int] = (0, 0),
+    ) -> tuple[int, int]:
+        """Copy the newest complete frame out of the segment into a CPU buffer.
+
+        Transfer flags are applied by the copy out of the slot. A region
+        copies only its rows and columns, and a scale shrinks it in the same
+        pass, so the buffer holds just the crop or thumbnail.
+        """
+        with self._lock:
+            if not self._attach():
+                raise RuntimeError(f"Sender '{self._active_sender}' is not available")
+            check_transfer(transfer, self._format)
+            bounds = check_region(region, self._width, self._height)
+            size = check_scale(scale, bounds, self._format)
+            with memoryview(buffer) as view:
+                expected = size[0] * size[1] * check_format(self._format).bytes_per_pixel
+                if view.nbytes != expected:
+                    raise ValueError(f"Frame buffer is {view.nbytes} bytes, expected {expected}")
+                target = view.cast("B")
+                start = time.perf_counter()
+                for _ in range(_READ_RETRIES):
+                    number, slot = self._latest()
+                    if number == 0:
+                        raise RuntimeError("No frame has been sent yet")
+                    if self._slot_sequence(slot) != 2 * number:
+                        time.sleep(_RETRY_SLEEP_S)  # Sender is rewriting the slot
+                        continue
+                    copy_frame(
+                        target,
+                        self._slots[slot],
+                        self._width,
+                        self._height,
+                        self._format,
+                        transfer,
+                        region=bounds,
+                        size=size,
+                    )
+                    metadata = unpack_metadata(self._metadata[slot])
+                    if self._slot_sequence(slot) == 2 * number:
+                        break
+                else:
+                    raise RuntimeError("Frame changed on every read attempt")
+            self._last_metadata = metadata
+            self._record_receive(number, start)
+            return size
+
+    def get_tile_table(self) -> bytes | None:
+        """Copy the sender's tile table, None if it does not track dirty tiles."""
+        with self._lock:
+            if not self._attach():
+                raise RuntimeError(f"Sender '{self._active_sender}' is not available")
+            segment = self._segment
+            assert segment is not None
+            if not _U32.unpack_from(segment.map, _FLAGS_OFFSET)[0] & FLAG_DIRTY_TILES:
+                return None
+            start = _segment_size(self._frame_size, len(self._slots))
+            return segment.map[start : start + table_size(self._width, self._height)]
+
+    def acquire_frame(self) -> Frame:
+        """Borrow the newest complete frame without copying.
+
+        Holds a shared lock on its slot, so the sender cannot write that slot,
+        until the returned Frame is released.
+        """
+        with self._lock:
+            if not self._attach():
+                raise RuntimeError(f"Sender '{self._active_sender}' is not available")
+            segment = self._segment
+            assert segment is not None
+
+            start = time.perf_counter()
+            for _ in range(_READ_RETRIES):
+                number, slot = self._latest()
+                if number == 0:
+                    raise RuntimeError("No frame has been sent yet")
+                if segment.try_lock_slot(slot, shared=True):
+                    seq = self._slot_sequence(slot)
+                    if seq and not seq & 1:
+                        number = seq // 2  # Rewritten since the latest word was read
+                        break
+                    segment.unlock_slot(slot)
+                time.sleep(_RETRY_SLEEP_S)  # Sender is mid-write
+            else:
+                raise RuntimeError("Frame is being written continuously")
+
+            data = pixel_view(self._slots[slot], self._width, self._height, self._format)
+            self._last_metadata = unpack_metadata(self._metadata[slot])
+            self._record_receive(number, start)
+            return Frame(
+                data,
+                number,
+                lambda: segment.unlock_slot(slot),
+                self._last_metadata,
+                self._format,
+            )
+
+    def _record_receive(self, number: int, start: float) -> None:
+        end = time.perf_counter()
+        self._last_receive_time_ms = (end - start) * 1000.0
+        if self._last_frame and number > self._last_frame + 1:
+            self._stats.record_dropped(number - self._last_frame - 1)
+        self._stats.record(end, self._last_receive_time_ms)
+        self._last_frame = number
+        self._initialized = True
+        if self._stats_block is not None:
+            write_stats_block(
+                self._stats_block,
+                self._stats.frames,
+                self._stats.dropped,
+                self._last_receive_time_ms,
+                self._stats.fps(),
+                self._width,
+                self._height,
+            )
+
+    def set_stats_block(self, block: Buffer | None) -> None:
+        """Publish counters into a shared stats block after every receive, or stop."""
+        with self._lock:
+            if self._stats_block is not None:
+                self._stats_block.release()
+            self._stats_block = None if block is None else memoryview(block)
+
+    def is_updated(self) -> bool:
+        with self._lock:
+            if not self._attach():
+                return False
+            return self._latest()[0] != self._last_frame
+
+    def wait_for_frame(self, timeout_ms: float) -> bool:
+        """Sleep until a frame newer than the last received one is published.
+
+        Returns False if none arrives within timeout_ms (negative waits
+        forever). Also waits for the sender to appear or come back.
+        """
+        deadline = None if timeout_ms < 0 else time.monotonic() + timeout_ms / 1000.0
+        while True:
+            # Read the counter first: a frame published after the check below
+            # changes it, so the futex wait returns at once
+            with self._lock:
+                signal = self.frame_signal()
+                if self._segment is not None and self._latest()[0] != self._last_frame:
+                    return True
+
+            remaining = _WAIT_SLICE_S
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+            if signal is not None:
+                _futex.wait(*signal, remaining)
+            else:
+                time.sleep(min(remaining, _POLL_INTERVAL_S))
+
+    def frame_signal(self) -> tuple[int, int] | None:
+        """Get the futex word the sender bumps and wakes after every frame.
+
+        Returns (address, current value) for multiplexed waits, or None if
+        the sender is gone, does not use frame sync, or there is no futex.
+        """
+        with self._lock:
+            if not self._attach() or not self._signal_address:
+                return None
+            assert self._segment is not None
+            if not _U32.unpack_from(self._segment.map, _FLAGS_OFFSET)[0] & FLAG_FRAME_SYNC:
+                return None
+            signal: int = _U32.unpack_from(self._segment.map, _SIGNAL_OFFSET)[0]
+            return self._signal_address, signal
+
+    def connect(self, timeout_ms: float) -> bool:
+        """Wait for the active sender, map its segment and fault in every page.
+
+        Returns False if the sender does not appear within timeout_ms
+        (negative waits forever).
+        """
+        if not self._active_sender:
+            raise RuntimeError("No sender selected")
+        deadline = None if timeout_ms < 0 else time.monotonic() + timeout_ms / 1000.0
+        while True:
+            with self._lock:
+                if self._attach():
+                    assert self._segment is not None
+                    self._segment.map[HEADER_SIZE::_PAGE_SIZE]  # Read one byte per page
+                    return True
+            remaining = _POLL_INTERVAL_S
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+            time.sleep(remaining)
+
+    def select_sender(self, name: str) -> None:
+        if not name:
+            raise ValueError("Sender name cannot be empty")
+        with self._lock:
+            self._detach()
+            self._active_sender = name
+            self._width = 0
+            self._height = 0
+            self.query_sender_info()
+
+    def get_sender_list(self) -> list[str]:
+        return list_senders()
+
+    def get_active_sender(self) -> str:
+        return self._active_sender
+
+    def get_width(self) -> int:
+        with self._lock:
+            self._attach()
+            return self._width
+
+    def get_height(self) -> int:
+        with self._lock:
+            self._attach()
+            return self._height
+
+    def get_format(self) -> int:
+        with self._lock:
+            self._attach()
+            return self._format
+
+    def get_frame(self) -> int:
+        return self._last_frame
+
+    def get_generation(self) -> int:
+        with self._lock:
+            self._attach()
+            return self._generation
+
+    def get_metadata(self) -> FrameMetadata:
+        return self._last_metadata
+
+    def get_last_receive_time_ms(self) -> float:
+        return self._last_receive_time_ms
+
+    def get_stats(self, deadline_ms: float = 0.0) -> FrameStats:
+        return self._stats.snapshot(deadline_ms)
+
+    def is_initialized(self) -> bool:
+        return self._initialized
+
+    def query_sender_info(self) -> bool:
+        with self._lock:
+            return self._attach()
+
+
+class ReceiverGroup:
+    """Batched receive with the same interface as the native ReceiverGroup.
+
+    Checks each member's latest-frame word and copies only the updated ones.
+    """
+
+    def __init__(self, receivers: tuple[ReceiverWrapper, ...]) -> None:
+        if not receivers:
+            raise ValueError("Receiver group cannot be empty")
+        self._receivers = receivers
+
+    def _check_count(self, count: int, what: str) -> None:
+        if count != len(self._receivers):
+            raise ValueError(f"Expected {len(self._receivers)} {what}, got {count}")
+
+    def poll_textures(self, texture_ids: list[int]) -> array[int]:
+        self._check_count(len(texture_ids), "texture IDs")
+        raise RuntimeError(
+            "receive_texture() needs a GPU backend; the shm backend shares CPU frames"
+        )
+
+    def poll_into(self, buffers: Sequence[Buffer | None]) -> array[int]:
+        """Receive every updated member into its buffer.
+
+        Returns (index, width, height) triples of the members received;
+        members that were resized or closed meanwhile are left out.
+        """
+        self._check_count(len(buffers), "buffers")
+        updates = array("i")
+        for index, (receiver, buffer) in enumerate(zip(self._receivers, buffers, strict=True)):
+            if buffer is None or not receiver.is_updated():
+                continue
+            try:
+                width, height = receiver.receive_into(buffer)
+            except (RuntimeError, ValueError):
+                continue  # Same as the native group: the others still get their frame
+            updates.extend((index, width, height))
+        return updates
+
+    def size(self) -> int:
+        return len(self._receivers)
+
+
+class CaptureWorker:
+    """Background capture with the same interface as the native CaptureWorker.
+
+    Receives on a daemon thread with its own ReceiverWrapper, so it never
+    shares state with the caller's receiver. Waits sleep on the sender's
+    frame-sync futex, or poll, without holding the GIL.
+    """
+
+    def __init__(
+        self,
+        sender_name: str,
+        on_frame: Callable[[bytearray, int, int, int, tuple[int, int, bytes]], object],
+    ) -> None:
+        if not sender_name:
+            raise ValueError("Sender name cannot be empty")
+        self._receiver = ReceiverWrapper(sender_name)
+        self._on_frame = on_frame
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"liru-capture-{sender_name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        receiver = self._receiver
+        try:
+            while not self._stop.is_set():
+                if not receiver.wait_for_frame(_CAPTURE_WAIT_MS):
+                    continue
+                width, height = receiver.get_width(), receiver.get_height()
+                fmt = receiver.get_format()
+                pixels = bytearray(width * height * check_format(fmt).bytes_per_pixel)
+                try:
+                    receiver.receive_into(pixels)
+                except (RuntimeError, ValueError):
+                    continue  # Sender closed or was replaced meanwhile
+                try:
+                    self._on_frame(pixels, width, height, fmt, receiver.get_metadata())
+                except Exception as e:
+                    # Same as the native worker: report and keep capturing
+                    sys.unraisablehook(
+                        types.SimpleNamespace(
+                            exc_type=type(e),
+                            exc_value=e,
+                            exc_traceback=e.__traceback__,
+                            err_msg="Exception ignored in liru capture callback",
+                            object=self._on_frame,
+                        )
+                    )
+        finally:
+            receiver._detach()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
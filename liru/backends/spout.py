@@ -0,0 +1,45 @@
+"""Spout 2.007 backend (Windows, DirectX 11 shared textures).
+
+Re-exports the native ``SenderWrapper``, ``SenderGroup``, ``FramePacer``,
+``ReceiverWrapper``, ``ReceiverGroup`` and ``CaptureWorker`` classes and the ``query_senders()``
+function from the ``_liru_core`` extension.
+"""
+
+from __future__ import annotations
+
+import sys
+
+if sys.platform != "win32":
+    raise ImportError(
+        f"The spout backend is only supported on Windows (current platform: {sys.platform}). "
+        "Spout 2.007 depends on DirectX 11. Use backend='shm' for shared-memory frames."
+    )
+
+try:
+    from liru._liru_core import (  # type: ignore[import-not-found]
+        CaptureWorker,
+        FramePacer,
+        ReceiverGroup,
+        ReceiverWrapper,
+        SenderGroup,
+        SenderWrapper,
+        query_senders,
+    )
+except ImportError as e:
+    raise ImportError(
+        "Failed to import _liru_core extension. "
+        "Ensure liru is properly installed with: pip install liru"
+    ) from e
+
+NAME = "spout"
+
+__all__ = [
+    "NAME",
+    "CaptureWorker",
+    "FramePacer",
+    "ReceiverGroup",
+    "ReceiverWrapper",
+    "SenderGroup",
+    "SenderWrapper",
+    "query_senders",
+]
@@ -0,0 +1,973 @@
+"""Bridging senders between machines over TCP or UDP.
+
+An ``Exporter`` sends the frames a receiver captures to a socket, and an
+``Importer`` on another machine publishes the frames it receives as a
+local sender, so receivers there see the remote sender like any other.
+The exporter connects to the importer, and reconnects when the connection
+is lost.
+
+Each frame travels as one message (little-endian):
+
+======  ==========  ===================================================
+Offset  Type        Field
+======  ==========  ===================================================
+0       char[4]     Magic ``LIRB``
+4       uint16      Version
+6       uint16      Flags: ``FLAG_ZLIB`` if the pixels are compressed
+8       uint32      Width
+12      uint32      Height
+16      uint32      Pixel format
+20      uint32      Stream, a random number per exporter
+24      uint64      Sequence number, counting frames offered from 1
+32      uint64      Size of the pixel data in bytes
+40      char[256]   The frame's metadata record (``liru.frame``)
+296     ...         Pixel data, rows top to bottom, or their zlib stream
+======  ==========  ===================================================
+
+Over TCP messages follow each other on the connection. Over UDP a message
+is split into datagrams, each starting with ``DATAGRAM_HEADER``: magic
+``LIRD``, stream, sequence number, offset of the fragment in the message
+(uint32) and message size (uint32). A message is published once all its
+fragments arrived; a fragment of a newer message abandons the one being
+assembled, so a lost datagram costs one frame and never stalls the stream.
+Assembly starts with the first fragment, once its message prefix is valid,
+and duplicated fragments are ignored. UDP has no congestion control: use it
+on a local network with headroom.
+"""
+
+from __future__ import annotations
+
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+import types
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple
+
+from liru.formats import PixelFormat, check_format
+from liru.frame import METADATA_SIZE, Frame, FrameMetadata, pack_metadata, unpack_metadata
+from liru.pacing import FramePacer, check_fps
+from liru.sender import Sender
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+    from liru.receiver import Receiver
+
+BRIDGE_VERSION = 1
+MESSAGE_MAGIC = b"LIRB"
+MESSAGE_HEADER = struct.Struct("<4sHHIIIIQQ")
+MESSAGE_PREFIX = MESSAGE_HEADER.size + METADATA_SIZE
+DATAGRAM_MAGIC = b"LIRD"
+DATAGRAM_HEADER = struct.Struct("<4sIQII")
+FLAG_ZLIB = 1
+PROTOCOLS = ("tcp", "udp")
+COMPRESSIONS = ("zlib",)
+MIN_DATAGRAM = 512  # Room for the header and message prefix
+MAX_DATAGRAM = 65507  # Largest UDP payload over IPv4
+_MAX_MESSAGE = 1 << 32  # Offsets in datagrams are 32-bit
+_SOCKET_BUFFER = 8 << 20
+_SEND_TIMEOUT = 5.0  # A stalled importer drops the connection
+_CONNECT_TIMEOUT = 2.0
+_RETRY_INTERVAL = 1.0  # Between connection attempts
+_POLL_INTERVAL = 0.1  # How often blocked importer threads check for close()
+_WINDOW = 1.0  # Seconds the fps and throughput are measured over
+
+
+class BridgeStats(NamedTuple):
+    """Counters of an ``Exporter`` or ``Importer``.
+
+    Attributes:
+        frames: Frames sent (exporter) or published (importer)
+        dropped: Frames dropped. The exporter counts frames the queue
+            discarded and frames lost while disconnected; the importer
+            counts every frame the exporter offered that was not published,
+            from whichever stage lost it
+        bytes: Message bytes sent or received, compressed where compressed
+        fps: Frames over the last second
+        throughput_mb_s: Message bytes over the last second, in MB/s
+        queue_depth: Frames waiting: queued and compressing (exporter), or
+            decompressing (importer)
+        connected: Exporter: has a socket to the importer. Importer: has a
+            TCP connection, or received a datagram in the last second
+    """
+
+    frames: int
+    dropped: int
+    bytes: int
+    fps: float
+    throughput_mb_s: float
+    queue_depth: int
+    connected: bool
+
+
+class _Meter:
+    """Frames and bytes over the last ``_WINDOW`` seconds."""
+
+    def __init__(self) -> None:
+        self._samples: deque[tuple[float, int]] = deque()
+        self._bytes = 0
+
+    def add(self, size: int) -> None:
+        now = time.monotonic()
+        self._samples.append((now, size))
+        self._bytes += size
+        self._trim(now)
+
+    def rates(self) -> tuple[float, float]:
+        """Get (frames per second, MB per second)."""
+        self._trim(time.monotonic())
+        return len(self._samples) / _WINDOW, self._bytes / _WINDOW / 1e6
+
+    def _trim(self, now: float) -> None:
+        samples = self._samples
+        while samples and samples[0][0] <= now - _WINDOW:
+            self._bytes -= samples.popleft()[1]
+
+
+def _report(e: Exception, what: str, obj: object) -> None:
+    """Report an exception on a bridge thread and keep running."""
+    sys.unraisablehook(
+        types.SimpleNamespace(
+            exc_type=type(e),
+            exc_value=e,
+            exc_traceback=e.__traceback__,
+            err_msg=f"Exception ignored in liru bridge {what}",
+            object=obj,
+        )
+    )
+
+
+def _check_protocol(protocol: str) -> None:
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown protocol '{protocol}', expected one of {', '.join(PROTOCOLS)}")
+
+
+class Exporter:
+    """Sends a receiver's frames and their metadata to an ``Importer``.
+
+    Attached to a ``Receiver``, it starts background capture
+    (``Receiver.start_capture()``) and queues every captured frame for a
+    sending thread, so capture never waits for the network. The queue holds
+    ``queue_size`` frames. When it is full, the latest frame wins: the
+    oldest queued frame is dropped to make room. With ``latest_wins=False``
+    the new frame is dropped instead, keeping the frames already queued.
+
+    With ``fps``, messages leave at most at that rate, paced like
+    ``Sender.pace()``; a faster source then loses frames to the queue
+    instead of flooding the link. With ``compression="zlib"``, frames are
+    compressed at level 1 on a pool of ``workers`` threads (zlib releases
+    the GIL), several frames at a time, and sent in order.
+
+    Frames keep their sender frame number, timestamp and payload in the
+    message. The importer republishes the payload; the timestamp belongs
+    to the exporting machine's clock.
+
+    Args:
+        receiver: Receiver to export, with its sender selected
+        address: (host, port) of the importer
+        protocol: "tcp" or "udp"
+        fps: Highest rate to send at, None to send as fast as frames come
+        queue_size: Frames queued for the sending thread
+        latest_wins: Drop the oldest queued frame for a new one, instead of
+            dropping the new one
+        compression: "zlib" to compress frames, None to send raw pixels
+        workers: Compression threads, and frames compressed at a time
+        datagram_size: Largest UDP datagram, header included
+        capture: Start capture on the receiver. False to pass frames to
+            write() yourself
+
+    Raises:
+        ValueError: If an option is invalid
+        RuntimeError: If capture cannot start
+
+    Example:
+        >>> receiver = liru.Receiver("Program")
+        >>> with liru.bridge.Exporter(receiver, ("mixer.local", 5960)) as exporter:
+        ...     time.sleep(60.0)
+        ...     print(exporter.stats())
+    """
+
+    def __init__(
+        self,
+        receiver: Receiver,
+        address: tuple[str, int],
+        *,
+        protocol: str = "tcp",
+        fps: float | None = None,
+        queue_size: int = 2,
+        latest_wins: bool = True,
+        compression: str | None = None,
+        workers: int = 2,
+        datagram_size: int = 1400,
+        capture: bool = True,
+    ) -> None:
+        """Start the sending thread and capture.
+
+        Args:
+            receiver: Receiver to export
+            address: (host, port) of the importer
+            protocol: "tcp" or "udp"
+            fps: Highest rate to send at, None for no pacing
+            queue_size: Frames queued for the sending thread
+            latest_wins: Drop the oldest queued frame when the queue is full
+            compression: "zlib" or None
+            workers: Compression threads
+            datagram_size: Largest UDP datagram
+            capture: Start capture on the receiver
+
+        Raises:
+            ValueError: If an option is invalid
+            RuntimeError: If capture cannot start
+        """
+        _check_protocol(protocol)
+        if fps is not None:
+            check_fps(fps)
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1, got {queue_size}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}"
+            )
+        if workers < 1:
+            raise ValueError(f"Worker count must be at least 1, got {workers}")
+        if not MIN_DATAGRAM <= datagram_size <= MAX_DATAGRAM:
+            raise ValueError(
+                f"Datagram size must be between {MIN_DATAGRAM} and {MAX_DATAGRAM}, "
+                f"got {datagram_size}"
+            )
+        self._receiver = receiver
+        self._address = address
+        self._protocol = protocol
+        self._pacer = None if fps is None else FramePacer(fps)
+        self._queue_size = queue_size
+        self._latest_wins = latest_wins
+        self._compression = compression
+        self._workers = workers
+        self._datagram = bytearray(datagram_size)
+        self._stream = random.getrandbits(32)
+
+        self._cond = threading.Condition()  # Guards the queue, socket, counters and state
+        self._queue: deque[tuple[int, Frame]] = deque()
+        self._pending: deque[Future[tuple[bytearray, Buffer]]] = deque()  # Compressing
+        self._sequence = 0
+        self._socket: socket.socket | None = None
+        self._retry_at = 0.0
+        self._frames = 0
+        self._dropped = 0
+        self._bytes = 0
+        self._meter = _Meter()
+        self._closing = False
+        self._closed = False
+        self._capturing = False
+
+        self._thread = threading.Thread(target=self._run, name="liru-bridge-export", daemon=True)
+        self._thread.start()
+        if capture:
+            try:
+                receiver.start_capture(self.write)
+            except (RuntimeError, TypeError):
+                self.close()
+                raise
+            self._capturing = True
+
+    def write(self, frame: Frame) -> bool:
+        """Queue a frame for the sending thread.
+
+        The frame is queued without copying, so it must be a private copy
+        (from capture, ``frames()`` or ``next_frame()``); copy frames from
+        ``acquire_frame()`` first. Never blocks on the network.
+
+        Args:
+            frame: Frame to send
+
+        Returns:
+            True if queued, False if dropped because the queue is full and
+            the latest frame does not win
+
+        Raises:
+            RuntimeError: If the exporter is closed
+        """
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Exporter is closed")
+            self._sequence += 1
+            if len(self._queue) >= self._queue_size:
+                self._dropped += 1
+                if not self._latest_wins:
+                    return False
+                self._queue.popleft()
+            self._queue.append((self._sequence, frame))
+            self._cond.notify()
+            return True
+
+    def stats(self) -> BridgeStats:
+        """Get the exporter's counters and queue depth.
+
+        Returns:
+            Snapshot of the counters
+        """
+        with self._cond:
+            fps, mb_s = self._meter.rates()
+            return BridgeStats(
+                self._frames,
+                self._dropped,
+                self._bytes,
+                fps,
+                mb_s,
+                len(self._queue) + len(self._pending),
+                self._socket is not None,
+            )
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Get the importer's address.
+
+        Returns:
+            (host, port) given at creation
+        """
+        return self._address
+
+    @property
+    def protocol(self) -> str:
+        """Get the transport protocol.
+
+        Returns:
+            "tcp" or "udp"
+        """
+        return self._protocol
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the exporter is closed.
+
+        Returns:
+            True after close()
+        """
+        return self._closed
+
+    def close(self) -> None:
+        """Stop capture and the sending thread and close the socket.
+
+        Frames still queued are dropped, and a message being sent is cut
+        short. Idempotent.
+        """
+        if self._closed:
+            return
+        if self._capturing:
+            self._receiver.stop_capture()
+            self._capturing = False
+        with self._cond:
+            self._closing = True
+            self._dropped += len(self._queue)
+            self._queue.clear()
+            sock = self._socket
+            self._cond.notify()
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)  # Wakes a blocked send
+            except OSError:
+                pass
+        self._thread.join()
+        with self._cond:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+        self._closed = True
+
+    def _run(self) -> None:
+        """Encode and send queued frames until closed (sending thread)."""
+        pool = None
+        if self._compression is not None:
+            pool = ThreadPoolExecutor(self._workers, thread_name_prefix="liru-bridge-deflate")
+        pending = self._pending
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not pending and not self._closing:
+                        self._cond.wait()
+                    if self._closing:
+                        break
+                    item = None
+                    if self._queue and len(pending) < self._workers:
+                        item = self._queue.popleft()
+                if item is None:
+                    self._transmit(pending.popleft().result())
+                elif pool is None:
+                    self._transmit(self._encode(*item))
+                else:
+                    pending.append(pool.submit(self._encode, *item))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            with self._cond:
+                self._dropped += len(pending)
+                pending.clear()
+
+    def _encode(self, sequence: int, frame: Frame) -> tuple[bytearray, Buffer]:
+        """Build the message prefix and body of a frame."""
+        data = frame.data.cast("B")
+        body: Buffer = data
+        flags = 0
+        if self._compression is not None:
+            body = zlib.compress(data, 1)
+            flags = FLAG_ZLIB
+            data.release()
+        prefix = bytearray(MESSAGE_PREFIX)
+        MESSAGE_HEADER.pack_into(
+            prefix,
+            0,
+            MESSAGE_MAGIC,
+            BRIDGE_VERSION,
+            flags,
+            frame.width,
+            frame.height,
+            frame.format,
+            self._stream,
+            sequence,
+            memoryview(body).nbytes,
+        )
+        metadata = frame.metadata
+        pack_metadata(
+            memoryview(prefix)[MESSAGE_HEADER.size :],
+            metadata.frame,
+            metadata.timestamp_ns,
+            metadata.payload,
+        )
+        return prefix, body
+
+    def _transmit(self, message: tuple[bytearray, Buffer]) -> None:
+        """Pace and send a message, connecting first if needed."""
+        prefix, body = message
+        if self._pacer is not None:
+            self._pacer.wait()
+        sock = self._socket or self._connect()
+        if sock is None:
+            with self._cond:
+                self._dropped += 1
+            return
+        size = MESSAGE_PREFIX + memoryview(body).nbytes
+        try:
+            if self._protocol == "tcp":
+                sock.sendall(prefix)
+                sock.sendall(body)
+            else:
+                self._send_datagrams(sock, prefix, memoryview(body).cast("B"), size)
+        except OSError:
+            with self._cond:
+                self._dropped += 1
+                self._socket = None
+                self._retry_at = time.monotonic() + _RETRY_INTERVAL
+            sock.close()
+            return
+        with self._cond:
+            self._frames += 1
+            self._bytes += size
+            self._meter.add(size)
+
+    def _send_datagrams(
+        self, sock: socket.socket, prefix: bytearray, body: memoryview, size: int
+    ) -> None:
+        """Send a message as datagrams; the first carries the prefix."""
+        buffer = self._datagram
+        view = memoryview(buffer)
+        room = len(buffer) - DATAGRAM_HEADER.size
+        sequence = MESSAGE_HEADER.unpack_from(prefix)[7]
+        start = DATAGRAM_HEADER.size + MESSAGE_PREFIX
+        DATAGRAM_HEADER.pack_into(buffer, 0, DATAGRAM_MAGIC, self._stream, sequence, 0, size)
+        buffer[DATAGRAM_HEADER.size : start] = prefix
+        sent = min(room - MESSAGE_PREFIX, body.nbytes)
+        buffer[start : start + sent] = body[:sent]
+        sock.send(view[: start + sent])
+        while sent < body.nbytes:
+            count = min(room, body.nbytes - sent)
+            DATAGRAM_HEADER.pack_into(
+                buffer, 0, DATAGRAM_MAGIC, self._stream, sequence, MESSAGE_PREFIX + sent, size
+            )
+            buffer[DATAGRAM_HEADER.size : DATAGRAM_HEADER.size + count] = body[sent : sent + count]
+            sock.send(view[: DATAGRAM_HEADER.size + count])
+            sent += count
+
+    def _connect(self) -> socket.socket | None:
+        """Open a socket to the importer; None while retrying is not due."""
+        if time.monotonic() < self._retry_at:
+            return None
+        sock = None
+        try:
+            if self._protocol == "tcp":
+                sock = socket.create_connection(self._address, timeout=_CONNECT_TIMEOUT)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            else:
+                host, port = self._address
+                family, kind, proto, _, target = socket.getaddrinfo(
+                    host, port, type=socket.SOCK_DGRAM
+                )[0]
+                sock = socket.socket(family, kind, proto)
+                sock.connect(target)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER)
+            sock.settimeout(_SEND_TIMEOUT)
+        except OSError:
+            if sock is not None:
+                sock.close()
+            self._retry_at = time.monotonic() + _RETRY_INTERVAL
+            return None
+        with self._cond:
+            if self._closing:
+                sock.close()
+                return None
+            self._socket = sock
+        return sock
+
+    def __enter__(self) -> Exporter:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and close the exporter.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the exporter
+        """
+        host, port = self._address
+        return f"Exporter(address='{host}:{port}', protocol='{self._protocol}')"
+
+
+class Importer:
+    """Publishes the frames an ``Exporter`` sends as a local sender.
+
+    Listens on ``address`` and publishes every frame it receives through a
+    ``Sender`` named ``name``, created with the first frame and resized or,
+    for a new format, recreated when a frame differs. Each frame is sent
+    with the payload it was captured with; its sender frame number and
+    timestamp, from the exporting machine, are in ``remote_metadata``.
+
+    Over TCP one exporter is served at a time; the next connection is
+    accepted when it disconnects. Compressed frames are decompressed on a
+    pool of ``workers`` threads. A frame that finishes after a newer one was
+    published is dropped, so the latest frame wins here too.
+
+    Exceptions raised while publishing, e.g. by a frame that does not match
+    its header, are reported through ``sys.unraisablehook`` and the frame is
+    counted as dropped.
+
+    Args:
+        name: Name of the sender to publish as
+        address: (host, port) to listen on; port 0 picks a free port
+            (see ``address``), host "" listens on every interface
+        protocol: "tcp" or "udp"
+        backend: Transport backend of the sender, None for the default
+        workers: Decompression threads, and frames decompressed at a time
+        max_frame_bytes: Largest uncompressed frame accepted. Memory for a
+            frame is only allocated for a valid header within this limit
+
+    Raises:
+        ValueError: If name is empty or an option is invalid
+        OSError: If the address cannot be bound
+
+    Example:
+        >>> with liru.bridge.Importer("Farm Program", ("", 5960)) as importer:
+        ...     time.sleep(60.0)
+        ...     print(importer.stats())
+    """
+
+    def __init__(
+        self,
+        name: str,
+        address: tuple[str, int] = ("", 0),
+        *,
+        protocol: str = "tcp",
+        backend: str | None = None,
+        workers: int = 2,
+        max_frame_bytes: int = 512 << 20,
+    ) -> None:
+        """Bind the socket and start listening.
+
+        Args:
+            name: Name of the sender to publish as
+            address: (host, port) to listen on
+            protocol: "tcp" or "udp"
+            backend: Transport backend name, None for the default backend
+            workers: Decompression threads
+            max_frame_bytes: Largest uncompressed frame accepted
+
+        Raises:
+            ValueError: If name is empty or an option is invalid
+            OSError: If the address cannot be bound
+        """
+        if not name:
+            raise ValueError("Sender name cannot be empty")
+        _check_protocol(protocol)
+        if workers < 1:
+            raise ValueError(f"Worker count must be at least 1, got {workers}")
+        if not 0 < max_frame_bytes < _MAX_MESSAGE - MESSAGE_PREFIX:
+            raise ValueError(f"Frame size limit must be positive and 32-bit, got {max_frame_bytes}")
+        self._name = name
+        self._protocol = protocol
+        self._backend = backend
+        self._max_frame_bytes = max_frame_bytes
+
+        if protocol == "tcp":
+            self._socket = socket.create_server(address, backlog=1)
+        else:
+            host, port = address
+            family, kind, proto, _, target = socket.getaddrinfo(
+                host or None, port, type=socket.SOCK_DGRAM, flags=socket.AI_PASSIVE
+            )[0]
+            self._socket = socket.socket(family, kind, proto)
+            try:
+                self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER)
+                self._socket.bind(target)
+            except OSError:
+                self._socket.close()
+                raise
+        self._socket.settimeout(_POLL_INTERVAL)
+
+        self._lock = threading.Lock()  # Guards the counters
+        self._publish_lock = threading.Lock()  # One publish at a time; guards the sender
+        self._slots = threading.BoundedSemaphore(workers)  # Frames decompressing
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="liru-bridge-inflate")
+        self._sender: Sender | None = None
+        self._remote_metadata = FrameMetadata(0, 0, b"")
+        self._arrived = (0, 0)  # (stream, sequence) of the newest message received
+        self._published = (0, 0)  # And of the newest frame published
+        self._frames = 0
+        self._dropped = 0
+        self._bytes = 0
+        self._inflight = 0
+        self._meter = _Meter()
+        self._connected = False
+        self._last_datagram = 0.0
+        self._closing = False
+        self._closed = False
+
+        serve = self._serve_tcp if protocol == "tcp" else self._serve_udp
+        self._thread = threading.Thread(target=serve, name="liru-bridge-import", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> BridgeStats:
+        """Get the importer's counters.
+
+        Returns:
+            Snapshot of the counters
+        """
+        with self._lock:
+            fps, mb_s = self._meter.rates()
+            connected = self._connected
+            if self._protocol == "udp":
+                connected = time.monotonic() - self._last_datagram < _WINDOW
+            return BridgeStats(
+                self._frames, self._dropped, self._bytes, fps, mb_s, self._inflight, connected
+            )
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Get the address the importer listens on.
+
+        Returns:
+            (host, port), with the port picked when 0 was given
+        """
+        host, port = self._socket.getsockname()[:2]
+        return host, port
+
+    @property
+    def protocol(self) -> str:
+        """Get the transport protocol.
+
+        Returns:
+            "tcp" or "udp"
+        """
+        return self._protocol
+
+    @property
+    def sender(self) -> Sender | None:
+        """Get the sender frames are published through.
+
+        Returns:
+            The sender, None before the first frame; replaced when the
+            format changes
+        """
+        return self._sender
+
+    @property
+    def remote_metadata(self) -> FrameMetadata:
+        """Get the metadata the last published frame was captured with.
+
+        Returns:
+            Frame number and timestamp on the exporting machine, and the
+            payload; all empty before the first frame
+        """
+        return self._remote_metadata
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the importer is closed.
+
+        Returns:
+            True after close()
+        """
+        return self._closed
+
+    def close(self) -> None:
+        """Stop listening and release the sender.
+
+        Frames being decompressed are dropped. Idempotent.
+        """
+        if self._closed:
+            return
+        self._closing = True
+        self._thread.join()
+        self._socket.close()
+        self._pool.shutdown(cancel_futures=True)
+        with self._publish_lock:
+            if self._sender is not None:
+                self._sender.release()
+            self._closed = True
+
+    def _serve_tcp(self) -> None:
+        """Accept exporters one at a time and read their messages."""
+        prefix = bytearray(MESSAGE_PREFIX)
+        while not self._closing:
+            try:
+                conn, _ = self._socket.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                break
+            conn.settimeout(_POLL_INTERVAL)
+            with self._lock:
+                self._connected = True
+            try:
+                while self._recv_exact(conn, memoryview(prefix)):
+                    try:
+                        size = self._check(prefix)
+                    except ValueError:
+                        break  # Not an exporter, or out of step: drop the connection
+                    body = bytearray(size)
+                    if not self._recv_exact(conn, memoryview(body)):
+                        break
+                    self._receive(prefix, body)
+            except OSError:
+                pass
+            finally:
+                conn.close()
+                with self._lock:
+                    self._connected = False
+
+    def _recv_exact(self, conn: socket.socket, view: memoryview) -> bool:
+        """Fill a buffer from a connection; False at its end or on close()."""
+        while view:
+            try:
+                count = conn.recv_into(view)
+            except TimeoutError:
+                if self._closing:
+                    return False
+                continue
+            if not count:
+                return False
+            view = view[count:]
+        return True
+
+    def _serve_udp(self) -> None:
+        """Reassemble datagrams into messages."""
+        buffer = bytearray(MAX_DATAGRAM)
+        view = memoryview(buffer)
+        message: memoryview | None = None  # Being assembled
+        current = (0, 0)  # (stream, sequence) of the newest message seen
+        finished = (0, 0)  # And of the last one completed
+        fragments: dict[int, int] = {}  # Offset to length of those received
+        received = 0
+        while not self._closing:
+            try:
+                count = self._socket.recv_into(buffer)
+            except TimeoutError:
+                continue
+            except OSError:
+                break
+            with self._lock:
+                self._last_datagram = time.monotonic()
+            if count < DATAGRAM_HEADER.size:
+                continue
+            magic, stream, sequence, offset, size = DATAGRAM_HEADER.unpack_from(buffer)
+            fragment = view[DATAGRAM_HEADER.size : count]
+            if magic != DATAGRAM_MAGIC or offset + len(fragment) > size:
+                continue
+            if (stream, sequence) == finished:
+                continue
+            if (stream, sequence) != current:
+                if stream == current[0] and sequence < current[1]:
+                    continue  # Late fragment of an abandoned message
+                current = (stream, sequence)
+                message = None
+            if message is None:
+                if offset or len(fragment) < MESSAGE_PREFIX:
+                    continue  # Arrived before the first fragment: the frame is lost
+                try:
+                    if MESSAGE_PREFIX + self._check(fragment) != size:
+                        continue
+                except ValueError:
+                    continue  # Counted as lost when the next frame arrives
+                message = memoryview(bytearray(size))
+                fragments.clear()
+                received = 0
+            if offset in fragments:
+                continue  # Duplicate
+            message[offset : offset + len(fragment)] = fragment
+            fragments[offset] = len(fragment)
+            received += len(fragment)
+            if received >= size:
+                if _covers(fragments, size):
+                    self._receive(message[:MESSAGE_PREFIX], message[MESSAGE_PREFIX:])
+                message = None
+                finished = current  # Its duplicates are ignored
+
+    def _check(self, prefix: Buffer) -> int:
+        """Validate a message prefix and get the size of its body."""
+        magic, version, flags, width, height, fmt, _, _, size = MESSAGE_HEADER.unpack_from(prefix)
+        if magic != MESSAGE_MAGIC or version != BRIDGE_VERSION:
+            raise ValueError("Not a liru bridge message")
+        raw = width * height * PixelFormat(check_format(fmt)).bytes_per_pixel
+        if raw > self._max_frame_bytes:
+            raise ValueError(f"Frame of {raw} bytes exceeds the {self._max_frame_bytes} limit")
+        # zlib grows incompressible data by a few bytes per 16 KB block
+        limit = raw + raw // 1000 + 64 if flags & FLAG_ZLIB else raw
+        if not 0 < size <= limit or MESSAGE_PREFIX + limit >= _MAX_MESSAGE:
+            raise ValueError(f"Invalid pixel data size {size} for {width}x{height}")
+        return int(size)
+
+    def _receive(self, prefix: Buffer, body: Buffer) -> None:
+        """Count a message and publish its frame, decompressing it on the pool."""
+        _, _, flags, width, height, fmt, stream, sequence, size = MESSAGE_HEADER.unpack_from(prefix)
+        metadata = unpack_metadata(memoryview(prefix)[MESSAGE_HEADER.size :])
+        with self._lock:
+            last_stream, last_sequence = self._arrived
+            if stream == last_stream and sequence > last_sequence:
+                self._dropped += sequence - last_sequence - 1  # Lost before they got here
+            if stream != last_stream or sequence > last_sequence:
+                self._arrived = (stream, sequence)
+        frame = (stream, sequence, width, height, fmt, metadata, MESSAGE_PREFIX + size)
+        if not flags & FLAG_ZLIB:
+            self._publish(frame, body)
+            return
+
+        raw = width * height * PixelFormat(fmt).bytes_per_pixel
+        self._slots.acquire()
+        with self._lock:
+            self._inflight += 1
+
+        def done(future: Future[bytes]) -> None:
+            self._slots.release()
+            with self._lock:
+                self._inflight -= 1
+            if not future.cancelled():
+                self._publish(frame, future)
+
+        self._pool.submit(_inflate, body, raw).add_done_callback(done)
+
+    def _publish(
+        self,
+        frame: tuple[int, int, int, int, int, FrameMetadata, int],
+        pixels: Buffer | Future[bytes],
+    ) -> None:
+        """Send a frame through the sender unless a newer one was published."""
+        stream, sequence, width, height, fmt, metadata, size = frame
+        with self._publish_lock:
+            stale = stream == self._published[0] and sequence <= self._published[1]
+            if self._closing or stale:
+                with self._lock:
+                    self._dropped += 1
+                return
+            self._published = (stream, sequence)
+            try:
+                if isinstance(pixels, Future):
+                    pixels = pixels.result()
+                if self._sender is None:
+                    self._sender = Sender(
+                        self._name, width, height, backend=self._backend, format=fmt
+                    )
+                else:
+                    self._sender.resize(width, height, format=fmt)
+                self._sender.send_buffer(pixels, payload=metadata.payload)
+            except Exception as e:
+                with self._lock:
+                    self._dropped += 1
+                _report(e, "importer", self)
+                return
+            self._remote_metadata = metadata
+        with self._lock:
+            self._frames += 1
+            self._bytes += size
+            self._meter.add(size)
+
+    def __enter__(self) -> Importer:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and close the importer.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the importer
+        """
+        return f"Importer(name='{self._name}', protocol='{self._protocol}')"
+
+
+def _covers(fragments: dict[int, int], size: int) -> bool:
+    """Check fragments (offset to length) tile a message exactly."""
+    position = 0
+    for offset in sorted(fragments):
+        if offset != position:
+            return False
+        position += fragments[offset]
+    return position == size
+
+
+def _inflate(body: Buffer, size: int) -> bytes:
+    """Decompress pixel data of exactly ``size`` bytes."""
+    inflater = zlib.decompressobj()
+    data = inflater.decompress(body, size)
+    if len(data) != size or not inflater.eof:
+        raise ValueError(f"Compressed pixel data does not hold {size} bytes")
+    return data
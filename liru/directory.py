@@ -0,0 +1,362 @@
+"""Cached, self-refreshing directory of the senders of a backend."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+import weakref
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+from liru.backends import get_backend
+
+
+class SenderInfo(NamedTuple):
+    """A sender listed by ``SenderDirectory``.
+
+    Attributes:
+        name: Sender name
+        width: Texture width in pixels
+        height: Texture height in pixels
+        format: Pixel format (DXGI_FORMAT code, as in Spout)
+        owner_pid: Process that owns the sender, 0 if the backend does not
+            record it (Spout)
+        frame: Latest frame number, 0 if the backend does not publish it
+            outside receivers (Spout)
+        last_update: ``time.monotonic()`` when the directory last saw the
+            sender appear, resize or publish a new frame
+    """
+
+    name: str
+    width: int
+    height: int
+    format: int
+    owner_pid: int
+    frame: int
+    last_update: float
+
+
+SenderCallback = Callable[[SenderInfo], object]
+
+
+class SenderDirectory:
+    """Indexed snapshot of all senders, refreshed on a background thread.
+
+    Scanning the backend's registry is left to a daemon thread that rescans
+    every ``interval`` seconds, so looking a sender up or listing names is a
+    dict or tuple read that never touches the registry. Each scan is diffed
+    against the previous one: only added, removed and changed senders are
+    rebuilt, and the snapshot is swapped in whole, so readers on other
+    threads always see a consistent one without locking.
+
+    Callbacks run on the refresh thread (or the thread calling refresh());
+    exceptions they raise are reported through ``sys.unraisablehook`` and
+    the directory keeps running. Senders that already exist when the
+    directory is created are reported to ``on_added`` before the
+    constructor returns.
+
+    Args:
+        backend: Transport backend name, None for the default
+        interval: Seconds between background scans
+        on_added: Called with each new sender
+        on_removed: Called with the last known info of each closed sender
+        on_resized: Called with the new info of each sender whose size or
+            format changed
+
+    Raises:
+        ValueError: If interval is not positive or the backend is unknown
+        RuntimeError: If the backend cannot list senders
+
+    Example:
+        >>> with liru.SenderDirectory(on_added=lambda s: print("new", s.name)) as senders:
+        ...     info = senders.get("MySource")  # O(1), no registry access
+        ...     names = senders.names()
+    """
+
+    def __init__(
+        self,
+        backend: str | None = None,
+        *,
+        interval: float = 0.1,
+        on_added: SenderCallback | None = None,
+        on_removed: SenderCallback | None = None,
+        on_resized: SenderCallback | None = None,
+    ) -> None:
+        """Initialize the directory, scan once and start refreshing.
+
+        Args:
+            backend: Transport backend name, None for the default backend
+            interval: Seconds between background scans
+            on_added: Called with each new sender
+            on_removed: Called with each closed sender
+            on_resized: Called with each resized sender
+
+        Raises:
+            ValueError: If interval is not positive or the backend is unknown
+            RuntimeError: If the backend cannot list senders
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        try:
+            transport = get_backend(backend)
+        except ImportError as e:
+            raise RuntimeError(f"Failed to create sender directory: {e}") from e
+        query = getattr(transport, "query_senders", None)
+        if query is None:
+            raise RuntimeError(f"The {transport.NAME} backend cannot list senders")
+
+        self._query: Callable[[], list[tuple[str, int, int, int, int, int]]] = query
+        self._backend = transport.NAME
+        self._interval = interval
+        self._on_added = on_added
+        self._on_removed = on_removed
+        self._on_resized = on_resized
+        self._senders: dict[str, SenderInfo] = {}
+        self._names: tuple[str, ...] = ()
+        self._refresh_lock = threading.Lock()  # One scan at a time
+        self._stop = threading.Event()
+
+        self.refresh()
+        # The thread holds only a weak reference, so a dropped directory stops
+        self._thread = threading.Thread(
+            target=_refresh_loop,
+            args=(weakref.ref(self), self._stop, interval),
+            name="liru-sender-directory",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def refresh(self) -> None:
+        """Scan the backend now and fire callbacks for the changes.
+
+        The background thread does this every ``interval`` seconds; call it
+        to pick up a change sooner.
+
+        Raises:
+            RuntimeError: If the backend fails to list senders
+        """
+        with self._refresh_lock:
+            try:
+                entries = self._query()
+            except Exception as e:
+                raise RuntimeError(f"Failed to list senders: {e}") from e
+            now = time.monotonic()
+            previous = self._senders
+            current: dict[str, SenderInfo] = {}
+            added: list[SenderInfo] = []
+            resized: list[SenderInfo] = []
+            for name, width, height, fmt, owner_pid, frame in entries:
+                old = previous.get(name)
+                if old is not None and (
+                    old.width,
+                    old.height,
+                    old.format,
+                    old.owner_pid,
+                    old.frame,
+                ) == (width, height, fmt, owner_pid, frame):
+                    current[name] = old  # Unchanged; keep the same object
+                    continue
+                info = SenderInfo(name, width, height, fmt, owner_pid, frame, now)
+                current[name] = info
+                if old is None or old.owner_pid != owner_pid:
+                    added.append(info)  # New, or replaced by another process
+                elif (old.width, old.height, old.format) != (width, height, fmt):
+                    resized.append(info)
+            removed = [info for name, info in previous.items() if name not in current]
+
+            self._senders = current
+            if added or removed:
+                self._names = tuple(sorted(current))
+
+        for info in removed:
+            self._notify(self._on_removed, info)
+        for info in added:
+            self._notify(self._on_added, info)
+        for info in resized:
+            self._notify(self._on_resized, info)
+
+    def _notify(self, callback: SenderCallback | None, info: SenderInfo) -> None:
+        if callback is None:
+            return
+        try:
+            callback(info)
+        except Exception as e:
+            # Same as capture callbacks: report and keep refreshing
+            sys.unraisablehook(
+                types.SimpleNamespace(
+                    exc_type=type(e),
+                    exc_value=e,
+                    exc_traceback=e.__traceback__,
+                    err_msg="Exception ignored in liru sender directory callback",
+                    object=callback,
+                )
+            )
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except RuntimeError as e:
+            sys.unraisablehook(
+                types.SimpleNamespace(
+                    exc_type=type(e),
+                    exc_value=e,
+                    exc_traceback=e.__traceback__,
+                    err_msg="Exception ignored in liru sender directory refresh",
+                    object=self,
+                )
+            )
+
+    def get(self, name: str) -> SenderInfo | None:
+        """Look up a sender by name.
+
+        Args:
+            name: Sender name
+
+        Returns:
+            Sender info from the latest scan, or None if not listed
+        """
+        return self._senders.get(name)
+
+    def names(self) -> tuple[str, ...]:
+        """Get the names of all senders.
+
+        Returns:
+            Sorted names from the latest scan (the same tuple until a sender
+            is added or removed)
+        """
+        return self._names
+
+    def snapshot(self) -> dict[str, SenderInfo]:
+        """Get every sender of the latest scan.
+
+        Returns:
+            New dict mapping name to info
+        """
+        return dict(self._senders)
+
+    def close(self) -> None:
+        """Stop refreshing and wait for the refresh thread to exit.
+
+        Lookups keep returning the last snapshot.
+        """
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def backend(self) -> str:
+        """Get transport backend name.
+
+        Returns:
+            Backend name, e.g. "spout" or "shm"
+        """
+        return self._backend
+
+    @property
+    def interval(self) -> float:
+        """Get the time between background scans.
+
+        Returns:
+            Interval in seconds
+        """
+        return self._interval
+
+    @property
+    def running(self) -> bool:
+        """Check whether the directory is still refreshing.
+
+        Returns:
+            True until close()
+        """
+        return not self._stop.is_set()
+
+    def __getitem__(self, name: str) -> SenderInfo:
+        """Look up a sender by name.
+
+        Args:
+            name: Sender name
+
+        Returns:
+            Sender info from the latest scan
+
+        Raises:
+            KeyError: If no sender has that name
+        """
+        return self._senders[name]
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a sender is listed.
+
+        Args:
+            name: Sender name
+
+        Returns:
+            True if the latest scan found it
+        """
+        return name in self._senders
+
+    def __len__(self) -> int:
+        """Get the number of senders.
+
+        Returns:
+            Sender count of the latest scan
+        """
+        return len(self._senders)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over sender names.
+
+        Returns:
+            Iterator over the sorted names of the latest scan
+        """
+        return iter(self._names)
+
+    def __enter__(self) -> SenderDirectory:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and stop refreshing.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the directory
+        """
+        return f"SenderDirectory(backend='{self._backend}', senders={len(self._senders)})"
+
+    def __del__(self) -> None:
+        """Stop the refresh thread on deletion."""
+        if hasattr(self, "_thread"):
+            self._stop.set()
+
+
+def _refresh_loop(
+    directory_ref: weakref.ref[SenderDirectory], stop: threading.Event, interval: float
+) -> None:
+    """Refresh a directory every interval until it is closed or collected."""
+    while not stop.wait(interval):
+        directory = directory_ref()
+        if directory is None:
+            return
+        directory._refresh_in_background()
+        del directory
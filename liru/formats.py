@@ -0,0 +1,101 @@
+"""Pixel formats of shared frames.
+
+A format is identified by its DXGI_FORMAT code, the value Spout stores in
+its sender registry and the shm backend in its segment header, so a
+``PixelFormat`` compares equal to the plain integers in ``SenderInfo.format``.
+
+CPU frames are rows of pixels, top to bottom, with no padding. Frame views
+have shape (height, width, components) and one item per component; 10-bit
+RGB10A2 pixels are one packed little-endian uint32 each (red in the low 10
+bits, alpha in the top 2), so their views have one component.
+"""
+
+from __future__ import annotations
+
+import enum
+import struct
+
+
+class PixelFormat(enum.IntEnum):
+    """Pixel format of a sender's frames, as a DXGI_FORMAT code.
+
+    Attributes:
+        RGBA8: 8-bit RGBA, the default (DXGI_FORMAT_R8G8B8A8_UNORM)
+        BGRA8: 8-bit BGRA, the order of Windows swap chains and of most
+            non-liru Spout senders (DXGI_FORMAT_B8G8R8A8_UNORM)
+        R8: One 8-bit channel, for masks, mattes and depth
+            (DXGI_FORMAT_R8_UNORM)
+        RGB10A2: 10-bit RGB and 2-bit alpha packed in 32 bits
+            (DXGI_FORMAT_R10G10B10A2_UNORM)
+        RGBA16F: Half-float RGBA, for HDR (DXGI_FORMAT_R16G16B16A16_FLOAT)
+        RGBA32F: Float RGBA (DXGI_FORMAT_R32G32B32A32_FLOAT)
+
+    Example:
+        >>> mask = liru.Sender("Matte", 1920, 1080, format=liru.PixelFormat.R8)
+        >>> mask.send_buffer(np.zeros((1080, 1920, 1), dtype=np.uint8))
+    """
+
+    RGBA32F = 2
+    RGBA16F = 10
+    RGB10A2 = 24
+    RGBA8 = 28
+    R8 = 61
+    BGRA8 = 87
+
+    @property
+    def item_format(self) -> str:
+        """Get the struct format character of one component.
+
+        Returns:
+            "B", "e", "f" or "I"
+        """
+        return _LAYOUTS[self][0]
+
+    @property
+    def components(self) -> int:
+        """Get the number of items per pixel in frame views.
+
+        Returns:
+            4 for RGBA formats, 1 for R8 and the packed RGB10A2
+        """
+        return _LAYOUTS[self][1]
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        """Get the size of one pixel.
+
+        Returns:
+            Bytes per pixel
+        """
+        return _LAYOUTS[self][2]
+
+
+# Component format, components per pixel and bytes per pixel of each format
+_LAYOUTS: dict[int, tuple[str, int, int]] = {
+    fmt: (item, components, struct.calcsize(item) * components)
+    for fmt, item, components in (
+        (PixelFormat.RGBA32F, "f", 4),
+        (PixelFormat.RGBA16F, "e", 4),
+        (PixelFormat.RGB10A2, "I", 1),
+        (PixelFormat.RGBA8, "B", 4),
+        (PixelFormat.R8, "B", 1),
+        (PixelFormat.BGRA8, "B", 4),
+    )
+}
+
+
+def check_format(format: int) -> PixelFormat:
+    """Validate a pixel format.
+
+    Args:
+        format: DXGI_FORMAT code or PixelFormat
+
+    Returns:
+        The format as a PixelFormat
+
+    Raises:
+        ValueError: If liru cannot carry frames of that format
+    """
+    if format not in _LAYOUTS:
+        raise ValueError(f"Unsupported pixel format: {format}")
+    return PixelFormat(format)
@@ -0,0 +1,262 @@
+"""Received frames and the metadata senders attach to them.
+
+Every sent frame carries a fixed-size metadata record next to its pixels
+(layout, little-endian):
+
+======  ==========  ===============================================
+Offset  Type        Field
+======  ==========  ===============================================
+0       uint64      Frame number, counting up from 1
+8       int64       Capture timestamp, ``time.perf_counter_ns()`` clock
+16      uint32      Payload length in bytes
+20      uint32      Reserved
+24      char[232]   Payload
+======  ==========  ===============================================
+
+``time.perf_counter_ns()`` reads the system-wide monotonic clock on Linux,
+macOS and Windows (``std::chrono::steady_clock`` in native code), so a
+receiver can subtract a sender's timestamp from its own clock to get the
+frame's age.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+import types
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from liru.formats import PixelFormat
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+METADATA_SIZE = 256
+MAX_PAYLOAD = 232
+METADATA_HEADER = struct.Struct("<QqII")
+
+
+class FrameMetadata(NamedTuple):
+    """Metadata a sender attached to a frame.
+
+    Attributes:
+        frame: Sender frame number, counting up from 1 (0 before any frame)
+        timestamp_ns: Capture time on the ``time.perf_counter_ns()`` clock,
+            0 if the sender did not provide one
+        payload: User bytes attached by the sender, up to ``MAX_PAYLOAD``
+
+    Example:
+        >>> metadata = receiver.metadata
+        >>> if metadata.frame != last_frame:
+        ...     print(f"{metadata.age_ms():.2f}ms old, scene {metadata.payload!r}")
+    """
+
+    frame: int
+    timestamp_ns: int
+    payload: bytes
+
+    def age_ms(self, now_ns: int | None = None) -> float:
+        """Get how long ago the frame was captured.
+
+        Args:
+            now_ns: Current ``time.perf_counter_ns()``, None to read it
+
+        Returns:
+            Age in milliseconds, 0.0 without a timestamp
+        """
+        if not self.timestamp_ns:
+            return 0.0
+        now = time.perf_counter_ns() if now_ns is None else now_ns
+        return (now - self.timestamp_ns) / 1e6
+
+
+def pack_metadata(record: Buffer, frame: int, timestamp_ns: int, payload: bytes) -> None:
+    """Write a metadata record.
+
+    Args:
+        record: Writable record of METADATA_SIZE bytes
+        frame: Frame number
+        timestamp_ns: Capture timestamp
+        payload: Payload of at most MAX_PAYLOAD bytes
+    """
+    view = memoryview(record)
+    METADATA_HEADER.pack_into(view, 0, frame, timestamp_ns, len(payload), 0)
+    view[METADATA_HEADER.size : METADATA_HEADER.size + len(payload)] = payload
+
+
+def unpack_metadata(record: Buffer) -> FrameMetadata:
+    """Read a metadata record.
+
+    Args:
+        record: Record of METADATA_SIZE bytes
+
+    Returns:
+        Metadata; a corrupt payload length is clamped to MAX_PAYLOAD
+    """
+    view = memoryview(record)
+    frame, timestamp_ns, length, _ = METADATA_HEADER.unpack_from(view, 0)
+    start = METADATA_HEADER.size
+    return FrameMetadata(frame, timestamp_ns, bytes(view[start : start + min(length, MAX_PAYLOAD)]))
+
+
+class Frame:
+    """A received frame borrowed from the sender without copying.
+
+    ``data`` is a read-only memoryview of shape (height, width, components),
+    in the sender's pixel format, that aliases the shared frame. While the
+    frame is held, the sender will not write to it. The view is only valid
+    until ``release()``, which is called automatically at the end of a
+    ``with`` block. NumPy arrays created from ``data`` alias the same memory
+    and must not be used after release.
+
+    Example:
+        >>> with receiver.acquire_frame() as frame:
+        ...     pixels = np.asarray(frame.data)
+        ...     print(frame.frame_number, pixels.mean())
+    """
+
+    def __init__(
+        self,
+        data: memoryview,
+        frame_number: int,
+        release: Callable[[], None] | None = None,
+        metadata: FrameMetadata | None = None,
+        format: int = PixelFormat.RGBA8,
+    ) -> None:
+        """Wrap a borrowed frame.
+
+        Args:
+            data: Read-only view of shape (height, width, components)
+            frame_number: Sender frame number of this frame
+            release: Called once when the frame is released
+            metadata: Metadata the sender attached, None if unknown
+            format: Pixel format of the frame
+        """
+        self._data = data
+        self._frame_number = frame_number
+        self._metadata = metadata or FrameMetadata(frame_number, 0, b"")
+        self._format = format
+        self._height, self._width = data.shape[0], data.shape[1]  # type: ignore[index]
+        self._release = release
+        self._released = False
+
+    @property
+    def data(self) -> memoryview:
+        """Get the borrowed pixel view.
+
+        Returns:
+            Read-only memoryview of shape (height, width, components)
+
+        Raises:
+            RuntimeError: If the frame has been released
+        """
+        if self._released:
+            raise RuntimeError("Frame has been released")
+        return self._data
+
+    @property
+    def frame_number(self) -> int:
+        """Get the sender frame number.
+
+        Returns:
+            Frame number (increments by one per sent frame)
+        """
+        return self._frame_number
+
+    @property
+    def metadata(self) -> FrameMetadata:
+        """Get the metadata the sender attached to this frame.
+
+        Returns:
+            Frame number, capture timestamp and payload
+        """
+        return self._metadata
+
+    @property
+    def format(self) -> int:
+        """Get the pixel format of the frame.
+
+        Returns:
+            PixelFormat of ``data``, the sender's at the time of the receive
+        """
+        return self._format
+
+    @property
+    def width(self) -> int:
+        """Get frame width.
+
+        Returns:
+            Width in pixels
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """Get frame height.
+
+        Returns:
+            Height in pixels
+        """
+        return self._height
+
+    @property
+    def released(self) -> bool:
+        """Check whether the frame has been released.
+
+        Returns:
+            True after release()
+        """
+        return self._released
+
+    def release(self) -> None:
+        """Return the frame to the sender.
+
+        Idempotent. Views derived from ``data`` must not be used afterwards.
+        """
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._data.release()
+        except BufferError:
+            pass  # Still exported (e.g. to NumPy); the mapping outlives it
+        if self._release is not None:
+            self._release()
+
+    def __enter__(self) -> Frame:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and release the frame.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.release()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of frame
+        """
+        state = ", released" if self._released else ""
+        return f"Frame(number={self._frame_number}, size={self._width}x{self._height}{state})"
+
+    def __del__(self) -> None:
+        """Release the lease if the frame was dropped without release()."""
+        if hasattr(self, "_released"):
+            self.release()
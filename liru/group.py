@@ -0,0 +1,454 @@
+"""Batched send and receive over several senders."""
+
+from __future__ import annotations
+
+import types
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from liru._buffers import byte_view
+from liru.backends import ReceiverGroupImpl, SenderGroupImpl, get_backend
+from liru.receiver import Receiver
+from liru.sender import Sender, _metadata_args
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Callable
+
+
+class GroupSendResult(NamedTuple):
+    """Outcome of ``SenderGroup.send()``.
+
+    Attributes:
+        sent: Bitmask of the members that published their frame, bit i for
+            member i
+        member_ms: Time each member's send took, in member order (0.0 for
+            skipped members)
+        total_ms: Time the whole batch took
+
+    Example:
+        >>> result = group.send(textures)
+        >>> if not result.all_sent:
+        ...     print(f"Failed outputs: {result.failed()}")
+    """
+
+    sent: int
+    member_ms: array[float]
+    total_ms: float
+
+    def ok(self, index: int) -> bool:
+        """Check whether a member published its frame.
+
+        Args:
+            index: Member index
+
+        Returns:
+            True if the member's bit is set
+        """
+        return bool(self.sent >> index & 1)
+
+    def failed(self) -> list[int]:
+        """Get the members that did not publish a frame.
+
+        Returns:
+            Indices of failed and skipped members
+        """
+        return [index for index in range(len(self.member_ms)) if not self.sent >> index & 1]
+
+    @property
+    def all_sent(self) -> bool:
+        """Check whether every member published its frame.
+
+        Returns:
+            True if no member failed or was skipped
+        """
+        return self.sent == (1 << len(self.member_ms)) - 1
+
+
+class SenderGroup:
+    """Senders published together in one call.
+
+    ``send()`` takes one frame per member, an OpenGL texture ID or a CPU
+    buffer, and publishes them all in a single backend call; the Spout
+    backend does the whole batch natively with the GIL released. Members
+    that fail (released, wrong buffer size, dropped frame) do not stop the
+    others and are reported in the result's bitmask instead of raising.
+    Every frame of a batch carries the same timestamp and payload.
+
+    The group does not own its senders; release them as usual.
+
+    Args:
+        senders: Senders to publish, in member order, all on one backend
+
+    Raises:
+        ValueError: If no senders are given or they use different backends
+        RuntimeError: If a sender is released or the backend has no batched
+            send
+
+    Example:
+        >>> outputs = [liru.Sender(f"Wall{i}", 640, 360) for i in range(24)]
+        >>> group = liru.SenderGroup(outputs)
+        >>> result = group.send([slice.glo for slice in slices])
+        >>> print(f"{result.total_ms:.2f}ms, sent {result.sent:024b}")
+    """
+
+    def __init__(self, senders: Iterable[Sender]) -> None:
+        """Register the senders.
+
+        Args:
+            senders: Senders to publish, in member order
+
+        Raises:
+            ValueError: If no senders are given or they use different backends
+            RuntimeError: If creation fails
+        """
+        self._senders = tuple(senders)
+        if not self._senders:
+            raise ValueError("SenderGroup needs at least one sender")
+        backends = {sender.backend for sender in self._senders}
+        if len(backends) > 1:
+            raise ValueError(f"Senders of a group must share a backend, got {sorted(backends)}")
+        for sender in self._senders:
+            if sender._released:
+                raise RuntimeError(f"Sender '{sender.name}' has been released")
+
+        transport = get_backend(self._senders[0].backend)
+        group_class = getattr(transport, "SenderGroup", None)
+        if group_class is None:
+            raise RuntimeError(f"The {transport.NAME} backend does not support sender groups")
+        try:
+            self._impl: SenderGroupImpl = group_class(
+                tuple(sender._impl for sender in self._senders)
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create sender group: {e}") from e
+
+    def send(
+        self,
+        frames: Sequence[int | Buffer | None],
+        *,
+        timestamp_ns: int | None = None,
+        payload: Buffer | None = None,
+    ) -> GroupSendResult:
+        """Publish one frame per member.
+
+        Args:
+            frames: One frame per member, in member order: an OpenGL texture
+                ID, a C-contiguous buffer of the member's size and pixel
+                format, or None (or texture 0) to skip the member
+            timestamp_ns: Capture time of the batch on the
+                ``time.perf_counter_ns()`` clock, None to stamp it at the call
+            payload: Up to 232 bytes attached to every frame
+
+        Returns:
+            Bitmask of the members that published, and the timings
+
+        Raises:
+            TypeError: If a frame is neither an int, a buffer nor None
+            ValueError: If there is not one frame per member, a buffer is not
+                C-contiguous with items of the member's format, or
+                timestamp_ns or payload is invalid
+            RuntimeError: If the batch fails as a whole
+
+        Example:
+            >>> result = group.send(frames, payload=timecode)
+            >>> slowest = max(range(len(group)), key=result.member_ms.__getitem__)
+        """
+        timestamp, data = _metadata_args(timestamp_ns, payload)
+        views = _member_views(frames, [sender.format for sender in self._senders], writable=False)
+        try:
+            sent, member_ms, total_ms = self._impl.send(views, timestamp, data)
+        except (TypeError, ValueError):
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Group send error: {e}") from e
+        times = array("d")
+        times.frombytes(memoryview(member_ms).cast("B"))
+        return GroupSendResult(int.from_bytes(sent, "little"), times, total_ms)
+
+    @property
+    def senders(self) -> tuple[Sender, ...]:
+        """Get the members.
+
+        Returns:
+            Senders in member order
+        """
+        return self._senders
+
+    @property
+    def backend(self) -> str:
+        """Get transport backend name.
+
+        Returns:
+            Backend name, e.g. "spout" or "shm"
+        """
+        return self._senders[0].backend
+
+    def __getitem__(self, index: int) -> Sender:
+        """Get a member.
+
+        Args:
+            index: Member index, as in the send() bitmask
+
+        Returns:
+            Member sender
+        """
+        return self._senders[index]
+
+    def __len__(self) -> int:
+        """Get the number of members.
+
+        Returns:
+            Member count
+        """
+        return len(self._senders)
+
+    def __iter__(self) -> Iterator[Sender]:
+        """Iterate over the members.
+
+        Returns:
+            Iterator over the senders in member order
+        """
+        return iter(self._senders)
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the group
+        """
+        return f"SenderGroup(backend='{self.backend}', senders={len(self._senders)})"
+
+
+class ReceiverGroup:
+    """Receivers for several senders, polled together in one call.
+
+    ``poll()`` and ``poll_into()`` check every member and receive each
+    updated one in a single backend call; the Spout backend does the whole
+    pass natively with the GIL released. The result lists only the members
+    that received a frame, as a flat ``array('i')`` of
+    ``(index, width, height)`` triples, so the Python work per tick grows
+    with the number of senders that changed, not with the group size.
+
+    Members are ordinary ``Receiver`` objects (``group[i]``) for everything
+    else: sizes, metadata, stats or selecting another sender.
+
+    Args:
+        sender_names: Names of the senders to receive from, in member order
+        backend: Transport backend name, None for the default
+        publish_stats: Publish a shared stats block per member, None for the
+            default
+
+    Raises:
+        ValueError: If no sender names are given or one is empty
+        RuntimeError: If a receiver cannot be created or the backend has no
+            batched receive
+
+    Example:
+        >>> group = liru.ReceiverGroup([f"Camera{i}" for i in range(16)])
+        >>> updates = group.poll([texture.glo for texture in textures])
+        >>> for i in range(0, len(updates), 3):
+        ...     index, width, height = updates[i : i + 3]
+        ...     draw_tile(index, textures[index])
+    """
+
+    def __init__(
+        self,
+        sender_names: Iterable[str],
+        *,
+        backend: str | None = None,
+        publish_stats: bool | None = None,
+    ) -> None:
+        """Create one receiver per sender and group them.
+
+        Args:
+            sender_names: Names of the senders to receive from
+            backend: Transport backend name, None for the default backend
+            publish_stats: Publish shared stats blocks, None for the default
+
+        Raises:
+            ValueError: If no sender names are given or one is empty
+            RuntimeError: If creation fails
+        """
+        names = list(sender_names)
+        if not names:
+            raise ValueError("ReceiverGroup needs at least one sender name")
+        if not all(names):
+            raise ValueError("Sender name cannot be empty")
+
+        self._receivers = tuple(
+            Receiver(name, backend=backend, publish_stats=publish_stats) for name in names
+        )
+        transport = get_backend(self._receivers[0].backend)
+        group_class = getattr(transport, "ReceiverGroup", None)
+        if group_class is None:
+            raise RuntimeError(f"The {transport.NAME} backend does not support receiver groups")
+        try:
+            self._impl: ReceiverGroupImpl = group_class(
+                tuple(receiver._impl for receiver in self._receivers)
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create receiver group: {e}") from e
+
+    def poll(self, textures: Sequence[int]) -> array[int]:
+        """Receive every updated member into its OpenGL texture.
+
+        Args:
+            textures: One texture ID per member, in member order; 0 skips
+                the member
+
+        Returns:
+            Flat ``(index, width, height)`` triples of the members that
+            received a frame, in member order
+
+        Raises:
+            TypeError: If a texture ID is not a non-negative integer
+            ValueError: If there is not one texture per member
+            RuntimeError: If the backend cannot receive textures
+
+        Example:
+            >>> updates = group.poll(texture_ids)
+            >>> updated = updates[0::3]  # Indices of the members that changed
+        """
+        return self._poll(self._impl.poll_textures, textures)
+
+    def poll_into(self, buffers: Sequence[Buffer | None]) -> array[int]:
+        """Receive every updated member into its CPU pixel buffer.
+
+        Buffers are C-contiguous frames of the member's size and format, as for
+        ``Receiver.receive_into()``. A member whose sender was resized or
+        closed is left out of the result; compare ``group[index].width``
+        and ``height`` to reallocate its buffer.
+
+        Args:
+            buffers: One writable buffer per member, in member order; None
+                skips the member
+
+        Returns:
+            Flat ``(index, width, height)`` triples of the members that
+            received a frame, in member order
+
+        Raises:
+            TypeError: If a buffer does not support the buffer protocol
+            ValueError: If there is not one buffer per member or a buffer
+                is not C-contiguous with items of the member's format, or is
+                read-only
+            RuntimeError: If the poll fails
+
+        Example:
+            >>> frames = [np.empty((r.height, r.width, 4), np.uint8) for r in group]
+            >>> updates = group.poll_into(frames)
+        """
+        views = _member_views(buffers, [r.format for r in self._receivers], writable=True)
+        return self._poll(self._impl.poll_into, views)
+
+    def _poll(self, poll: Callable[[Any], Buffer], targets: Sequence[Any]) -> array[int]:
+        """Run a backend poll and unpack its triples."""
+        try:
+            raw = poll(targets)
+        except (TypeError, ValueError):
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Group receive error: {e}") from e
+        updates = array("i")
+        updates.frombytes(memoryview(raw).cast("B"))
+        return updates
+
+    @property
+    def receivers(self) -> tuple[Receiver, ...]:
+        """Get the members.
+
+        Returns:
+            Receivers in member order
+        """
+        return self._receivers
+
+    @property
+    def sender_names(self) -> list[str]:
+        """Get the sender each member is connected to.
+
+        Returns:
+            Active sender names in member order
+        """
+        return [receiver.active_sender for receiver in self._receivers]
+
+    @property
+    def backend(self) -> str:
+        """Get transport backend name.
+
+        Returns:
+            Backend name, e.g. "spout" or "shm"
+        """
+        return self._receivers[0].backend
+
+    def __getitem__(self, index: int) -> Receiver:
+        """Get a member.
+
+        Args:
+            index: Member index, as in poll() results
+
+        Returns:
+            Member receiver
+        """
+        return self._receivers[index]
+
+    def __len__(self) -> int:
+        """Get the number of members.
+
+        Returns:
+            Member count
+        """
+        return len(self._receivers)
+
+    def __iter__(self) -> Iterator[Receiver]:
+        """Iterate over the members.
+
+        Returns:
+            Iterator over the receivers in member order
+        """
+        return iter(self._receivers)
+
+    def __enter__(self) -> ReceiverGroup:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and clean up every member.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        for receiver in self._receivers:
+            receiver.__exit__(exc_type, exc_val, exc_tb)
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the group
+        """
+        return f"ReceiverGroup(backend='{self.backend}', receivers={len(self._receivers)})"
+
+
+def _member_views(items: Sequence[Any], formats: Sequence[int], *, writable: bool) -> list[Any]:
+    """Flatten each member's buffer to bytes of its format; ints and None pass through.
+
+    Entries beyond the member count also pass through, so the backend
+    reports the count mismatch.
+    """
+    views = list(items)
+    for index, (item, fmt) in enumerate(zip(items, formats, strict=False)):
+        if item is not None and not isinstance(item, int):
+            views[index] = byte_view(item, writable=writable, format=fmt)
+    return views
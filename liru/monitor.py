@@ -0,0 +1,369 @@
+"""Shared stats blocks for monitoring senders and receivers from other processes.
+
+A Sender or Receiver created with ``publish_stats=True`` (or with
+``LIRU_PUBLISH_STATS=1`` in the environment) owns a small memory-mapped file
+in the shared-memory directory and updates its counters after every frame
+(layout in ``liru.stats``). A monitor maps the files read-only, so scraping
+needs no cooperation from the pipelines and never touches their hot loops.
+
+Example:
+    >>> from liru import monitor
+    >>> for block in monitor.open_stats_blocks():
+    ...     record = block.read()
+    ...     print(record.name, record.role, record.fps, record.peak_latency_ms)
+    ...     block.close()
+"""
+
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import time
+import types
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import quote
+
+from liru.backends.shm import pid_alive, shm_dir
+from liru.stats import (
+    ROLE_RECEIVER,
+    ROLE_SENDER,
+    STATS_BLOCK_COUNTERS,
+    STATS_BLOCK_COUNTERS_OFFSET,
+    STATS_BLOCK_IDENTITY,
+    STATS_BLOCK_MAGIC,
+    STATS_BLOCK_SEQ,
+    STATS_BLOCK_SEQ_OFFSET,
+    STATS_BLOCK_SIZE,
+    STATS_BLOCK_VERSION,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+PUBLISH_ENV = "LIRU_PUBLISH_STATS"
+_PREFIX = "liru-stats."
+_ROLES = {ROLE_SENDER: "sender", ROLE_RECEIVER: "receiver"}
+_READ_RETRIES = 100
+_receiver_ids = itertools.count(1)
+
+
+class StatsRecord(NamedTuple):
+    """A consistent snapshot of one stats block."""
+
+    role: str
+    pid: int
+    name: str
+    created_ns: int
+    frames: int
+    dropped: int
+    last_latency_ms: float
+    peak_latency_ms: float
+    fps: float
+    last_frame_ns: int
+    width: int
+    height: int
+
+
+def publish_stats_default() -> bool:
+    """Check whether senders and receivers publish stats blocks by default.
+
+    Returns:
+        True if ``LIRU_PUBLISH_STATS`` is set to a true value
+    """
+    return os.environ.get(PUBLISH_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def stats_dtype() -> np.dtype[Any]:
+    """Get the NumPy structured dtype of a stats block.
+
+    Returns:
+        Structured dtype with one field per block field
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    import numpy as np
+
+    fields = [
+        ("magic", "S4", 0),
+        ("version", "<u4", 4),
+        ("role", "<u4", 8),
+        ("pid", "<u4", 12),
+        ("created_ns", "<i8", 16),
+        ("name", "S64", 24),
+        ("seq", "<u8", 88),
+        ("frames", "<u8", 96),
+        ("dropped", "<u8", 104),
+        ("last_latency_ms", "<f8", 112),
+        ("peak_latency_ms", "<f8", 120),
+        ("fps", "<f8", 128),
+        ("last_frame_ns", "<i8", 136),
+        ("width", "<u4", 144),
+        ("height", "<u4", 148),
+    ]
+    return np.dtype(
+        {
+            "names": [name for name, _, _ in fields],
+            "formats": [fmt for _, fmt, _ in fields],
+            "offsets": [offset for _, _, offset in fields],
+            "itemsize": STATS_BLOCK_SIZE,
+        }
+    )
+
+
+class StatsBlock:
+    """A memory-mapped stats block.
+
+    Created by ``Sender``/``Receiver`` for publishing, or opened read-only by
+    ``open_stats_blocks()`` for monitoring.
+    """
+
+    def __init__(self, path: str, fd: int, mapping: mmap.mmap, *, owner: bool) -> None:
+        """Wrap a mapped block; use create() or open() instead.
+
+        Args:
+            path: Block file path
+            fd: Open file descriptor of the block
+            mapping: Mapping of the block
+            owner: Whether this process writes the block and removes it on close
+        """
+        self._path = path
+        self._fd = fd
+        self._map = mapping
+        self._owner = owner
+        self._closed = False
+
+    @classmethod
+    def create(cls, role: int, name: str, width: int = 0, height: int = 0) -> StatsBlock:
+        """Create a block for a sender or receiver of this process.
+
+        Args:
+            role: ROLE_SENDER or ROLE_RECEIVER
+            name: Sender name
+            width: Frame width in pixels, if known
+            height: Frame height in pixels, if known
+
+        Returns:
+            Writable block, to be passed to a backend's ``set_stats_block()``
+
+        Raises:
+            OSError: If the block file cannot be created
+        """
+        file_name = f"{_PREFIX}{_ROLES[role]}.{quote(name, safe='')}"
+        if role == ROLE_RECEIVER:
+            file_name += f".{os.getpid()}.{next(_receiver_ids)}"
+        path = os.path.join(shm_dir(), file_name)
+        flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(path, flags, 0o644)
+        try:
+            os.ftruncate(fd, STATS_BLOCK_SIZE)
+            mapping = mmap.mmap(fd, STATS_BLOCK_SIZE)
+        except OSError:
+            os.close(fd)
+            raise
+
+        # Magic goes in last so monitors never see a half-written header
+        STATS_BLOCK_IDENTITY.pack_into(
+            mapping,
+            0,
+            b"\0\0\0\0",
+            STATS_BLOCK_VERSION,
+            role,
+            os.getpid(),
+            time.time_ns(),
+            name.encode()[:64],
+        )
+        STATS_BLOCK_COUNTERS.pack_into(
+            mapping, STATS_BLOCK_COUNTERS_OFFSET, 0, 0, 0.0, 0.0, 0.0, 0, width, height
+        )
+        mapping[0:4] = STATS_BLOCK_MAGIC
+        return cls(path, fd, mapping, owner=True)
+
+    @classmethod
+    def open(cls, path: str) -> StatsBlock | None:
+        """Map a live block read-only.
+
+        Args:
+            path: Block file path
+
+        Returns:
+            Block, or None if the file is not a live stats block
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except OSError:
+            return None
+        try:
+            if os.fstat(fd).st_size < STATS_BLOCK_SIZE:
+                raise ValueError("Block is still being created")
+            mapping = mmap.mmap(fd, STATS_BLOCK_SIZE, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            os.close(fd)
+            return None
+        block = cls(path, fd, mapping, owner=False)
+        magic, version, _, pid, _, _ = STATS_BLOCK_IDENTITY.unpack_from(mapping, 0)
+        if magic != STATS_BLOCK_MAGIC or version != STATS_BLOCK_VERSION or not pid_alive(pid):
+            block.close()
+            return None
+        return block
+
+    @property
+    def path(self) -> str:
+        """Get the block file path.
+
+        Returns:
+            Path in the shared-memory directory
+        """
+        return self._path
+
+    @property
+    def buffer(self) -> mmap.mmap:
+        """Get the mapped block.
+
+        Returns:
+            Mapping of STATS_BLOCK_SIZE bytes
+        """
+        return self._map
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the block is closed.
+
+        Returns:
+            True after close()
+        """
+        return self._closed
+
+    def read(self) -> StatsRecord:
+        """Read a consistent snapshot of the block.
+
+        Returns:
+            Snapshot of every field
+
+        Raises:
+            ValueError: If the block is closed
+            RuntimeError: If the counters changed on every attempt
+        """
+        if self._closed:
+            raise ValueError("Stats block is closed")
+        _, _, role, pid, created_ns, raw_name = STATS_BLOCK_IDENTITY.unpack_from(self._map, 0)
+        for _ in range(_READ_RETRIES):
+            seq = STATS_BLOCK_SEQ.unpack_from(self._map, STATS_BLOCK_SEQ_OFFSET)[0]
+            if seq & 1:
+                continue  # Owner is mid-update
+            counters = STATS_BLOCK_COUNTERS.unpack_from(self._map, STATS_BLOCK_COUNTERS_OFFSET)
+            if STATS_BLOCK_SEQ.unpack_from(self._map, STATS_BLOCK_SEQ_OFFSET)[0] == seq:
+                break
+        else:
+            raise RuntimeError("Stats block changed on every read attempt")
+        name = raw_name.rstrip(b"\0").decode(errors="replace")
+        return StatsRecord(_ROLES.get(role, "unknown"), pid, name, created_ns, *counters)
+
+    def view(self) -> np.ndarray[Any, np.dtype[Any]]:
+        """Get a live NumPy structured view of the block.
+
+        The fields follow the block as the owner updates it, without locking;
+        use read() when the counters must be consistent with each other.
+
+        Returns:
+            Array of shape (1,) with dtype stats_dtype()
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the block is closed
+        """
+        if self._closed:
+            raise ValueError("Stats block is closed")
+        import numpy as np
+
+        return np.frombuffer(self._map, dtype=stats_dtype(), count=1)
+
+    def close(self) -> None:
+        """Unmap the block; the owner also removes the file.
+
+        Detach the block from its backend (``set_stats_block(None)``) first.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._owner:
+            self._map[0:4] = b"\0\0\0\0"  # Monitors still mapping it skip it
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # A NumPy view still aliases it; unmapped once it is gone
+        os.close(self._fd)
+        if self._owner:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass  # Still mapped by a monitor (Windows); the cleared magic marks it
+
+    def __enter__(self) -> StatsBlock:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and close the block.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the block
+        """
+        state = "closed" if self._closed else "owner" if self._owner else "read-only"
+        return f"StatsBlock('{os.path.basename(self._path)}', {state})"
+
+
+def open_stats_blocks() -> list[StatsBlock]:
+    """Map the stats blocks of every live sender and receiver read-only.
+
+    Keep the blocks open and call read() on each scrape; close them when
+    their process goes away or when done.
+
+    Returns:
+        Read-only blocks, sorted by file name
+    """
+    directory = shm_dir()
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return []
+    blocks = []
+    for entry in sorted(entries):
+        if entry.startswith(_PREFIX):
+            block = StatsBlock.open(os.path.join(directory, entry))
+            if block is not None:
+                blocks.append(block)
+    return blocks
+
+
+def list_stats_blocks() -> list[str]:
+    """Get paths of the stats blocks of live processes.
+
+    Returns:
+        Sorted list of block file paths
+    """
+    paths = []
+    for block in open_stats_blocks():
+        paths.append(block.path)
+        block.close()
+    return paths
@@ -0,0 +1,103 @@
+"""Frame pacing for senders.
+
+``Sender(target_fps=...)`` paces its loop with a ``FramePacer``: the native
+one of the Spout backend, which waits with the GIL released, or the portable
+one below. Both keep deadlines on a fixed grid of periods from the first
+wait, so sleep overshoot never accumulates into drift. They sleep until
+shortly before each deadline and spin the rest of the way.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+# Left to spinning: the usual oversleep of time.sleep()
+SPIN_MARGIN_S = 0.001 if sys.platform == "win32" else 0.0005
+
+
+def check_fps(fps: float) -> float:
+    """Validate a target frame rate.
+
+    Args:
+        fps: Target frames per second
+
+    Returns:
+        The frame rate
+
+    Raises:
+        ValueError: If fps is not positive
+    """
+    if not fps > 0:
+        raise ValueError(f"Target FPS must be positive, got {fps}")
+    return fps
+
+
+def sleep_until(deadline: float) -> None:
+    """Sleep until shortly before a deadline and spin the rest of the way.
+
+    Args:
+        deadline: ``time.perf_counter()`` time to return at
+    """
+    remaining = deadline - time.perf_counter() - SPIN_MARGIN_S
+    if remaining > 0:
+        time.sleep(remaining)
+    while time.perf_counter() < deadline:
+        pass
+
+
+class FramePacer:
+    """Fixed-rate frame clock, with the same interface as the native FramePacer.
+
+    The first ``wait()`` starts the cadence and returns at once. A call made
+    after its deadline returns at once and counts a miss; more than a period
+    late, the cadence restarts from then instead of bursting to catch up.
+    Thread-safe.
+
+    Args:
+        fps: Target frames per second
+
+    Raises:
+        ValueError: If fps is not positive
+    """
+
+    def __init__(self, fps: float) -> None:
+        self._fps = check_fps(fps)
+        self._period = 1.0 / fps
+        self._lock = threading.Lock()  # Guards the cadence; held while waiting
+        self._deadline: float | None = None
+        self._missed = 0
+
+    def wait(self) -> bool:
+        """Block until the next frame deadline.
+
+        Returns:
+            True if the deadline was met, False if it had already passed
+        """
+        with self._lock:
+            now = time.perf_counter()
+            if self._deadline is None:
+                self._deadline = now
+                return True
+
+            deadline = self._deadline + self._period
+            if now > deadline:
+                self._missed += 1
+                # More than a frame behind: restart the cadence instead of bursting
+                self._deadline = now if now - deadline >= self._period else deadline
+                return False
+            self._deadline = deadline
+            sleep_until(deadline)
+            return True
+
+    def reset(self) -> None:
+        """Restart the cadence at the next wait()."""
+        with self._lock:
+            self._deadline = None
+
+    def get_fps(self) -> float:
+        return self._fps
+
+    def get_missed(self) -> int:
+        return self._missed
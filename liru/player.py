@@ -0,0 +1,348 @@
+"""Playing recordings back through a sender."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import types
+
+from liru.pacing import SPIN_MARGIN_S, check_fps, sleep_until
+from liru.recorder import Recording
+from liru.sender import Sender
+
+
+class Player:
+    """Publishes a recording (``liru.Recorder``) as a normal sender.
+
+    Frames are sent straight from the memory-mapped recording: each is a
+    view of the page cache passed to ``Sender.send_buffer()``, which copies
+    it into the shared frame, with the payload it was recorded with. The
+    next ``readahead`` frames are hinted to the OS so they are read from
+    disk before they are due.
+
+    Without ``fps``, frames keep the spacing of their recorded timestamps,
+    counted from the first frame played after creation, a seek or a loop.
+    Frames recorded without a timestamp are sent right after the previous
+    one. With ``fps``, they are paced at that fixed rate by
+    ``Sender.pace()``. Sent frames get new frame numbers and timestamps
+    from the sender.
+
+    The sender is created with the first frame's size and format. When a
+    later frame differs, the sender is resized or, for a new format,
+    recreated under the same name.
+
+    Args:
+        path: Recording container file
+        name: Name of the sender to publish as
+        fps: Fixed frame rate, None to follow the recorded timestamps
+        loop: Start over after the last frame instead of stopping
+        readahead: Frames to hint ahead of the one being sent
+        backend: Transport backend name, None for the default
+
+    Raises:
+        ValueError: If the recording is invalid or empty, fps is not
+            positive or readahead is negative
+        OSError: If the recording cannot be opened
+        RuntimeError: If sender creation fails
+
+    Example:
+        >>> with liru.Player("show.liru", "Replay", loop=True) as player:
+        ...     player.play()  # Until stop() from another thread
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        name: str,
+        *,
+        fps: float | None = None,
+        loop: bool = False,
+        readahead: int = 8,
+        backend: str | None = None,
+    ) -> None:
+        """Open the recording and create the sender.
+
+        Args:
+            path: Recording container file
+            name: Name of the sender to publish as
+            fps: Fixed frame rate, None for the recorded timestamps
+            loop: Start over after the last frame
+            readahead: Frames to hint ahead
+            backend: Transport backend name, None for the default backend
+
+        Raises:
+            ValueError: If the recording is invalid or empty, fps is not
+                positive or readahead is negative
+            OSError: If the recording cannot be opened
+            RuntimeError: If sender creation fails
+        """
+        if fps is not None:
+            check_fps(fps)
+        if readahead < 0:
+            raise ValueError(f"Readahead cannot be negative, got {readahead}")
+        self._recording = Recording(path)
+        if not len(self._recording):
+            self._recording.close()
+            raise ValueError(f"Recording '{self._recording.path}' has no frames")
+
+        first = self._recording.entry(0)
+        try:
+            self._sender = Sender(
+                name,
+                first.width,
+                first.height,
+                backend=backend,
+                target_fps=fps,
+                format=first.format,
+            )
+        except Exception:
+            self._recording.close()
+            raise
+        self._name = name
+        self._fps = fps
+        self._loop = loop
+        self._readahead = readahead
+        self._position = 0
+        self._origin: tuple[float, int] | None = None  # (perf_counter, timestamp_ns) of the first
+        self._missed = 0
+        self._wake = threading.Condition()  # Signals stop() and close() to waits
+        self._stops = 0  # Calls to stop(); a wait ends when it changes
+        self._closing = False
+        self._lock = threading.Lock()  # One step at a time
+        self._closed = False
+        self._recording.prefetch(0, readahead + 1)
+
+    def step(self) -> bool:
+        """Wait until the next frame is due and send it.
+
+        Returns:
+            True if a frame was sent, False at the end of a recording that
+            does not loop, or if stop() or close() ended the wait; the frame
+            is then sent by the next step()
+
+        Raises:
+            RuntimeError: If the player is closed or sending fails
+        """
+        return self._step(self._stops)
+
+    def _step(self, stops: int) -> bool:
+        """Send the next frame unless stop() is called after ``stops`` calls."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Player is closed")
+            recording = self._recording
+            if self._position >= len(recording):
+                if not self._loop:
+                    return False
+                self._seek(0)
+            index = self._position
+            entry = recording.entry(index)
+            if not self._wait(entry.timestamp_ns, stops):
+                return False
+
+            sender = self._sender
+            sender.resize(entry.width, entry.height, format=entry.format)
+            with recording.pixels(index) as pixels:
+                sender.send_buffer(pixels, payload=recording.metadata(index).payload)
+
+            self._position = index + 1
+            if self._readahead:
+                recording.prefetch(index + 1 + self._readahead)
+            return True
+
+    def play(self, count: int | None = None) -> int:
+        """Send frames until the end, ``count`` frames, or stop().
+
+        Args:
+            count: Most frames to send, None for no limit
+
+        Returns:
+            Number of frames sent
+
+        Raises:
+            RuntimeError: If the player is closed or sending fails
+        """
+        stops = self._stops
+        sent = 0
+        while (count is None or sent < count) and self._stops == stops:
+            if not self._step(stops):
+                break
+            sent += 1
+        return sent
+
+    def stop(self) -> None:
+        """Make play() return, cutting short the wait for the next frame; thread-safe."""
+        with self._wake:
+            self._stops += 1
+            self._wake.notify_all()
+
+    def seek(self, index: int) -> None:
+        """Continue from a frame.
+
+        Timing restarts from it: it is sent at once, and with recorded
+        timestamps the following frames keep their spacing from it.
+
+        Args:
+            index: Frame position, from 0; negative counts from the end
+
+        Raises:
+            IndexError: If there is no such frame
+        """
+        with self._lock:
+            if index < 0:
+                index += len(self._recording)
+            if not 0 <= index < len(self._recording):
+                raise IndexError(
+                    f"Frame {index} is outside a {len(self._recording)}-frame recording"
+                )
+            self._seek(index)
+
+    def _seek(self, index: int) -> None:
+        self._position = index
+        self._origin = None
+        if self._fps is not None:
+            self._sender.target_fps = self._fps  # Restarts the cadence
+        self._recording.prefetch(index, self._readahead + 1)
+
+    def _wait(self, timestamp_ns: int, stops: int) -> bool:
+        """Wait until a frame with this recorded timestamp is due.
+
+        Returns False if stop() or close() came first.
+        """
+        if self._fps is not None:
+            if not self._sender.pace():  # At most one period
+                self._missed += 1
+            return True
+        now = time.perf_counter()
+        if self._origin is None or not timestamp_ns:
+            if timestamp_ns:
+                self._origin = (now, timestamp_ns)
+            return True
+        start, first_ns = self._origin
+        deadline = start + (timestamp_ns - first_ns) / 1e9
+        if now > deadline:
+            self._missed += 1
+            return True
+        with self._wake:
+            while self._stops == stops and not self._closing:
+                remaining = deadline - time.perf_counter() - SPIN_MARGIN_S
+                if remaining <= 0:
+                    break
+                self._wake.wait(remaining)
+            else:
+                return False
+        sleep_until(deadline)
+        return True
+
+    @property
+    def position(self) -> int:
+        """Get the position of the next frame to send.
+
+        Returns:
+            Frame position, from 0; the frame count at the end
+        """
+        return self._position
+
+    @property
+    def frames(self) -> int:
+        """Get the number of frames in the recording.
+
+        Returns:
+            Frame count
+        """
+        return len(self._recording)
+
+    @property
+    def loop(self) -> bool:
+        """Get whether playback starts over after the last frame.
+
+        Returns:
+            True if looping
+        """
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: bool) -> None:
+        """Set whether playback starts over after the last frame.
+
+        Args:
+            loop: True to loop
+        """
+        self._loop = loop
+
+    @property
+    def missed_deadlines(self) -> int:
+        """Get the number of frames sent after they were due.
+
+        Returns:
+            Late frames since creation
+        """
+        return self._missed
+
+    @property
+    def sender(self) -> Sender:
+        """Get the sender frames are published through.
+
+        Returns:
+            The sender; replaced when the recorded format changes
+        """
+        return self._sender
+
+    @property
+    def recording(self) -> Recording:
+        """Get the recording being played.
+
+        Returns:
+            The memory-mapped recording
+        """
+        return self._recording
+
+    def close(self) -> None:
+        """Release the sender and unmap the recording.
+
+        Idempotent. Stops play() on other threads first.
+        """
+        with self._wake:
+            self._closing = True
+            self._wake.notify_all()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._sender.release()
+            self._recording.close()
+
+    def __enter__(self) -> Player:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and close the player.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the player
+        """
+        return (
+            f"Player(path='{self._recording.path}', sender='{self._name}', "
+            f"position={self._position}/{len(self._recording)})"
+        )
@@ -0,0 +1,529 @@
+"""Pool of receive targets (CPU buffers and GPU textures) keyed by size and format."""
+
+from __future__ import annotations
+
+import mmap
+import threading
+import types
+import warnings
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple
+
+from liru._buffers import pixel_view
+from liru.formats import PixelFormat, check_format
+
+TextureFactory = Callable[[int, int, int], int]
+
+
+class PoolStats(NamedTuple):
+    """Counters of a ``FramePool``.
+
+    Attributes:
+        hits: Acquires served by a pooled target
+        misses: Acquires that had to allocate
+        evictions: Pooled targets freed to stay under the byte budget
+        in_use: Targets handed out and not released
+        pooled: Released targets kept for reuse
+        bytes_in_use: Size of the targets handed out
+        bytes_pooled: Size of the targets kept for reuse
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    in_use: int
+    pooled: int
+    bytes_in_use: int
+    bytes_pooled: int
+
+
+class _Entry:
+    """A pooled target and what it is keyed by."""
+
+    __slots__ = ("key", "nbytes", "storage")
+
+    def __init__(self, key: tuple[int, int, int], nbytes: int, storage: mmap.mmap | int) -> None:
+        self.key = key
+        self.nbytes = nbytes
+        self.storage = storage
+
+
+class FramePool:
+    """Receive targets reused across frames, keyed by (width, height, format).
+
+    Hands out CPU buffers (``acquire()``) and, given a ``texture_factory``,
+    OpenGL textures (``acquire_texture()``). A released target goes back to
+    the pool and the next request for the same size and format gets it
+    again instead of a new allocation, so switching between sources of
+    different sizes settles into a fixed set of targets.
+
+    ``max_bytes`` caps the pool: when targets in use plus pooled ones would
+    exceed it, the least recently released pooled targets are freed
+    (textures through ``texture_deleter``). Targets in use are never taken
+    back, so the pool may exceed the budget while they are held.
+
+    CPU buffers are anonymous memory maps, aligned to the page size and so
+    to any SIMD width, and zero-filled on first use. Thread-safe; textures
+    are created and deleted on the thread that acquires or releases them,
+    which must have the OpenGL context current.
+
+    Pass the pool to ``Receiver.receive_into()`` or
+    ``Receiver.receive_texture()`` to have the receiver take a target of
+    the sender's size from it.
+
+    Args:
+        max_bytes: Byte budget of targets in use plus pooled ones
+        texture_factory: Called as ``factory(width, height, format)`` to
+            create an OpenGL texture, returning its ID
+        texture_deleter: Called with a texture ID the pool frees
+
+    Raises:
+        ValueError: If max_bytes is negative
+
+    Example:
+        >>> pool = liru.FramePool(max_bytes=512 << 20)
+        >>> with receiver.receive_into(pool) as frame:
+        ...     pixels = np.asarray(frame)  # (height, width, 4) uint8
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 << 20,
+        *,
+        texture_factory: TextureFactory | None = None,
+        texture_deleter: Callable[[int], object] | None = None,
+    ) -> None:
+        """Create an empty pool.
+
+        Args:
+            max_bytes: Byte budget of targets in use plus pooled ones
+            texture_factory: Creates an OpenGL texture, returning its ID
+            texture_deleter: Deletes a texture the pool frees
+
+        Raises:
+            ValueError: If max_bytes is negative
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Byte budget cannot be negative, got {max_bytes}")
+        self._max_bytes = max_bytes
+        self._texture_factory = texture_factory
+        self._texture_deleter = texture_deleter
+        self._lock = threading.Lock()  # Guards the entries and counters
+        self._free: dict[tuple[tuple[int, int, int], bool], list[_Entry]] = {}
+        self._lru: OrderedDict[int, _Entry] = OrderedDict()  # Pooled, oldest release first
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._in_use = 0
+        self._bytes_in_use = 0
+        self._bytes_pooled = 0
+
+    def acquire(self, width: int, height: int, format: int = PixelFormat.RGBA8) -> PooledBuffer:
+        """Get a CPU buffer for one frame.
+
+        Args:
+            width: Width in pixels
+            height: Height in pixels
+            format: Pixel format
+
+        Returns:
+            Writable buffer of shape (height, width, components); release
+            it to return it to the pool
+
+        Raises:
+            ValueError: If the size or format is invalid
+
+        Example:
+            >>> with pool.acquire(1920, 1080) as buffer:
+            ...     receiver.receive_into(buffer)
+        """
+        key, nbytes = _check_key(width, height, format)
+        entry = self._take(key, nbytes, texture=False)
+        if entry is None:
+            try:
+                # Page-aligned and only backed by memory once written
+                entry = _Entry(key, nbytes, mmap.mmap(-1, nbytes))
+            except OSError:
+                self._forget(nbytes)
+                raise
+        return PooledBuffer(self, entry)
+
+    def acquire_texture(
+        self, width: int, height: int, format: int = PixelFormat.RGBA8
+    ) -> PooledTexture:
+        """Get an OpenGL texture for one frame.
+
+        Args:
+            width: Width in pixels
+            height: Height in pixels
+            format: Pixel format
+
+        Returns:
+            Texture lease; release it to return the texture to the pool
+
+        Raises:
+            ValueError: If the size or format is invalid
+            RuntimeError: If the pool has no texture_factory or it fails
+        """
+        if self._texture_factory is None:
+            raise RuntimeError("FramePool needs a texture_factory to hand out textures")
+        key, nbytes = _check_key(width, height, format)
+        entry = self._take(key, nbytes, texture=True)
+        if entry is None:
+            try:
+                texture_id = int(self._texture_factory(width, height, format))
+            except Exception as e:
+                self._forget(nbytes)
+                raise RuntimeError(f"Texture factory error: {e}") from e
+            entry = _Entry(key, nbytes, texture_id)
+        return PooledTexture(self, entry)
+
+    def _take(self, key: tuple[int, int, int], nbytes: int, *, texture: bool) -> _Entry | None:
+        """Count a target in use and reuse a pooled one, or return None to allocate."""
+        with self._lock:
+            self._in_use += 1
+            self._bytes_in_use += nbytes
+            free = self._free.get((key, texture))
+            if free:
+                entry = free.pop()
+                del self._lru[id(entry)]
+                self._bytes_pooled -= nbytes
+                self._hits += 1
+                return entry
+            self._misses += 1
+            evicted = self._evict_locked()
+        self._free_entries(evicted)
+        return None
+
+    def _give_back(self, entry: _Entry) -> None:
+        """Pool a released target, evicting old ones over the budget."""
+        with self._lock:
+            self._in_use -= 1
+            self._bytes_in_use -= entry.nbytes
+            self._free.setdefault((entry.key, isinstance(entry.storage, int)), []).append(entry)
+            self._lru[id(entry)] = entry
+            self._bytes_pooled += entry.nbytes
+            evicted = self._evict_locked()
+        self._free_entries(evicted)
+
+    def _forget(self, nbytes: int) -> None:
+        """Stop counting a target that will not come back."""
+        with self._lock:
+            self._in_use -= 1
+            self._bytes_in_use -= nbytes
+
+    def _evict_locked(self, max_bytes: int | None = None) -> list[_Entry]:
+        """Unpool the least recently released targets until under the budget."""
+        budget = self._max_bytes if max_bytes is None else max_bytes
+        evicted = []
+        while self._lru and self._bytes_in_use + self._bytes_pooled > budget:
+            _, entry = self._lru.popitem(last=False)
+            self._free[(entry.key, isinstance(entry.storage, int))].remove(entry)
+            self._bytes_pooled -= entry.nbytes
+            self._evictions += 1
+            evicted.append(entry)
+        return evicted
+
+    def _free_entries(self, entries: list[_Entry]) -> None:
+        """Free evicted targets, outside the lock."""
+        for entry in entries:
+            if isinstance(entry.storage, int):
+                if self._texture_deleter is not None:
+                    self._texture_deleter(entry.storage)
+            else:
+                try:
+                    entry.storage.close()
+                except BufferError:
+                    pass  # Still viewed after release; freed once the views are gone
+
+    def clear(self) -> None:
+        """Free every pooled target; targets in use are not affected."""
+        with self._lock:
+            evicted = self._evict_locked(0)
+        self._free_entries(evicted)
+
+    def stats(self) -> PoolStats:
+        """Get the pool counters.
+
+        Returns:
+            Hits, misses, evictions and the targets in use and pooled
+        """
+        with self._lock:
+            return PoolStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._in_use,
+                len(self._lru),
+                self._bytes_in_use,
+                self._bytes_pooled,
+            )
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the byte budget.
+
+        Returns:
+            Budget of targets in use plus pooled ones, in bytes
+        """
+        return self._max_bytes
+
+    def __enter__(self) -> FramePool:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and free the pooled targets.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.clear()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the pool
+        """
+        stats = self.stats()
+        return (
+            f"FramePool(in_use={stats.in_use}, pooled={stats.pooled}, "
+            f"bytes={stats.bytes_in_use + stats.bytes_pooled}/{self._max_bytes})"
+        )
+
+
+def _check_key(width: int, height: int, format: int) -> tuple[tuple[int, int, int], int]:
+    """Validate a target size and format and get its pool key and byte size."""
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid dimensions: {width}x{height}")
+    fmt = check_format(format)
+    return (width, height, fmt), width * height * fmt.bytes_per_pixel
+
+
+class _Lease:
+    """A target handed out by a FramePool until released."""
+
+    def __init__(self, pool: FramePool, entry: _Entry) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+
+    @property
+    def width(self) -> int:
+        """Get target width.
+
+        Returns:
+            Width in pixels
+        """
+        return self._entry.key[0]
+
+    @property
+    def height(self) -> int:
+        """Get target height.
+
+        Returns:
+            Height in pixels
+        """
+        return self._entry.key[1]
+
+    @property
+    def format(self) -> int:
+        """Get target pixel format.
+
+        Returns:
+            PixelFormat of the target
+        """
+        return self._entry.key[2]
+
+    @property
+    def nbytes(self) -> int:
+        """Get target size.
+
+        Returns:
+            Size of one frame in bytes
+        """
+        return self._entry.nbytes
+
+    @property
+    def released(self) -> bool:
+        """Check whether the target went back to the pool.
+
+        Returns:
+            True after release()
+        """
+        return self._released
+
+    def release(self) -> None:
+        """Return the target to the pool; it must not be used afterwards."""
+        if not self._released:
+            self._released = True
+            self._pool._give_back(self._entry)
+
+    def _check(self) -> None:
+        if self._released:
+            raise RuntimeError(f"{type(self).__name__} has been released")
+
+    def __del__(self) -> None:
+        """Stop counting a target dropped without release()."""
+        if hasattr(self, "_released") and not self._released:
+            self._released = True
+            self._pool._forget(self._entry.nbytes)
+
+
+class PooledBuffer(_Lease):
+    """A CPU frame buffer lent by ``FramePool.acquire()``.
+
+    Supports the buffer protocol as a writable array of shape
+    (height, width, components), e.g. (height, width, 4) uint8 for RGBA8,
+    so it can be passed to ``Receiver.receive_into()``,
+    ``Sender.send_buffer()`` or ``np.asarray()`` directly. Release it, or
+    use it as a context manager, to give it back to the pool; views made
+    from it must not be used afterwards.
+
+    Example:
+        >>> with pool.acquire(640, 360) as buffer:
+        ...     receiver.receive_into(buffer)
+        ...     thumbnail = np.asarray(buffer)[::4, ::4]
+    """
+
+    @property
+    def data(self) -> memoryview:
+        """Get the pixel view.
+
+        Returns:
+            Writable memoryview of shape (height, width, components)
+
+        Raises:
+            RuntimeError: If the buffer has been released
+        """
+        self._check()
+        storage = self._entry.storage
+        assert isinstance(storage, mmap.mmap)
+        with memoryview(storage) as whole:
+            return pixel_view(whole[: self.nbytes], self.width, self.height, self.format)
+
+    def __buffer__(self, flags: int, /) -> memoryview:
+        """Expose the pixels through the buffer protocol.
+
+        Args:
+            flags: Buffer request flags
+
+        Returns:
+            View of the pixels
+        """
+        return self.data
+
+    def __enter__(self) -> PooledBuffer:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and return the buffer to the pool.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.release()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the buffer
+        """
+        state = "released" if self._released else "in use"
+        return f"PooledBuffer(size={self.width}x{self.height}, {state})"
+
+
+class PooledTexture(_Lease):
+    """An OpenGL texture lent by ``FramePool.acquire_texture()``.
+
+    Release it, or use it as a context manager, to give the texture back
+    to the pool.
+
+    Example:
+        >>> with receiver.receive_texture(pool) as texture:
+        ...     draw(texture.texture_id)
+    """
+
+    @property
+    def texture_id(self) -> int:
+        """Get the OpenGL texture ID.
+
+        Returns:
+            Texture ID from the pool's texture_factory
+
+        Raises:
+            RuntimeError: If the texture has been released
+        """
+        self._check()
+        storage = self._entry.storage
+        assert isinstance(storage, int)
+        return storage
+
+    def __enter__(self) -> PooledTexture:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and return the texture to the pool.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.release()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the texture
+        """
+        state = "released" if self._released else "in use"
+        return f"PooledTexture(id={self._entry.storage}, size={self.width}x{self.height}, {state})"
+
+    def __del__(self) -> None:
+        """Warn about a texture dropped without release(); it is not deleted."""
+        if hasattr(self, "_released") and not self._released:
+            warnings.warn(
+                f"PooledTexture {self._entry.storage} was not released. "
+                "Call texture.release() or use 'with' statement to return it to the pool.",
+                ResourceWarning,
+                stacklevel=2,
+            )
+        super().__del__()
@@ -2,27 +2,50 @@
 
 from __future__ import annotations
 
+import asyncio
+import queue
 import types
+from typing import TYPE_CHECKING, TypeVar, overload
 
-try:
-    from . import _liru_core  # type: ignore[attr-defined]
-except ImportError as e:
-    raise ImportError(
-        "Failed to import _liru_core extension. "
-        "Ensure liru is properly installed with: pip install liru"
-    ) from e
+from liru._buffers import frame_view, pixel_view
+from liru.backends import CaptureWorkerImpl, ReceiverImpl, get_backend
+from liru.formats import PixelFormat, check_format
+from liru.frame import Frame, FrameMetadata
+from liru.monitor import StatsBlock, publish_stats_default
+from liru.pool import FramePool, PooledBuffer, PooledTexture
+from liru.stats import ROLE_RECEIVER, FrameStats, backend_deadline
+from liru.stream import FrameStream
+from liru.tiles import DirtyTiles, dirty_tiles
+from liru.transfer import Transfer, check_region, check_scale, check_transfer
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Callable
+
+_Target = TypeVar("_Target", PooledBuffer, PooledTexture)
+_RESIZE_ATTEMPTS = 3  # Receives before giving up on a sender that keeps resizing
+_WHOLE_FRAME = (0, 0, 0, 0)
 
 
 class Receiver:
     """Spout receiver for receiving GPU textures.
 
     Wraps a Spout receiver that receives OpenGL textures from senders
-    via DirectX shared texture handles.
+    via DirectX shared texture handles, or a shared-memory receiver on
+    platforms without Spout.
 
     Args:
         sender_name: Name of sender to connect to (optional, can connect later)
+        backend: Transport backend name ("spout" or "shm"), None for default
+        publish_stats: Publish counters in a shared stats block that other
+            processes read with ``liru.monitor``. None follows the
+            ``LIRU_PUBLISH_STATS`` environment variable
+        connect_timeout: Seconds to wait in connect() before returning, so
+            the first frame is received as fast as the rest. None connects
+            on the first receive
 
     Raises:
+        ValueError: If connect_timeout is negative
+        TimeoutError: If the sender does not appear within connect_timeout
         RuntimeError: If receiver creation fails
 
     Example:
@@ -35,50 +58,512 @@ class Receiver:
         ...     width, height = receiver.receive_texture(texture.glo)
     """
 
-    def __init__(self, sender_name: str | None = None) -> None:
+    def __init__(
+        self,
+        sender_name: str | None = None,
+        *,
+        backend: str | None = None,
+        publish_stats: bool | None = None,
+        connect_timeout: float | None = None,
+    ) -> None:
         """Initialize Spout receiver.
 
         Args:
             sender_name: Name of sender to connect to (optional)
+            backend: Transport backend name, None for the default backend
+            publish_stats: Publish a shared stats block, None for the default
+            connect_timeout: Connect before returning, waiting up to this many
+                seconds; None to connect on the first receive
 
         Raises:
-            RuntimeError: If receiver creation fails
+            ValueError: If the backend is unknown or connect_timeout is
+                negative
+            TimeoutError: If the sender does not appear within connect_timeout
+            RuntimeError: If receiver creation or connection fails
         """
         try:
-            self._impl = _liru_core.ReceiverWrapper(sender_name or "")
-        except RuntimeError as e:
+            transport = get_backend(backend)
+            self._impl: ReceiverImpl = transport.ReceiverWrapper(sender_name or "")
+        except (ImportError, RuntimeError) as e:
             raise RuntimeError(f"Failed to create receiver: {e}") from e
 
-    def receive_texture(self, texture_id: int) -> tuple[int, int]:
+        self._backend = transport.NAME
+        self._capture_worker_class = getattr(transport, "CaptureWorker", None)
+        self._capture: CaptureWorkerImpl | None = None
+        self._staging: bytearray | None = None
+        self._staging_lent = False
+        self._stats_block: StatsBlock | None = None
+
+        if publish_stats_default() if publish_stats is None else publish_stats:
+            try:
+                self._stats_block = StatsBlock.create(ROLE_RECEIVER, sender_name or "")
+            except OSError as e:
+                raise RuntimeError(f"Failed to create stats block: {e}") from e
+            self._impl.set_stats_block(self._stats_block.buffer)
+
+        if connect_timeout is not None:
+            try:
+                connected = self.connect(connect_timeout)
+            except (ValueError, RuntimeError):
+                self._close_stats_block()
+                raise
+            if not connected:
+                self._close_stats_block()
+                raise TimeoutError(
+                    f"Sender '{sender_name or ''}' did not appear within {connect_timeout}s"
+                )
+
+    def connect(self, timeout: float | None = None) -> bool:
+        """Connect to the sender ahead of the first receive.
+
+        Waits for the sender to appear and does the handshake the first
+        receive would otherwise do, so that receive is as fast as the rest
+        and is_updated() reports frames from the first one on. The Spout
+        backend opens the sender's shared texture and sets up the
+        OpenGL/DirectX interop (with an OpenGL context current, as for
+        receive_texture()); the shm backend maps the sender's memory and
+        faults in its pages. Receives nothing. The GIL is released while
+        waiting.
+
+        Args:
+            timeout: Maximum time to wait for the sender in seconds, None to
+                wait forever
+
+        Returns:
+            True once connected, False if the timeout expired
+
+        Raises:
+            ValueError: If timeout is negative
+            RuntimeError: If no sender is selected or connecting fails
+
+        Example:
+            >>> receiver = liru.Receiver("MySource")
+            >>> if not receiver.connect(timeout=5.0):
+            ...     raise SystemExit("MySource is not running")
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"Timeout cannot be negative: {timeout}")
+
+        timeout_ms = -1.0 if timeout is None else timeout * 1000.0
+        try:
+            connected: bool = self._impl.connect(timeout_ms)
+            return connected
+        except Exception as e:
+            raise RuntimeError(f"Connect error: {e}") from e
+
+    @overload
+    def receive_texture(
+        self,
+        texture_id: int,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+    ) -> tuple[int, int]: ...
+    @overload
+    def receive_texture(
+        self,
+        texture_id: FramePool,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+    ) -> PooledTexture: ...
+
+    def receive_texture(
+        self,
+        texture_id: int | FramePool,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+    ) -> tuple[int, int] | PooledTexture:
         """Receive texture from Spout sender.
 
         Updates the specified OpenGL texture with content from the sender.
-        The texture must exist in the current OpenGL context.
+        The texture must exist in the current OpenGL context. Given a
+        FramePool instead, takes a texture of the sender's size from it,
+        receives into that and returns it.
+
+        A region copies only that rectangle of the frame into the corner of
+        the texture, on the GPU, so a crop costs its own size.
 
         Args:
-            texture_id: OpenGL texture ID to receive into
+            texture_id: OpenGL texture ID to receive into, or a FramePool
+                with a texture_factory
+            transfer: ``Transfer.INVERT`` to flip the frame in Spout's copy;
+                textures cannot swap channels or convert alpha
+            region: (x, y, width, height) of the frame to receive, rows
+                counted from the top; None for the whole frame
 
         Returns:
-            Tuple of (width, height) of received texture
+            Tuple of (width, height) of received texture, or the pooled
+            texture when given a pool
 
         Raises:
-            ValueError: If texture_id is invalid
-            RuntimeError: If receive operation fails
+            ValueError: If texture_id, transfer or region is invalid
+            RuntimeError: If receive operation fails, or a region is given
+                before connecting
 
         Example:
             >>> texture = ctx.texture((1920, 1080), 4)
             >>> width, height = receiver.receive_texture(texture.glo)
             >>> print(f"Received {width}x{height} texture")
         """
+        flags = check_transfer(transfer, self.format, texture=True)
+        if isinstance(texture_id, FramePool):
+            pool = texture_id
+            return self._receive_pooled(
+                pool.acquire_texture,
+                lambda texture, bounds, _: self._impl.receive_texture(
+                    texture.texture_id, flags, bounds
+                ),
+                region,
+            )
         if texture_id <= 0:
             raise ValueError(f"Invalid texture ID: {texture_id}")
+        bounds = _WHOLE_FRAME
+        if region is not None:
+            width, height = self.width, self.height
+            if width <= 0 or height <= 0:
+                raise RuntimeError(f"Not connected to sender '{self.active_sender}'")
+            bounds = check_region(region, width, height)
 
         try:
-            result: tuple[int, int] = self._impl.receive_texture(texture_id)
+            result: tuple[int, int] = self._impl.receive_texture(texture_id, flags, bounds)
             return result
         except Exception as e:
             raise RuntimeError(f"Texture receive error: {e}") from e
 
+    @overload
+    def receive_into(
+        self,
+        buffer: FramePool,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+        scale: tuple[int, int] | None = None,
+    ) -> PooledBuffer: ...
+    @overload
+    def receive_into(
+        self,
+        buffer: Buffer,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+        scale: tuple[int, int] | None = None,
+    ) -> tuple[int, int]: ...
+
+    def receive_into(
+        self,
+        buffer: Buffer | FramePool,
+        *,
+        transfer: int = Transfer.NONE,
+        region: tuple[int, int, int, int] | None = None,
+        scale: tuple[int, int] | None = None,
+    ) -> tuple[int, int] | PooledBuffer:
+        """Receive the current frame into a CPU pixel buffer.
+
+        Copies one frame straight out of the shared frame into any
+        writable C-contiguous buffer-protocol object, without an OpenGL
+        texture. The buffer must match the sender size and pixel format
+        (see width, height and format). The Spout backend uses Spout's
+        image receiving path for 8-bit RGBA and BGRA, and reads the other
+        formats back from the shared texture.
+
+        Given a FramePool instead, takes a buffer of the sender's size from
+        it, receives into that and returns it, so a resized sender never
+        needs a reallocation by hand.
+
+        Transfer flags flip, swap channels or convert alpha in the same copy
+        (see ``liru.Transfer``).
+
+        A region receives only that rectangle of the frame, and a scale
+        shrinks it with a box filter in the same copy, so the buffer holds
+        just the crop or thumbnail. Spout crops and shrinks on the GPU and
+        reads back only the result; the shm backend reads only the rows and
+        columns of the region. Shrinking needs NumPy on the shm backend.
+
+        Args:
+            buffer: Writable frame of width * height * bytes per pixel, e.g.
+                a uint8 array of shape (height, width, 4) for RGBA8, or a
+                FramePool; sized to the scale, or else the region, if given
+            transfer: Transfer flags applied while copying
+            region: (x, y, width, height) of the frame to receive, rows
+                counted from the top; None for the whole frame
+            scale: (width, height) to shrink the region to, no larger than
+                it; None to keep its size
+
+        Returns:
+            Tuple of (width, height) of received frame, or the pooled buffer
+            when given a pool
+
+        Raises:
+            TypeError: If buffer does not support the buffer protocol
+            ValueError: If the buffer layout or size does not match the
+                sender, or transfer, region or scale is invalid
+            RuntimeError: If not connected to a sender, no frame has been
+                sent yet (the buffer is left untouched) or receive fails
+
+        Example:
+            >>> frame = np.empty((receiver.height, receiver.width, 4), dtype=np.uint8)
+            >>> if receiver.is_updated():
+            ...     receiver.receive_into(frame)
+            >>> thumbnail = np.empty((180, 320, 4), dtype=np.uint8)
+            >>> receiver.receive_into(thumbnail, scale=(320, 180))
+        """
+        width, height = self.width, self.height
+        if width <= 0 or height <= 0:
+            raise RuntimeError(f"Not connected to sender '{self.active_sender}'")
+        flags = check_transfer(transfer, self.format)
+        if isinstance(buffer, FramePool):
+            pool = buffer
+            return self._receive_pooled(
+                pool.acquire,
+                lambda target, bounds, size: self._impl.receive_into(
+                    target.data.cast("B"), flags, bounds, size
+                ),
+                region,
+                scale,
+            )
+        bounds, size, delivered = _crop(region, scale, width, height, self.format)
+        view = frame_view(buffer, *delivered, writable=True, format=self.format)
+
+        try:
+            result: tuple[int, int] = self._impl.receive_into(view, flags, bounds, size)
+            return result
+        except Exception as e:
+            raise RuntimeError(f"Buffer receive error: {e}") from e
+
+    def _receive_pooled(
+        self,
+        acquire: Callable[[int, int, int], _Target],
+        receive: Callable[[_Target, tuple[int, int, int, int], tuple[int, int]], tuple[int, int]],
+        region: tuple[int, int, int, int] | None = None,
+        scale: tuple[int, int] | None = None,
+    ) -> _Target:
+        """Receive into a pooled target of the sender's current size, or the region's or scale's."""
+        for _ in range(_RESIZE_ATTEMPTS):
+            width, height = self.width, self.height
+            if width <= 0 or height <= 0:
+                raise RuntimeError(f"Not connected to sender '{self.active_sender}'")
+            bounds, size, delivered = _crop(region, scale, width, height, self.format)
+            target = acquire(*delivered, self.format)
+            try:
+                received = receive(target, bounds, size)
+            except Exception as e:
+                target.release()
+                if (self.width, self.height) != (width, height):
+                    continue  # Resized meanwhile; try again at the new size
+                raise RuntimeError(f"Pooled receive error: {e}") from e
+            if tuple(received) == delivered:
+                return target
+            target.release()
+        raise RuntimeError("Sender size changed on every receive attempt")
+
+    def acquire_frame(self) -> Frame:
+        """Borrow the current frame as a read-only view, without copying.
+
+        Returns a Frame whose ``data`` is a read-only memoryview of shape
+        (height, width, components) aliasing the shared frame, plus its frame
+        number. The sender is fenced off from the frame until the Frame is
+        released, so use it as a context manager and keep the lease short.
+
+        On the shm backend the view maps the sender's memory directly. On the
+        Spout backend the frame lives on the GPU, so it is received once into
+        a reused staging buffer and the view aliases that.
+
+        Returns:
+            Borrowed frame, released by ``release()`` or the with block
+
+        Raises:
+            RuntimeError: If not connected, no frame was sent yet, or the
+                receive fails
+
+        Example:
+            >>> with receiver.acquire_frame() as frame:
+            ...     histogram = np.bincount(np.asarray(frame.data)[..., 0].ravel())
+        """
+        try:
+            acquire = getattr(self._impl, "acquire_frame", None)
+            if acquire is not None:
+                frame: Frame = acquire()
+                return frame
+            return self._acquire_staged()
+        except Exception as e:
+            raise RuntimeError(f"Frame acquire error: {e}") from e
+
+    def _acquire_staged(self) -> Frame:
+        """Receive into a staging buffer for backends without shared CPU frames."""
+        width, height, fmt = self.width, self.height, self.format
+        if width <= 0 or height <= 0:
+            raise RuntimeError(f"Not connected to sender '{self.active_sender}'")
+
+        size = width * height * check_format(fmt).bytes_per_pixel
+        if self._staging_lent or self._staging is None or len(self._staging) != size:
+            self._staging = bytearray(size)
+        staging = self._staging
+        self._impl.receive_into(staging)
+        self._staging_lent = True
+
+        def release() -> None:
+            if self._staging is staging:
+                self._staging_lent = False
+
+        data = pixel_view(memoryview(staging).toreadonly(), width, height, fmt)
+        return Frame(data, self._impl.get_frame(), release, self.metadata, fmt)
+
+    def _receive_copy(self) -> Frame:
+        """Receive the current frame into a new buffer owned by the Frame."""
+        for _ in range(_RESIZE_ATTEMPTS):
+            width, height = self._impl.get_width(), self._impl.get_height()
+            if width <= 0 or height <= 0:
+                raise RuntimeError(f"Not connected to sender '{self._impl.get_active_sender()}'")
+
+            fmt = self._impl.get_format()
+            buffer = bytearray(width * height * check_format(fmt).bytes_per_pixel)
+            try:
+                self._impl.receive_into(buffer)
+            except (ValueError, RuntimeError):
+                if (self._impl.get_width(), self._impl.get_height()) != (width, height):
+                    continue  # Resized meanwhile; try again at the new size
+                raise
+            data = pixel_view(memoryview(buffer).toreadonly(), width, height, fmt)
+            return Frame(data, self._impl.get_frame(), None, self.metadata, fmt)
+        raise RuntimeError("Sender size changed on every receive attempt")
+
+    def frames(self, *, queue_size: int = 1) -> FrameStream:
+        """Iterate asynchronously over new frames.
+
+        Frames are received on one watcher thread shared by every stream in
+        the process, as soon as the sender publishes them, and handed to the
+        event loop; no thread is needed per receiver. The watcher sleeps on
+        the senders' frame-sync futexes (Linux), so enable frame sync on the
+        sender; otherwise it polls every millisecond. Only the shm backend
+        supports frame streams: Spout frames must be received on the thread
+        that owns the OpenGL context.
+
+        Each frame is a private read-only copy of shape
+        (height, width, components).
+        If the consumer falls behind, the oldest queued frame is dropped, so
+        ``queue_size=1`` always yields the latest frame. Do not receive from
+        this Receiver by other means while a stream is open.
+
+        Args:
+            queue_size: Number of frames buffered before the oldest is dropped
+
+        Returns:
+            Async iterator of frames; close it or use ``async with``
+
+        Raises:
+            ValueError: If queue_size is less than 1
+            RuntimeError: If the backend does not support frame streams
+
+        Example:
+            >>> async with receiver.frames() as frames:
+            ...     async for frame in frames:
+            ...         await publish(frame.frame_number, np.asarray(frame.data))
+        """
+        if getattr(self._impl, "frame_signal", None) is None:
+            raise RuntimeError(f"The {self._backend} backend does not support frame streams")
+        return FrameStream(self._impl, self._receive_copy, queue_size)
+
+    async def next_frame(self, timeout: float | None = None) -> Frame:
+        """Wait for the next new frame without blocking the event loop.
+
+        Returns the first frame newer than the last one received, as a
+        private read-only copy. Uses the same shared watcher thread as
+        frames().
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            Received frame
+
+        Raises:
+            TimeoutError: If no frame arrives within the timeout
+            RuntimeError: If receiving fails or the backend does not
+                support frame streams
+
+        Example:
+            >>> frame = await receiver.next_frame(timeout=1.0)
+            >>> print(frame.frame_number)
+        """
+        async with asyncio.timeout(timeout), self.frames() as stream:
+            return await anext(stream)
+
+    def start_capture(self, target: Callable[[Frame], object] | queue.Queue[Frame]) -> None:
+        """Receive every new frame on a background thread.
+
+        Frames are delivered as private read-only copies of shape
+        (height, width, components), either by calling ``target(frame)`` on
+        the capture thread or by putting them on a ``queue.Queue``. A full queue
+        drops its oldest frame, so ``queue.Queue(maxsize=1)`` always holds
+        the latest frame. Exceptions raised by a callback are reported
+        through ``sys.unraisablehook`` and capture continues.
+
+        The Spout backend runs a native worker thread with its own Spout
+        receiver and OpenGL context and only takes the GIL to deliver a
+        frame. The shm backend uses a daemon thread with its own shared-memory
+        receiver that sleeps on the sender's frame-sync futex. Either way the
+        capture never stalls other Python threads while it waits or copies.
+
+        Args:
+            target: Callable taking a Frame, or a queue.Queue to put frames on
+
+        Raises:
+            TypeError: If target is neither callable nor a queue.Queue
+            RuntimeError: If capture is already running, no sender is
+                selected, or the backend cannot capture
+
+        Example:
+            >>> frames = queue.Queue(maxsize=1)
+            >>> receiver.start_capture(frames)
+            >>> frame = frames.get(timeout=1.0)
+            >>> receiver.stop_capture()
+        """
+        if self.capturing:
+            raise RuntimeError("Capture is already running")
+        deliver = _capture_delivery(target)
+        if self._capture_worker_class is None:
+            raise RuntimeError(f"The {self._backend} backend does not support capture")
+        sender_name = self.active_sender
+        if not sender_name:
+            raise RuntimeError("No sender selected")
+
+        def on_frame(
+            pixels: bytearray,
+            width: int,
+            height: int,
+            fmt: int,
+            metadata: tuple[int, int, bytes],
+        ) -> None:
+            data = pixel_view(memoryview(pixels).toreadonly(), width, height, fmt)
+            info = FrameMetadata._make(metadata)
+            deliver(Frame(data, info.frame, None, info, fmt))
+
+        try:
+            self._capture = self._capture_worker_class(sender_name, on_frame)
+        except Exception as e:
+            raise RuntimeError(f"Failed to start capture: {e}") from e
+
+    def stop_capture(self) -> None:
+        """Stop the background capture started by start_capture().
+
+        Waits for the capture thread to exit; no frames are delivered after
+        this returns. A no-op if capture is not running.
+        """
+        if self._capture is not None:
+            self._capture.stop()
+            self._capture = None
+
+    @property
+    def capturing(self) -> bool:
+        """Check whether background capture is running.
+
+        Returns:
+            True between start_capture() and stop_capture()
+        """
+        return self._capture is not None and self._capture.is_running()
+
     def is_updated(self) -> bool:
         """Check if new frame is available.
 
@@ -92,6 +577,41 @@ class Receiver:
         updated: bool = self._impl.is_updated()
         return updated
 
+    def wait_for_frame(self, timeout: float | None = None) -> bool:
+        """Block until the sender publishes a new frame.
+
+        Sleeps on an OS wait primitive instead of spinning on is_updated(),
+        so idle receivers use no CPU. The sender must call
+        ``enable_frame_sync()``: Spout then signals its frame-sync event, and
+        the shm backend wakes receivers through a futex on Linux. Without
+        frame sync (or a futex) the shm backend polls every millisecond.
+        The GIL is released while waiting.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            True if a new frame is available, False if the timeout expired
+
+        Raises:
+            ValueError: If timeout is negative
+            RuntimeError: If the wait fails
+
+        Example:
+            >>> while running:
+            ...     if receiver.wait_for_frame(timeout=1.0):
+            ...         receiver.receive_into(frame)
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"Timeout cannot be negative: {timeout}")
+
+        timeout_ms = -1.0 if timeout is None else timeout * 1000.0
+        try:
+            signalled: bool = self._impl.wait_for_frame(timeout_ms)
+            return signalled
+        except Exception as e:
+            raise RuntimeError(f"Frame wait error: {e}") from e
+
     def select_sender(self, name: str) -> None:
         """Connect to a different sender.
 
@@ -126,6 +646,41 @@ class Receiver:
         senders: list[str] = self._impl.get_sender_list()
         return senders
 
+    def stats(self, deadline_ms: float | None = None) -> FrameStats:
+        """Get statistics of the last 256 receives.
+
+        Reports receive latency percentiles, inter-frame jitter and windowed
+        FPS from a fixed-size ring of per-frame timings that the receive path
+        fills without allocating. ``dropped`` counts frames the sender
+        published between two receives, which this receiver never saw.
+
+        Args:
+            deadline_ms: Target frame period in milliseconds; intervals between
+                received frames longer than this count as deadline misses.
+                None counts none
+
+        Returns:
+            FrameStats snapshot
+
+        Raises:
+            ValueError: If deadline_ms is not positive
+
+        Example:
+            >>> stats = receiver.stats(deadline_ms=1000 / 30)
+            >>> if stats.dropped or stats.deadline_misses:
+            ...     print(f"Falling behind: {stats}")
+        """
+        return FrameStats._make(self._impl.get_stats(backend_deadline(deadline_ms)))
+
+    @property
+    def backend(self) -> str:
+        """Get transport backend name.
+
+        Returns:
+            Backend name, e.g. "spout" or "shm"
+        """
+        return self._backend
+
     @property
     def active_sender(self) -> str:
         """Get name of currently connected sender.
@@ -156,6 +711,104 @@ class Receiver:
         height: int = self._impl.get_height()
         return height
 
+    @property
+    def format(self) -> int:
+        """Get the sender's pixel format.
+
+        Frames from receive_into(), acquire_frame() and the capture and
+        async APIs are in this format.
+
+        Returns:
+            PixelFormat, or the raw DXGI_FORMAT code of a format liru cannot
+            carry (0 if not connected)
+        """
+        fmt: int = self._impl.get_format()
+        try:
+            return PixelFormat(fmt)
+        except ValueError:
+            return fmt
+
+    @property
+    def generation(self) -> int:
+        """Get the sender's resize generation.
+
+        Changes whenever the sender is resized (``Sender.resize()``), so
+        comparing it once per frame tells when to reallocate the target
+        texture or buffer without comparing sizes. On the shm backend it is
+        the sender's own counter; Spout does not share one, so there it
+        counts the size changes this receiver has seen.
+
+        Returns:
+            Generation, 0 until the sender is resized
+
+        Example:
+            >>> if receiver.generation != generation:
+            ...     generation = receiver.generation
+            ...     frame = np.empty((receiver.height, receiver.width, 4), np.uint8)
+        """
+        generation: int = self._impl.get_generation()
+        return generation
+
+    @property
+    def metadata(self) -> FrameMetadata:
+        """Get the metadata of the last received frame.
+
+        Updated by every receive call; compare ``frame`` between receives to
+        skip repeated frames, and use ``age_ms()`` for the end-to-end age.
+
+        Returns:
+            Frame number, capture timestamp and payload; all zero/empty
+            before the first frame
+
+        Example:
+            >>> receiver.receive_into(frame)
+            >>> print(f"Frame {receiver.metadata.frame} is {receiver.metadata.age_ms():.2f}ms old")
+        """
+        return FrameMetadata._make(self._impl.get_metadata())
+
+    def changed_tiles(self) -> DirtyTiles | None:
+        """Get the tiles the sender changed since the last frame received.
+
+        Reads the sender's tile table (see ``liru.tiles``) without receiving,
+        and compares it with ``metadata.frame``, so frames skipped in between
+        are accounted for. Call it before receiving to leave unchanged frames
+        alone, or to receive only the changed regions.
+
+        Returns:
+            The changed tiles, all of them before the first receive, or None
+            if the sender does not track dirty tiles
+
+        Raises:
+            RuntimeError: If the sender is not available
+
+        Example:
+            >>> tiles = receiver.changed_tiles()
+            >>> if tiles is None or tiles.dirty_count:
+            ...     receiver.receive_into(frame)
+        """
+        try:
+            table = self._impl.get_tile_table()
+        except Exception as e:
+            raise RuntimeError(f"Tile table error: {e}") from e
+        return None if table is None else dirty_tiles(table, self.metadata.frame)
+
+    @property
+    def stats_block(self) -> StatsBlock | None:
+        """Get the shared stats block this receiver publishes.
+
+        Returns:
+            Block, or None if the receiver was created without publish_stats
+            or has been closed
+        """
+        return self._stats_block
+
+    def _close_stats_block(self) -> None:
+        """Stop publishing and remove the stats block."""
+        if self._stats_block is not None:
+            self._impl.set_stats_block(None)
+            self._stats_block.close()
+            self._stats_block = None
+
     @property
     def last_receive_time_ms(self) -> float:
         """Get last receive latency in milliseconds.
@@ -197,10 +850,11 @@ class Receiver:
             exc_tb: Exception traceback if an error occurred
 
         Note:
-            Receiver cleanup is handled by C++ destructor, no explicit release needed.
+            Receiver cleanup is handled by C++ destructor; only a running
+            background capture and the stats block are cleaned up here.
         """
-        # Receiver cleanup handled by C++ destructor
-        pass
+        self.stop_capture()
+        self._close_stats_block()
 
     def __repr__(self) -> str:
         """Get string representation.
@@ -214,4 +868,54 @@ class Receiver:
     def __del__(self) -> None:
         """Cleanup on deletion."""
         # Receiver cleanup handled by C++ destructor
-        pass
+        if hasattr(self, "_capture"):
+            self.stop_capture()
+        if hasattr(self, "_stats_block"):
+            self._close_stats_block()
+
+
+def _capture_delivery(
+    target: Callable[[Frame], object] | queue.Queue[Frame],
+) -> Callable[[Frame], object]:
+    """Turn a start_capture() target into a function taking each frame."""
+    if isinstance(target, queue.Queue):
+        frames = target
+
+        def put(frame: Frame) -> None:
+            while True:
+                try:
+                    frames.put_nowait(frame)
+                    return
+                except queue.Full:
+                    try:
+                        frames.get_nowait()  # Drop the oldest frame
+                    except queue.Empty:
+                        pass
+
+        return put
+    if callable(target):
+        return target
+    raise TypeError(
+        f"Capture target must be callable or a queue.Queue, got {type(target).__name__}"
+    )
+
+
+def _crop(
+    region: tuple[int, int, int, int] | None,
+    scale: tuple[int, int] | None,
+    width: int,
+    height: int,
+    format: int,
+) -> tuple[tuple[int, int, int, int], tuple[int, int], tuple[int, int]]:
+    """Validate a region and scale of a frame.
+
+    Returns the region and scale to pass the backend, zeros when not given
+    so a resized sender is still received whole, and the delivered size.
+    """
+    bounds = check_region(region, width, height)
+    size = check_scale(scale, bounds, format)
+    return (
+        _WHOLE_FRAME if region is None else bounds,
+        (0, 0) if scale is None else size,
+        size,
+    )
@@ -0,0 +1,728 @@
+"""Recording received frames to disk.
+
+A ``Recorder`` writes every frame a receiver captures to a raw container
+file on a writer thread, and keeps a memory-mapped index next to it so any
+frame can be found without scanning. ``Recording`` opens both read-only.
+
+Container layout (little-endian). Every block starts at a multiple of
+``ALIGNMENT`` bytes, so frames can be written with large aligned writes and
+mapped straight from the page cache:
+
+==========  ===============================================================
+Block       Content
+==========  ===============================================================
+Header      ``FILE_HEADER`` (magic, version, alignment), padded to ALIGNMENT
+Frame       ``RECORD_HEADER`` (magic, width, height, format, pixel bytes)
+            and the frame's metadata record (``liru.frame``) at offset 32,
+            padded to ALIGNMENT; then the pixels, rows top to bottom,
+            padded to ALIGNMENT
+==========  ===============================================================
+
+Each frame block describes itself, so the index can be rebuilt from the
+container. Index layout (``<path>.idx``):
+
+======  ==========  ===============================================
+Offset  Type        Field
+======  ==========  ===============================================
+0       char[8]     Magic ``LIRUIDX\\0``
+8       uint32      Version
+12      uint32      Entry size in bytes
+16      uint64      Number of entries written
+24      ...         Entries, ``INDEX_ENTRY``: pixel offset (uint64),
+                    frame number (uint64), timestamp (int64), pixel
+                    bytes (uint64), width, height, format (uint32)
+                    and 4 reserved bytes
+======  ==========  ===============================================
+
+Entries are written after the frame they point at, and the count after the
+entries, so a reader never sees an entry of a frame that is not on disk.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+import types
+import warnings
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+from liru._buffers import pixel_view
+from liru.formats import check_format
+from liru.frame import METADATA_SIZE, Frame, FrameMetadata, pack_metadata, unpack_metadata
+
+if TYPE_CHECKING:
+    from liru.receiver import Receiver
+
+ALIGNMENT = 4096
+FILE_MAGIC = b"LIRUREC\0"
+INDEX_MAGIC = b"LIRUIDX\0"
+RECORDING_VERSION = 1
+FILE_HEADER = struct.Struct("<8sII")
+RECORD_MAGIC = b"LFRM"
+RECORD_HEADER = struct.Struct("<4sIIIQ")
+RECORD_METADATA_OFFSET = 32
+INDEX_HEADER = struct.Struct("<8sIIQ")
+INDEX_ENTRY = struct.Struct("<QQqQIII4x")
+INDEX_SUFFIX = ".idx"
+_INDEX_GROWTH = 4096  # Entries the index grows by at least
+
+
+class RecorderStats(NamedTuple):
+    """Counters of a ``Recorder``.
+
+    Attributes:
+        frames: Frames written to disk
+        dropped: Frames dropped because the backlog was full or a write
+            failed
+        bytes_written: Bytes written to the container, padding included
+        backlog_frames: Frames queued and not yet written
+        backlog_bytes: Pixel bytes queued and not yet written
+        peak_backlog_bytes: Largest backlog since creation
+        write_mb_s: Write throughput of the last flush in MB/s
+    """
+
+    frames: int
+    dropped: int
+    bytes_written: int
+    backlog_frames: int
+    backlog_bytes: int
+    peak_backlog_bytes: int
+    write_mb_s: float
+
+
+class IndexEntry(NamedTuple):
+    """Where a recorded frame is and what it holds.
+
+    Attributes:
+        offset: Offset of the pixels in the container
+        frame: Sender frame number
+        timestamp_ns: Capture timestamp, ``time.perf_counter_ns()`` clock
+        size: Pixel bytes
+        width: Frame width in pixels
+        height: Frame height in pixels
+        format: Pixel format
+    """
+
+    offset: int
+    frame: int
+    timestamp_ns: int
+    size: int
+    width: int
+    height: int
+    format: int
+
+
+def _align(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _map_read(path: str) -> mmap.mmap:
+    """Map a whole file read-only; an empty one cannot be mapped."""
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            raise ValueError(f"'{path}' is empty")
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _write_all(file: int, data: memoryview) -> None:
+    """Write a whole buffer; os.write may write less."""
+    while data:
+        data = data[os.write(file, data) :]
+
+
+class Recorder:
+    """Streams a receiver's frames and their metadata to a file on disk.
+
+    Attached to a ``Receiver``, it starts background capture
+    (``Receiver.start_capture()``) and queues every captured frame for a
+    dedicated writer thread, so the capture loop only appends to a queue and
+    never waits for the disk. The writer copies queued frames into a
+    page-aligned chunk and writes whole chunks, or frames larger than a chunk
+    directly, at aligned offsets. After each write it appends the frames to
+    the memory-mapped index (layout above).
+
+    The queue is bounded by ``max_backlog_bytes``. A frame that would exceed
+    it is dropped and counted in ``stats().dropped``, and the first drop
+    until the queue drains again reports the backlog with a
+    ``RuntimeWarning``; capture itself never blocks.
+
+    Args:
+        receiver: Receiver to record, with its sender selected
+        path: Container file to create; the index is ``path + ".idx"``
+        max_backlog_bytes: Most pixel bytes queued for the writer
+        chunk_size: Size of the writer's chunk, a multiple of ALIGNMENT
+        capture: Start capture on the receiver. False to pass frames to
+            write() yourself, e.g. from ``Receiver.frames()``
+
+    Raises:
+        ValueError: If max_backlog_bytes or chunk_size is invalid
+        OSError: If the files cannot be created
+        RuntimeError: If capture cannot start
+
+    Example:
+        >>> receiver = liru.Receiver("Program")
+        >>> with liru.Recorder(receiver, "show.liru") as recorder:
+        ...     time.sleep(60.0)
+        ...     print(recorder.stats())
+    """
+
+    def __init__(
+        self,
+        receiver: Receiver,
+        path: str | os.PathLike[str],
+        *,
+        max_backlog_bytes: int = 256 << 20,
+        chunk_size: int = 32 << 20,
+        capture: bool = True,
+    ) -> None:
+        """Create the container and index and start recording.
+
+        Args:
+            receiver: Receiver to record
+            path: Container file to create
+            max_backlog_bytes: Most pixel bytes queued for the writer
+            chunk_size: Size of the writer's chunk
+            capture: Start capture on the receiver
+
+        Raises:
+            ValueError: If max_backlog_bytes or chunk_size is invalid
+            OSError: If the files cannot be created
+            RuntimeError: If capture cannot start
+        """
+        if max_backlog_bytes <= 0:
+            raise ValueError(f"Backlog limit must be positive, got {max_backlog_bytes}")
+        if chunk_size <= 0 or chunk_size % ALIGNMENT:
+            raise ValueError(
+                f"Chunk size must be a positive multiple of {ALIGNMENT}, got {chunk_size}"
+            )
+        self._receiver = receiver
+        self._path = os.fspath(path)
+        self._max_backlog_bytes = max_backlog_bytes
+        self._chunk_size = chunk_size
+
+        self._cond = threading.Condition()  # Guards the queue, counters and state
+        self._queue: deque[Frame] = deque()
+        self._backlog_bytes = 0
+        self._peak_backlog_bytes = 0
+        self._frames = 0
+        self._dropped = 0
+        self._bytes_written = 0
+        self._write_mb_s = 0.0
+        self._behind = False  # Dropping since the queue last drained; warned once
+        self._closing = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self._capturing = False
+
+        flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        self._file = os.open(self._path, flags, 0o644)
+        try:
+            header = bytearray(ALIGNMENT)
+            FILE_HEADER.pack_into(header, 0, FILE_MAGIC, RECORDING_VERSION, ALIGNMENT)
+            _write_all(self._file, memoryview(header))
+            self._offset = ALIGNMENT
+            self._index_file = os.open(self._path + INDEX_SUFFIX, flags, 0o644)
+        except OSError:
+            os.close(self._file)
+            raise
+        self._index_count = 0
+        self._index_capacity = 0
+        self._index: mmap.mmap | None = None
+        self._grow_index(_INDEX_GROWTH)
+
+        self._thread = threading.Thread(target=self._run, name="liru-recorder", daemon=True)
+        self._thread.start()
+        if capture:
+            try:
+                receiver.start_capture(self.write)
+            except (RuntimeError, TypeError):
+                self.close()
+                raise
+            self._capturing = True
+
+    def write(self, frame: Frame) -> bool:
+        """Queue a frame for the writer thread.
+
+        The frame is queued without copying, so it must be a private copy
+        (from capture, ``frames()`` or ``next_frame()``); copy frames from
+        ``acquire_frame()`` first. Never blocks on the disk.
+
+        Args:
+            frame: Frame to record
+
+        Returns:
+            True if queued, False if dropped because the backlog is full or
+            the writer failed
+
+        Raises:
+            RuntimeError: If the recorder is closed
+        """
+        size = frame.data.nbytes
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Recorder is closed")
+            if self._error is not None:
+                self._dropped += 1
+                return False
+            if self._backlog_bytes + size > self._max_backlog_bytes and self._queue:
+                self._dropped += 1
+                if self._behind:
+                    return False
+                self._behind = True
+                backlog = (len(self._queue), self._backlog_bytes)
+            else:
+                self._queue.append(frame)
+                self._backlog_bytes += size
+                self._peak_backlog_bytes = max(self._peak_backlog_bytes, self._backlog_bytes)
+                self._cond.notify()
+                return True
+        warnings.warn(
+            f"Recorder is {backlog[0]} frames ({backlog[1] / 1e6:.1f} MB) behind; "
+            f"dropping frames from frame {frame.frame_number}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return False
+
+    def stats(self) -> RecorderStats:
+        """Get the recorder's counters and backlog.
+
+        Returns:
+            Snapshot of the counters
+        """
+        with self._cond:
+            return RecorderStats(
+                self._frames,
+                self._dropped,
+                self._bytes_written,
+                len(self._queue),
+                self._backlog_bytes,
+                self._peak_backlog_bytes,
+                self._write_mb_s,
+            )
+
+    @property
+    def path(self) -> str:
+        """Get the container file path.
+
+        Returns:
+            Path given at creation
+        """
+        return self._path
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the recorder is closed.
+
+        Returns:
+            True after close()
+        """
+        return self._closed
+
+    def close(self) -> None:
+        """Stop capture, write the frames still queued and close the files.
+
+        Idempotent.
+
+        Raises:
+            RuntimeError: If a write failed; frames before the failure are
+                in the recording
+        """
+        if self._closed:
+            return
+        if self._capturing:
+            self._receiver.stop_capture()
+            self._capturing = False
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+        self._closed = True
+
+        try:
+            assert self._index is not None
+            self._index.flush()
+            self._index.close()
+            os.ftruncate(self._index_file, INDEX_HEADER.size + self._index_count * INDEX_ENTRY.size)
+        finally:
+            os.close(self._index_file)
+            os.close(self._file)
+        if self._error is not None:
+            raise RuntimeError(f"Recorder write error: {self._error}") from self._error
+
+    def _run(self) -> None:
+        """Write queued frames until closed (writer thread)."""
+        chunk = mmap.mmap(-1, self._chunk_size)  # Page-aligned
+        view = memoryview(chunk)
+        fill = 0
+        pending: list[bytes] = []  # Index entries of the frames in the chunk
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closing:
+                        self._cond.wait()
+                    if not self._queue:
+                        break
+                    frame = self._queue[0]
+                data = frame.data.cast("B")
+                record = ALIGNMENT + _align(data.nbytes)
+                if fill and fill + record > self._chunk_size:
+                    fill = self._flush(view, fill, pending)
+
+                offset = self._offset + fill
+                if record > self._chunk_size:
+                    header = bytearray(ALIGNMENT)
+                    self._pack_header(header, frame, data.nbytes)
+                    start = time.perf_counter()
+                    _write_all(self._file, memoryview(header))
+                    _write_all(self._file, data)
+                    _write_all(self._file, memoryview(bytes(record - ALIGNMENT - data.nbytes)))
+                    self._offset += record
+                    self._record_write(record, start)
+                    pending.append(self._entry(frame, offset, data.nbytes))
+                    self._append_index(pending)
+                else:
+                    view[fill : fill + ALIGNMENT] = bytes(ALIGNMENT)
+                    self._pack_header(view[fill : fill + ALIGNMENT], frame, data.nbytes)
+                    view[fill + ALIGNMENT : fill + ALIGNMENT + data.nbytes] = data
+                    padding = record - ALIGNMENT - data.nbytes
+                    view[fill + record - padding : fill + record] = bytes(padding)
+                    fill += record
+                    pending.append(self._entry(frame, offset, data.nbytes))
+
+                with self._cond:
+                    self._queue.popleft()
+                    self._backlog_bytes -= data.nbytes
+                    idle = not self._queue
+                    if idle:
+                        self._behind = False
+                data.release()
+                if idle and fill:
+                    fill = self._flush(view, fill, pending)  # Keep the disk current
+        except Exception as e:
+            # Reported by close(); later frames are dropped
+            with self._cond:
+                self._error = e
+                self._dropped += len(self._queue)
+                self._queue.clear()
+                self._backlog_bytes = 0
+        finally:
+            view.release()
+            chunk.close()
+
+    def _flush(self, view: memoryview, fill: int, pending: list[bytes]) -> int:
+        """Write the chunk and index its frames; returns the new fill (0)."""
+        start = time.perf_counter()
+        _write_all(self._file, view[:fill])
+        self._offset += fill
+        self._record_write(fill, start)
+        self._append_index(pending)
+        return 0
+
+    def _record_write(self, size: int, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._bytes_written += size
+            if elapsed > 0:
+                self._write_mb_s = size / elapsed / 1e6
+
+    def _pack_header(self, header: memoryview | bytearray, frame: Frame, size: int) -> None:
+        RECORD_HEADER.pack_into(
+            header, 0, RECORD_MAGIC, frame.width, frame.height, frame.format, size
+        )
+        metadata = frame.metadata
+        record = memoryview(header)[RECORD_METADATA_OFFSET : RECORD_METADATA_OFFSET + METADATA_SIZE]
+        pack_metadata(record, metadata.frame, metadata.timestamp_ns, metadata.payload)
+
+    def _entry(self, frame: Frame, offset: int, size: int) -> bytes:
+        metadata = frame.metadata
+        return INDEX_ENTRY.pack(
+            offset + ALIGNMENT,
+            metadata.frame,
+            metadata.timestamp_ns,
+            size,
+            frame.width,
+            frame.height,
+            frame.format,
+        )
+
+    def _append_index(self, pending: list[bytes]) -> None:
+        """Append entries of frames on disk, then publish the new count."""
+        count = self._index_count + len(pending)
+        if count > self._index_capacity:
+            self._grow_index(max(count, 2 * self._index_capacity))
+        index = self._index
+        assert index is not None
+        for entry in pending:
+            start = INDEX_HEADER.size + self._index_count * INDEX_ENTRY.size
+            index[start : start + INDEX_ENTRY.size] = entry
+            self._index_count += 1
+        pending.clear()
+        INDEX_HEADER.pack_into(
+            index, 0, INDEX_MAGIC, RECORDING_VERSION, INDEX_ENTRY.size, self._index_count
+        )
+        with self._cond:
+            self._frames = self._index_count
+
+    def _grow_index(self, capacity: int) -> None:
+        """Remap the index with room for a number of entries."""
+        if self._index is not None:
+            self._index.close()
+        os.ftruncate(self._index_file, INDEX_HEADER.size + capacity * INDEX_ENTRY.size)
+        self._index = mmap.mmap(self._index_file, 0)
+        self._index_capacity = capacity
+        INDEX_HEADER.pack_into(
+            self._index, 0, INDEX_MAGIC, RECORDING_VERSION, INDEX_ENTRY.size, self._index_count
+        )
+
+    def __enter__(self) -> Recorder:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and close the recorder.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the recorder
+        """
+        state = "closed" if self._closed else f"{self._frames} frames"
+        return f"Recorder(path='{self._path}', {state})"
+
+
+class Recording:
+    """A recorded container opened read-only through memory maps.
+
+    ``entry(i)`` reads the i-th index entry, and ``frame(i)`` maps its
+    pixels without copying, both in O(1). Frames are numbered from 0 in
+    the order they were written. The container is mapped when opened, so
+    frames a recorder writes afterwards are not seen; open it again.
+
+    Args:
+        path: Container file; the index is read from ``path + ".idx"``
+
+    Raises:
+        OSError: If the files cannot be opened
+        ValueError: If they are not a liru recording
+
+    Example:
+        >>> with liru.Recording("show.liru") as recording:
+        ...     with recording.frame(len(recording) - 1) as frame:
+        ...         print(frame.metadata.timestamp_ns, frame.width, frame.height)
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Map the container and its index.
+
+        Args:
+            path: Container file
+
+        Raises:
+            OSError: If the files cannot be opened
+            ValueError: If they are not a liru recording
+        """
+        self._path = os.fspath(path)
+        try:
+            self._data = _map_read(self._path)
+            try:
+                self._index = _map_read(self._path + INDEX_SUFFIX)
+            except BaseException:
+                self._data.close()
+                raise
+        except ValueError as e:
+            raise ValueError(f"'{self._path}' is not a liru recording") from e
+        self._closed = False
+        try:
+            magic, version, alignment = FILE_HEADER.unpack_from(self._data)
+            if magic != FILE_MAGIC or version != RECORDING_VERSION or alignment != ALIGNMENT:
+                raise ValueError(f"'{self._path}' is not a liru recording")
+            magic, version, entry_size, count = INDEX_HEADER.unpack_from(self._index)
+            if magic != INDEX_MAGIC or entry_size != INDEX_ENTRY.size:
+                raise ValueError(f"'{self._path}{INDEX_SUFFIX}' is not a liru recording index")
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise ValueError(f"'{self._path}' is not a liru recording") from e
+        # Entries past the mapped container belong to frames written since
+        available = (len(self._index) - INDEX_HEADER.size) // INDEX_ENTRY.size
+        self._count: int = min(count, available)
+        while self._count and self._entry_end(self._count - 1) > len(self._data):
+            self._count -= 1
+
+    def __len__(self) -> int:
+        """Get the number of frames.
+
+        Returns:
+            Frames in the recording
+        """
+        return self._count
+
+    def entry(self, index: int) -> IndexEntry:
+        """Get the index entry of a frame.
+
+        Args:
+            index: Frame position, from 0; negative counts from the end
+
+        Returns:
+            Its index entry
+
+        Raises:
+            IndexError: If there is no such frame
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Frame {index} is outside a {self._count}-frame recording")
+        return IndexEntry._make(
+            INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + index * INDEX_ENTRY.size)
+        )
+
+    def pixels(self, index: int) -> memoryview:
+        """Get a frame's pixels without copying.
+
+        Args:
+            index: Frame position, from 0; negative counts from the end
+
+        Returns:
+            Flat read-only byte view of the pixels in the mapped container,
+            valid until close()
+
+        Raises:
+            IndexError: If there is no such frame
+        """
+        entry = self.entry(index)
+        return memoryview(self._data)[entry.offset : entry.offset + entry.size]
+
+    def metadata(self, index: int) -> FrameMetadata:
+        """Get the metadata record stored with a frame, payload included.
+
+        Args:
+            index: Frame position, from 0; negative counts from the end
+
+        Returns:
+            The frame's metadata
+
+        Raises:
+            IndexError: If there is no such frame
+        """
+        start = self.entry(index).offset - ALIGNMENT + RECORD_METADATA_OFFSET
+        return unpack_metadata(self._data[start : start + METADATA_SIZE])
+
+    def frame(self, index: int) -> Frame:
+        """Borrow a frame as a read-only view of the mapped container.
+
+        Args:
+            index: Frame position, from 0; negative counts from the end
+
+        Returns:
+            Frame of shape (height, width, components) with its metadata;
+            release it before close()
+
+        Raises:
+            IndexError: If there is no such frame
+        """
+        entry = self.entry(index)
+        check_format(entry.format)
+        data = pixel_view(self.pixels(index), entry.width, entry.height, entry.format)
+        return Frame(data, entry.frame, None, self.metadata(index), entry.format)
+
+    def prefetch(self, index: int, count: int = 1) -> None:
+        """Hint the OS to read frames into the page cache ahead of use.
+
+        Does nothing where ``mmap.madvise()`` is not available (Windows).
+
+        Args:
+            index: First frame position, from 0; negative counts from the end
+            count: Number of frames from there, clipped to the recording
+        """
+        if index < 0:
+            index += self._count
+        end = min(index + count, self._count)
+        if not hasattr(mmap, "MADV_WILLNEED") or not 0 <= index < end:
+            return
+        # Each frame's header page starts a block, and the pixels are page-aligned
+        start = self.entry(index).offset - ALIGNMENT
+        last = self.entry(end - 1)
+        start -= start % mmap.PAGESIZE
+        self._data.madvise(mmap.MADV_WILLNEED, start, last.offset + last.size - start)
+
+    @property
+    def path(self) -> str:
+        """Get the container file path.
+
+        Returns:
+            Path given at opening
+        """
+        return self._path
+
+    def close(self) -> None:
+        """Unmap the files.
+
+        Idempotent.
+
+        Raises:
+            BufferError: If views from pixels() or frame() are still held
+        """
+        if self._closed:
+            return
+        self._data.close()
+        self._index.close()
+        self._closed = True
+
+    def _entry_end(self, index: int) -> int:
+        entry = IndexEntry._make(
+            INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + index * INDEX_ENTRY.size)
+        )
+        return entry.offset + entry.size
+
+    def __enter__(self) -> Recording:
+        """Enter context manager.
+
+        Returns:
+            Self for use in with statement
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit context manager and unmap the files.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the recording
+        """
+        return f"Recording(path='{self._path}', frames={self._count})"
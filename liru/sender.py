@@ -3,29 +3,55 @@
 from __future__ import annotations
 
 import types
+from typing import TYPE_CHECKING
 
-try:
-    from . import _liru_core  # type: ignore[attr-defined]
-except ImportError as e:
-    raise ImportError(
-        "Failed to import _liru_core extension. "
-        "Ensure liru is properly installed with: pip install liru"
-    ) from e
+from liru._buffers import frame_view
+from liru.backends import MAX_SLOTS, FramePacerImpl, SenderImpl, get_backend
+from liru.formats import PixelFormat, check_format
+from liru.frame import MAX_PAYLOAD
+from liru.monitor import StatsBlock, publish_stats_default
+from liru.pacing import FramePacer, check_fps
+from liru.stats import ROLE_SENDER, FrameStats, backend_deadline
+from liru.tiles import DirtyTiles, dirty_tiles
+from liru.transfer import Transfer, check_transfer
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
 
 
 class Sender:
     """Spout sender for sharing GPU textures.
 
     Wraps a Spout sender that shares OpenGL textures with other processes
-    via DirectX shared texture handles.
+    via DirectX shared texture handles, or a shared-memory sender on
+    platforms without Spout.
 
     Args:
         name: Unique sender name (visible to receivers)
         width: Texture width in pixels
         height: Texture height in pixels
+        slots: Number of frames buffered in a ring (1 to 64). With two or
+            more, receivers always read the newest complete frame while the
+            sender writes another slot, so a slow receiver neither tears nor
+            stalls the sender. The Spout backend only takes 1
+        backend: Transport backend name ("spout" or "shm"), None for default
+        publish_stats: Publish counters in a shared stats block that other
+            processes read with ``liru.monitor``. None follows the
+            ``LIRU_PUBLISH_STATS`` environment variable
+        target_fps: Frame rate pace() holds the sending loop to, None for
+            no pacing
+        warmup: Call warmup() before returning, so the first frame is sent
+            as fast as the rest
+        format: Pixel format of the frames (``liru.PixelFormat``); send_buffer()
+            takes pixels in this format and receivers see it in
+            ``Receiver.format``
+        dirty_tiles: Hash every frame sent with send_buffer() in 64x64 tiles
+            and publish which tiles changed, for ``Receiver.changed_tiles()``
+            (see ``liru.tiles``); needs NumPy on the shm backend
 
     Raises:
-        ValueError: If name is empty or dimensions are invalid
+        ValueError: If name is empty, dimensions are invalid, target_fps
+            is not positive or the format is not supported
         RuntimeError: If sender creation fails
 
     Example:
@@ -38,34 +64,211 @@ class Sender:
         >>> print(f"FPS: {sender.get_fps():.1f}")
     """
 
-    def __init__(self, name: str, width: int, height: int) -> None:
+    def __init__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        *,
+        slots: int = 1,
+        backend: str | None = None,
+        publish_stats: bool | None = None,
+        target_fps: float | None = None,
+        warmup: bool = False,
+        format: int = PixelFormat.RGBA8,
+        dirty_tiles: bool = False,
+    ) -> None:
         """Initialize Spout sender.
 
         Args:
             name: Unique sender name
             width: Texture width in pixels
             height: Texture height in pixels
+            slots: Number of frames buffered in a ring (1 to 64, 1 on Spout)
+            backend: Transport backend name, None for the default backend
+            publish_stats: Publish a shared stats block, None for the default
+            target_fps: Frame rate for pace(), None for no pacing
+            warmup: Create all sender resources now instead of on the first send
+            format: Pixel format of the frames
+            dirty_tiles: Track and publish which tiles each frame changes
 
         Raises:
-            ValueError: If name is empty or dimensions are invalid
-            RuntimeError: If sender creation fails
+            ValueError: If name is empty, dimensions, slot count (for the
+                backend), target_fps or format are invalid or the backend is
+                unknown
+            RuntimeError: If sender creation or warm-up fails
         """
         if not name:
             raise ValueError("Sender name cannot be empty")
         if width <= 0 or height <= 0:
             raise ValueError(f"Invalid dimensions: {width}x{height}")
+        if not 1 <= slots <= MAX_SLOTS:
+            raise ValueError(f"Slot count must be between 1 and {MAX_SLOTS}, got {slots}")
+        if target_fps is not None:
+            check_fps(target_fps)
+        fmt = check_format(format)
 
         try:
-            self._impl = _liru_core.SenderWrapper(name, width, height)
-        except RuntimeError as e:
+            transport = get_backend(backend)
+            self._impl: SenderImpl = transport.SenderWrapper(
+                name, width, height, slots, fmt, dirty_tiles
+            )
+        except (ImportError, RuntimeError) as e:
             raise RuntimeError(f"Failed to create sender '{name}': {e}") from e
 
+        self._backend = transport.NAME
+        self._impl_class = transport.SenderWrapper
+        self._pacer_class = getattr(transport, "FramePacer", FramePacer)
+        self._pacer: FramePacerImpl | None = None
+        self._missed_deadlines = 0  # Missed by pacers replaced since
+        if target_fps is not None:
+            self._pacer = self._pacer_class(target_fps)
+
         self._name = name
         self._width = width
         self._height = height
+        self._slots = slots
+        self._format = fmt
+        self._dirty_tiles = dirty_tiles
+        self._stats_block: StatsBlock | None = None
         self._released = False
 
-    def send_texture(self, texture_id: int) -> None:
+        if publish_stats_default() if publish_stats is None else publish_stats:
+            try:
+                self._stats_block = StatsBlock.create(ROLE_SENDER, name, width, height)
+            except OSError as e:
+                self.release()
+                raise RuntimeError(f"Failed to create stats block for '{name}': {e}") from e
+            self._impl.set_stats_block(self._stats_block.buffer)
+
+        if warmup:
+            try:
+                self.warmup()
+            except RuntimeError:
+                self.release()
+                raise
+
+    def warmup(self) -> None:
+        """Allocate and register everything the first send would.
+
+        Without warm-up the first frame pays for setting the sender up, so
+        it takes far longer than the rest. The Spout backend creates the
+        sender, its shared texture and the OpenGL/DirectX interop (with an
+        OpenGL context current, as for send_texture()); the shm backend
+        faults in the pages of every frame slot. Receivers can find the
+        sender from then on, but no frame is published. Calling it again
+        does nothing.
+
+        Raises:
+            RuntimeError: If warm-up fails or the sender has been released
+
+        Example:
+            >>> sender = liru.Sender("Output", 1920, 1080)
+            >>> sender.warmup()  # Before the show starts
+            >>> sender.send_texture(texture.glo)  # As fast as every later frame
+        """
+        if self._released:
+            raise RuntimeError("Sender has been released and cannot be used")
+        try:
+            self._impl.warmup()
+        except Exception as e:
+            raise RuntimeError(f"Sender warm-up error: {e}") from e
+
+    def resize(self, width: int, height: int, *, format: int | None = None) -> None:
+        """Change the frame size or format in place, keeping the sender name.
+
+        Receivers stay connected: they pick up the new size on their next
+        call, and ``generation`` (here and on ``Receiver``) goes up so they
+        can tell cheaply when to reallocate their target. The Spout backend
+        resizes the shared texture (at once after warmup(), otherwise on the
+        next send); the shm backend swaps in a new shared segment under the
+        same name. Frames sent afterwards must have the new size. On the shm
+        backend, receiving before the first of them raises ``RuntimeError``
+        ("No frame has been sent yet") rather than returning a blank frame.
+
+        A new format recreates the backend sender under the same name, as a
+        sender's format is fixed; slots, frame sync, stats publishing, dirty
+        tiles and pacing carry over, and receivers reconnect on their next
+        call. If the new sender cannot be created, the old one is restored.
+
+        Args:
+            width: New width in pixels
+            height: New height in pixels
+            format: New pixel format, None to keep the current one
+
+        Raises:
+            ValueError: If the dimensions or format are invalid
+            RuntimeError: If resizing fails or the sender has been released
+
+        Example:
+            >>> if frame_time_ms > budget_ms:
+            ...     sender.resize(sender.width * 3 // 4, sender.height * 3 // 4)
+        """
+        if self._released:
+            raise RuntimeError("Sender has been released and cannot be used")
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid dimensions: {width}x{height}")
+        fmt = self._format if format is None else check_format(format)
+
+        if fmt != self._format:
+            self._recreate(width, height, fmt)
+            return
+        try:
+            self._impl.resize(width, height)
+        except Exception as e:
+            raise RuntimeError(f"Sender resize error: {e}") from e
+        self._width = width
+        self._height = height
+
+    def _recreate(self, width: int, height: int, fmt: PixelFormat) -> None:
+        """Replace the backend sender with one of another format."""
+        frame_sync = self.frame_sync
+        if self._stats_block is not None:
+            self._impl.set_stats_block(None)
+        self._impl.release()  # Frees the name for the replacement
+
+        try:
+            impl = self._impl_class(self._name, width, height, self._slots, fmt, self._dirty_tiles)
+        except Exception as e:
+            try:
+                impl = self._impl_class(
+                    self._name,
+                    self._width,
+                    self._height,
+                    self._slots,
+                    self._format,
+                    self._dirty_tiles,
+                )
+            except Exception:
+                if self._stats_block is not None:
+                    self._stats_block.close()
+                    self._stats_block = None
+                self._released = True
+                raise RuntimeError(f"Sender resize error: {e}; the sender is released") from e
+            self._attach(impl, frame_sync)
+            raise RuntimeError(f"Sender resize error: {e}") from e
+
+        self._attach(impl, frame_sync)
+        self._width = width
+        self._height = height
+        self._format = fmt
+
+    def _attach(self, impl: SenderImpl, frame_sync: bool) -> None:
+        """Make impl the backend sender, restoring frame sync and stats."""
+        self._impl = impl
+        if frame_sync:
+            impl.enable_frame_sync(True)
+        if self._stats_block is not None:
+            impl.set_stats_block(self._stats_block.buffer)
+
+    def send_texture(
+        self,
+        texture_id: int,
+        *,
+        timestamp_ns: int | None = None,
+        payload: Buffer | None = None,
+        transfer: int = Transfer.NONE,
+    ) -> None:
         """Send OpenGL texture via Spout.
 
         Shares the texture with receivers using DirectX shared handles.
@@ -73,9 +276,16 @@ class Sender:
 
         Args:
             texture_id: OpenGL texture ID (e.g., from texture.glo in ModernGL)
+            timestamp_ns: Capture time on the ``time.perf_counter_ns()`` clock,
+                None to stamp the frame with the time of the call
+            payload: Up to 232 bytes for receivers (timecode, scene ID, ...),
+                returned in ``FrameMetadata.payload``
+            transfer: ``Transfer.INVERT`` to flip the texture in Spout's copy;
+                textures cannot swap channels or convert alpha
 
         Raises:
-            ValueError: If texture_id is invalid
+            ValueError: If texture_id, timestamp_ns, payload or transfer is
+                invalid
             RuntimeError: If send operation fails or sender already released
 
         Example:
@@ -86,13 +296,169 @@ class Sender:
             raise RuntimeError("Sender has been released and cannot be used")
         if texture_id <= 0:
             raise ValueError(f"Invalid texture ID: {texture_id}")
+        flags = check_transfer(transfer, self._format, texture=True)
+        timestamp, data = _metadata_args(timestamp_ns, payload)
 
         try:
-            if not self._impl.send_texture(texture_id):
+            if not self._impl.send_texture(texture_id, timestamp, data, flags):
                 raise RuntimeError("Failed to send texture")
         except Exception as e:
             raise RuntimeError(f"Texture send error: {e}") from e
 
+    def send_buffer(
+        self,
+        buffer: Buffer,
+        *,
+        timestamp_ns: int | None = None,
+        payload: Buffer | None = None,
+        transfer: int = Transfer.NONE,
+    ) -> bool:
+        """Send a CPU pixel buffer.
+
+        Copies one frame in the sender's pixel format from any C-contiguous
+        buffer-protocol object (NumPy array, bytearray, memoryview) straight
+        into the shared frame, without an OpenGL texture upload. The Spout
+        backend uses Spout's image sending path for 8-bit RGBA and BGRA, and
+        uploads the other formats to a staging texture. Every frame carries a
+        metadata record with its frame number, capture timestamp and optional
+        payload, which receivers read from ``Receiver.metadata`` or
+        ``Frame.metadata``.
+
+        Transfer flags flip, swap channels or convert alpha in the same copy
+        (see ``liru.Transfer``); the buffer itself is not modified.
+
+        Args:
+            buffer: Frame of width * height * bytes per pixel, e.g. a uint8
+                array of shape (height, width, 4) for RGBA8, (height, width, 1)
+                for R8 or a float16 array of shape (height, width, 4) for
+                RGBA16F
+            timestamp_ns: Capture time on the ``time.perf_counter_ns()`` clock,
+                None to stamp the frame with the time of the call
+            payload: Up to 232 bytes for receivers (timecode, scene ID, ...)
+            transfer: Transfer flags applied while copying
+
+        Returns:
+            True if the frame was published, False if it was dropped because
+            receivers are borrowing every slot the sender may write (see
+            Receiver.acquire_frame)
+
+        Raises:
+            TypeError: If buffer does not support the buffer protocol
+            ValueError: If the buffer layout or size does not match the
+                sender, or timestamp_ns, payload or transfer is invalid
+            RuntimeError: If send operation fails or sender already released,
+                or the shm backend needs NumPy for the transfer and it is not
+                installed
+
+        Example:
+            >>> frame = np.zeros((1080, 1920, 4), dtype=np.uint8)
+            >>> sender.send_buffer(frame, timestamp_ns=captured_ns, payload=b"cam-2")
+        """
+        if self._released:
+            raise RuntimeError("Sender has been released and cannot be used")
+        view = frame_view(buffer, self._width, self._height, writable=False, format=self._format)
+        flags = check_transfer(transfer, self._format)
+        timestamp, data = _metadata_args(timestamp_ns, payload)
+
+        try:
+            sent: bool = self._impl.send_buffer(view, timestamp, data, flags)
+            return sent
+        except Exception as e:
+            raise RuntimeError(f"Buffer send error: {e}") from e
+
+    def enable_frame_sync(self, enabled: bool = True) -> None:
+        """Signal waiting receivers after every frame.
+
+        Opt-in counterpart of ``Receiver.wait_for_frame()``: each successful
+        send wakes receivers blocked there. Uses Spout's frame-sync event on
+        the Spout backend and a futex on the shm backend.
+
+        Args:
+            enabled: True to signal every frame, False to stop
+
+        Raises:
+            RuntimeError: If the sender has been released
+
+        Example:
+            >>> sender.enable_frame_sync()
+            >>> sender.send_buffer(frame)  # Wakes receiver.wait_for_frame()
+        """
+        if self._released:
+            raise RuntimeError("Sender has been released and cannot be used")
+        self._impl.enable_frame_sync(enabled)
+
+    def pace(self) -> bool:
+        """Wait for the next frame slot at target_fps.
+
+        Call once per frame in the sending loop. Deadlines sit on a fixed
+        grid of frame periods from the first call, so the cadence does not
+        drift; each call sleeps until shortly before its deadline and spins
+        the rest of the way for low jitter. The Spout backend waits natively
+        with the GIL released. A call made after its deadline returns at
+        once and counts in ``missed_deadlines``; more than a frame late, the
+        cadence restarts instead of sending a burst to catch up. Without a
+        target_fps this returns at once.
+
+        Returns:
+            True if the deadline was met, False if it had already passed
+
+        Raises:
+            RuntimeError: If the sender has been released
+
+        Example:
+            >>> sender = liru.Sender("Output", 1920, 1080, target_fps=60)
+            >>> while running:
+            ...     sender.pace()
+            ...     render(texture)
+            ...     sender.send_texture(texture.glo)
+        """
+        if self._released:
+            raise RuntimeError("Sender has been released and cannot be used")
+        if self._pacer is None:
+            return True
+        met: bool = self._pacer.wait()
+        return met
+
+    @property
+    def target_fps(self) -> float | None:
+        """Get the frame rate pace() holds.
+
+        Returns:
+            Frames per second, or None without pacing
+        """
+        if self._pacer is None:
+            return None
+        fps: float = self._pacer.get_fps()
+        return fps
+
+    @target_fps.setter
+    def target_fps(self, fps: float | None) -> None:
+        """Change the frame rate; the cadence restarts at the next pace().
+
+        Args:
+            fps: Frames per second, or None to stop pacing
+
+        Raises:
+            ValueError: If fps is not positive
+        """
+        if fps is not None:
+            check_fps(fps)
+        if self._pacer is not None:
+            self._missed_deadlines += self._pacer.get_missed()
+        self._pacer = None if fps is None else self._pacer_class(fps)
+
+    @property
+    def missed_deadlines(self) -> int:
+        """Get the number of frame deadlines pace() found already passed.
+
+        Returns:
+            Missed deadlines since creation
+        """
+        missed = self._missed_deadlines
+        if self._pacer is not None:
+            missed += self._pacer.get_missed()
+        return missed
+
     def release(self) -> None:
         """Release Spout sender resources.
 
@@ -102,13 +468,17 @@ class Sender:
             >>> sender.release()
         """
         if not self._released and hasattr(self, "_impl"):
+            if self._stats_block is not None:
+                self._impl.set_stats_block(None)
+                self._stats_block.close()
+                self._stats_block = None
             self._impl.release()
             self._released = True
 
     def get_fps(self) -> float:
         """Get current frames per second.
 
-        Returns rolling average FPS over recent frames.
+        Returns the average FPS over the last 256 frames (see stats()).
 
         Returns:
             Current FPS as a float
@@ -120,6 +490,40 @@ class Sender:
         fps: float = self._impl.get_fps()
         return fps
 
+    def stats(self, deadline_ms: float | None = None) -> FrameStats:
+        """Get statistics of the last 256 sends.
+
+        Reports send latency percentiles, inter-frame jitter and windowed FPS
+        from a fixed-size ring of per-frame timings that the send path fills
+        without allocating.
+
+        Args:
+            deadline_ms: Target frame period in milliseconds; intervals between
+                frames longer than this count as deadline misses. None counts
+                none
+
+        Returns:
+            FrameStats snapshot
+
+        Raises:
+            ValueError: If deadline_ms is not positive
+
+        Example:
+            >>> stats = sender.stats(deadline_ms=1000 / 60)
+            >>> print(f"p99 {stats.latency_p99_ms:.2f}ms, misses {stats.deadline_misses}")
+        """
+        return FrameStats._make(self._impl.get_stats(backend_deadline(deadline_ms)))
+
+    @property
+    def stats_block(self) -> StatsBlock | None:
+        """Get the shared stats block this sender publishes.
+
+        Returns:
+            Block, or None if the sender was created without publish_stats
+            or has been released
+        """
+        return self._stats_block
+
     @property
     def last_send_time_ms(self) -> float:
         """Get last send latency in milliseconds.
@@ -134,6 +538,57 @@ class Sender:
         latency: float = self._impl.get_last_send_time_ms()
         return latency
 
+    @property
+    def backend(self) -> str:
+        """Get transport backend name.
+
+        Returns:
+            Backend name, e.g. "spout" or "shm"
+        """
+        return self._backend
+
+    @property
+    def frame_sync(self) -> bool:
+        """Check whether frame sync is enabled.
+
+        Returns:
+            True if every send signals waiting receivers
+        """
+        enabled: bool = self._impl.is_frame_sync_enabled()
+        return enabled
+
+    @property
+    def generation(self) -> int:
+        """Get the number of times the sender was resized.
+
+        Returns:
+            Generation, 0 until the first resize()
+        """
+        generation: int = self._impl.get_generation()
+        return generation
+
+    @property
+    def changed_tiles(self) -> DirtyTiles | None:
+        """Get the tiles the last frame sent changed.
+
+        Frames sent with send_texture() are not hashed and mark every tile.
+
+        Returns:
+            The changed tiles of the last frame (all of them for the first),
+            or None if the sender was not created with ``dirty_tiles=True``
+        """
+        table = self._impl.get_tile_table()
+        return None if table is None else dirty_tiles(table)
+
+    @property
+    def slots(self) -> int:
+        """Get number of buffered frames.
+
+        Returns:
+            Slot count
+        """
+        return self._slots
+
     @property
     def name(self) -> str:
         """Get sender name.
@@ -161,6 +616,15 @@ class Sender:
         """
         return self._height
 
+    @property
+    def format(self) -> PixelFormat:
+        """Get the pixel format of the frames.
+
+        Returns:
+            Pixel format
+        """
+        return self._format
+
     def __enter__(self) -> Sender:
         """Enter context manager.
 
@@ -213,3 +677,13 @@ class Sender:
                 stacklevel=2,
             )
         self.release()
+
+
+def _metadata_args(timestamp_ns: int | None, payload: Buffer | None) -> tuple[int, bytes]:
+    """Validate send metadata and convert it for the backend (0 stamps at send)."""
+    if timestamp_ns is not None and timestamp_ns <= 0:
+        raise ValueError(f"Timestamp must be positive, got {timestamp_ns}")
+    data = b"" if payload is None else bytes(payload)
+    if len(data) > MAX_PAYLOAD:
+        raise ValueError(f"Payload is {len(data)} bytes, at most {MAX_PAYLOAD} allowed")
+    return timestamp_ns or 0, data
@@ -0,0 +1,266 @@
+"""Per-frame timing statistics.
+
+``Sender.stats()`` and ``Receiver.stats()`` summarize a window of recent
+frames (``FrameStats``). Senders and receivers created with
+``publish_stats=True`` also write running counters into a shared stats block
+after every frame, which other processes read through ``liru.monitor``.
+
+Stats block layout (256 bytes, little-endian):
+
+======  ========  ===============================================
+Offset  Type      Field
+======  ========  ===============================================
+0       char[4]   Magic ``b"LSTB"`` (zeroed when the owner closes it)
+4       uint32    Layout version
+8       uint32    Role (1: sender, 2: receiver)
+12      uint32    Owner process ID
+16      int64     Creation time, nanoseconds since the Unix epoch
+24      char[64]  Sender name, UTF-8, NUL-padded
+88      uint64    Sequence counter, odd while the counters below change
+96      uint64    Frames sent or received
+104     uint64    Frames dropped
+112     float64   Last send/receive call time in milliseconds
+120     float64   Peak send/receive call time in milliseconds
+128     float64   Frames per second over the statistics window
+136     int64     Time of the last frame, nanoseconds since the Unix epoch
+144     uint32    Frame width in pixels
+148     uint32    Frame height in pixels
+======  ========  ===============================================
+
+Writers bump the sequence counter to odd, update the counters and bump it
+back to even; readers retry while it is odd or changed under them.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import threading
+import time
+from array import array
+from itertools import pairwise
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+STATS_WINDOW = 256  # Frames covered by the statistics (same as the native FrameStats)
+
+STATS_BLOCK_MAGIC = b"LSTB"
+STATS_BLOCK_VERSION = 1
+STATS_BLOCK_SIZE = 256
+ROLE_SENDER = 1
+ROLE_RECEIVER = 2
+
+STATS_BLOCK_IDENTITY = struct.Struct("<4sIIIq64s")
+STATS_BLOCK_SEQ = struct.Struct("<Q")
+STATS_BLOCK_COUNTERS = struct.Struct("<QQdddqII")
+STATS_BLOCK_SEQ_OFFSET = 88
+STATS_BLOCK_COUNTERS_OFFSET = 96
+_PEAK = struct.Struct("<d")
+_PEAK_OFFSET = 120
+
+
+class FrameStats(NamedTuple):
+    """Statistics of the last ``STATS_WINDOW`` frames sent or received.
+
+    Latencies measure the send or receive call itself. ``jitter_ms`` is the
+    standard deviation of the intervals between frames, and
+    ``deadline_misses`` counts the intervals in the window that were longer
+    than the frame period passed to ``stats()``.
+
+    Attributes:
+        frames: Frames sent or received since creation
+        window: Frames in the window
+        fps: Frames per second over the window
+        latency_mean_ms: Mean send/receive call time
+        latency_p50_ms: Median send/receive call time
+        latency_p95_ms: 95th percentile send/receive call time
+        latency_p99_ms: 99th percentile send/receive call time
+        jitter_ms: Standard deviation of the intervals between frames
+        deadline_misses: Intervals in the window longer than the deadline
+        dropped: Frames dropped since creation; for a sender, frames it could
+            not publish, for a receiver, frames published between two receives
+
+    Example:
+        >>> stats = sender.stats(deadline_ms=1000 / 60)
+        >>> if stats.deadline_misses or stats.latency_p99_ms > 4.0:
+        ...     alert(stats)
+    """
+
+    frames: int
+    window: int
+    fps: float
+    latency_mean_ms: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    jitter_ms: float
+    deadline_misses: int
+    dropped: int
+
+
+def backend_deadline(deadline_ms: float | None) -> float:
+    """Validate a stats() deadline and convert it for ``get_stats()``.
+
+    Args:
+        deadline_ms: Target frame period in milliseconds, or None
+
+    Returns:
+        The deadline, or 0.0 (no deadline) for None
+
+    Raises:
+        ValueError: If deadline_ms is not positive
+    """
+    if deadline_ms is None:
+        return 0.0
+    if deadline_ms <= 0:
+        raise ValueError(f"Deadline must be positive, got {deadline_ms}")
+    return deadline_ms
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    rank = min(max(math.ceil(fraction * len(ordered)), 1), len(ordered))
+    return ordered[rank - 1]
+
+
+class StatsWindow:
+    """Ring of the last ``STATS_WINDOW`` frame timings, for Python backends.
+
+    ``record()`` only stores two floats into preallocated arrays, so the
+    send and receive paths never grow anything; percentiles are computed by
+    ``snapshot()``. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._time_s = array("d", bytes(8 * STATS_WINDOW))
+        self._latency_ms = array("d", bytes(8 * STATS_WINDOW))
+        self._frames = 0
+        self._dropped = 0
+
+    def record(self, end: float, latency_ms: float) -> None:
+        """Record one frame.
+
+        Args:
+            end: ``time.perf_counter()`` when the call returned
+            latency_ms: How long the call took
+        """
+        with self._lock:
+            index = self._frames % STATS_WINDOW
+            self._time_s[index] = end
+            self._latency_ms[index] = latency_ms
+            self._frames += 1
+
+    def record_dropped(self, count: int = 1) -> None:
+        """Count frames dropped instead of sent or received."""
+        with self._lock:
+            self._dropped += count
+
+    @property
+    def frames(self) -> int:
+        """Frames recorded since creation."""
+        return self._frames
+
+    @property
+    def dropped(self) -> int:
+        """Frames dropped since creation."""
+        return self._dropped
+
+    def _fps(self) -> float:
+        count = min(self._frames, STATS_WINDOW)
+        if count < 2:
+            return 0.0
+        newest = (self._frames - 1) % STATS_WINDOW
+        oldest = (self._frames - count) % STATS_WINDOW
+        span = self._time_s[newest] - self._time_s[oldest]
+        return (count - 1) / span if span > 0 else 0.0
+
+    def fps(self) -> float:
+        """Get frames per second over the window (0 with fewer than two frames)."""
+        with self._lock:
+            return self._fps()
+
+    def snapshot(self, deadline_ms: float = 0.0) -> FrameStats:
+        """Summarize the window.
+
+        Args:
+            deadline_ms: Target frame period; longer intervals count as
+                deadline misses. Zero or less counts none
+
+        Returns:
+            Statistics of the frames in the window
+        """
+        with self._lock:
+            frames, dropped, fps = self._frames, self._dropped, self._fps()
+            count = min(frames, STATS_WINDOW)
+            order = [(frames - count + i) % STATS_WINDOW for i in range(count)]
+            times = [self._time_s[i] for i in order]
+            latencies = [self._latency_ms[i] for i in order]
+        if not count:
+            return FrameStats(frames, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, dropped)
+
+        latencies.sort()
+        jitter = 0.0
+        misses = 0
+        if count > 1:
+            intervals = [(b - a) * 1000.0 for a, b in pairwise(times)]
+            mean = sum(intervals) / len(intervals)
+            jitter = math.sqrt(sum((x - mean) ** 2 for x in intervals) / len(intervals))
+            if deadline_ms > 0:
+                misses = sum(1 for x in intervals if x > deadline_ms)
+        return FrameStats(
+            frames=frames,
+            window=count,
+            fps=fps,
+            latency_mean_ms=sum(latencies) / count,
+            latency_p50_ms=_percentile(latencies, 0.50),
+            latency_p95_ms=_percentile(latencies, 0.95),
+            latency_p99_ms=_percentile(latencies, 0.99),
+            jitter_ms=jitter,
+            deadline_misses=misses,
+            dropped=dropped,
+        )
+
+
+def write_stats_block(
+    block: Buffer,
+    frames: int,
+    dropped: int,
+    latency_ms: float,
+    fps: float,
+    width: int,
+    height: int,
+) -> None:
+    """Publish counters into a stats block after a frame.
+
+    The peak latency is kept in the block itself. Callers serialize writes
+    to one block.
+
+    Args:
+        block: Writable stats block of STATS_BLOCK_SIZE bytes
+        frames: Frames sent or received so far
+        dropped: Frames dropped so far
+        latency_ms: Time the last send or receive call took
+        fps: Frames per second over the statistics window
+        width: Frame width in pixels
+        height: Frame height in pixels
+    """
+    view = memoryview(block)
+    seq = STATS_BLOCK_SEQ.unpack_from(view, STATS_BLOCK_SEQ_OFFSET)[0]
+    STATS_BLOCK_SEQ.pack_into(view, STATS_BLOCK_SEQ_OFFSET, seq + 1)
+    peak = max(_PEAK.unpack_from(view, _PEAK_OFFSET)[0], latency_ms)
+    STATS_BLOCK_COUNTERS.pack_into(
+        view,
+        STATS_BLOCK_COUNTERS_OFFSET,
+        frames,
+        dropped,
+        latency_ms,
+        peak,
+        fps,
+        time.time_ns(),
+        width,
+        height,
+    )
+    STATS_BLOCK_SEQ.pack_into(view, STATS_BLOCK_SEQ_OFFSET, seq + 2)
@@ -0,0 +1,221 @@
+"""Async iteration over the frames of a receiver."""
+
+from __future__ import annotations
+
+import asyncio
+import types
+from collections import deque
+from collections.abc import Callable
+
+from liru._watcher import Watch, get_watcher
+from liru.backends import ReceiverImpl
+from liru.frame import Frame
+
+
+class FrameStream:
+    """Asynchronous iterator over new frames from a receiver.
+
+    Created by ``Receiver.frames()``. Frames are received on a shared
+    watcher thread as soon as the sender publishes them and queued for the
+    event loop, so awaiting a frame never blocks the loop and hundreds of
+    streams share one thread. Each yielded Frame is a private copy and needs
+    no release.
+
+    When the consumer falls behind, the queue keeps the ``queue_size``
+    newest frames and drops the oldest; ``queue_size=1`` always yields the
+    latest frame.
+
+    Receiving starts on entering ``async with`` or on the first
+    ``__anext__()``. Close the stream, or leave the ``async with`` block, to
+    stop receiving.
+
+    Example:
+        >>> async with receiver.frames(queue_size=4) as frames:
+        ...     async for frame in frames:
+        ...         process(np.asarray(frame.data))
+    """
+
+    def __init__(
+        self,
+        impl: ReceiverImpl,
+        receive: Callable[[], Frame],
+        queue_size: int = 1,
+    ) -> None:
+        """Initialize frame stream.
+
+        Args:
+            impl: Backend receiver to watch for new frames
+            receive: Receives the current frame as a private copy; called on
+                the watcher thread
+            queue_size: Number of frames buffered before the oldest is dropped
+
+        Raises:
+            ValueError: If queue_size is less than 1
+        """
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1, got {queue_size}")
+
+        self._impl = impl
+        self._receive = receive
+        self._queue_size = queue_size
+        self._queue: deque[Frame] = deque()
+        self._dropped = 0
+        self._error: BaseException | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiter: asyncio.Future[None] | None = None
+        self._watch: Watch | None = None
+        self._closed = False
+
+    def _on_frame(self) -> None:
+        """Receive a frame and hand it to the event loop (watcher thread)."""
+        frame = self._receive()
+        self._call_soon(self._push, frame)
+
+    def _on_error(self, error: BaseException) -> None:
+        """Hand a receive error to the event loop (watcher thread)."""
+        self._call_soon(self._fail, error)
+
+    def _call_soon(self, callback: Callable[..., None], arg: object) -> None:
+        assert self._loop is not None
+        try:
+            self._loop.call_soon_threadsafe(callback, arg)
+        except RuntimeError:
+            self._stop_watching()  # Event loop closed
+
+    def _push(self, frame: Frame) -> None:
+        if self._closed:
+            return
+        self._queue.append(frame)
+        if len(self._queue) > self._queue_size:
+            self._queue.popleft()
+            self._dropped += 1
+        self._wake()
+
+    def _fail(self, error: BaseException) -> None:
+        self._error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _start_watching(self) -> None:
+        if self._loop is None and not self._closed:
+            self._loop = asyncio.get_running_loop()
+            self._watch = get_watcher().watch(self._impl, self._on_frame, self._on_error)
+
+    def _stop_watching(self) -> None:
+        if self._watch is not None:
+            get_watcher().unwatch(self._watch)
+            self._watch = None
+
+    def __aiter__(self) -> FrameStream:
+        """Get the iterator.
+
+        Returns:
+            Self
+        """
+        return self
+
+    async def __anext__(self) -> Frame:
+        """Wait for the next frame.
+
+        Returns:
+            Oldest queued frame
+
+        Raises:
+            StopAsyncIteration: If the stream is closed
+            RuntimeError: If receiving failed
+        """
+        if self._closed:
+            raise StopAsyncIteration
+        self._start_watching()
+        assert self._loop is not None
+
+        while not self._queue:
+            if self._error is not None:
+                raise RuntimeError(f"Frame stream error: {self._error}") from self._error
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+            if self._closed:
+                raise StopAsyncIteration
+        return self._queue.popleft()
+
+    def close(self) -> None:
+        """Stop receiving frames and drop queued ones.
+
+        Pending and later ``__anext__()`` calls end the iteration.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_watching()
+        self._queue.clear()
+        self._wake()
+
+    async def aclose(self) -> None:
+        """Close the stream (async generator protocol)."""
+        self.close()
+
+    @property
+    def dropped(self) -> int:
+        """Get number of frames dropped because the consumer fell behind.
+
+        Returns:
+            Dropped frame count
+        """
+        return self._dropped
+
+    @property
+    def queue_size(self) -> int:
+        """Get number of frames buffered before the oldest is dropped.
+
+        Returns:
+            Queue size
+        """
+        return self._queue_size
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the stream is closed.
+
+        Returns:
+            True after close()
+        """
+        return self._closed
+
+    async def __aenter__(self) -> FrameStream:
+        """Enter async context manager and start receiving.
+
+        Returns:
+            Self for use in async with statement
+        """
+        self._start_watching()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        """Exit async context manager and close the stream.
+
+        Args:
+            exc_type: Exception type if an error occurred
+            exc_val: Exception value if an error occurred
+            exc_tb: Exception traceback if an error occurred
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """Get string representation.
+
+        Returns:
+            String representation of the stream
+        """
+        state = "closed" if self._closed else f"queued={len(self._queue)}"
+        return f"FrameStream({state}, dropped={self._dropped})"
@@ -0,0 +1,270 @@
+"""Dirty-tile tracking: which parts of a frame changed.
+
+A sender created with ``dirty_tiles=True`` cuts every frame it sends from
+CPU pixels into ``TILE_SIZE`` x ``TILE_SIZE`` tiles (smaller at the right and
+bottom edges), hashes each tile and compares the hashes with those of its
+previous frame. Next to its frames it publishes a tile table holding, for
+every tile, the number of the last frame in which it changed. A receiver
+compares those numbers with the last frame it received, so frames it
+skipped are accounted for, and can leave unchanged frames alone or receive
+only the changed regions (``Receiver.receive_into(region=...)``).
+
+Tiles are hashed with a multilinear hash: every 8-byte word of a tile row
+is multiplied by a fixed odd key for its column, the row sums by a key for
+the row, and everything added modulo 2**64. A change of any one word
+always changes the hash, and it vectorizes: the shm backend hashes with two
+NumPy reductions, the Spout backend with a native loop. Frames sent as
+textures are not read back, so they mark every tile.
+
+Tile table layout (little-endian):
+
+======  ==========  ===============================================
+Offset  Type        Field
+======  ==========  ===============================================
+0       uint32      Tile size in pixels, 0 if tiles are not tracked
+4       uint32      Frame width in pixels
+8       uint32      Frame height in pixels
+12      uint32      Reserved
+16      uint64      Number of the last frame hashed
+24      uint64[]    Last frame each tile changed in, rows of tiles
+                    from the top, 0 before any frame
+======  ==========  ===============================================
+
+The Spout backend sizes its table for the sender's first size; if a resize
+needs more tiles than that, it doubles the tile size until they fit.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, NamedTuple
+
+from liru.formats import check_format
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+    import numpy as np
+
+TILE_SIZE = 64
+TABLE_HEADER = struct.Struct("<IIIIQ")
+_KEY_SEED = 0x6C697275  # Any fixed seed; hashes are only compared within one sender
+
+
+def tile_grid(width: int, height: int, tile_size: int = TILE_SIZE) -> tuple[int, int]:
+    """Get the number of tile columns and rows of a frame.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        tile_size: Tile width and height in pixels
+
+    Returns:
+        Tuple of (columns, rows)
+    """
+    return -(-width // tile_size), -(-height // tile_size)
+
+
+def table_size(width: int, height: int) -> int:
+    """Get the size of the tile table of a frame.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        Table size in bytes
+    """
+    columns, rows = tile_grid(width, height)
+    return TABLE_HEADER.size + columns * rows * 8
+
+
+class DirtyTiles(NamedTuple):
+    """Tiles of a frame that changed.
+
+    Tile ``i`` is column ``i % columns`` of tile row ``i // columns``, and is
+    dirty if bit ``i % 8`` (least significant first) of ``bitmap[i // 8]`` is
+    set.
+
+    Attributes:
+        frame: Sender frame the tiles are up to date with
+        tile_size: Tile width and height in pixels
+        width: Frame width in pixels
+        height: Frame height in pixels
+        bitmap: One bit per tile, set for tiles that changed
+
+    Example:
+        >>> tiles = receiver.changed_tiles()
+        >>> if tiles is not None and not tiles.dirty_count:
+        ...     continue  # Nothing changed since the last receive
+    """
+
+    frame: int
+    tile_size: int
+    width: int
+    height: int
+    bitmap: bytes
+
+    @property
+    def columns(self) -> int:
+        """Get the number of tile columns."""
+        return tile_grid(self.width, self.height, self.tile_size)[0]
+
+    @property
+    def rows(self) -> int:
+        """Get the number of tile rows."""
+        return tile_grid(self.width, self.height, self.tile_size)[1]
+
+    @property
+    def dirty_count(self) -> int:
+        """Get the number of dirty tiles."""
+        return sum(byte.bit_count() for byte in self.bitmap)
+
+    def is_dirty(self, column: int, row: int) -> bool:
+        """Check whether a tile changed.
+
+        Args:
+            column: Tile column, from the left
+            row: Tile row, from the top
+
+        Returns:
+            True if the tile changed
+        """
+        index = row * self.columns + column
+        return bool(self.bitmap[index >> 3] >> (index & 7) & 1)
+
+    def regions(self) -> list[tuple[int, int, int, int]]:
+        """Get the dirty tiles as pixel rectangles.
+
+        Runs of dirty tiles in a tile row are merged into one rectangle, and
+        rectangles are clipped to the frame, so each can be passed to
+        ``Receiver.receive_into(region=...)``.
+
+        Returns:
+            List of (x, y, width, height), top to bottom and left to right
+        """
+        columns, rows = tile_grid(self.width, self.height, self.tile_size)
+        size = self.tile_size
+        regions = []
+        for row in range(rows):
+            y = row * size
+            height = min(size, self.height - y)
+            column = 0
+            while column < columns:
+                if not self.is_dirty(column, row):
+                    column += 1
+                    continue
+                first = column
+                while column < columns and self.is_dirty(column, row):
+                    column += 1
+                x = first * size
+                regions.append((x, y, min(column * size, self.width) - x, height))
+        return regions
+
+
+def dirty_tiles(table: Buffer, since: int | None = None) -> DirtyTiles | None:
+    """Get the tiles that changed after a frame from a tile table.
+
+    Args:
+        table: Tile table (layout above)
+        since: Last frame the caller has, 0 to mark every tile of a sent
+            frame; None for the tiles the last hashed frame changed
+
+    Returns:
+        The changed tiles, or None if the table does not track tiles
+    """
+    with memoryview(table) as view:
+        if view.nbytes < TABLE_HEADER.size:
+            return None
+        tile_size, width, height, _, frame = TABLE_HEADER.unpack_from(view)
+        if not tile_size:
+            return None
+        if since is None:
+            since = max(frame - 1, 0)
+        columns, rows = tile_grid(width, height, tile_size)
+        count = columns * rows
+        stamps = view[TABLE_HEADER.size : TABLE_HEADER.size + count * 8].cast("Q")
+        bitmap = bytearray(-(-count // 8))
+        for index, stamp in enumerate(stamps):
+            if stamp > since:
+                bitmap[index >> 3] |= 1 << (index & 7)
+        stamps.release()
+    return DirtyTiles(frame, tile_size, width, height, bytes(bitmap))
+
+
+class TileHasher:
+    """Hashes the tiles of each frame and stamps the ones that changed.
+
+    Needs NumPy.
+
+    Args:
+        table: Writable tile table of table_size(width, height) bytes
+        width: Frame width in pixels
+        height: Frame height in pixels
+        format: Pixel format of the frames
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+
+    def __init__(self, table: memoryview, width: int, height: int, format: int) -> None:
+        import numpy as np
+
+        self._width = width
+        self._height = height
+        self._row_bytes = width * check_format(format).bytes_per_pixel
+        self._tile_bytes = TILE_SIZE * check_format(format).bytes_per_pixel
+        self._columns, self._rows = tile_grid(width, height)
+        self._full_columns = width // TILE_SIZE  # Tiles whose rows are whole words
+        keys = np.random.default_rng(_KEY_SEED).integers(
+            0, 2**64, size=self._tile_bytes + TILE_SIZE, dtype=np.uint64, endpoint=False
+        )
+        keys |= np.uint64(1)
+        self._word_keys = keys[: self._tile_bytes // 8]
+        self._byte_keys = keys[: self._tile_bytes]
+        self._row_keys = np.resize(keys[self._tile_bytes :], height)
+        self._row_starts = np.arange(0, height, TILE_SIZE)
+        self._hashes: np.ndarray | None = None
+
+        self._table = table
+        TABLE_HEADER.pack_into(table, 0, TILE_SIZE, width, height, 0, 0)
+        self._stamps = np.frombuffer(table, dtype="<u8", offset=TABLE_HEADER.size)
+        self._stamps[:] = 0
+
+    def update(self, frame: Buffer, number: int) -> None:
+        """Hash a frame and stamp its changed tiles with its number.
+
+        Args:
+            frame: The frame as published, in the format given
+            number: Its frame number
+        """
+        hashes = self._hash(frame)
+        if self._hashes is None:
+            self._stamps[:] = number
+        else:
+            self._stamps[hashes != self._hashes] = number
+        self._hashes = hashes
+        TABLE_HEADER.pack_into(self._table, 0, TILE_SIZE, self._width, self._height, 0, number)
+
+    def mark_all(self, number: int) -> None:
+        """Stamp every tile, for a frame that was not hashed."""
+        self._stamps[:] = number
+        self._hashes = None
+        TABLE_HEADER.pack_into(self._table, 0, TILE_SIZE, self._width, self._height, 0, number)
+
+    def _hash(self, frame: Buffer) -> np.ndarray:
+        import numpy as np
+
+        pixels = np.frombuffer(frame, dtype=np.uint8).reshape(self._height, self._row_bytes)
+        sums = np.empty((self._height, self._columns), dtype=np.uint64)
+        if self._full_columns:
+            split = self._full_columns * self._tile_bytes
+            words = pixels[:, :split].view("<u8")
+            words = words.reshape(self._height, self._full_columns, -1)
+            np.matmul(words, self._word_keys, out=sums[:, : self._full_columns])
+        if self._full_columns < self._columns:
+            rest = pixels[:, self._full_columns * self._tile_bytes :]
+            sums[:, -1] = rest @ self._byte_keys[: rest.shape[1]]
+        sums *= self._row_keys[:, None]
+        hashes: np.ndarray = np.add.reduceat(sums, self._row_starts, axis=0).ravel()
+        return hashes
@@ -0,0 +1,320 @@
+"""Transforms applied while a frame is copied.
+
+A ``Transfer`` flips, swaps channels and converts alpha in the same copy
+that moves the frame to or from the shared frame, so no separate pass over
+the pixels is needed.
+
+The Spout backend uses Spout's own vertical flip (``bInvert``) and uploads
+or reads back with the GL_BGRA/GL_RGBA client format of the other channel
+order. Only the alpha conversion is a separate native loop. Textures are
+copied with a framebuffer blit, which can flip but not reorder or scale
+channels, so on them only ``INVERT`` is supported.
+
+The shm backend copies with ``copy_frame()``. Flips copy the rows in reverse
+order. Channel swaps and alpha conversion need NumPy and write each
+destination channel from strided views of the source.
+
+Premultiplying 8-bit frames rounds ``color * alpha / 255`` to nearest.
+Unpremultiplying rounds ``color * 255 / alpha`` and clamps it to 255. Pixels
+with zero alpha come out as zero.
+
+Receivers can also take a region of the frame and shrink it, so a crop or a
+thumbnail costs its own size rather than a full frame. Spout crops and
+shrinks on the GPU with framebuffer blits: linear blits to half size, each a
+2x2 box average, then one to the exact size. The shm backend copies only the
+rows and columns of the region, and shrinks with a box filter: each output
+pixel is the mean of the source pixels whose top-left corners fall in its
+footprint, which is the exact area average for whole-number factors.
+"""
+
+from __future__ import annotations
+
+import enum
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from liru.formats import PixelFormat, check_format
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class Transfer(enum.IntFlag):
+    """Transforms applied while a frame is sent or received.
+
+    Flags combine with ``|``. The same flags mean the same on both sides: a
+    sender applies them to the frame it publishes, a receiver to the copy it
+    takes.
+
+    Attributes:
+        NONE: Copy unchanged
+        INVERT: Flip rows, top to bottom (OpenGL's bottom-up row order)
+        SWAP_RB: Swap red and blue, converting RGBA to BGRA and back
+        PREMULTIPLY: Multiply color by alpha
+        UNPREMULTIPLY: Divide color by alpha
+
+    Example:
+        >>> sender.send_buffer(frame, transfer=liru.Transfer.INVERT | liru.Transfer.SWAP_RB)
+    """
+
+    NONE = 0
+    INVERT = 1
+    SWAP_RB = 2
+    PREMULTIPLY = 4
+    UNPREMULTIPLY = 8
+
+
+_ALPHA = Transfer.PREMULTIPLY | Transfer.UNPREMULTIPLY
+_ALL = Transfer.INVERT | Transfer.SWAP_RB | _ALPHA
+_FOUR_CHANNELS = frozenset(
+    (PixelFormat.RGBA8, PixelFormat.BGRA8, PixelFormat.RGBA16F, PixelFormat.RGBA32F)
+)
+
+
+def check_transfer(transfer: int, format: int, *, texture: bool = False) -> Transfer:
+    """Validate transfer flags for frames of a format.
+
+    Args:
+        transfer: Transfer flags
+        format: Pixel format of the frames
+        texture: Whether the frames are OpenGL textures, which only invert
+
+    Returns:
+        The flags as a Transfer
+
+    Raises:
+        ValueError: If the flags are unknown, contradict each other or
+            cannot be applied to the format or to a texture
+    """
+    if int(transfer) & ~int(_ALL):
+        raise ValueError(f"Unknown transfer flags: {transfer}")
+    flags = Transfer(transfer)
+    if flags & _ALPHA == _ALPHA:
+        raise ValueError("Cannot both premultiply and unpremultiply alpha")
+    if texture and flags & ~Transfer.INVERT:
+        raise ValueError(
+            "Textures are copied by a blit, which can only invert; "
+            "swap channels or convert alpha on CPU frames"
+        )
+    if flags & (Transfer.SWAP_RB | _ALPHA):
+        fmt = check_format(format)
+        if fmt not in _FOUR_CHANNELS:
+            raise ValueError(
+                f"Channel swaps and alpha conversion need an RGBA or BGRA format, not {fmt.name}"
+            )
+    return flags
+
+
+def check_region(
+    region: Sequence[int] | None, width: int, height: int
+) -> tuple[int, int, int, int]:
+    """Validate a region of a frame.
+
+    Args:
+        region: (x, y, width, height) in pixels, rows counted from the top;
+            None or a zero width or height for the whole frame
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        The region as (x, y, width, height)
+
+    Raises:
+        ValueError: If the region is not four integers or is outside the frame
+    """
+    if region is None:
+        return 0, 0, width, height
+    if len(region) != 4:
+        raise ValueError(f"Region must be (x, y, width, height), not {tuple(region)}")
+    x, y, w, h = (int(value) for value in region)
+    if w == 0 or h == 0:
+        return 0, 0, width, height
+    if x < 0 or y < 0 or w < 0 or h < 0 or x + w > width or y + h > height:
+        raise ValueError(f"Region {(x, y, w, h)} is outside the {width}x{height} frame")
+    return x, y, w, h
+
+
+def check_scale(
+    scale: Sequence[int] | None, region: tuple[int, int, int, int], format: int
+) -> tuple[int, int]:
+    """Validate the size a region is shrunk to.
+
+    Args:
+        scale: (width, height) to shrink to; None or zeros for the region size
+        region: Region being received, from check_region()
+        format: Pixel format of the frames
+
+    Returns:
+        The output size as (width, height)
+
+    Raises:
+        ValueError: If the size is not two integers, is larger than the
+            region, or the format cannot be filtered
+    """
+    size = region[2], region[3]
+    if scale is None:
+        return size
+    if len(scale) != 2:
+        raise ValueError(f"Scale must be (width, height), not {tuple(scale)}")
+    out = int(scale[0]), int(scale[1])
+    if out == (0, 0) or out == size:
+        return size
+    if not (0 < out[0] <= size[0] and 0 < out[1] <= size[1]):
+        raise ValueError(
+            f"Cannot scale a {size[0]}x{size[1]} region to {out[0]}x{out[1]}; "
+            "receives can only shrink frames"
+        )
+    fmt = check_format(format)
+    if fmt is PixelFormat.RGB10A2:
+        raise ValueError("Cannot scale packed RGB10A2 frames")
+    return out
+
+
+def copy_frame(
+    dst: memoryview,
+    src: memoryview,
+    width: int,
+    height: int,
+    format: int,
+    transfer: int,
+    *,
+    region: tuple[int, int, int, int] | None = None,
+    size: tuple[int, int] | None = None,
+) -> None:
+    """Copy one frame, or a region of it, applying transfer flags in the same pass.
+
+    Args:
+        dst: Writable one-dimensional byte view of the destination frame
+        src: One-dimensional byte view of the source frame, not overlapping dst
+        width: Source frame width in pixels
+        height: Source frame height in pixels
+        format: Pixel format of both frames
+        transfer: Transfer flags, already validated with check_transfer()
+        region: Region of the source to copy, from check_region(); the whole
+            frame by default
+        size: Size to shrink the region to, from check_scale(); the region
+            size by default
+
+    Raises:
+        ImportError: If the flags swap channels or convert alpha, or the
+            region is shrunk, and NumPy is not installed
+    """
+    x, y, w, h = region or (0, 0, width, height)
+    out_width, out_height = size or (w, h)
+    scaled = (out_width, out_height) != (w, h)
+    if not scaled and not transfer & ~Transfer.INVERT:
+        pixel = check_format(format).bytes_per_pixel
+        _copy_rows(dst, src, width * pixel, (x * pixel, y, w * pixel, h), bool(transfer))
+        return
+
+    import numpy as np
+
+    fmt = check_format(format)
+    dtype = np.dtype(fmt.item_format)
+    source = np.frombuffer(src, dtype=dtype).reshape(height, width, fmt.components)
+    source = source[y : y + h, x : x + w]
+    target = np.frombuffer(dst, dtype=dtype).reshape(out_height, out_width, fmt.components)
+    if scaled:
+        source = _box_shrink(source, out_width, out_height)
+    if transfer & Transfer.INVERT:
+        source = source[::-1]
+    if not transfer & ~Transfer.INVERT:
+        target[...] = source
+        return
+    order = (2, 1, 0) if transfer & Transfer.SWAP_RB else (0, 1, 2)
+    alpha = source[..., 3]
+    target[..., 3] = alpha
+    if not transfer & _ALPHA:
+        for channel, origin in enumerate(order):
+            target[..., channel] = source[..., origin]
+    elif dtype.kind == "f":
+        _convert_float(target, source, alpha, order, bool(transfer & Transfer.PREMULTIPLY))
+    else:
+        _convert_unorm8(target, source, alpha, order, bool(transfer & Transfer.PREMULTIPLY))
+
+
+def _copy_rows(
+    dst: memoryview,
+    src: memoryview,
+    stride: int,
+    block: tuple[int, int, int, int],
+    invert: bool,
+) -> None:
+    # block is (first byte of a row, first row, bytes per row, rows)
+    start, top, span, rows = block
+    if span == stride and not invert:
+        dst[:] = src[top * stride : (top + rows) * stride]
+        return
+    for row in range(rows):
+        origin = (top + (rows - 1 - row if invert else row)) * stride + start
+        dst[row * span : (row + 1) * span] = src[origin : origin + span]
+
+
+def _box_shrink(source: np.ndarray, width: int, height: int) -> np.ndarray:
+    import numpy as np
+
+    rows = np.arange(height) * source.shape[0] // height
+    cols = np.arange(width) * source.shape[1] // width
+    wide = np.uint32 if source.dtype.kind == "u" else np.float32
+    sums = np.add.reduceat(source, rows, axis=0, dtype=wide)
+    sums = np.add.reduceat(sums, cols, axis=1)
+    row_counts = np.diff(rows, append=source.shape[0])
+    col_counts = np.diff(cols, append=source.shape[1])
+    counts = (row_counts[:, None] * col_counts[None, :])[..., None].astype(wide)
+    if source.dtype.kind == "u":
+        sums += counts // 2
+        sums //= counts
+    else:
+        sums /= counts
+    return sums.astype(source.dtype)
+
+
+def _convert_float(
+    target: np.ndarray,
+    source: np.ndarray,
+    alpha: np.ndarray,
+    order: tuple[int, int, int],
+    premultiply: bool,
+) -> None:
+    import numpy as np
+
+    transparent = alpha == 0
+    for channel, origin in enumerate(order):
+        out = target[..., channel]
+        if premultiply:
+            np.multiply(source[..., origin], alpha, out=out)
+        else:
+            np.divide(source[..., origin], alpha, out=out, where=~transparent)
+            out[transparent] = 0
+
+
+def _convert_unorm8(
+    target: np.ndarray,
+    source: np.ndarray,
+    alpha: np.ndarray,
+    order: tuple[int, int, int],
+    premultiply: bool,
+) -> None:
+    import numpy as np
+
+    wide_alpha = alpha.astype(np.uint16)
+    scratch = np.empty_like(wide_alpha)
+    if premultiply:
+        for channel, origin in enumerate(order):
+            # round(color * alpha / 255), exact for all 16-bit products
+            np.multiply(source[..., origin], wide_alpha, out=scratch)
+            scratch += 128
+            scratch += scratch >> 8
+            scratch >>= 8
+            target[..., channel] = scratch
+        return
+
+    divisor = np.maximum(wide_alpha, 1)
+    half = wide_alpha >> 1
+    for channel, origin in enumerate(order):
+        np.multiply(source[..., origin], 255, out=scratch, dtype=np.uint16)
+        scratch += half
+        scratch //= divisor
+        np.minimum(scratch, 255, out=scratch)
+        scratch[wide_alpha == 0] = 0
+        target[..., channel] = scratch
@@ -1,33 +1,192 @@
 /**
  * pybind11 bindings for liru
  *
- * Exposes SenderWrapper and ReceiverWrapper C++ classes to Python.
+ * Exposes SenderWrapper, SenderGroup, FramePacer, ReceiverWrapper,
+ * ReceiverGroup and CaptureWorker C++ classes and query_senders() to Python. Every call that may block in Spout releases the
+ * GIL.
  */
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <memory>
+#include <stdexcept>
+#include <string>
+
+#include "capture_worker.h"
+#include "frame_format.h"
+#include "frame_pacer.h"
+#include "sender_group.h"
 #include "sender_wrapper.h"
+#include "receiver_group.h"
 #include "receiver_wrapper.h"
+#include "sender_directory.h"
 
 namespace py = pybind11;
 
-PYBIND11_MODULE(_liru_core, m) {
+/**
+ * Check a Python buffer is C-contiguous with 1-byte items.
+ *
+ * @throws std::invalid_argument (ValueError in Python) otherwise
+ */
+static void check_byte_buffer(const py::buffer_info& info) {
+    if (info.itemsize != 1) {
+        throw std::invalid_argument("Frame buffer must have 1-byte items");
+    }
+    py::ssize_t stride = info.itemsize;
+    for (py::ssize_t dim = info.ndim - 1; dim >= 0; --dim) {
+        if (info.strides[dim] != stride) {
+            throw std::invalid_argument("Frame buffer must be C-contiguous");
+        }
+        stride *= info.shape[dim];
+    }
+}
+
+/**
+ * Convert statistics to a tuple in liru.FrameStats field order.
+ */
+static py::tuple stats_tuple(const FrameStatsSnapshot& stats) {
+    return py::make_tuple(stats.frames, stats.window, stats.fps,
+                          stats.latency_mean_ms, stats.latency_p50_ms,
+                          stats.latency_p95_ms, stats.latency_p99_ms,
+                          stats.jitter_ms, stats.deadline_misses, stats.dropped);
+}
+
+/**
+ * Convert frame metadata to a (frame, timestamp_ns, payload) tuple.
+ */
+static py::tuple metadata_tuple(const FrameMetadata& metadata) {
+    return py::make_tuple(metadata.frame, metadata.timestamp_ns, py::bytes(metadata.payload));
+}
+
+/**
+ * Convert an encoded tile table to bytes, or None if tiles are not tracked.
+ */
+static py::object tile_table_bytes(const std::string& table) {
+    if (table.empty()) {
+        return py::none();
+    }
+    return py::bytes(table);
+}
+
+static_assert(sizeof(GroupUpdate) == 3 * sizeof(int), "GroupUpdate must pack as int triples");
+
+/**
+ * Pack group updates as bytes of native int (index, width, height) triples.
+ */
+static py::bytes updates_bytes(const std::vector<GroupUpdate>& updates) {
+    return py::bytes(reinterpret_cast<const char*>(updates.data()),
+                     updates.size() * sizeof(GroupUpdate));
+}
+
+/**
+ * Get the address of a writable stats block, or nullptr for None.
+ *
+ * @throws std::invalid_argument (ValueError in Python) if it is too small
+ */
+static unsigned char* stats_block_address(const py::object& block) {
+    if (block.is_none()) {
+        return nullptr;
+    }
+    py::buffer_info info = py::reinterpret_borrow<py::buffer>(block).request(true);
+    if (info.size * info.itemsize < static_cast<py::ssize_t>(StatsBlockWriter::SIZE)) {
+        throw std::invalid_argument("Stats block must be at least " +
+                                    std::to_string(StatsBlockWriter::SIZE) + " bytes");
+    }
+    return static_cast<unsigned char*>(info.ptr);
+}
+
+/**
+ * Keep a Python callable alive for a worker thread.
+ *
+ * The last reference may be dropped on any thread, so the deleter takes the
+ * GIL before releasing the callable.
+ */
+static std::shared_ptr<py::function> share_function(py::function fn) {
+    return std::shared_ptr<py::function>(new py::function(std::move(fn)), [](py::function* f) {
+        py::gil_scoped_acquire gil;
+        delete f;
+    });
+}
+
+/**
+ * Holder deleter that joins a capture worker without holding the GIL, so a
+ * worker waiting for the GIL to deliver a frame cannot deadlock the join.
+ */
+struct StopWithoutGil {
+    void operator()(CaptureWorker* worker) const {
+        {
+            py::gil_scoped_release release;
+            worker->stop();
+        }
+        delete worker;
+    }
+};
+
+using CaptureWorkerHolder = std::unique_ptr<CaptureWorker, StopWithoutGil>;
+
+PYBIND11_MODULE(_liru_core, m, py::mod_gil_not_used()) {
     m.doc() = "liru C++ extension - Spout 2.007 bindings for Python";
 
     // SenderWrapper class
     py::class_<SenderWrapper>(m, "SenderWrapper")
-        .def(py::init<const std::string&, int, int>(),
+        .def(py::init<const std::string&, int, int, int, unsigned int, bool>(),
              py::arg("name"),
              py::arg("width"),
              py::arg("height"),
-             "Create a Spout sender")
+             py::arg("slots") = 1,
+             py::arg("format") = FrameFormat::RGBA8,
+             py::arg("dirty_tiles") = false,
+             "Create a Spout sender of a DXGI pixel format")
         .def("send_texture",
              &SenderWrapper::send_texture,
              py::arg("texture_id"),
-             "Send OpenGL texture via Spout")
+             py::arg("timestamp_ns") = 0,
+             py::arg("payload") = std::string(),
+             py::arg("transfer") = 0,
+             py::call_guard<py::gil_scoped_release>(),
+             "Send OpenGL texture via Spout with its metadata")
+        .def("send_buffer",
+             [](SenderWrapper& self, py::buffer buffer, long long timestamp_ns,
+                const std::string& payload, unsigned int transfer) {
+                 py::buffer_info info = buffer.request();
+                 check_byte_buffer(info);
+                 const auto* pixels = static_cast<const unsigned char*>(info.ptr);
+                 const auto size = static_cast<size_t>(info.size);
+                 py::gil_scoped_release release;
+                 return self.send_image(pixels, size, timestamp_ns, payload, transfer);
+             },
+             py::arg("buffer"),
+             py::arg("timestamp_ns") = 0,
+             py::arg("payload") = std::string(),
+             py::arg("transfer") = 0,
+             "Send a CPU pixel buffer via Spout (GIL released during the copy)")
+        .def("get_slots",
+             &SenderWrapper::get_slots,
+             "Get number of buffered frames")
+        .def("resize",
+             &SenderWrapper::resize,
+             py::arg("width"),
+             py::arg("height"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Change the frame size, keeping the sender")
+        .def("get_generation",
+             &SenderWrapper::get_generation,
+             "Get the number of resizes since creation")
+        .def("warmup",
+             &SenderWrapper::warmup,
+             py::call_guard<py::gil_scoped_release>(),
+             "Create the sender ahead of the first frame")
+        .def("enable_frame_sync",
+             &SenderWrapper::enable_frame_sync,
+             py::arg("enabled") = true,
+             "Signal waiting receivers after every send")
+        .def("is_frame_sync_enabled",
+             &SenderWrapper::is_frame_sync_enabled,
+             "Check whether frame sync is enabled")
         .def("release",
              &SenderWrapper::release,
+             py::call_guard<py::gil_scoped_release>(),
              "Release sender resources")
         .def("get_fps",
              &SenderWrapper::get_fps,
@@ -35,6 +194,21 @@ PYBIND11_MODULE(_liru_core, m) {
         .def("get_last_send_time_ms",
              &SenderWrapper::get_last_send_time_ms,
              "Get last send time in milliseconds")
+        .def("get_stats",
+             [](const SenderWrapper& self, double deadline_ms) {
+                 return stats_tuple(self.get_stats(deadline_ms));
+             },
+             py::arg("deadline_ms") = 0.0,
+             "Get windowed send statistics as a liru.FrameStats tuple")
+        .def("set_stats_block",
+             [](SenderWrapper& self, const py::object& block) {
+                 self.set_stats_block(stats_block_address(block));
+             },
+             py::arg("block"),
+             "Publish counters into a shared stats block (None to stop)")
+        .def("get_tile_table",
+             [](SenderWrapper& self) { return tile_table_bytes(self.get_tile_table()); },
+             "Get the tile table as bytes (None without dirty tiles)")
         .def("get_name",
              &SenderWrapper::get_name,
              "Get sender name")
@@ -43,26 +217,144 @@ PYBIND11_MODULE(_liru_core, m) {
              "Get texture width")
         .def("get_height",
              &SenderWrapper::get_height,
-             "Get texture height");
+             "Get texture height")
+        .def("get_format",
+             &SenderWrapper::get_format,
+             "Get the DXGI pixel format");
+
+    // SenderGroup class
+    py::class_<SenderGroup>(m, "SenderGroup")
+        .def(py::init([](const py::tuple& senders) {
+                 std::vector<SenderWrapper*> members;
+                 members.reserve(senders.size());
+                 for (const py::handle& sender : senders) {
+                     members.push_back(sender.cast<SenderWrapper*>());
+                 }
+                 return std::make_unique<SenderGroup>(std::move(members));
+             }),
+             py::arg("senders"),
+             py::keep_alive<1, 2>(),
+             "Group a tuple of senders, kept alive by the group")
+        .def("send",
+             [](SenderGroup& self, const py::sequence& frames, long long timestamp_ns,
+                const std::string& payload) {
+                 // Views stay open, and are released with the GIL held, after the batch
+                 std::vector<py::buffer_info> views;
+                 std::vector<SendItem> items(frames.size());
+                 views.reserve(frames.size());
+                 for (size_t i = 0; i < items.size(); ++i) {
+                     py::object frame = frames[i];
+                     if (frame.is_none()) {
+                         continue;
+                     }
+                     if (py::isinstance<py::int_>(frame)) {
+                         items[i].texture_id = frame.cast<unsigned int>();
+                         continue;
+                     }
+                     views.push_back(py::reinterpret_borrow<py::buffer>(frame).request());
+                     check_byte_buffer(views.back());
+                     items[i].pixels = static_cast<const unsigned char*>(views.back().ptr);
+                     items[i].size = static_cast<size_t>(views.back().size);
+                 }
+                 SendBatchResult result;
+                 {
+                     py::gil_scoped_release release;
+                     result = self.send(items, timestamp_ns, payload);
+                 }
+                 return py::make_tuple(
+                     py::bytes(result.sent),
+                     py::bytes(reinterpret_cast<const char*>(result.member_ms.data()),
+                               result.member_ms.size() * sizeof(double)),
+                     result.total_ms);
+             },
+             py::arg("frames"),
+             py::arg("timestamp_ns") = 0,
+             py::arg("payload") = std::string(),
+             "Send one texture ID or CPU buffer per member (GIL released); returns "
+             "(sent bitmask bytes, member times as native doubles, total ms)")
+        .def("size",
+             &SenderGroup::size,
+             "Get the number of members");
+
+    // FramePacer class
+    py::class_<FramePacer>(m, "FramePacer")
+        .def(py::init<double>(),
+             py::arg("fps"),
+             "Create a fixed-rate frame clock")
+        .def("wait",
+             &FramePacer::wait,
+             py::call_guard<py::gil_scoped_release>(),
+             "Block until the next frame deadline (GIL released); False if it was missed")
+        .def("reset",
+             &FramePacer::reset,
+             "Restart the cadence at the next wait()")
+        .def("get_fps",
+             &FramePacer::get_fps,
+             "Get the target frame rate")
+        .def("get_missed",
+             &FramePacer::get_missed,
+             "Get the number of missed deadlines");
 
     // ReceiverWrapper class
     py::class_<ReceiverWrapper>(m, "ReceiverWrapper")
         .def(py::init<const std::string&>(),
              py::arg("sender_name") = "",
+             py::call_guard<py::gil_scoped_release>(),
              "Create a Spout receiver")
         .def("receive_texture",
-             &ReceiverWrapper::receive_texture,
+             [](ReceiverWrapper& self, unsigned int texture_id, unsigned int transfer,
+                std::tuple<int, int, int, int> region) {
+                 const auto [x, y, width, height] = region;
+                 return self.receive_texture(texture_id, transfer,
+                                             FrameRegion{x, y, width, height});
+             },
              py::arg("texture_id"),
-             "Receive texture from Spout sender")
+             py::arg("transfer") = 0,
+             py::arg("region") = std::make_tuple(0, 0, 0, 0),
+             py::call_guard<py::gil_scoped_release>(),
+             "Receive texture from Spout sender, or a region (x, y, width, height) of it")
+        .def("receive_into",
+             [](ReceiverWrapper& self, py::buffer buffer, unsigned int transfer,
+                std::tuple<int, int, int, int> region, std::tuple<int, int> scale) {
+                 py::buffer_info info = buffer.request(true);
+                 check_byte_buffer(info);
+                 auto* pixels = static_cast<unsigned char*>(info.ptr);
+                 const auto size = static_cast<size_t>(info.size);
+                 const auto [x, y, width, height] = region;
+                 const auto [out_width, out_height] = scale;
+                 py::gil_scoped_release release;
+                 return self.receive_image(pixels, size, transfer,
+                                           FrameRegion{x, y, width, height},
+                                           out_width, out_height);
+             },
+             py::arg("buffer"),
+             py::arg("transfer") = 0,
+             py::arg("region") = std::make_tuple(0, 0, 0, 0),
+             py::arg("scale") = std::make_tuple(0, 0),
+             "Receive into a CPU pixel buffer via Spout, optionally a region shrunk to "
+             "scale (GIL released during the copy)")
         .def("is_updated",
              &ReceiverWrapper::is_updated,
+             py::call_guard<py::gil_scoped_release>(),
              "Check if new frame is available")
+        .def("wait_for_frame",
+             &ReceiverWrapper::wait_for_frame,
+             py::arg("timeout_ms"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Wait for the sender's frame-sync signal (GIL released while waiting)")
+        .def("connect",
+             &ReceiverWrapper::connect,
+             py::arg("timeout_ms"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Connect to the sender ahead of the first receive (GIL released while waiting)")
         .def("select_sender",
              &ReceiverWrapper::select_sender,
              py::arg("name"),
+             py::call_guard<py::gil_scoped_release>(),
              "Connect to a different sender")
         .def("get_sender_list",
              &ReceiverWrapper::get_sender_list,
+             py::call_guard<py::gil_scoped_release>(),
              "Get list of available senders")
         .def("get_active_sender",
              &ReceiverWrapper::get_active_sender,
@@ -73,16 +365,154 @@ PYBIND11_MODULE(_liru_core, m) {
         .def("get_height",
              &ReceiverWrapper::get_height,
              "Get texture height")
+        .def("get_format",
+             &ReceiverWrapper::get_format,
+             "Get the sender's DXGI pixel format (0 if not connected)")
+        .def("get_frame",
+             &ReceiverWrapper::get_frame,
+             "Get sender frame number of the last received frame")
+        .def("get_generation",
+             &ReceiverWrapper::get_generation,
+             "Get the number of sender size changes seen")
+        .def("get_metadata",
+             [](const ReceiverWrapper& self) { return metadata_tuple(self.get_metadata()); },
+             "Get (frame, timestamp_ns, payload) of the last received frame")
         .def("get_last_receive_time_ms",
              &ReceiverWrapper::get_last_receive_time_ms,
              "Get last receive time in milliseconds")
+        .def("get_stats",
+             [](const ReceiverWrapper& self, double deadline_ms) {
+                 return stats_tuple(self.get_stats(deadline_ms));
+             },
+             py::arg("deadline_ms") = 0.0,
+             "Get windowed receive statistics as a liru.FrameStats tuple")
+        .def("set_stats_block",
+             [](ReceiverWrapper& self, const py::object& block) {
+                 self.set_stats_block(stats_block_address(block));
+             },
+             py::arg("block"),
+             "Publish counters into a shared stats block (None to stop)")
+        .def("get_tile_table",
+             [](ReceiverWrapper& self) {
+                 std::string table;
+                 {
+                     py::gil_scoped_release release;
+                     table = self.get_tile_table();
+                 }
+                 return tile_table_bytes(table);
+             },
+             "Read the sender's tile table as bytes (None without dirty tiles)")
         .def("is_initialized",
              &ReceiverWrapper::is_initialized,
              "Check if receiver was successfully initialized")
         .def("query_sender_info",
              &ReceiverWrapper::query_sender_info,
+             py::call_guard<py::gil_scoped_release>(),
              "Query sender dimensions without receiving frames");
 
+    // ReceiverGroup class
+    py::class_<ReceiverGroup>(m, "ReceiverGroup")
+        .def(py::init([](const py::tuple& receivers) {
+                 std::vector<ReceiverWrapper*> members;
+                 members.reserve(receivers.size());
+                 for (const py::handle& receiver : receivers) {
+                     members.push_back(receiver.cast<ReceiverWrapper*>());
+                 }
+                 return std::make_unique<ReceiverGroup>(std::move(members));
+             }),
+             py::arg("receivers"),
+             py::keep_alive<1, 2>(),
+             "Group a tuple of receivers, kept alive by the group")
+        .def("poll_textures",
+             [](ReceiverGroup& self, const std::vector<unsigned int>& texture_ids) {
+                 std::vector<GroupUpdate> updates;
+                 {
+                     py::gil_scoped_release release;
+                     updates = self.poll_textures(texture_ids);
+                 }
+                 return updates_bytes(updates);
+             },
+             py::arg("texture_ids"),
+             "Receive every updated member into its texture (GIL released); "
+             "returns int (index, width, height) triples as bytes")
+        .def("poll_into",
+             [](ReceiverGroup& self, const py::sequence& buffers) {
+                 // Views stay open, and are released with the GIL held, after the poll
+                 std::vector<py::buffer_info> views;
+                 std::vector<unsigned char*> pixels;
+                 std::vector<size_t> sizes;
+                 views.reserve(buffers.size());
+                 for (const py::handle& buffer : buffers) {
+                     if (buffer.is_none()) {
+                         pixels.push_back(nullptr);
+                         sizes.push_back(0);
+                         continue;
+                     }
+                     views.push_back(py::reinterpret_borrow<py::buffer>(buffer).request(true));
+                     check_byte_buffer(views.back());
+                     pixels.push_back(static_cast<unsigned char*>(views.back().ptr));
+                     sizes.push_back(static_cast<size_t>(views.back().size));
+                 }
+                 std::vector<GroupUpdate> updates;
+                 {
+                     py::gil_scoped_release release;
+                     updates = self.poll_images(pixels, sizes);
+                 }
+                 return updates_bytes(updates);
+             },
+             py::arg("buffers"),
+             "Receive every updated member into its CPU buffer (GIL released); "
+             "returns int (index, width, height) triples as bytes")
+        .def("size",
+             &ReceiverGroup::size,
+             "Get the number of members");
+
+    // CaptureWorker class
+    py::class_<CaptureWorker, CaptureWorkerHolder>(m, "CaptureWorker")
+        .def(py::init([](const std::string& sender_name, py::function on_frame) {
+                 auto callback = share_function(std::move(on_frame));
+                 return CaptureWorkerHolder(new CaptureWorker(
+                     sender_name,
+                     [callback](const unsigned char* pixels, int width, int height,
+                                unsigned int format, const FrameMetadata& metadata) {
+                         const size_t size = FrameFormat::get(format).frame_size(width, height);
+                         py::gil_scoped_acquire gil;
+                         try {
+                             py::bytearray data(reinterpret_cast<const char*>(pixels), size);
+                             (*callback)(data, width, height, format, metadata_tuple(metadata));
+                         } catch (py::error_already_set& e) {
+                             e.discard_as_unraisable("liru capture callback");
+                         }
+                     }));
+             }),
+             py::arg("sender_name"),
+             py::arg("on_frame"),
+             "Receive frames on a worker thread and call "
+             "on_frame(pixels, width, height, format, metadata)")
+        .def("stop",
+             &CaptureWorker::stop,
+             py::call_guard<py::gil_scoped_release>(),
+             "Stop the worker thread and wait for it to exit")
+        .def("is_running",
+             &CaptureWorker::is_running,
+             "Check whether the worker thread is still capturing");
+
+    m.def("query_senders",
+          []() {
+              std::vector<SenderInfo> senders;
+              {
+                  py::gil_scoped_release release;
+                  senders = query_senders();
+              }
+              py::list result;
+              for (const SenderInfo& info : senders) {
+                  result.append(py::make_tuple(info.name, info.width, info.height, info.format,
+                                               info.owner_pid, info.frame));
+              }
+              return result;
+          },
+          "List senders as (name, width, height, format, owner_pid, frame) tuples");
+
     // Module version - will be overridden by Python package __init__.py
     m.attr("__version__") = "0.0.0";
 }
@@ -0,0 +1,121 @@
+/**
+ * Background frame capture implementation
+ */
+
+#include "capture_worker.h"
+#include "Spout.h"
+#include <chrono>
+#include <stdexcept>
+
+namespace {
+constexpr DWORD SYNC_WAIT_MS = 5;  // Longest wait before re-checking stop
+constexpr auto IDLE_SLEEP = std::chrono::milliseconds(1);
+}
+
+CaptureWorker::CaptureWorker(const std::string& sender_name, FrameCallback on_frame)
+    : m_sender_name(sender_name), m_on_frame(std::move(on_frame)),
+      m_stop(false), m_running(true) {
+
+    if (sender_name.empty()) {
+        throw std::invalid_argument("Sender name cannot be empty");
+    }
+    m_thread = std::thread(&CaptureWorker::run, this);
+}
+
+CaptureWorker::~CaptureWorker() {
+    stop();
+}
+
+void CaptureWorker::stop() {
+    m_stop = true;
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+    m_running = false;
+}
+
+bool CaptureWorker::is_running() const {
+    return m_running;
+}
+
+void CaptureWorker::run() {
+    // A separate receiver, so the caller's receiver and OpenGL context are
+    // never used from this thread
+    Spout receiver;
+    if (!receiver.CreateOpenGL()) {
+        m_running = false;
+        return;
+    }
+    receiver.SetReceiverName(m_sender_name.c_str());
+    receiver.EnableFrameSync(true);
+    StagingTexture staging;  // For formats ReceiveImage cannot take
+    unsigned int width = 0, height = 0;
+
+    while (!m_stop) {
+        if (!receiver.WaitFrameSync(m_sender_name.c_str(), SYNC_WAIT_MS)) {
+            // No sync event from this sender; fall back to a short poll
+            std::this_thread::sleep_for(IDLE_SLEEP);
+        }
+
+        if (m_pixels.empty()) {
+            HANDLE share_handle = nullptr;
+            DWORD format = 0;
+            if (!receiver.GetSenderInfo(m_sender_name.c_str(), width, height,
+                                        share_handle, format)) {
+                continue;  // No sender yet
+            }
+            m_format = FrameFormat::find(FrameFormat::from_registry(format));
+            if (!m_format) {
+                continue;  // A format liru cannot carry; wait for a resize
+            }
+            m_pixels.assign(m_format->frame_size(width, height), 0);
+        }
+
+        bool received;
+        if (m_format->image_path) {
+            received = receiver.ReceiveImage(m_pixels.data(), m_format->gl_format, false);
+        } else {
+            const unsigned int texture = staging.prepare(*m_format, width, height);
+            received = receiver.ReceiveTexture(texture, GL_TEXTURE_2D, false);
+        }
+        if (!received) {
+            continue;  // Sender closed
+        }
+        if (receiver.IsUpdated()) {
+            // Connected, or the sender size or format changed: resize and
+            // receive again
+            m_format = FrameFormat::find(FrameFormat::from_registry(receiver.GetSenderFormat()));
+            if (!m_format) {
+                m_pixels.clear();
+                continue;
+            }
+            width = receiver.GetSenderWidth();
+            height = receiver.GetSenderHeight();
+            m_pixels.assign(m_format->frame_size(width, height), 0);
+            continue;
+        }
+        if (!m_format->image_path) {
+            staging.download(m_pixels.data());
+        }
+        if (receiver.IsFrameNew()) {
+            unsigned char record[FrameMetadata::SIZE];
+            const int size = receiver.ReadMemoryBuffer(
+                m_sender_name.c_str(), reinterpret_cast<char*>(record),
+                static_cast<int>(FrameMetadata::SIZE));
+            FrameMetadata metadata =
+                FrameMetadata::decode(record, size > 0 ? static_cast<size_t>(size) : 0);
+            if (metadata.frame == 0) {
+                metadata.frame = receiver.GetSenderFrame();  // Not a liru sender
+            }
+            m_on_frame(m_pixels.data(),
+                       static_cast<int>(width),
+                       static_cast<int>(height),
+                       m_format->dxgi,
+                       metadata);
+        }
+    }
+
+    staging.release();
+    receiver.ReleaseReceiver();
+    receiver.CloseOpenGL();
+}
@@ -0,0 +1,80 @@
+/**
+ * Background frame capture
+ *
+ * Receives frames from a Spout sender on a worker thread, with its own Spout
+ * receiver and OpenGL context, and hands each new frame to a callback.
+ */
+
+#pragma once
+
+#include <atomic>
+#include <functional>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include "frame_format.h"
+#include "frame_metadata.h"
+
+/**
+ * Worker thread that receives every new frame of one sender as CPU pixels in
+ * the sender's pixel format.
+ *
+ * Callbacks run on the worker thread. Nothing here touches Python; the
+ * bindings acquire the GIL inside the callbacks only.
+ */
+class CaptureWorker {
+public:
+    /**
+     * Called with each new frame: pixels (one frame of the sender's size
+     * and format, valid only during the call), width, height, the
+     * DXGI_FORMAT code and the frame's metadata.
+     */
+    using FrameCallback = std::function<void(const unsigned char* pixels, int width, int height,
+                                             unsigned int format,
+                                             const FrameMetadata& metadata)>;
+
+    /**
+     * Start capturing.
+     *
+     * @param sender_name Sender to receive from
+     * @param on_frame Called on the worker thread for every new frame
+     * @throws std::invalid_argument if sender_name is empty
+     */
+    CaptureWorker(const std::string& sender_name, FrameCallback on_frame);
+
+    /**
+     * Destructor - stops the worker thread.
+     */
+    ~CaptureWorker();
+
+    // Disable copy (owns a thread)
+    CaptureWorker(const CaptureWorker&) = delete;
+    CaptureWorker& operator=(const CaptureWorker&) = delete;
+
+    /**
+     * Stop the worker thread and wait for it to exit.
+     *
+     * Must not be called from on_frame. Callers holding the GIL must release
+     * it first, or the worker may block delivering a frame.
+     */
+    void stop();
+
+    /**
+     * Check whether the worker thread is still capturing.
+     *
+     * @return true until stop() is called or the worker fails to start
+     */
+    bool is_running() const;
+
+private:
+    void run();
+
+    std::string m_sender_name;
+    FrameCallback m_on_frame;
+    std::atomic<bool> m_stop;
+    std::atomic<bool> m_running;
+    std::vector<unsigned char> m_pixels;
+    const FrameFormat* m_format = nullptr;  // Of m_pixels; used by the worker thread only
+    std::thread m_thread;
+};
@@ -0,0 +1,131 @@
+/**
+ * Pixel formats of shared frames implementation
+ */
+
+#include "frame_format.h"
+#include "frame_transfer.h"
+#include "Spout.h"
+#include <stdexcept>
+#include <string>
+
+namespace {
+
+// OpenGL enums, spelled out because the Windows gl.h stops at OpenGL 1.1
+namespace gl {
+constexpr unsigned int RED = 0x1903;
+constexpr unsigned int RGBA = 0x1908;
+constexpr unsigned int BGRA = 0x80E1;
+constexpr unsigned int UNSIGNED_BYTE = 0x1401;
+constexpr unsigned int FLOAT = 0x1406;
+constexpr unsigned int HALF_FLOAT = 0x140B;
+constexpr unsigned int UNSIGNED_INT_2_10_10_10_REV = 0x8368;
+constexpr unsigned int R8 = 0x8229;
+constexpr unsigned int RGBA8 = 0x8058;
+constexpr unsigned int RGB10_A2 = 0x8059;
+constexpr unsigned int RGBA16F = 0x881A;
+constexpr unsigned int RGBA32F = 0x8814;
+constexpr unsigned int TEXTURE_MIN_FILTER = 0x2801;
+constexpr unsigned int TEXTURE_MAG_FILTER = 0x2800;
+constexpr int NEAREST = 0x2600;
+constexpr unsigned int PACK_ALIGNMENT = 0x0D05;
+constexpr unsigned int UNPACK_ALIGNMENT = 0x0CF5;
+}  // namespace gl
+
+// Same formats as liru/formats.py
+constexpr FrameFormat FORMATS[] = {
+    {FrameFormat::RGBA32F, 16, gl::RGBA32F, gl::RGBA, gl::FLOAT, false},
+    {FrameFormat::RGBA16F, 8, gl::RGBA16F, gl::RGBA, gl::HALF_FLOAT, false},
+    {FrameFormat::RGB10A2, 4, gl::RGB10_A2, gl::RGBA, gl::UNSIGNED_INT_2_10_10_10_REV, false},
+    {FrameFormat::RGBA8, 4, gl::RGBA8, gl::RGBA, gl::UNSIGNED_BYTE, true},
+    {FrameFormat::R8, 1, gl::R8, gl::RED, gl::UNSIGNED_BYTE, false},
+    {FrameFormat::BGRA8, 4, gl::RGBA8, gl::BGRA, gl::UNSIGNED_BYTE, true},
+};
+
+// D3DFMT_A8R8G8B8 and D3DFMT_X8R8G8B8 of DirectX 9 senders
+constexpr unsigned long D3D_BGRA8 = 21;
+constexpr unsigned long D3D_BGRX8 = 22;
+
+}  // namespace
+
+const FrameFormat* FrameFormat::find(unsigned long dxgi) {
+    for (const FrameFormat& format : FORMATS) {
+        if (format.dxgi == dxgi) {
+            return &format;
+        }
+    }
+    return nullptr;
+}
+
+const FrameFormat& FrameFormat::get(unsigned long dxgi) {
+    const FrameFormat* format = find(dxgi);
+    if (!format) {
+        throw std::invalid_argument("Unsupported pixel format: " + std::to_string(dxgi));
+    }
+    return *format;
+}
+
+unsigned long FrameFormat::from_registry(unsigned long registered) {
+    if (registered == 0 || registered == D3D_BGRA8 || registered == D3D_BGRX8) {
+        return BGRA8;
+    }
+    return registered;
+}
+
+std::size_t FrameFormat::frame_size(int width, int height) const {
+    return static_cast<std::size_t>(width) * static_cast<std::size_t>(height) * bytes_per_pixel;
+}
+
+unsigned int StagingTexture::prepare(const FrameFormat& format, int width, int height) {
+    if (m_id != 0 && m_format == &format && m_width == width && m_height == height) {
+        return m_id;
+    }
+    if (m_id == 0) {
+        GLuint id = 0;
+        glGenTextures(1, &id);
+        m_id = id;
+    }
+    glBindTexture(GL_TEXTURE_2D, m_id);
+    glTexParameteri(GL_TEXTURE_2D, gl::TEXTURE_MIN_FILTER, gl::NEAREST);
+    glTexParameteri(GL_TEXTURE_2D, gl::TEXTURE_MAG_FILTER, gl::NEAREST);
+    glTexImage2D(GL_TEXTURE_2D, 0, static_cast<GLint>(format.gl_internal), width, height, 0,
+                 format.gl_format, format.gl_type, nullptr);
+    glBindTexture(GL_TEXTURE_2D, 0);
+    m_format = &format;
+    m_width = width;
+    m_height = height;
+    return m_id;
+}
+
+unsigned int StagingTexture::upload(const FrameFormat& format, const unsigned char* pixels,
+                                    int width, int height, unsigned int transfer) {
+    const unsigned int id = prepare(format, width, height);
+    glBindTexture(GL_TEXTURE_2D, id);
+    // Rows are tightly packed, which GL's default 4-byte alignment breaks for R8
+    glPixelStorei(gl::UNPACK_ALIGNMENT, 1);
+    glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height,
+                    FrameTransfer::client_format(transfer, format), format.gl_type, pixels);
+    glPixelStorei(gl::UNPACK_ALIGNMENT, 4);
+    glBindTexture(GL_TEXTURE_2D, 0);
+    return id;
+}
+
+void StagingTexture::download(unsigned char* pixels, unsigned int transfer) const {
+    if (m_id == 0) {
+        throw std::logic_error("Staging texture was not prepared");
+    }
+    glBindTexture(GL_TEXTURE_2D, m_id);
+    glPixelStorei(gl::PACK_ALIGNMENT, 1);
+    glGetTexImage(GL_TEXTURE_2D, 0, FrameTransfer::client_format(transfer, *m_format),
+                  m_format->gl_type, pixels);
+    glPixelStorei(gl::PACK_ALIGNMENT, 4);
+    glBindTexture(GL_TEXTURE_2D, 0);
+}
+
+void StagingTexture::release() {
+    if (m_id != 0) {
+        GLuint id = m_id;
+        glDeleteTextures(1, &id);
+        m_id = 0;
+        m_format = nullptr;
+    }
+}
@@ -0,0 +1,124 @@
+/**
+ * Pixel formats of shared frames
+ *
+ * Formats are DXGI_FORMAT codes, as in Spout's sender registry; the list
+ * matches liru/formats.py. Spout's image path (SendImage/ReceiveImage)
+ * takes 8-bit RGBA and BGRA directly. CPU frames of the other formats go
+ * through a staging OpenGL texture of the same layout, which Spout copies
+ * to or from the shared texture.
+ */
+
+#pragma once
+
+#include <cstddef>
+
+/**
+ * Layout of one pixel format, in DXGI and OpenGL terms.
+ */
+struct FrameFormat {
+    unsigned int dxgi;             ///< DXGI_FORMAT code
+    unsigned int bytes_per_pixel;  ///< Size of one pixel
+    unsigned int gl_internal;      ///< Sized internal format of a staging texture
+    unsigned int gl_format;        ///< Client pixel format (GL_RGBA, GL_RED, ...)
+    unsigned int gl_type;          ///< Client component type (GL_UNSIGNED_BYTE, ...)
+    bool image_path;               ///< Whether SendImage/ReceiveImage take it directly
+
+    /** DXGI_FORMAT_R8G8B8A8_UNORM, the default of liru senders. */
+    static constexpr unsigned int RGBA8 = 28;
+
+    /** DXGI_FORMAT_B8G8R8A8_UNORM, the default of Spout senders. */
+    static constexpr unsigned int BGRA8 = 87;
+
+    /** DXGI_FORMAT_R32G32B32A32_FLOAT. */
+    static constexpr unsigned int RGBA32F = 2;
+
+    /** DXGI_FORMAT_R16G16B16A16_FLOAT. */
+    static constexpr unsigned int RGBA16F = 10;
+
+    /** DXGI_FORMAT_R10G10B10A2_UNORM, one packed 32-bit word per pixel. */
+    static constexpr unsigned int RGB10A2 = 24;
+
+    /** DXGI_FORMAT_R8_UNORM. */
+    static constexpr unsigned int R8 = 61;
+
+    /**
+     * Look up a format.
+     *
+     * @param dxgi DXGI_FORMAT code
+     * @return Format, or nullptr if liru cannot carry it
+     */
+    static const FrameFormat* find(unsigned long dxgi);
+
+    /**
+     * Look up a format that must be supported.
+     *
+     * @param dxgi DXGI_FORMAT code
+     * @return Format
+     * @throws std::invalid_argument if liru cannot carry it
+     */
+    static const FrameFormat& get(unsigned long dxgi);
+
+    /**
+     * Map the format a sender registered to a DXGI_FORMAT code.
+     *
+     * Older senders register 0 (unknown) or a DirectX 9 D3DFORMAT code for
+     * their 8-bit BGRA textures.
+     *
+     * @param registered Format from the Spout registry
+     * @return DXGI_FORMAT code
+     */
+    static unsigned long from_registry(unsigned long registered);
+
+    /**
+     * Get the size of one frame.
+     *
+     * @return width * height * bytes_per_pixel
+     */
+    std::size_t frame_size(int width, int height) const;
+};
+
+/**
+ * OpenGL texture that carries CPU frames of formats Spout's image path
+ * does not take.
+ *
+ * Every call, release() included, needs the OpenGL context the texture was
+ * created in to be current. Not thread-safe; owners lock around it.
+ */
+class StagingTexture {
+public:
+    /**
+     * Get a texture of the given format and size, reallocating on a change.
+     *
+     * @return OpenGL texture ID
+     */
+    unsigned int prepare(const FrameFormat& format, int width, int height);
+
+    /**
+     * Upload one frame into the texture.
+     *
+     * @param pixels Frame in the format's layout, rows top to bottom
+     * @param transfer FrameTransfer flags; SWAP_RB swaps channels in the upload
+     * @return OpenGL texture ID holding the frame
+     */
+    unsigned int upload(const FrameFormat& format, const unsigned char* pixels,
+                        int width, int height, unsigned int transfer = 0);
+
+    /**
+     * Read the texture back after prepare() and a receive into it.
+     *
+     * @param pixels Destination of format.frame_size(width, height) bytes
+     * @param transfer FrameTransfer flags; SWAP_RB swaps channels in the read
+     */
+    void download(unsigned char* pixels, unsigned int transfer = 0) const;
+
+    /**
+     * Delete the texture.
+     */
+    void release();
+
+private:
+    unsigned int m_id = 0;
+    int m_width = 0;
+    int m_height = 0;
+    const FrameFormat* m_format = nullptr;
+};
@@ -0,0 +1,56 @@
+/**
+ * Per-frame metadata record implementation
+ */
+
+#include "frame_metadata.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <cstring>
+
+namespace {
+
+// Field offsets, see liru/frame.py
+constexpr std::size_t FRAME_OFFSET = 0;
+constexpr std::size_t TIMESTAMP_OFFSET = 8;
+constexpr std::size_t LENGTH_OFFSET = 16;
+constexpr std::size_t PAYLOAD_OFFSET = 24;
+
+}  // namespace
+
+long long FrameMetadata::now_ns() {
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+void FrameMetadata::encode(unsigned char* record) const {
+    // Windows and Linux targets are little-endian, like the record
+    const auto number = static_cast<std::uint64_t>(frame);
+    const auto timestamp = static_cast<std::int64_t>(timestamp_ns);
+    const auto length = static_cast<std::uint32_t>(std::min(payload.size(), MAX_PAYLOAD));
+    std::memset(record, 0, SIZE);
+    std::memcpy(record + FRAME_OFFSET, &number, sizeof(number));
+    std::memcpy(record + TIMESTAMP_OFFSET, &timestamp, sizeof(timestamp));
+    std::memcpy(record + LENGTH_OFFSET, &length, sizeof(length));
+    std::memcpy(record + PAYLOAD_OFFSET, payload.data(), length);
+}
+
+FrameMetadata FrameMetadata::decode(const unsigned char* record, std::size_t size) {
+    FrameMetadata metadata;
+    if (size < PAYLOAD_OFFSET) {
+        return metadata;
+    }
+    std::uint64_t number = 0;
+    std::int64_t timestamp = 0;
+    std::uint32_t length = 0;
+    std::memcpy(&number, record + FRAME_OFFSET, sizeof(number));
+    std::memcpy(&timestamp, record + TIMESTAMP_OFFSET, sizeof(timestamp));
+    std::memcpy(&length, record + LENGTH_OFFSET, sizeof(length));
+    const std::size_t available = std::min(size, SIZE) - PAYLOAD_OFFSET;
+    length = static_cast<std::uint32_t>(std::min<std::size_t>({length, MAX_PAYLOAD, available}));
+    metadata.frame = static_cast<long long>(number);
+    metadata.timestamp_ns = static_cast<long long>(timestamp);
+    metadata.payload.assign(reinterpret_cast<const char*>(record + PAYLOAD_OFFSET), length);
+    return metadata;
+}
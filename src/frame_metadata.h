@@ -0,0 +1,54 @@
+/**
+ * Per-frame metadata record
+ *
+ * Frame number, capture timestamp and user payload that travel with every
+ * frame. The Spout backend carries the record in the sender's Spout memory
+ * buffer; the layout is documented in liru/frame.py.
+ */
+
+#pragma once
+
+#include <cstddef>
+#include <string>
+
+/**
+ * Metadata of one frame.
+ */
+struct FrameMetadata {
+    long long frame = 0;         ///< Sender frame number, counting up from 1
+    long long timestamp_ns = 0;  ///< Capture time on the steady clock, 0 if unknown
+    std::string payload;         ///< User bytes, at most MAX_PAYLOAD
+
+    /** Size of an encoded record in bytes. */
+    static constexpr std::size_t SIZE = 256;
+
+    /** Largest payload in bytes. */
+    static constexpr std::size_t MAX_PAYLOAD = 232;
+
+    /**
+     * Get the current time on the clock timestamps use.
+     *
+     * steady_clock is CLOCK_MONOTONIC on Linux and QueryPerformanceCounter
+     * on Windows, the same clock as Python's time.perf_counter_ns().
+     *
+     * @return Nanoseconds since the clock's epoch
+     */
+    static long long now_ns();
+
+    /**
+     * Encode into a record.
+     *
+     * @param record Destination of SIZE bytes
+     */
+    void encode(unsigned char* record) const;
+
+    /**
+     * Decode a record.
+     *
+     * @param record Source bytes
+     * @param size Number of valid bytes; shorter than the fixed fields
+     *             decodes as empty metadata
+     * @return Decoded metadata, payload clamped to the valid bytes
+     */
+    static FrameMetadata decode(const unsigned char* record, std::size_t size);
+};
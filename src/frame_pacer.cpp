@@ -0,0 +1,109 @@
+/**
+ * Frame pacing implementation
+ */
+
+#include "frame_pacer.h"
+
+#include <stdexcept>
+#include <string>
+#include <thread>
+
+#ifdef _WIN32
+#include <windows.h>
+#ifndef CREATE_WAITABLE_TIMER_HIGH_RESOLUTION
+#define CREATE_WAITABLE_TIMER_HIGH_RESOLUTION 0x00000002
+#endif
+#endif
+
+namespace {
+
+// Left to spinning: the usual oversleep of the OS sleep
+#ifdef _WIN32
+constexpr auto SPIN_MARGIN = std::chrono::microseconds(1000);
+#else
+constexpr auto SPIN_MARGIN = std::chrono::microseconds(500);
+#endif
+
+}  // namespace
+
+FramePacer::FramePacer(double fps)
+    : m_fps(fps),
+      m_period(std::chrono::duration_cast<Clock::duration>(
+          std::chrono::duration<double>(fps > 0.0 ? 1.0 / fps : 0.0))),
+      m_started(false), m_missed(0), m_timer(nullptr) {
+    if (!(fps > 0.0)) {
+        throw std::invalid_argument("Target FPS must be positive, got " + std::to_string(fps));
+    }
+#ifdef _WIN32
+    // Windows 10 1803+; older systems fall back to sleep_until
+    m_timer = CreateWaitableTimerExW(nullptr, nullptr, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION,
+                                     TIMER_ALL_ACCESS);
+#endif
+}
+
+FramePacer::~FramePacer() {
+#ifdef _WIN32
+    if (m_timer != nullptr) {
+        CloseHandle(static_cast<HANDLE>(m_timer));
+    }
+#endif
+}
+
+bool FramePacer::wait() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    const Clock::time_point now = Clock::now();
+    if (!m_started) {
+        m_started = true;
+        m_deadline = now;
+        return true;
+    }
+
+    const Clock::time_point deadline = m_deadline + m_period;
+    if (now > deadline) {
+        ++m_missed;
+        // More than a frame behind: restart the cadence instead of bursting
+        m_deadline = now - deadline >= m_period ? now : deadline;
+        return false;
+    }
+    m_deadline = deadline;
+    sleep_until(deadline);
+    return true;
+}
+
+void FramePacer::sleep_until(Clock::time_point deadline) {
+    const Clock::duration sleep = deadline - Clock::now() - SPIN_MARGIN;
+    if (sleep > Clock::duration::zero()) {
+#ifdef _WIN32
+        if (m_timer != nullptr) {
+            LARGE_INTEGER due;
+            // Relative due time in 100 ns units
+            due.QuadPart = -static_cast<LONGLONG>(
+                std::chrono::duration_cast<std::chrono::nanoseconds>(sleep).count() / 100);
+            if (SetWaitableTimerEx(static_cast<HANDLE>(m_timer), &due, 0, nullptr, nullptr,
+                                   nullptr, 0)) {
+                WaitForSingleObject(static_cast<HANDLE>(m_timer), INFINITE);
+            }
+        } else {
+            std::this_thread::sleep_for(sleep);
+        }
+#else
+        std::this_thread::sleep_for(sleep);
+#endif
+    }
+    while (Clock::now() < deadline) {
+        std::this_thread::yield();
+    }
+}
+
+void FramePacer::reset() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_started = false;
+}
+
+double FramePacer::get_fps() const {
+    return m_fps;
+}
+
+long long FramePacer::get_missed() const {
+    return m_missed;
+}
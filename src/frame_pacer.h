@@ -0,0 +1,87 @@
+/**
+ * Frame pacing
+ *
+ * Holds a sender loop to a fixed frame rate with a hybrid sleep and spin.
+ */
+
+#pragma once
+
+#include <atomic>
+#include <chrono>
+#include <mutex>
+
+/**
+ * Fixed-rate frame clock.
+ *
+ * Deadlines are a fixed grid of periods from the first wait(), so sleep
+ * overshoot never accumulates into drift. Each wait() sleeps until shortly
+ * before the deadline, then spins the rest of the way; on Windows the sleep
+ * uses a high-resolution waitable timer. Nothing here touches Python
+ * objects, so callers may release the GIL. Thread-safe.
+ */
+class FramePacer {
+public:
+    using Clock = std::chrono::steady_clock;
+
+    /**
+     * Create a pacer.
+     *
+     * @param fps Target frames per second
+     * @throws std::invalid_argument if fps is not positive
+     */
+    explicit FramePacer(double fps);
+
+    /**
+     * Destructor - closes the Windows timer.
+     */
+    ~FramePacer();
+
+    // Disable copy
+    FramePacer(const FramePacer&) = delete;
+    FramePacer& operator=(const FramePacer&) = delete;
+
+    /**
+     * Block until the next frame deadline.
+     *
+     * The first call starts the cadence and returns at once. A call made
+     * after its deadline returns at once and counts a miss; more than a
+     * period late, the cadence restarts from now instead of bursting to
+     * catch up.
+     *
+     * @return true if the deadline was met, false if it had already passed
+     */
+    bool wait();
+
+    /**
+     * Restart the cadence at the next wait().
+     */
+    void reset();
+
+    /**
+     * Get the target frame rate.
+     *
+     * @return Frames per second
+     */
+    double get_fps() const;
+
+    /**
+     * Get the number of missed deadlines.
+     *
+     * @return wait() calls made after their deadline
+     */
+    long long get_missed() const;
+
+private:
+    /**
+     * Sleep until shortly before the deadline, then spin until it.
+     */
+    void sleep_until(Clock::time_point deadline);
+
+    std::mutex m_mutex;  // Guards the cadence; held while waiting
+    const double m_fps;
+    const Clock::duration m_period;
+    Clock::time_point m_deadline;
+    bool m_started;
+    std::atomic<long long> m_missed;
+    void* m_timer;  // Windows high-resolution waitable timer, or nullptr
+};
@@ -0,0 +1,112 @@
+/**
+ * Regions and downscaling of shared frames implementation
+ */
+
+#include "frame_region.h"
+#include "Spout.h"
+#include <algorithm>
+#include <stdexcept>
+#include <string>
+#include <utility>
+
+namespace {
+
+// OpenGL enums, spelled out because the Windows gl.h stops at OpenGL 1.1
+namespace gl {
+constexpr unsigned int READ_FRAMEBUFFER = 0x8CA8;
+constexpr unsigned int DRAW_FRAMEBUFFER = 0x8CA9;
+constexpr unsigned int COLOR_ATTACHMENT0 = 0x8CE0;
+constexpr unsigned int FRAMEBUFFER_COMPLETE = 0x8CD5;
+constexpr unsigned int COLOR_BUFFER_BIT = 0x4000;
+constexpr unsigned int NEAREST = 0x2600;
+constexpr unsigned int LINEAR = 0x2601;
+}  // namespace gl
+
+}  // namespace
+
+FrameRegion FrameRegion::within(int frame_width, int frame_height) const {
+    const FrameRegion region = whole() ? FrameRegion{0, 0, frame_width, frame_height} : *this;
+    if (region.x < 0 || region.y < 0 || region.width <= 0 || region.height <= 0 ||
+        region.x + region.width > frame_width || region.y + region.height > frame_height) {
+        throw std::invalid_argument(
+            "Region (" + std::to_string(region.x) + ", " + std::to_string(region.y) + ", " +
+            std::to_string(region.width) + ", " + std::to_string(region.height) +
+            ") is outside the " + std::to_string(frame_width) + "x" +
+            std::to_string(frame_height) + " frame");
+    }
+    return region;
+}
+
+void RegionBlitter::blit(const FrameFormat& format, unsigned int source,
+                         const FrameRegion& region, unsigned int target, int width, int height,
+                         bool invert) {
+    if (m_read_fbo == 0) {
+        GLuint ids[2] = {0, 0};
+        glGenFramebuffersEXT(2, ids);
+        m_read_fbo = ids[0];
+        m_draw_fbo = ids[1];
+    }
+
+    // Halve while at least twice the target size; the last step blits
+    // straight into the target
+    std::vector<std::pair<int, int>> sizes;
+    int step_width = region.width;
+    int step_height = region.height;
+    while (step_width >= 2 * width || step_height >= 2 * height) {
+        step_width = std::max(width, step_width / 2);
+        step_height = std::max(height, step_height / 2);
+        sizes.emplace_back(step_width, step_height);
+    }
+    if (!sizes.empty() && sizes.back() == std::make_pair(width, height)) {
+        sizes.pop_back();
+    }
+    if (m_steps.size() < sizes.size()) {
+        m_steps.resize(sizes.size());
+    }
+
+    FrameRegion from = region;
+    for (std::size_t i = 0; i < sizes.size(); ++i) {
+        const unsigned int step = m_steps[i].prepare(format, sizes[i].first, sizes[i].second);
+        attach(m_read_fbo, gl::READ_FRAMEBUFFER, source);
+        attach(m_draw_fbo, gl::DRAW_FRAMEBUFFER, step);
+        glBlitFramebufferEXT(from.x, from.y, from.x + from.width, from.y + from.height,
+                             0, 0, sizes[i].first, sizes[i].second,
+                             gl::COLOR_BUFFER_BIT, gl::LINEAR);
+        source = step;
+        from = FrameRegion{0, 0, sizes[i].first, sizes[i].second};
+    }
+
+    const bool scaled = from.width != width || from.height != height;
+    attach(m_read_fbo, gl::READ_FRAMEBUFFER, source);
+    attach(m_draw_fbo, gl::DRAW_FRAMEBUFFER, target);
+    glBlitFramebufferEXT(from.x, from.y, from.x + from.width, from.y + from.height,
+                         0, invert ? height : 0, width, invert ? 0 : height,
+                         gl::COLOR_BUFFER_BIT, scaled ? gl::LINEAR : gl::NEAREST);
+
+    glBindFramebufferEXT(gl::READ_FRAMEBUFFER, 0);
+    glBindFramebufferEXT(gl::DRAW_FRAMEBUFFER, 0);
+}
+
+void RegionBlitter::attach(unsigned int framebuffer, unsigned int binding,
+                           unsigned int texture) const {
+    glBindFramebufferEXT(binding, framebuffer);
+    glFramebufferTexture2DEXT(binding, gl::COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0);
+    if (glCheckFramebufferStatusEXT(binding) != gl::FRAMEBUFFER_COMPLETE) {
+        glBindFramebufferEXT(binding, 0);
+        throw std::runtime_error("Cannot attach texture " + std::to_string(texture) +
+                                 " to a framebuffer");
+    }
+}
+
+void RegionBlitter::release() {
+    if (m_read_fbo != 0) {
+        GLuint ids[2] = {m_read_fbo, m_draw_fbo};
+        glDeleteFramebuffersEXT(2, ids);
+        m_read_fbo = 0;
+        m_draw_fbo = 0;
+    }
+    for (auto& step : m_steps) {
+        step.release();
+    }
+    m_steps.clear();
+}
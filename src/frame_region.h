@@ -0,0 +1,79 @@
+/**
+ * Regions and downscaling of shared frames
+ *
+ * Crops and shrinks the shared texture on the GPU with framebuffer blits, so
+ * only the region, or the thumbnail, crosses to the destination texture or
+ * is read back to the CPU.
+ */
+
+#pragma once
+
+#include <vector>
+
+#include "frame_format.h"
+
+/**
+ * Rectangle of a frame in pixels, rows counted from the top.
+ *
+ * A zero width or height stands for the whole frame.
+ */
+struct FrameRegion {
+    int x = 0;
+    int y = 0;
+    int width = 0;
+    int height = 0;
+
+    /**
+     * Check whether this stands for the whole frame.
+     */
+    bool whole() const { return width == 0 || height == 0; }
+
+    /**
+     * Resolve the whole-frame default and check the region fits a frame.
+     *
+     * @return The region within a width x height frame
+     * @throws std::invalid_argument if it does not fit
+     */
+    FrameRegion within(int frame_width, int frame_height) const;
+};
+
+/**
+ * Copies a region of one texture into another, shrinking it on the way.
+ *
+ * Each step is a linear-filtered blit to half the size, which averages
+ * 2x2 texels: a box filter. Steps repeat while the region is at least
+ * twice the target size, and a last linear blit reaches the exact size.
+ * The intermediate textures keep their sizes from frame to frame.
+ */
+class RegionBlitter {
+public:
+    /**
+     * Blit a region of a texture into the corner of another.
+     *
+     * Needs a current OpenGL context and, for the shared texture, its
+     * interop lock (Spout's BindSharedTexture()).
+     *
+     * @param format Pixel format of the intermediate textures
+     * @param source Texture ID to copy from
+     * @param region Rectangle of source, within its size
+     * @param target Texture ID of at least width x height to copy into
+     * @param width Target width, at most region.width
+     * @param height Target height, at most region.height
+     * @param invert Flip rows top to bottom
+     * @throws std::runtime_error if a framebuffer cannot be set up
+     */
+    void blit(const FrameFormat& format, unsigned int source, const FrameRegion& region,
+              unsigned int target, int width, int height, bool invert);
+
+    /**
+     * Delete the framebuffers and intermediate textures.
+     */
+    void release();
+
+private:
+    void attach(unsigned int framebuffer, unsigned int binding, unsigned int texture) const;
+
+    std::vector<StagingTexture> m_steps;
+    unsigned int m_read_fbo = 0;
+    unsigned int m_draw_fbo = 0;
+};
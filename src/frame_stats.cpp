@@ -0,0 +1,113 @@
+/**
+ * Windowed per-frame timing statistics implementation
+ */
+
+#include "frame_stats.h"
+
+#include <algorithm>
+#include <cmath>
+
+namespace {
+
+/**
+ * Nearest-rank percentile of sorted samples.
+ */
+double percentile(const double* sorted, int count, double fraction) {
+    int rank = static_cast<int>(std::ceil(fraction * count));
+    rank = std::clamp(rank, 1, count);
+    return sorted[rank - 1];
+}
+
+}  // namespace
+
+FrameStats::FrameStats()
+    : m_epoch(Clock::now()), m_time_s{}, m_latency_ms{}, m_frames(0), m_dropped(0) {}
+
+void FrameStats::record(Clock::time_point end, double latency_ms) {
+    const double time_s = std::chrono::duration<double>(end - m_epoch).count();
+    std::lock_guard<std::mutex> lock(m_mutex);
+    const int index = static_cast<int>(m_frames % WINDOW);
+    m_time_s[index] = time_s;
+    m_latency_ms[index] = latency_ms;
+    ++m_frames;
+}
+
+void FrameStats::record_dropped(long long count) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_dropped += count;
+}
+
+double FrameStats::fps() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return fps_locked();
+}
+
+long long FrameStats::frames() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_frames;
+}
+
+long long FrameStats::dropped() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_dropped;
+}
+
+double FrameStats::fps_locked() const {
+    const int count = static_cast<int>(std::min<long long>(m_frames, WINDOW));
+    if (count < 2) {
+        return 0.0;
+    }
+    const int newest = static_cast<int>((m_frames - 1) % WINDOW);
+    const int oldest = static_cast<int>((m_frames - count) % WINDOW);
+    const double span = m_time_s[newest] - m_time_s[oldest];
+    return span > 0.0 ? (count - 1) / span : 0.0;
+}
+
+FrameStatsSnapshot FrameStats::snapshot(double deadline_ms) const {
+    std::array<double, WINDOW> latency;
+    std::array<double, WINDOW> time_s;
+    FrameStatsSnapshot stats;
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        stats.frames = m_frames;
+        stats.dropped = m_dropped;
+        stats.window = static_cast<int>(std::min<long long>(m_frames, WINDOW));
+        stats.fps = fps_locked();
+        // Copy oldest to newest so intervals come out in order
+        for (int i = 0; i < stats.window; ++i) {
+            const int index = static_cast<int>((m_frames - stats.window + i) % WINDOW);
+            latency[i] = m_latency_ms[index];
+            time_s[i] = m_time_s[index];
+        }
+    }
+
+    const int count = stats.window;
+    if (count == 0) {
+        return stats;
+    }
+
+    double sum = 0.0;
+    for (int i = 0; i < count; ++i) {
+        sum += latency[i];
+    }
+    stats.latency_mean_ms = sum / count;
+    std::sort(latency.begin(), latency.begin() + count);
+    stats.latency_p50_ms = percentile(latency.data(), count, 0.50);
+    stats.latency_p95_ms = percentile(latency.data(), count, 0.95);
+    stats.latency_p99_ms = percentile(latency.data(), count, 0.99);
+
+    if (count > 1) {
+        const int intervals = count - 1;
+        const double mean_interval_ms = (time_s[count - 1] - time_s[0]) * 1000.0 / intervals;
+        double variance = 0.0;
+        for (int i = 1; i < count; ++i) {
+            const double interval_ms = (time_s[i] - time_s[i - 1]) * 1000.0;
+            variance += (interval_ms - mean_interval_ms) * (interval_ms - mean_interval_ms);
+            if (deadline_ms > 0.0 && interval_ms > deadline_ms) {
+                ++stats.deadline_misses;
+            }
+        }
+        stats.jitter_ms = std::sqrt(variance / intervals);
+    }
+    return stats;
+}
@@ -0,0 +1,99 @@
+/**
+ * Windowed per-frame timing statistics
+ *
+ * Fixed-size ring of frame timings shared by SenderWrapper and ReceiverWrapper.
+ */
+
+#pragma once
+
+#include <array>
+#include <chrono>
+#include <mutex>
+
+/**
+ * Summary of the frames in the statistics window, in liru.FrameStats order.
+ */
+struct FrameStatsSnapshot {
+    long long frames = 0;          ///< Frames sent or received since creation
+    int window = 0;                ///< Frames in the window
+    double fps = 0.0;              ///< Frames per second over the window
+    double latency_mean_ms = 0.0;  ///< Mean send/receive call time
+    double latency_p50_ms = 0.0;   ///< Median send/receive call time
+    double latency_p95_ms = 0.0;   ///< 95th percentile send/receive call time
+    double latency_p99_ms = 0.0;   ///< 99th percentile send/receive call time
+    double jitter_ms = 0.0;        ///< Standard deviation of inter-frame intervals
+    int deadline_misses = 0;       ///< Inter-frame intervals in the window over the deadline
+    long long dropped = 0;         ///< Frames dropped since creation
+};
+
+/**
+ * Ring of the last WINDOW frame timings.
+ *
+ * record() only writes into fixed arrays, so the send and receive paths
+ * never allocate. Percentiles are computed by snapshot(), on a stack copy.
+ * Thread-safe.
+ */
+class FrameStats {
+public:
+    using Clock = std::chrono::steady_clock;
+
+    /** Number of frames the statistics cover (same as the shm backend). */
+    static constexpr int WINDOW = 256;
+
+    FrameStats();
+
+    /**
+     * Record one frame.
+     *
+     * @param end When the send or receive call returned
+     * @param latency_ms How long the call took
+     */
+    void record(Clock::time_point end, double latency_ms);
+
+    /**
+     * Count frames that were dropped instead of sent or received.
+     *
+     * @param count Number of dropped frames
+     */
+    void record_dropped(long long count);
+
+    /**
+     * Summarize the window.
+     *
+     * @param deadline_ms Target frame period; intervals longer than this
+     *                    count as deadline misses. Zero or less counts none
+     * @return Statistics of the frames in the window
+     */
+    FrameStatsSnapshot snapshot(double deadline_ms) const;
+
+    /**
+     * Get frames per second over the window.
+     *
+     * @return FPS, 0 with fewer than two frames
+     */
+    double fps() const;
+
+    /**
+     * Get frames recorded since creation.
+     *
+     * @return Frame count
+     */
+    long long frames() const;
+
+    /**
+     * Get frames dropped since creation.
+     *
+     * @return Dropped frame count
+     */
+    long long dropped() const;
+
+private:
+    double fps_locked() const;
+
+    mutable std::mutex m_mutex;
+    Clock::time_point m_epoch;
+    std::array<double, WINDOW> m_time_s;
+    std::array<double, WINDOW> m_latency_ms;
+    long long m_frames;
+    long long m_dropped;
+};
@@ -0,0 +1,157 @@
+/**
+ * Transfer transforms of shared frames implementation
+ */
+
+#include "frame_transfer.h"
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+
+namespace {
+
+constexpr unsigned int GL_RGBA_FORMAT = 0x1908;
+constexpr unsigned int GL_BGRA_FORMAT = 0x80E1;
+
+// 8-bit RGBA or BGRA, and the float formats: four components, alpha last
+bool has_four_channels(const FrameFormat& format) {
+    return format.dxgi == FrameFormat::RGBA8 || format.dxgi == FrameFormat::BGRA8 ||
+           format.dxgi == FrameFormat::RGBA16F || format.dxgi == FrameFormat::RGBA32F;
+}
+
+float half_to_float(std::uint16_t half) {
+    const float sign = (half & 0x8000) ? -1.0f : 1.0f;
+    const int exponent = (half >> 10) & 0x1F;
+    const int mantissa = half & 0x3FF;
+    if (exponent == 0) {
+        return sign * std::ldexp(static_cast<float>(mantissa), -24);
+    }
+    if (exponent == 31) {
+        return mantissa ? NAN : sign * INFINITY;
+    }
+    return sign * std::ldexp(static_cast<float>(mantissa | 0x400), exponent - 25);
+}
+
+// Round to nearest even, as NumPy's float16 conversion does
+std::uint16_t float_to_half(float value) {
+    std::uint32_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    const std::uint16_t sign = static_cast<std::uint16_t>((bits >> 16) & 0x8000);
+    std::uint32_t mantissa = bits & 0x7FFFFF;
+    const int exponent = static_cast<int>((bits >> 23) & 0xFF);
+    if (exponent == 255) {
+        return sign | 0x7C00 | (mantissa ? 0x200 : 0);
+    }
+    const int half_exponent = exponent - 127 + 15;
+    if (half_exponent >= 31) {
+        return sign | 0x7C00;
+    }
+    std::uint32_t half;
+    std::uint32_t rest;
+    std::uint32_t middle;
+    if (half_exponent <= 0) {
+        if (half_exponent < -10) {
+            return sign;
+        }
+        mantissa |= 0x800000;
+        const int shift = 14 - half_exponent;
+        half = mantissa >> shift;
+        rest = mantissa & ((1u << shift) - 1);
+        middle = 1u << (shift - 1);
+    } else {
+        half = (static_cast<std::uint32_t>(half_exponent) << 10) | (mantissa >> 13);
+        rest = mantissa & 0x1FFF;
+        middle = 0x1000;
+    }
+    if (rest > middle || (rest == middle && (half & 1))) {
+        ++half;  // May carry into the exponent, which is still correct
+    }
+    return static_cast<std::uint16_t>(sign | half);
+}
+
+void convert_unorm8(bool premultiply, const unsigned char* src, unsigned char* dst,
+                    std::size_t pixels) {
+    for (std::size_t i = 0; i < pixels * 4; i += 4) {
+        const unsigned int alpha = src[i + 3];
+        for (std::size_t c = 0; c < 3; ++c) {
+            const unsigned int color = src[i + c];
+            unsigned int result;
+            if (premultiply) {
+                result = (color * alpha + 127) / 255;
+            } else if (alpha == 0) {
+                result = 0;
+            } else {
+                result = (color * 255 + alpha / 2) / alpha;
+                result = result > 255 ? 255 : result;
+            }
+            dst[i + c] = static_cast<unsigned char>(result);
+        }
+        dst[i + 3] = static_cast<unsigned char>(alpha);
+    }
+}
+
+float convert_float(bool premultiply, float color, float alpha) {
+    if (premultiply) {
+        return color * alpha;
+    }
+    return alpha == 0.0f ? 0.0f : color / alpha;
+}
+
+}  // namespace
+
+void FrameTransfer::check(unsigned int transfer, const FrameFormat& format, bool texture) {
+    if (transfer & ~ALL) {
+        throw std::invalid_argument("Unknown transfer flags: " + std::to_string(transfer));
+    }
+    if ((transfer & ALPHA) == ALPHA) {
+        throw std::invalid_argument("Cannot both premultiply and unpremultiply alpha");
+    }
+    if (texture && (transfer & ~INVERT)) {
+        throw std::invalid_argument(
+            "Textures are copied by a blit, which can only invert; "
+            "swap channels or convert alpha on CPU frames");
+    }
+    if ((transfer & (SWAP_RB | ALPHA)) && !has_four_channels(format)) {
+        throw std::invalid_argument("Channel swaps and alpha conversion need an RGBA or "
+                                    "BGRA format, not " + std::to_string(format.dxgi));
+    }
+}
+
+unsigned int FrameTransfer::client_format(unsigned int transfer, const FrameFormat& format) {
+    if (!(transfer & SWAP_RB)) {
+        return format.gl_format;
+    }
+    return format.gl_format == GL_BGRA_FORMAT ? GL_RGBA_FORMAT : GL_BGRA_FORMAT;
+}
+
+void FrameTransfer::convert_alpha(unsigned int transfer, const FrameFormat& format,
+                                  const unsigned char* src, unsigned char* dst,
+                                  std::size_t pixels) {
+    if (!(transfer & ALPHA)) {
+        return;
+    }
+    const bool premultiply = (transfer & PREMULTIPLY) != 0;
+    if (format.dxgi == FrameFormat::RGBA32F) {
+        for (std::size_t i = 0; i < pixels; ++i) {
+            float pixel[4];
+            std::memcpy(pixel, src + i * sizeof(pixel), sizeof(pixel));
+            for (int c = 0; c < 3; ++c) {
+                pixel[c] = convert_float(premultiply, pixel[c], pixel[3]);
+            }
+            std::memcpy(dst + i * sizeof(pixel), pixel, sizeof(pixel));
+        }
+    } else if (format.dxgi == FrameFormat::RGBA16F) {
+        for (std::size_t i = 0; i < pixels; ++i) {
+            std::uint16_t pixel[4];
+            std::memcpy(pixel, src + i * sizeof(pixel), sizeof(pixel));
+            const float alpha = half_to_float(pixel[3]);
+            for (int c = 0; c < 3; ++c) {
+                pixel[c] = float_to_half(convert_float(premultiply, half_to_float(pixel[c]), alpha));
+            }
+            std::memcpy(dst + i * sizeof(pixel), pixel, sizeof(pixel));
+        }
+    } else {
+        convert_unorm8(premultiply, src, dst, pixels);
+    }
+}
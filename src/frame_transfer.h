@@ -0,0 +1,59 @@
+/**
+ * Transfer transforms of shared frames
+ *
+ * Flags of liru.Transfer, applied while a frame is copied to or from the
+ * shared texture. Vertical flips are Spout's bInvert, and channel swaps the
+ * GL_BGRA/GL_RGBA client format of the same upload or read-back. Alpha
+ * conversion is a native loop over the CPU frame.
+ */
+
+#pragma once
+
+#include <cstddef>
+
+#include "frame_format.h"
+
+/**
+ * Transfer flags, matching liru/transfer.py.
+ */
+struct FrameTransfer {
+    static constexpr unsigned int INVERT = 1;         ///< Flip rows top to bottom
+    static constexpr unsigned int SWAP_RB = 2;        ///< Swap red and blue (RGBA <-> BGRA)
+    static constexpr unsigned int PREMULTIPLY = 4;    ///< Multiply color by alpha
+    static constexpr unsigned int UNPREMULTIPLY = 8;  ///< Divide color by alpha
+    static constexpr unsigned int ALPHA = PREMULTIPLY | UNPREMULTIPLY;
+    static constexpr unsigned int ALL = INVERT | SWAP_RB | ALPHA;
+
+    /**
+     * Check transfer flags can be applied to frames of a format.
+     *
+     * @param transfer Transfer flags
+     * @param format Pixel format of the frames
+     * @param texture Whether the frame is an OpenGL texture rather than CPU
+     *                pixels; textures are copied by a blit, which only flips
+     * @throws std::invalid_argument if they cannot
+     */
+    static void check(unsigned int transfer, const FrameFormat& format, bool texture);
+
+    /**
+     * Get the OpenGL client format that applies the channel swap, if any.
+     *
+     * @return format.gl_format, or its GL_RGBA/GL_BGRA counterpart
+     */
+    static unsigned int client_format(unsigned int transfer, const FrameFormat& format);
+
+    /**
+     * Premultiply or unpremultiply alpha, if the flags ask for it.
+     *
+     * Source and destination may be the same buffer. Pixels with zero alpha
+     * unpremultiply to zero.
+     *
+     * @param transfer Transfer flags
+     * @param format Pixel format of both buffers, with four components
+     * @param src Source pixels
+     * @param dst Destination pixels
+     * @param pixels Number of pixels
+     */
+    static void convert_alpha(unsigned int transfer, const FrameFormat& format,
+                              const unsigned char* src, unsigned char* dst, std::size_t pixels);
+};
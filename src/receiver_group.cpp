@@ -0,0 +1,90 @@
+/**
+ * Batched receive implementation
+ */
+
+#include "receiver_group.h"
+
+#include <exception>
+#include <stdexcept>
+#include <string>
+
+namespace {
+
+/**
+ * Check a per-member argument has one entry per member.
+ */
+void check_count(size_t count, size_t members, const char* what) {
+    if (count != members) {
+        throw std::invalid_argument("Expected " + std::to_string(members) + " " + what +
+                                    ", got " + std::to_string(count));
+    }
+}
+
+}  // namespace
+
+ReceiverGroup::ReceiverGroup(std::vector<ReceiverWrapper*> receivers)
+    : m_receivers(std::move(receivers)) {
+    if (m_receivers.empty()) {
+        throw std::invalid_argument("Receiver group cannot be empty");
+    }
+    for (const ReceiverWrapper* receiver : m_receivers) {
+        if (receiver == nullptr) {
+            throw std::invalid_argument("Receiver group member cannot be null");
+        }
+    }
+}
+
+std::vector<GroupUpdate> ReceiverGroup::poll_textures(
+    const std::vector<unsigned int>& texture_ids) {
+    check_count(texture_ids.size(), m_receivers.size(), "texture IDs");
+
+    std::vector<GroupUpdate> updates;
+    for (size_t i = 0; i < m_receivers.size(); ++i) {
+        ReceiverWrapper& receiver = *m_receivers[i];
+        if (texture_ids[i] == 0) {
+            continue;
+        }
+        try {
+            // IsUpdated() only reports a size or format change, so receive
+            // and let Spout say whether the frame was new
+            bool frame_new = false;
+            const auto [width, height] =
+                receiver.receive_texture(texture_ids[i], 0, FrameRegion{}, &frame_new);
+            if (frame_new) {
+                updates.push_back({static_cast<int>(i), width, height});
+            }
+        } catch (const std::exception&) {
+            // One sender going away must not cost the others their frame
+        }
+    }
+    return updates;
+}
+
+std::vector<GroupUpdate> ReceiverGroup::poll_images(const std::vector<unsigned char*>& pixels,
+                                                    const std::vector<size_t>& sizes) {
+    check_count(pixels.size(), m_receivers.size(), "buffers");
+    check_count(sizes.size(), m_receivers.size(), "buffer sizes");
+
+    std::vector<GroupUpdate> updates;
+    for (size_t i = 0; i < m_receivers.size(); ++i) {
+        ReceiverWrapper& receiver = *m_receivers[i];
+        if (pixels[i] == nullptr) {
+            continue;
+        }
+        try {
+            bool frame_new = false;
+            const auto [width, height] =
+                receiver.receive_image(pixels[i], sizes[i], 0, FrameRegion{}, 0, 0, &frame_new);
+            if (frame_new) {
+                updates.push_back({static_cast<int>(i), width, height});
+            }
+        } catch (const std::exception&) {
+            // Resized or closed; the caller sees the new size on the member
+        }
+    }
+    return updates;
+}
+
+size_t ReceiverGroup::size() const {
+    return m_receivers.size();
+}
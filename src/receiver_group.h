@@ -0,0 +1,76 @@
+/**
+ * Batched receive from several senders
+ *
+ * Receives every member of a fixed set that has a new frame, in a single
+ * call, for liru.ReceiverGroup.
+ */
+
+#pragma once
+
+#include <cstddef>
+#include <vector>
+
+#include "receiver_wrapper.h"
+
+/**
+ * A member that received a new frame in ReceiverGroup::poll_textures() or
+ * poll_images(). Laid out as three ints, the row format liru.ReceiverGroup
+ * returns.
+ */
+struct GroupUpdate {
+    int index;   ///< Position of the member in the group
+    int width;   ///< Frame width in pixels
+    int height;  ///< Frame height in pixels
+};
+
+/**
+ * Fixed set of receivers polled together.
+ *
+ * Does not own the receivers; the bindings keep them alive for the lifetime
+ * of the group. Nothing here touches Python objects, so callers may release
+ * the GIL for a whole poll. Each member is locked only while it is checked
+ * and received, so other threads may use the receivers in between.
+ */
+class ReceiverGroup {
+public:
+    /**
+     * Create a group.
+     *
+     * @param receivers Members, in the order results refer to them
+     * @throws std::invalid_argument if receivers is empty or holds nullptr
+     */
+    explicit ReceiverGroup(std::vector<ReceiverWrapper*> receivers);
+
+    /**
+     * Receive every member into its texture, reporting those with a new frame.
+     *
+     * @param texture_ids One OpenGL texture ID per member; 0 skips the member
+     * @return Updated members, in group order
+     * @throws std::invalid_argument if there is not one texture per member
+     */
+    std::vector<GroupUpdate> poll_textures(const std::vector<unsigned int>& texture_ids);
+
+    /**
+     * Receive every member into its CPU buffer, reporting those with a new frame.
+     *
+     * Members whose buffer no longer matches the sender size, or whose
+     * receive fails, are left out of the result.
+     *
+     * @param pixels One RGBA8 destination per member; nullptr skips the member
+     * @param sizes Size of each destination in bytes
+     * @return Updated members, in group order
+     * @throws std::invalid_argument if there is not one buffer per member
+     */
+    std::vector<GroupUpdate> poll_images(const std::vector<unsigned char*>& pixels,
+                                         const std::vector<size_t>& sizes);
+
+    /**
+     * Get the number of members.
+     *
+     * @return Member count
+     */
+    size_t size() const;
+
+private:
+    std::vector<ReceiverWrapper*> m_receivers;
+};
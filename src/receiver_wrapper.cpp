@@ -3,12 +3,22 @@
  */
 
 #include "receiver_wrapper.h"
+#include "tile_tracker.h"
 #include "Spout.h"
 #include <stdexcept>
+#include <cmath>
 #include <cstring>
+#include <string>
+#include <thread>
+
+namespace {
+constexpr DWORD WAIT_FOREVER = 0xFFFFFFFF;  // INFINITE
+constexpr auto CONNECT_RETRY = std::chrono::milliseconds(1);
+}
 
 ReceiverWrapper::ReceiverWrapper(const std::string& sender_name)
-    : m_active_sender(sender_name), m_width(0), m_height(0),
+    : m_active_sender(sender_name), m_width(0), m_height(0), m_format(0), m_frame(0),
+      m_generation(0),
       m_initialized(false), m_last_receive_time_ms(0.0) {
 
     m_receiver = std::make_unique<Spout>();
@@ -26,22 +36,49 @@ ReceiverWrapper::ReceiverWrapper(const std::string& sender_name)
 
 ReceiverWrapper::~ReceiverWrapper() {
     if (m_receiver) {
+        m_staging.release();
+        m_blitter.release();
         m_receiver->ReleaseReceiver();
         m_receiver.reset();
     }
 }
 
-std::tuple<int, int> ReceiverWrapper::receive_texture(unsigned int texture_id) {
+std::tuple<int, int> ReceiverWrapper::receive_texture(unsigned int texture_id,
+                                                      unsigned int transfer,
+                                                      const FrameRegion& region,
+                                                      bool* frame_new) {
     if (texture_id == 0) {
         throw std::invalid_argument("Invalid texture ID: 0");
     }
+    // Any format will do: a blit can only invert, whatever the format
+    FrameTransfer::check(transfer, FrameFormat::get(FrameFormat::RGBA8), true);
 
+    std::lock_guard<std::mutex> lock(m_mutex);
     auto start = std::chrono::high_resolution_clock::now();
 
+    if (!region.whole()) {
+        update_shared_locked();
+        const FrameRegion bounds = region.within(m_width, m_height);
+        // Copied at its own size, so no intermediate texture needs the format
+        blit_region_locked(FrameFormat::get(FrameFormat::RGBA8), bounds, texture_id,
+                           bounds.width, bounds.height, (transfer & FrameTransfer::INVERT) != 0);
+
+        auto end = std::chrono::high_resolution_clock::now();
+        m_last_receive_time_ms =
+            std::chrono::duration<double, std::milli>(end - start).count();
+        record_receive(m_receiver->GetSenderFrame(), m_last_receive_time_ms);
+        read_metadata_locked(m_receiver->GetSenderFrame());
+        m_initialized = true;
+        if (frame_new) {
+            *frame_new = m_receiver->IsFrameNew();
+        }
+        return std::make_tuple(bounds.width, bounds.height);
+    }
+
     bool success = m_receiver->ReceiveTexture(
         texture_id,
         GL_TEXTURE_2D,
-        false  // bInvert
+        (transfer & FrameTransfer::INVERT) != 0  // bInvert
     );
 
     unsigned int width = m_receiver->GetSenderWidth();
@@ -52,32 +89,320 @@ std::tuple<int, int> ReceiverWrapper::receive_texture(unsigned int texture_id) {
         std::chrono::duration<double, std::milli>(end - start).count();
 
     if (success) {
-        m_width = static_cast<int>(width);
-        m_height = static_cast<int>(height);
+        set_size(width, height);
+        m_format = FrameFormat::from_registry(m_receiver->GetSenderFormat());
         if (m_receiver->GetSenderName()) {
             m_active_sender = std::string(m_receiver->GetSenderName());
         }
+        record_receive(m_receiver->GetSenderFrame(), m_last_receive_time_ms);
+        read_metadata_locked(m_receiver->GetSenderFrame());
         m_initialized = true;
+        if (frame_new) {
+            *frame_new = m_receiver->IsFrameNew();
+        }
     } else {
         throw std::runtime_error("ReceiveTexture failed");
     }
 
-    m_last_receive = end;
+    return std::make_tuple(static_cast<int>(width), static_cast<int>(height));
+}
 
-    return std::make_tuple(m_width, m_height);
+std::tuple<int, int> ReceiverWrapper::receive_image(unsigned char* pixels, size_t size,
+                                                    unsigned int transfer,
+                                                    const FrameRegion& region,
+                                                    int out_width, int out_height,
+                                                    bool* frame_new) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (m_width == 0 || m_height == 0 || m_format == 0) {
+        query_sender_info_locked();
+    }
+    const int cached_width = m_width;
+    const int cached_height = m_height;
+    const unsigned long cached_format = m_format;
+    const FrameFormat* format = FrameFormat::find(cached_format);
+    if (!format) {
+        throw std::runtime_error("Unsupported sender pixel format " +
+                                 std::to_string(cached_format));
+    }
+    try {
+        FrameTransfer::check(transfer, *format, false);
+    } catch (const std::invalid_argument& e) {
+        throw std::runtime_error(e.what());  // Depends on the sender, like the size
+    }
+    if (!region.whole() || out_width != 0 || out_height != 0) {
+        const auto received = receive_region_locked(pixels, size, transfer, *format,
+                                                    region.within(cached_width, cached_height),
+                                                    out_width, out_height);
+        if (frame_new) {
+            *frame_new = m_receiver->IsFrameNew();
+        }
+        return received;
+    }
+    const size_t expected = format->frame_size(cached_width, cached_height);
+    if (expected == 0 || size != expected) {
+        throw std::runtime_error("Buffer of " + std::to_string(size) +
+                                 " bytes does not match sender size " +
+                                 std::to_string(cached_width) + "x" +
+                                 std::to_string(cached_height));
+    }
+
+    auto start = std::chrono::high_resolution_clock::now();
+
+    // Spout flips and the client format swaps channels as part of the copy
+    const bool invert = (transfer & FrameTransfer::INVERT) != 0;
+    bool success;
+    if (format->image_path) {
+        success = m_receiver->ReceiveImage(
+            pixels,
+            FrameTransfer::client_format(transfer, *format),
+            invert  // bInvert
+        );
+    } else {
+        const unsigned int texture = m_staging.prepare(*format, cached_width, cached_height);
+        success = m_receiver->ReceiveTexture(texture, GL_TEXTURE_2D, invert);
+    }
+
+    unsigned int width = m_receiver->GetSenderWidth();
+    unsigned int height = m_receiver->GetSenderHeight();
+
+    auto end = std::chrono::high_resolution_clock::now();
+    m_last_receive_time_ms =
+        std::chrono::duration<double, std::milli>(end - start).count();
+
+    if (!success) {
+        throw std::runtime_error("ReceiveImage failed");
+    }
+
+    // Spout skips the copy when the sender size changed; report it so the
+    // caller can reallocate rather than read a stale buffer
+    if (static_cast<int>(width) != cached_width || static_cast<int>(height) != cached_height) {
+        set_size(width, height);
+        throw std::runtime_error("Sender size changed to " +
+                                 std::to_string(width) + "x" +
+                                 std::to_string(height));
+    }
+    const unsigned long sender_format = FrameFormat::from_registry(m_receiver->GetSenderFormat());
+    if (sender_format != cached_format) {
+        m_format = sender_format;
+        throw std::runtime_error("Sender pixel format changed to " +
+                                 std::to_string(sender_format));
+    }
+    if (!format->image_path) {
+        m_staging.download(pixels, transfer);
+    }
+    FrameTransfer::convert_alpha(transfer, *format, pixels, pixels,
+                                 size / format->bytes_per_pixel);
+
+    if (m_receiver->GetSenderName()) {
+        m_active_sender = std::string(m_receiver->GetSenderName());
+    }
+    record_receive(m_receiver->GetSenderFrame(), m_last_receive_time_ms);
+    read_metadata_locked(m_receiver->GetSenderFrame());
+    m_initialized = true;
+    if (frame_new) {
+        *frame_new = m_receiver->IsFrameNew();
+    }
+
+    return std::make_tuple(cached_width, cached_height);
+}
+
+std::tuple<int, int> ReceiverWrapper::receive_region_locked(unsigned char* pixels, size_t size,
+                                                            unsigned int transfer,
+                                                            const FrameFormat& format,
+                                                            const FrameRegion& region,
+                                                            int out_width, int out_height) {
+    const int width = out_width != 0 ? out_width : region.width;
+    const int height = out_height != 0 ? out_height : region.height;
+    if (width <= 0 || height <= 0 || width > region.width || height > region.height) {
+        throw std::invalid_argument("Cannot scale a " + std::to_string(region.width) + "x" +
+                                    std::to_string(region.height) + " region to " +
+                                    std::to_string(width) + "x" + std::to_string(height) +
+                                    "; receives can only shrink frames");
+    }
+    const size_t expected = format.frame_size(width, height);
+    if (size != expected) {
+        throw std::runtime_error("Buffer of " + std::to_string(size) +
+                                 " bytes does not match the " + std::to_string(width) + "x" +
+                                 std::to_string(height) + " frame");
+    }
+
+    auto start = std::chrono::high_resolution_clock::now();
+
+    const unsigned long cached_format = m_format;
+    update_shared_locked();
+    if (m_format != cached_format) {
+        throw std::runtime_error("Sender pixel format changed to " +
+                                 std::to_string(m_format.load()));
+    }
+    const unsigned int texture = m_staging.prepare(format, width, height);
+    blit_region_locked(format, region, texture, width, height,
+                       (transfer & FrameTransfer::INVERT) != 0);
+    m_staging.download(pixels, transfer);
+    FrameTransfer::convert_alpha(transfer, format, pixels, pixels,
+                                 static_cast<size_t>(width) * height);
+
+    auto end = std::chrono::high_resolution_clock::now();
+    m_last_receive_time_ms =
+        std::chrono::duration<double, std::milli>(end - start).count();
+    record_receive(m_receiver->GetSenderFrame(), m_last_receive_time_ms);
+    read_metadata_locked(m_receiver->GetSenderFrame());
+    m_initialized = true;
+
+    return std::make_tuple(width, height);
+}
+
+void ReceiverWrapper::update_shared_locked() {
+    const int cached_width = m_width;
+    const int cached_height = m_height;
+    // Without a texture to copy into, ReceiveTexture() only connects and
+    // updates the shared texture
+    if (!m_receiver->ReceiveTexture()) {
+        throw std::runtime_error("ReceiveTexture failed");
+    }
+    const unsigned int width = m_receiver->GetSenderWidth();
+    const unsigned int height = m_receiver->GetSenderHeight();
+    m_format = FrameFormat::from_registry(m_receiver->GetSenderFormat());
+    if (m_receiver->GetSenderName()) {
+        m_active_sender = std::string(m_receiver->GetSenderName());
+    }
+    set_size(width, height);
+    if (cached_width != 0 && cached_height != 0 &&
+        (static_cast<int>(width) != cached_width || static_cast<int>(height) != cached_height)) {
+        throw std::runtime_error("Sender size changed to " +
+                                 std::to_string(width) + "x" +
+                                 std::to_string(height));
+    }
+}
+
+void ReceiverWrapper::blit_region_locked(const FrameFormat& format, const FrameRegion& region,
+                                         unsigned int target, int width, int height,
+                                         bool invert) {
+    if (!m_receiver->BindSharedTexture()) {
+        throw std::runtime_error("Cannot lock the shared texture");
+    }
+    try {
+        m_blitter.blit(format, m_receiver->GetSharedTextureID(), region, target, width, height,
+                       invert);
+    } catch (...) {
+        m_receiver->UnBindSharedTexture();
+        throw;
+    }
+    m_receiver->UnBindSharedTexture();
+}
+
+void ReceiverWrapper::set_size(unsigned int width, unsigned int height) {
+    const int old_width = m_width.exchange(static_cast<int>(width));
+    const int old_height = m_height.exchange(static_cast<int>(height));
+    // Zero means not connected yet (or another sender was selected)
+    if (old_width != 0 && old_height != 0 &&
+        (old_width != static_cast<int>(width) || old_height != static_cast<int>(height))) {
+        ++m_generation;
+    }
+}
+
+void ReceiverWrapper::record_receive(long frame, double latency_ms) {
+    const long previous = m_frame.exchange(frame);
+    // Spout numbers frames from 1 (0 if the sender does not count them)
+    if (previous > 0 && frame > previous + 1) {
+        m_stats.record_dropped(frame - previous - 1);
+    }
+    m_stats.record(FrameStats::Clock::now(), latency_ms);
+    m_stats_block.publish(m_stats.frames(), m_stats.dropped(), latency_ms, m_stats.fps(),
+                          m_width, m_height);
+}
+
+void ReceiverWrapper::read_metadata_locked(long frame) {
+    unsigned char record[FrameMetadata::SIZE];
+    const int size = m_receiver->ReadMemoryBuffer(
+        m_active_sender.c_str(), reinterpret_cast<char*>(record),
+        static_cast<int>(FrameMetadata::SIZE));
+    m_metadata = FrameMetadata::decode(record, size > 0 ? static_cast<size_t>(size) : 0);
+    if (m_metadata.frame == 0) {
+        m_metadata.frame = frame;  // Not a liru sender
+    }
+}
+
+FrameMetadata ReceiverWrapper::get_metadata() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_metadata;
 }
 
 bool ReceiverWrapper::is_updated() {
+    std::lock_guard<std::mutex> lock(m_mutex);
     return m_receiver->IsUpdated();
 }
 
+bool ReceiverWrapper::wait_for_frame(double timeout_ms) {
+    std::shared_ptr<Spout> sync;
+    std::string sender;
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        if (m_active_sender.empty() && !query_sender_info_locked()) {
+            throw std::runtime_error("No sender selected");
+        }
+        if (!m_sync) {
+            m_sync = std::make_shared<Spout>();
+            m_sync->EnableFrameSync(true);
+        }
+        sync = m_sync;
+        sender = m_active_sender;
+
+        // Open the sender's event under the lock, so concurrent waiters never
+        // race to open it; a frame signalled meanwhile is reported at once
+        if (sync->WaitFrameSync(sender.c_str(), 0)) {
+            return true;
+        }
+    }
+
+    DWORD timeout = WAIT_FOREVER;
+    if (timeout_ms >= 0.0) {
+        // Round up so a short timeout never becomes a non-blocking check
+        timeout = static_cast<DWORD>(std::ceil(timeout_ms));
+    }
+    // Wait without the lock so other threads can receive meanwhile. The event
+    // belongs to this wait's reference to the frame-sync object, which
+    // select_sender() and the destructor only drop, so it stays open until
+    // the wait returns
+    return sync->WaitFrameSync(sender.c_str(), timeout);
+}
+
+bool ReceiverWrapper::connect(double timeout_ms) {
+    const auto start = std::chrono::steady_clock::now();
+    while (true) {
+        {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            // Without a texture ReceiveTexture() only connects: it finds the
+            // sender and opens its shared texture, receiving nothing
+            if (m_receiver->ReceiveTexture() && m_receiver->IsConnected()) {
+                set_size(m_receiver->GetSenderWidth(), m_receiver->GetSenderHeight());
+                m_format = FrameFormat::from_registry(m_receiver->GetSenderFormat());
+                if (m_receiver->GetSenderName()) {
+                    m_active_sender = std::string(m_receiver->GetSenderName());
+                }
+                m_initialized = true;
+                return true;
+            }
+        }
+        const double elapsed_ms = std::chrono::duration<double, std::milli>(
+            std::chrono::steady_clock::now() - start).count();
+        if (timeout_ms >= 0.0 && elapsed_ms >= timeout_ms) {
+            return false;
+        }
+        // Retry without the lock so other threads can use the receiver
+        std::this_thread::sleep_for(CONNECT_RETRY);
+    }
+}
+
 void ReceiverWrapper::select_sender(const std::string& name) {
     if (name.empty()) {
         throw std::invalid_argument("Sender name cannot be empty");
     }
 
-    // Release current receiver
+    std::lock_guard<std::mutex> lock(m_mutex);
+
+    // Release current receiver; waits in progress keep the old sender's event
     m_receiver->ReleaseReceiver();
+    m_sync.reset();
     m_initialized = false;
 
     // Set new sender name (connection will happen on next receive_texture)
@@ -87,13 +412,16 @@ void ReceiverWrapper::select_sender(const std::string& name) {
     // Reset cached dimensions
     m_width = 0;
     m_height = 0;
+    m_format = 0;
 }
 
 std::vector<std::string> ReceiverWrapper::get_sender_list() {
+    std::lock_guard<std::mutex> lock(m_mutex);
     return m_receiver->GetSenderList();
 }
 
 std::string ReceiverWrapper::get_active_sender() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
     return m_active_sender;
 }
 
@@ -107,6 +435,44 @@ int ReceiverWrapper::get_height() const {
     return m_height;
 }
 
+unsigned long ReceiverWrapper::get_format() const {
+    return m_format;
+}
+
+long ReceiverWrapper::get_frame() const {
+    return m_frame;
+}
+
+long ReceiverWrapper::get_generation() const {
+    return m_generation;
+}
+
+FrameStatsSnapshot ReceiverWrapper::get_stats(double deadline_ms) const {
+    return m_stats.snapshot(deadline_ms);
+}
+
+void ReceiverWrapper::set_stats_block(unsigned char* block) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_stats_block.attach(block);
+}
+
+std::string ReceiverWrapper::get_tile_table() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (m_active_sender.empty()) {
+        throw std::runtime_error("No sender connected");
+    }
+    const int size = m_receiver->GetMemoryBufferSize(m_active_sender.c_str());
+    if (size <= static_cast<int>(FrameMetadata::SIZE + TileTracker::HEADER_SIZE)) {
+        return std::string();
+    }
+    std::string buffer(static_cast<std::size_t>(size), '\0');
+    const int read = m_receiver->ReadMemoryBuffer(m_active_sender.c_str(), buffer.data(), size);
+    if (read <= static_cast<int>(FrameMetadata::SIZE)) {
+        return std::string();
+    }
+    return buffer.substr(FrameMetadata::SIZE, static_cast<std::size_t>(read) - FrameMetadata::SIZE);
+}
+
 double ReceiverWrapper::get_last_receive_time_ms() const {
     return m_last_receive_time_ms;
 }
@@ -116,6 +482,11 @@ bool ReceiverWrapper::is_initialized() const {
 }
 
 bool ReceiverWrapper::query_sender_info() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return query_sender_info_locked();
+}
+
+bool ReceiverWrapper::query_sender_info_locked() {
     if (m_active_sender.empty()) {
         // No sender specified, get the active sender
         char name_buffer[256] = {0};
@@ -131,8 +502,8 @@ bool ReceiverWrapper::query_sender_info() {
     DWORD format = 0;
 
     if (m_receiver->GetSenderInfo(m_active_sender.c_str(), width, height, shareHandle, format)) {
-        m_width = static_cast<int>(width);
-        m_height = static_cast<int>(height);
+        set_size(width, height);
+        m_format = FrameFormat::from_registry(format);
         return true;
     }
 
@@ -11,12 +11,26 @@
 #include <memory>
 #include <tuple>
 #include <chrono>
+#include <cstddef>
+#include <atomic>
+#include <mutex>
+
+#include "frame_format.h"
+#include "frame_metadata.h"
+#include "frame_region.h"
+#include "frame_transfer.h"
+#include "frame_stats.h"
+#include "stats_block.h"
 
 // Forward declarations for Spout SDK
 class Spout;
 
 /**
  * C++ wrapper for Spout receiver with performance monitoring.
+ *
+ * Safe to share between threads: calls into Spout are serialized by a
+ * per-receiver mutex, and the cached size, frame number and latency are
+ * atomics the getters read without locking.
  */
 class ReceiverWrapper {
 public:
@@ -41,10 +55,59 @@ public:
      * Receive texture from Spout sender.
      *
      * @param texture_id OpenGL texture ID to receive into
-     * @return Tuple of (width, height) of received texture
-     * @throws std::runtime_error if receive fails
+     * @param transfer FrameTransfer flags; only INVERT, which Spout's blit
+     *                 applies while copying
+     * @param region Rectangle of the frame to copy into the corner of the
+     *               texture; whole by default. A region is blitted out of the
+     *               shared texture under its interop lock.
+     * @param frame_new Set to whether the sender published a frame since the
+     *                  last receive (IsFrameNew), if not null
+     * @return Tuple of (width, height) of received texture, the region's
+     *         size for a region
+     * @throws std::runtime_error if receive fails or, for a region, the
+     *         sender size changed
+     * @throws std::invalid_argument if the transfer flags cannot be applied
+     *         to a texture or the region is outside the frame
+     */
+    std::tuple<int, int> receive_texture(unsigned int texture_id, unsigned int transfer = 0,
+                                         const FrameRegion& region = FrameRegion{},
+                                         bool* frame_new = nullptr);
+
+    /**
+     * Receive into CPU pixels via Spout's image path (ReceiveImage), or for
+     * formats it does not take, through a staging texture read back with
+     * glGetTexImage.
+     *
+     * Frames arrive in the sender's pixel format. Does not touch Python
+     * objects, so callers may release the GIL. Nothing is copied if the
+     * buffer does not match the sender size and format.
+     *
+     * @param pixels Destination in the sender's format, rows top to bottom
+     * @param size Destination size in bytes
+     * @param transfer FrameTransfer flags, applied by the read-back; alpha
+     *                 is converted in place afterwards
+     * @param region Rectangle of the frame to receive; whole by default
+     * @param out_width Width to shrink the region to, 0 to keep its size
+     * @param out_height Height to shrink the region to, 0 to keep its size
+     * @param frame_new Set to whether the sender published a frame since the
+     *                  last receive (IsFrameNew), if not null
+     *
+     * A region or a smaller size is cropped and shrunk on the GPU by
+     * RegionBlitter, so only out_width x out_height pixels are read back.
+     *
+     * @return Tuple of (width, height) of received frame, the shrunk size
+     *         for a region or scale
+     * @throws std::runtime_error if receive fails, the sender size changed,
+     *         liru cannot carry the sender's format or the transfer flags
+     *         do not fit it
+     * @throws std::invalid_argument if the region is outside the frame or
+     *         the size is larger than the region
      */
-    std::tuple<int, int> receive_texture(unsigned int texture_id);
+    std::tuple<int, int> receive_image(unsigned char* pixels, size_t size,
+                                       unsigned int transfer = 0,
+                                       const FrameRegion& region = FrameRegion{},
+                                       int out_width = 0, int out_height = 0,
+                                       bool* frame_new = nullptr);
 
     /**
      * Check if new frame is available.
@@ -53,6 +116,34 @@ public:
      */
     bool is_updated();
 
+    /**
+     * Block until the sender signals a new frame or the timeout expires.
+     *
+     * Waits on Spout's frame-sync event, which the sender signals after each
+     * send once it has called enable_frame_sync(). The event is opened under
+     * the lock and waited on without it, through a reference select_sender()
+     * cannot close. Does not touch Python objects, so callers may release the
+     * GIL.
+     *
+     * @param timeout_ms Timeout in milliseconds, negative to wait forever
+     * @return true if a frame was signalled, false on timeout
+     * @throws std::runtime_error if no sender is selected
+     */
+    bool wait_for_frame(double timeout_ms);
+
+    /**
+     * Connect to the sender ahead of the first receive.
+     *
+     * Retries until the sender exists, then opens its shared texture and
+     * sets up the OpenGL/DirectX interop, which the first receive would
+     * otherwise do. Needs a current OpenGL context, like receive_texture().
+     * Does not touch Python objects, so callers may release the GIL.
+     *
+     * @param timeout_ms Timeout in milliseconds, negative to wait forever
+     * @return true once connected, false if the sender did not appear in time
+     */
+    bool connect(double timeout_ms);
+
     /**
      * Connect to a different sender.
      *
@@ -75,6 +166,34 @@ public:
      */
     std::string get_active_sender() const;
 
+    /**
+     * Get windowed receive statistics.
+     *
+     * Frames the sender published between two receives count as dropped.
+     *
+     * @param deadline_ms Target frame period for counting deadline misses,
+     *                    zero or less for none
+     * @return Statistics of the last FrameStats::WINDOW receives
+     */
+    FrameStatsSnapshot get_stats(double deadline_ms) const;
+
+    /**
+     * Publish counters into a shared stats block after every receive.
+     *
+     * @param block Writable block of StatsBlockWriter::SIZE bytes that stays
+     *              mapped until the next call, or nullptr to stop
+     */
+    void set_stats_block(unsigned char* block);
+
+    /**
+     * Read the tile table the sender publishes after its metadata record.
+     *
+     * @return Encoded table (layout in liru/tiles.py), empty if the sender
+     *         does not track dirty tiles
+     * @throws std::runtime_error if no sender is connected
+     */
+    std::string get_tile_table();
+
     /**
      * Get texture width.
      *
@@ -89,6 +208,43 @@ public:
      */
     int get_height() const;
 
+    /**
+     * Get the sender's pixel format.
+     *
+     * Registry formats of DirectX 9 and older senders are reported as BGRA8.
+     *
+     * @return DXGI_FORMAT code (0 if not connected)
+     */
+    unsigned long get_format() const;
+
+    /**
+     * Get sender frame number of the last received frame.
+     *
+     * @return Frame number (0 if the sender does not count frames)
+     */
+    long get_frame() const;
+
+    /**
+     * Get the number of sender size changes this receiver has seen.
+     *
+     * Spout keeps no resize counter of its own, so this counts changes of
+     * the sender size between receives or registry queries. Selecting
+     * another sender does not count.
+     *
+     * @return Generation, 0 until the sender size changes
+     */
+    long get_generation() const;
+
+    /**
+     * Get the metadata of the last received frame.
+     *
+     * Read from the sender's Spout memory buffer after each receive. Senders
+     * that write none report the Spout frame number and no timestamp.
+     *
+     * @return Frame number, capture timestamp and payload
+     */
+    FrameMetadata get_metadata() const;
+
     /**
      * Get last receive latency in milliseconds.
      *
@@ -112,13 +268,72 @@ public:
     bool query_sender_info();
 
 private:
+    /**
+     * query_sender_info() with m_mutex already held.
+     */
+    bool query_sender_info_locked();
+
+    /**
+     * Cache the sender size, counting a change of a known size as a new
+     * generation.
+     */
+    void set_size(unsigned int width, unsigned int height);
+
+    /**
+     * Record a received frame and count frames skipped since the last one.
+     */
+    void record_receive(long frame, double latency_ms);
+
+    /**
+     * Read the sender's metadata record after a receive. Called with
+     * m_mutex held.
+     */
+    void read_metadata_locked(long frame);
+
+    /**
+     * Connect to or update the shared texture with Spout's ReceiveTexture(),
+     * without copying it anywhere. Called with m_mutex held.
+     *
+     * @throws std::runtime_error if receive fails or a known sender size
+     *         changed
+     */
+    void update_shared_locked();
+
+    /**
+     * receive_image() of a region or a shrunk frame, with m_mutex held.
+     */
+    std::tuple<int, int> receive_region_locked(unsigned char* pixels, size_t size,
+                                               unsigned int transfer,
+                                               const FrameFormat& format,
+                                               const FrameRegion& region,
+                                               int out_width, int out_height);
+
+    /**
+     * Blit a region of the shared texture into a target texture under its
+     * interop lock. Called with m_mutex held.
+     */
+    void blit_region_locked(const FrameFormat& format, const FrameRegion& region,
+                            unsigned int target, int width, int height, bool invert);
+
+    // Guards m_receiver, m_sync and m_active_sender
+    mutable std::mutex m_mutex;
     std::unique_ptr<Spout> m_receiver;
+    // Frame-sync waits use their own Spout object, created on the first wait,
+    // so releasing m_receiver never closes the event under a waiter
+    std::shared_ptr<Spout> m_sync;
     std::string m_active_sender;
-    int m_width;
-    int m_height;
-    bool m_initialized;
+    std::atomic<int> m_width;
+    std::atomic<int> m_height;
+    std::atomic<unsigned long> m_format;
+    std::atomic<long> m_frame;
+    std::atomic<long> m_generation;
+    std::atomic<bool> m_initialized;
+    FrameMetadata m_metadata;  // Guarded by m_mutex
+    StagingTexture m_staging;  // Receives frames ReceiveImage cannot take; guarded by m_mutex
+    RegionBlitter m_blitter;  // Crops and shrinks regions; guarded by m_mutex
 
-    // Performance tracking
-    std::chrono::high_resolution_clock::time_point m_last_receive;
-    double m_last_receive_time_ms;
+    // Performance tracking; FrameStats has its own lock
+    std::atomic<double> m_last_receive_time_ms;
+    FrameStats m_stats;
+    StatsBlockWriter m_stats_block;  // Guarded by m_mutex
 };
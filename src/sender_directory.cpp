@@ -0,0 +1,32 @@
+/**
+ * Sender registry query implementation
+ */
+
+#include "sender_directory.h"
+#include "Spout.h"
+
+#include <mutex>
+
+std::vector<SenderInfo> query_senders() {
+    // The registry is shared memory; one reader object serves every caller
+    static std::mutex mutex;
+    static Spout registry;
+    std::lock_guard<std::mutex> lock(mutex);
+
+    std::vector<SenderInfo> senders;
+    for (const std::string& name : registry.GetSenderList()) {
+        unsigned int width = 0, height = 0;
+        HANDLE share_handle = nullptr;
+        DWORD format = 0;
+        if (!registry.GetSenderInfo(name.c_str(), width, height, share_handle, format)) {
+            continue;  // Closed since the list was read
+        }
+        SenderInfo info;
+        info.name = name;
+        info.width = static_cast<int>(width);
+        info.height = static_cast<int>(height);
+        info.format = static_cast<unsigned>(format);
+        senders.push_back(std::move(info));
+    }
+    return senders;
+}
@@ -0,0 +1,33 @@
+/**
+ * Sender registry queries
+ *
+ * Lists Spout senders and their registry information without creating a
+ * receiver, for liru.SenderDirectory.
+ */
+
+#pragma once
+
+#include <string>
+#include <vector>
+
+/**
+ * Registry information of one sender.
+ */
+struct SenderInfo {
+    std::string name;       ///< Sender name
+    int width = 0;          ///< Texture width in pixels
+    int height = 0;         ///< Texture height in pixels
+    unsigned format = 0;    ///< DXGI_FORMAT code
+    long owner_pid = 0;     ///< Owning process, 0 (Spout does not record it)
+    long frame = 0;         ///< Frame number, 0 (only known to receivers)
+};
+
+/**
+ * List every sender in the Spout registry with its size and format.
+ *
+ * Uses one process-wide Spout object under a mutex; does not touch Python
+ * objects, so callers may release the GIL.
+ *
+ * @return One entry per sender whose information could be read
+ */
+std::vector<SenderInfo> query_senders();
@@ -0,0 +1,74 @@
+/**
+ * Batched send implementation
+ */
+
+#include "sender_group.h"
+
+#include <chrono>
+#include <exception>
+#include <stdexcept>
+#include <string>
+
+#include "frame_metadata.h"
+
+SenderGroup::SenderGroup(std::vector<SenderWrapper*> senders) : m_senders(std::move(senders)) {
+    if (m_senders.empty()) {
+        throw std::invalid_argument("Sender group cannot be empty");
+    }
+    for (const SenderWrapper* sender : m_senders) {
+        if (sender == nullptr) {
+            throw std::invalid_argument("Sender group member cannot be null");
+        }
+    }
+}
+
+SendBatchResult SenderGroup::send(const std::vector<SendItem>& items, long long timestamp_ns,
+                                  const std::string& payload) {
+    if (items.size() != m_senders.size()) {
+        throw std::invalid_argument("Expected " + std::to_string(m_senders.size()) +
+                                    " frames, got " + std::to_string(items.size()));
+    }
+    if (payload.size() > FrameMetadata::MAX_PAYLOAD) {
+        throw std::invalid_argument("Payload is " + std::to_string(payload.size()) +
+                                    " bytes, at most " +
+                                    std::to_string(FrameMetadata::MAX_PAYLOAD) + " allowed");
+    }
+
+    using Clock = std::chrono::steady_clock;
+    const Clock::time_point batch_start = Clock::now();
+    // Every output of the batch shows the same moment
+    const long long timestamp = timestamp_ns > 0 ? timestamp_ns : FrameMetadata::now_ns();
+
+    SendBatchResult result;
+    result.sent.assign((m_senders.size() + 7) / 8, '\0');
+    result.member_ms.assign(m_senders.size(), 0.0);
+    for (size_t i = 0; i < m_senders.size(); ++i) {
+        SenderWrapper& sender = *m_senders[i];
+        const SendItem& item = items[i];
+        if (item.texture_id == 0 && item.pixels == nullptr) {
+            continue;
+        }
+        const Clock::time_point start = Clock::now();
+        bool sent = false;
+        try {
+            if (item.pixels != nullptr) {
+                sent = sender.send_image(item.pixels, item.size, timestamp, payload);
+            } else {
+                sent = sender.send_texture(item.texture_id, timestamp, payload);
+            }
+        } catch (const std::exception&) {
+            // Released, wrong size or failed; reported through the bitmask
+        }
+        result.member_ms[i] =
+            std::chrono::duration<double, std::milli>(Clock::now() - start).count();
+        if (sent) {
+            result.sent[i / 8] = static_cast<char>(result.sent[i / 8] | (1 << (i % 8)));
+        }
+    }
+    result.total_ms = std::chrono::duration<double, std::milli>(Clock::now() - batch_start).count();
+    return result;
+}
+
+size_t SenderGroup::size() const {
+    return m_senders.size();
+}
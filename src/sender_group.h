@@ -0,0 +1,76 @@
+/**
+ * Batched send to several senders
+ *
+ * Publishes one frame on each of a fixed set of senders in a single call,
+ * for liru.SenderGroup.
+ */
+
+#pragma once
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+#include "sender_wrapper.h"
+
+/**
+ * Frame for one member of a batch: a texture, a CPU buffer, or neither to
+ * skip the member.
+ */
+struct SendItem {
+    unsigned int texture_id = 0;           ///< OpenGL texture ID, 0 if pixels is used
+    const unsigned char* pixels = nullptr; ///< Pixels in the member's format, or nullptr
+    size_t size = 0;                       ///< Size of pixels in bytes
+};
+
+/**
+ * Outcome of SenderGroup::send().
+ */
+struct SendBatchResult {
+    std::string sent;               ///< Bitmask of published members, little-endian bytes
+    std::vector<double> member_ms;  ///< Time each member's send took (0 if skipped)
+    double total_ms = 0.0;          ///< Time the whole batch took
+};
+
+/**
+ * Fixed set of senders published together.
+ *
+ * Does not own the senders; the bindings keep them alive for the lifetime
+ * of the group. Nothing here touches Python objects, so callers may release
+ * the GIL for a whole batch. A member that fails does not stop the others.
+ */
+class SenderGroup {
+public:
+    /**
+     * Create a group.
+     *
+     * @param senders Members, in the order batches refer to them
+     * @throws std::invalid_argument if senders is empty or holds nullptr
+     */
+    explicit SenderGroup(std::vector<SenderWrapper*> senders);
+
+    /**
+     * Send one frame per member.
+     *
+     * Every frame of the batch carries the same timestamp and payload.
+     *
+     * @param items One item per member, in member order
+     * @param timestamp_ns Capture time of the batch, 0 to stamp it at the call
+     * @param payload Metadata payload for every frame
+     * @return Which members published their frame, and the timings
+     * @throws std::invalid_argument if there is not one item per member or
+     *         the payload is too long
+     */
+    SendBatchResult send(const std::vector<SendItem>& items, long long timestamp_ns,
+                         const std::string& payload);
+
+    /**
+     * Get the number of members.
+     *
+     * @return Member count
+     */
+    size_t size() const;
+
+private:
+    std::vector<SenderWrapper*> m_senders;
+};
@@ -6,9 +6,25 @@
 #include "Spout.h"
 #include <stdexcept>
 
-SenderWrapper::SenderWrapper(const std::string& name, int width, int height)
-    : m_name(name), m_width(width), m_height(height),
-      m_fps(0.0), m_last_send_time_ms(0.0), m_frame_count(0) {
+namespace {
+
+void check_payload(const std::string& payload) {
+    if (payload.size() > FrameMetadata::MAX_PAYLOAD) {
+        throw std::invalid_argument("Payload is " + std::to_string(payload.size()) +
+                                    " bytes, at most " +
+                                    std::to_string(FrameMetadata::MAX_PAYLOAD) + " allowed");
+    }
+}
+
+}  // namespace
+
+SenderWrapper::SenderWrapper(const std::string& name, int width, int height, int slots,
+                             unsigned int format, bool dirty_tiles)
+    : m_name(name), m_width(width), m_height(height), m_slots(slots),
+      m_format(FrameFormat::get(format)), m_generation(0),
+      m_frame_sync(false),
+      m_frame_number(0), m_metadata_buffer(false), m_dirty_tiles(dirty_tiles),
+      m_tile_capacity(0), m_last_send_time_ms(0.0) {
 
     if (name.empty()) {
         throw std::runtime_error("Sender name cannot be empty");
@@ -18,63 +34,260 @@ SenderWrapper::SenderWrapper(const std::string& name, int width, int height)
                                  std::to_string(width) + "x" +
                                  std::to_string(height));
     }
+    if (slots != 1) {
+        // Receivers read the one shared texture; there is no ring to buffer in
+        throw std::invalid_argument("Slot count must be 1 on the Spout backend, got " +
+                                    std::to_string(slots));
+    }
 
     m_sender = std::make_unique<Spout>();
     m_sender->SetSenderName(name.c_str());
-    // Sender will be initialized on first SendTexture call
+    // Receivers read the format from the registry and receive in it
+    m_sender->SetSenderFormat(m_format.dxgi);
+    // Per-frame metadata, and the tile table after it, travel in a memory
+    // buffer named after the sender. Its size is fixed, so the table has room
+    // for the tiles of this size and resize() makes tiles larger if needed.
+    std::size_t record_size = FrameMetadata::SIZE;
+    if (dirty_tiles) {
+        m_tile_capacity = TileTracker::tiles(width, height);
+        m_tiles.reset(width, height, m_format.bytes_per_pixel, m_tile_capacity);
+        record_size += TileTracker::table_size(m_tile_capacity);
+    }
+    m_record.resize(record_size);
+    m_metadata_buffer =
+        m_sender->CreateMemoryBuffer(name.c_str(), static_cast<int>(record_size));
+    // Sender will be initialized by warmup() or on the first send
 }
 
 SenderWrapper::~SenderWrapper() {
     release();
 }
 
-bool SenderWrapper::send_texture(unsigned int texture_id) {
+bool SenderWrapper::send_texture(unsigned int texture_id, long long timestamp_ns,
+                                 const std::string& payload, unsigned int transfer) {
     if (texture_id == 0) {
         throw std::invalid_argument("Invalid texture ID: 0");
     }
+    check_payload(payload);
+    FrameTransfer::check(transfer, m_format, true);
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_sender) {
+        throw std::runtime_error("Sender has been released");
+    }
 
     auto start = std::chrono::high_resolution_clock::now();
+    if (m_dirty_tiles) {
+        m_tiles.mark_all(m_frame_number + 1);  // Not read back, so not hashed
+    }
+    write_metadata(timestamp_ns, payload);
 
     bool success = m_sender->SendTexture(
         texture_id,
         GL_TEXTURE_2D,
         m_width,
         m_height,
-        false,  // bInvert
-        0       // HostFBO
+        (transfer & FrameTransfer::INVERT) != 0,  // bInvert
+        0                                         // HostFBO
     );
 
-    auto end = std::chrono::high_resolution_clock::now();
-    m_last_send_time_ms =
-        std::chrono::duration<double, std::milli>(end - start).count();
-
-    // Update FPS (simple rolling average)
-    m_frame_count++;
-    if (m_frame_count > 0) {
-        auto time_since_start =
-            std::chrono::duration<double>(end - m_last_send).count();
-        if (time_since_start > 0.0) {
-            m_fps = 1.0 / time_since_start;
-        }
-    }
-    m_last_send = end;
+    record_send(start, std::chrono::high_resolution_clock::now());
 
     if (!success) {
         throw std::runtime_error("SendTexture failed");
     }
+    ++m_frame_number;
+    signal_frame();
+
+    return true;
+}
+
+bool SenderWrapper::send_image(const unsigned char* pixels, size_t size,
+                               long long timestamp_ns, const std::string& payload,
+                               unsigned int transfer) {
+    check_payload(payload);
+    FrameTransfer::check(transfer, m_format, false);
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_sender) {
+        throw std::runtime_error("Sender has been released");
+    }
+    const size_t expected = m_format.frame_size(m_width, m_height);
+    if (size != expected) {
+        throw std::invalid_argument("Frame buffer is " + std::to_string(size) +
+                                    " bytes, expected " + std::to_string(expected));
+    }
+
+    auto start = std::chrono::high_resolution_clock::now();
+
+    if (transfer & FrameTransfer::ALPHA) {
+        m_scratch.resize(size);
+        FrameTransfer::convert_alpha(transfer, m_format, pixels, m_scratch.data(),
+                                     size / m_format.bytes_per_pixel);
+        pixels = m_scratch.data();
+    }
+    // Spout flips and the client format swaps channels as part of the upload
+    const bool invert = (transfer & FrameTransfer::INVERT) != 0;
+    if (m_dirty_tiles) {
+        // A channel swap changes a tile exactly when the unswapped one changes
+        m_tiles.update(pixels, m_frame_number + 1, invert);
+    }
+    write_metadata(timestamp_ns, payload);
+    bool success;
+    if (m_format.image_path) {
+        success = m_sender->SendImage(
+            pixels,
+            m_width,
+            m_height,
+            FrameTransfer::client_format(transfer, m_format),
+            invert,  // bInvert
+            0        // HostFBO
+        );
+    } else {
+        const unsigned int texture =
+            m_staging.upload(m_format, pixels, m_width, m_height, transfer);
+        success = m_sender->SendTexture(texture, GL_TEXTURE_2D, m_width, m_height, invert, 0);
+    }
+
+    record_send(start, std::chrono::high_resolution_clock::now());
+
+    if (!success) {
+        throw std::runtime_error("SendImage failed");
+    }
+    ++m_frame_number;
+    signal_frame();
 
     return true;
 }
 
+void SenderWrapper::warmup() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_sender) {
+        throw std::runtime_error("Sender has been released");
+    }
+    if (m_sender->IsInitialized()) {
+        return;
+    }
+    if (!m_sender->CreateSender(m_name.c_str(), m_width, m_height, m_format.dxgi)) {
+        throw std::runtime_error("CreateSender failed");
+    }
+}
+
+void SenderWrapper::resize(int width, int height) {
+    if (width <= 0 || height <= 0) {
+        throw std::runtime_error("Invalid dimensions: " +
+                                 std::to_string(width) + "x" +
+                                 std::to_string(height));
+    }
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_sender) {
+        throw std::runtime_error("Sender has been released");
+    }
+    if (width == m_width && height == m_height) {
+        return;
+    }
+    // Reallocates the shared texture and updates the registry entry that
+    // receivers read their size from; otherwise SendTexture() creates it
+    if (m_sender->IsInitialized() &&
+        !m_sender->UpdateSender(m_name.c_str(), width, height)) {
+        throw std::runtime_error("UpdateSender failed");
+    }
+    m_width = width;
+    m_height = height;
+    if (m_dirty_tiles) {
+        m_tiles.reset(width, height, m_format.bytes_per_pixel, m_tile_capacity);
+    }
+    ++m_generation;
+}
+
+long SenderWrapper::get_generation() const {
+    return m_generation;
+}
+
+void SenderWrapper::record_send(std::chrono::high_resolution_clock::time_point start,
+                                std::chrono::high_resolution_clock::time_point end) {
+    const double latency_ms = std::chrono::duration<double, std::milli>(end - start).count();
+    m_last_send_time_ms = latency_ms;
+    m_stats.record(FrameStats::Clock::now(), latency_ms);
+    m_stats_block.publish(m_stats.frames(), m_stats.dropped(), latency_ms, m_stats.fps(),
+                          m_width, m_height);
+}
+
+void SenderWrapper::write_metadata(long long timestamp_ns, const std::string& payload) {
+    if (!m_metadata_buffer) {
+        return;
+    }
+    FrameMetadata metadata;
+    metadata.frame = m_frame_number + 1;
+    metadata.timestamp_ns = timestamp_ns ? timestamp_ns : FrameMetadata::now_ns();
+    metadata.payload = payload;
+    metadata.encode(m_record.data());
+    std::size_t size = FrameMetadata::SIZE;
+    if (m_dirty_tiles) {
+        m_tiles.encode(m_record.data() + size);
+        size += m_tiles.size();
+    }
+    m_sender->WriteMemoryBuffer(m_name.c_str(), reinterpret_cast<const char*>(m_record.data()),
+                                static_cast<int>(size));
+}
+
+std::string SenderWrapper::get_tile_table() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_dirty_tiles) {
+        return std::string();
+    }
+    std::string table(m_tiles.size(), '\0');
+    m_tiles.encode(reinterpret_cast<unsigned char*>(table.data()));
+    return table;
+}
+
+void SenderWrapper::enable_frame_sync(bool enable) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (!m_sender) {
+        throw std::runtime_error("Sender has been released");
+    }
+    m_sender->EnableFrameSync(enable);
+    m_frame_sync = enable;
+}
+
+bool SenderWrapper::is_frame_sync_enabled() const {
+    return m_frame_sync;
+}
+
+void SenderWrapper::signal_frame() {
+    if (m_frame_sync) {
+        m_sender->SetFrameSync(m_name.c_str());
+    }
+}
+
 void SenderWrapper::release() {
+    std::lock_guard<std::mutex> lock(m_mutex);
     if (m_sender) {
+        if (m_frame_sync) {
+            m_sender->CloseFrameSync();
+        }
+        if (m_metadata_buffer) {
+            m_sender->DeleteMemoryBuffer();
+        }
+        m_staging.release();
+        m_scratch = std::vector<unsigned char>();
         m_sender->ReleaseSender();
         m_sender.reset();
     }
 }
 
 double SenderWrapper::get_fps() const {
-    return m_fps;
+    return m_stats.fps();
+}
+
+FrameStatsSnapshot SenderWrapper::get_stats(double deadline_ms) const {
+    return m_stats.snapshot(deadline_ms);
+}
+
+void SenderWrapper::set_stats_block(unsigned char* block) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_stats_block.attach(block);
 }
 
 double SenderWrapper::get_last_send_time_ms() const {
@@ -85,6 +298,10 @@ std::string SenderWrapper::get_name() const {
     return m_name;
 }
 
+int SenderWrapper::get_slots() const {
+    return m_slots;
+}
+
 int SenderWrapper::get_width() const {
     return m_width;
 }
@@ -92,3 +309,7 @@ int SenderWrapper::get_width() const {
 int SenderWrapper::get_height() const {
     return m_height;
 }
+
+unsigned int SenderWrapper::get_format() const {
+    return m_format.dxgi;
+}
@@ -7,14 +7,29 @@
 #pragma once
 
 #include <string>
+#include <vector>
 #include <memory>
 #include <chrono>
+#include <atomic>
+#include <cstddef>
+#include <mutex>
+
+#include "frame_format.h"
+#include "frame_metadata.h"
+#include "frame_transfer.h"
+#include "frame_stats.h"
+#include "stats_block.h"
+#include "tile_tracker.h"
 
 // Forward declarations for Spout SDK
 class Spout;
 
 /**
  * C++ wrapper for Spout sender with performance monitoring.
+ *
+ * Safe to share between threads: sends, frame-sync changes and release()
+ * are serialized by a per-sender mutex, so release() waits for an in-flight
+ * send, and the statistics getters read atomics without locking.
  */
 class SenderWrapper {
 public:
@@ -24,9 +39,18 @@ public:
      * @param name Unique sender name (visible to receivers)
      * @param width Texture width in pixels
      * @param height Texture height in pixels
+     * @param slots Number of buffered frames; Spout shares a single
+     *              texture, so only 1 is supported
+     * @param format Pixel format of the shared texture and of send_image()
+     *               frames, a DXGI_FORMAT code (see frame_format.h)
+     * @param dirty_tiles Hash send_image() frames in tiles and publish the
+     *                    tile table after the metadata record
      * @throws std::runtime_error if sender creation fails
+     * @throws std::invalid_argument if slots is not 1 or the format is not
+     *         supported
      */
-    SenderWrapper(const std::string& name, int width, int height);
+    SenderWrapper(const std::string& name, int width, int height, int slots = 1,
+                  unsigned int format = FrameFormat::RGBA8, bool dirty_tiles = false);
 
     /**
      * Destructor - releases Spout sender resources.
@@ -40,24 +64,139 @@ public:
     /**
      * Send OpenGL texture via Spout.
      *
+     * The frame's metadata record is written to the sender's Spout memory
+     * buffer just before the texture.
+     *
      * @param texture_id OpenGL texture ID
+     * @param timestamp_ns Capture time on the steady clock, 0 for now
+     * @param payload User bytes for receivers, at most FrameMetadata::MAX_PAYLOAD
+     * @param transfer FrameTransfer flags; only INVERT, which Spout's blit
+     *                 applies while copying
+     * @return true if send succeeded
+     * @throws std::runtime_error if send fails or the sender was released
+     * @throws std::invalid_argument if the payload is too long or the
+     *         transfer flags cannot be applied to a texture
+     */
+    bool send_texture(unsigned int texture_id, long long timestamp_ns = 0,
+                      const std::string& payload = "", unsigned int transfer = 0);
+
+    /**
+     * Send CPU pixels via Spout's image path (SendImage), or for formats it
+     * does not take, through a staging texture (SendTexture).
+     *
+     * Does not touch Python objects, so callers may release the GIL.
+     *
+     * @param pixels Pixels in the sender's format, rows top to bottom
+     * @param size Size of pixels in bytes; checked against the sender size
+     *             under the lock, so a concurrent resize() cannot overrun it
+     * @param timestamp_ns Capture time on the steady clock, 0 for now
+     * @param payload User bytes for receivers, at most FrameMetadata::MAX_PAYLOAD
+     * @param transfer FrameTransfer flags, applied by the upload; alpha
+     *                 conversion goes through a scratch frame first
      * @return true if send succeeded
      * @throws std::runtime_error if send fails
+     * @throws std::invalid_argument if size is not one frame of the sender's
+     *         size and format, the payload is too long or the transfer
+     *         flags do not fit the format
+     */
+    bool send_image(const unsigned char* pixels, size_t size, long long timestamp_ns = 0,
+                    const std::string& payload = "", unsigned int transfer = 0);
+
+    /**
+     * Create the Spout sender ahead of the first frame.
+     *
+     * Registers the sender and allocates its shared texture and the
+     * OpenGL/DirectX interop, which SendTexture() and SendImage() otherwise
+     * do on the first send, without publishing a frame. Needs a current
+     * OpenGL context, like the sends. Does nothing if already created.
+     *
+     * @throws std::runtime_error if creation fails or the sender was released
+     */
+    void warmup();
+
+    /**
+     * Change the frame size, keeping the sender and its name.
+     *
+     * Resizes the shared texture at once if the sender was created
+     * (warmup() or a send), otherwise the next send creates it at the new
+     * size. Needs a current OpenGL context, like the sends.
+     *
+     * @param width New width in pixels
+     * @param height New height in pixels
+     * @throws std::runtime_error if the dimensions are invalid, the update
+     *         fails or the sender was released
+     */
+    void resize(int width, int height);
+
+    /**
+     * Get the number of resizes since creation.
+     *
+     * @return Generation, 0 before the first resize
+     */
+    long get_generation() const;
+
+    /**
+     * Signal receivers waiting in wait_for_frame() after every send.
+     *
+     * Uses Spout's frame-sync event named after the sender.
+     *
+     * @param enable true to signal each frame, false to stop
+     */
+    void enable_frame_sync(bool enable = true);
+
+    /**
+     * Check whether frame sync is enabled.
+     *
+     * @return true if every send signals waiting receivers
      */
-    bool send_texture(unsigned int texture_id);
+    bool is_frame_sync_enabled() const;
+
+    /**
+     * Get a copy of the tile table.
+     *
+     * @return Encoded table (layout in liru/tiles.py), empty if the sender
+     *         does not track dirty tiles
+     */
+    std::string get_tile_table();
 
     /**
      * Release sender resources.
+     *
+     * Waits for a send running on another thread; later sends throw.
      */
     void release();
 
     /**
-     * Get current frames per second (rolling average).
+     * Get number of buffered frames.
+     *
+     * @return Slot count
+     */
+    int get_slots() const;
+
+    /**
+     * Get frames per second over the last FrameStats::WINDOW sends.
      *
      * @return FPS as double
      */
     double get_fps() const;
 
+    /**
+     * Get windowed send statistics.
+     *
+     * @param deadline_ms Target frame period for counting deadline misses,
+     *                    zero or less for none
+     * @return Statistics of the last FrameStats::WINDOW sends
+     */
+    FrameStatsSnapshot get_stats(double deadline_ms) const;
+
+    /**
+     * Publish counters into a shared stats block after every send.
+     *
+     * @param block Writable block of StatsBlockWriter::SIZE bytes that stays
+     *              mapped until the next call, or nullptr to stop
+     */
+    void set_stats_block(unsigned char* block);
+
     /**
      * Get last send latency in milliseconds.
      *
@@ -86,15 +225,54 @@ public:
      */
     int get_height() const;
 
+    /**
+     * Get the pixel format.
+     *
+     * @return DXGI_FORMAT code
+     */
+    unsigned int get_format() const;
+
 private:
+    /**
+     * Update latency and FPS after a send. Called with m_mutex held.
+     */
+    void record_send(std::chrono::high_resolution_clock::time_point start,
+                     std::chrono::high_resolution_clock::time_point end);
+
+    /**
+     * Signal the frame-sync event if frame sync is enabled. Called with
+     * m_mutex held.
+     */
+    void signal_frame();
+
+    /**
+     * Write the metadata of the next frame, and the tile table if tiles are
+     * tracked, to the Spout memory buffer. Called with m_mutex held, before
+     * the frame is sent.
+     */
+    void write_metadata(long long timestamp_ns, const std::string& payload);
+
+    // Guards m_sender and everything a send writes
+    std::mutex m_mutex;
     std::unique_ptr<Spout> m_sender;
     std::string m_name;
-    int m_width;
-    int m_height;
-
-    // Performance tracking
-    std::chrono::high_resolution_clock::time_point m_last_send;
-    double m_fps;
-    double m_last_send_time_ms;
-    int m_frame_count;
+    std::atomic<int> m_width;   // Written with m_mutex held
+    std::atomic<int> m_height;  // Written with m_mutex held
+    int m_slots;
+    const FrameFormat& m_format;
+    StagingTexture m_staging;  // Uploads send_image() frames Spout cannot take; guarded by m_mutex
+    std::vector<unsigned char> m_scratch;  // Alpha-converted send_image() frame; guarded by m_mutex
+    std::atomic<long> m_generation;
+    std::atomic<bool> m_frame_sync;
+    long long m_frame_number;  // Frames sent; guarded by m_mutex
+    bool m_metadata_buffer;    // Whether the Spout memory buffer exists
+    bool m_dirty_tiles;
+    std::size_t m_tile_capacity;  // Tiles the memory buffer has room for
+    TileTracker m_tiles;  // Guarded by m_mutex
+    std::vector<unsigned char> m_record;  // Metadata record and tile table; guarded by m_mutex
+
+    // Performance tracking; FrameStats has its own lock
+    std::atomic<double> m_last_send_time_ms;
+    FrameStats m_stats;
+    StatsBlockWriter m_stats_block;  // Guarded by m_mutex
 };
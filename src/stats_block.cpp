@@ -0,0 +1,71 @@
+/**
+ * Shared stats block writer implementation
+ */
+
+#include "stats_block.h"
+
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstring>
+
+namespace {
+
+// Field offsets, see liru/stats.py
+constexpr std::size_t SEQ_OFFSET = 88;
+constexpr std::size_t FRAMES_OFFSET = 96;
+constexpr std::size_t DROPPED_OFFSET = 104;
+constexpr std::size_t LAST_LATENCY_OFFSET = 112;
+constexpr std::size_t PEAK_LATENCY_OFFSET = 120;
+constexpr std::size_t FPS_OFFSET = 128;
+constexpr std::size_t LAST_FRAME_OFFSET = 136;
+constexpr std::size_t WIDTH_OFFSET = 144;
+constexpr std::size_t HEIGHT_OFFSET = 148;
+
+// Windows and Linux targets are little-endian, like the block
+template <typename T>
+void store(unsigned char* block, std::size_t offset, T value) {
+    std::memcpy(block + offset, &value, sizeof(T));
+}
+
+template <typename T>
+T load(const unsigned char* block, std::size_t offset) {
+    T value;
+    std::memcpy(&value, block + offset, sizeof(T));
+    return value;
+}
+
+}  // namespace
+
+void StatsBlockWriter::attach(unsigned char* block) {
+    m_block = block;
+}
+
+bool StatsBlockWriter::attached() const {
+    return m_block != nullptr;
+}
+
+void StatsBlockWriter::publish(long long frames, long long dropped, double latency_ms,
+                               double fps, int width, int height) {
+    if (!m_block) {
+        return;
+    }
+    const auto seq = load<std::uint64_t>(m_block, SEQ_OFFSET);
+    store<std::uint64_t>(m_block, SEQ_OFFSET, seq + 1);
+    std::atomic_thread_fence(std::memory_order_release);
+
+    const double peak = std::max(load<double>(m_block, PEAK_LATENCY_OFFSET), latency_ms);
+    const auto now = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::system_clock::now().time_since_epoch()).count();
+    store<std::uint64_t>(m_block, FRAMES_OFFSET, static_cast<std::uint64_t>(frames));
+    store<std::uint64_t>(m_block, DROPPED_OFFSET, static_cast<std::uint64_t>(dropped));
+    store<double>(m_block, LAST_LATENCY_OFFSET, latency_ms);
+    store<double>(m_block, PEAK_LATENCY_OFFSET, peak);
+    store<double>(m_block, FPS_OFFSET, fps);
+    store<std::int64_t>(m_block, LAST_FRAME_OFFSET, static_cast<std::int64_t>(now));
+    store<std::uint32_t>(m_block, WIDTH_OFFSET, static_cast<std::uint32_t>(width));
+    store<std::uint32_t>(m_block, HEIGHT_OFFSET, static_cast<std::uint32_t>(height));
+
+    std::atomic_thread_fence(std::memory_order_release);
+    store<std::uint64_t>(m_block, SEQ_OFFSET, seq + 2);
+}
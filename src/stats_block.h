@@ -0,0 +1,54 @@
+/**
+ * Shared stats block writer
+ *
+ * Publishes running counters into a stats block mapped by Python, so other
+ * processes can monitor a sender or receiver. The layout is documented in
+ * liru/stats.py.
+ */
+
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+/**
+ * Writes counters into a 256-byte stats block owned by the caller.
+ *
+ * Not thread-safe; the owning wrapper serializes publish() and attach().
+ */
+class StatsBlockWriter {
+public:
+    /** Size of a stats block in bytes. */
+    static constexpr std::size_t SIZE = 256;
+
+    /**
+     * Start publishing into a block, or stop.
+     *
+     * @param block Writable block of SIZE bytes that stays mapped until the
+     *              next attach(), or nullptr to stop
+     */
+    void attach(unsigned char* block);
+
+    /**
+     * Check whether a block is attached.
+     *
+     * @return true if publish() writes
+     */
+    bool attached() const;
+
+    /**
+     * Publish counters after a frame; keeps the peak latency in the block.
+     *
+     * @param frames Frames sent or received so far
+     * @param dropped Frames dropped so far
+     * @param latency_ms Time the last send or receive call took
+     * @param fps Frames per second over the statistics window
+     * @param width Frame width in pixels
+     * @param height Frame height in pixels
+     */
+    void publish(long long frames, long long dropped, double latency_ms, double fps,
+                 int width, int height);
+
+private:
+    unsigned char* m_block = nullptr;
+};
@@ -0,0 +1,112 @@
+/**
+ * Dirty-tile tracking of sent frames implementation
+ */
+
+#include "tile_tracker.h"
+#include <algorithm>
+#include <cstring>
+
+namespace {
+
+// Deterministic odd keys; hashes are only compared within one sender
+std::uint64_t splitmix64(std::uint64_t& state) {
+    std::uint64_t z = (state += 0x9E3779B97F4A7C15ull);
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ull;
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBull;
+    return (z ^ (z >> 31)) | 1;
+}
+
+// Sum of each 8-byte word, then each leftover byte, times its key
+std::uint64_t hash_row(const unsigned char* bytes, std::size_t length,
+                       const std::uint64_t* keys) {
+    const std::size_t words = length / 8;
+    std::uint64_t sum = 0;
+    for (std::size_t i = 0; i < words; ++i) {
+        std::uint64_t word;
+        std::memcpy(&word, bytes + i * 8, sizeof(word));
+        sum += word * keys[i];
+    }
+    for (std::size_t i = words * 8; i < length; ++i) {
+        sum += bytes[i] * keys[words + i - words * 8];
+    }
+    return sum;
+}
+
+}  // namespace
+
+std::size_t TileTracker::tiles(int width, int height) {
+    const std::size_t columns = (width + TILE_SIZE - 1) / TILE_SIZE;
+    const std::size_t rows = (height + TILE_SIZE - 1) / TILE_SIZE;
+    return columns * rows;
+}
+
+void TileTracker::reset(int width, int height, std::size_t bytes_per_pixel,
+                        std::size_t max_tiles) {
+    int tile = TILE_SIZE;
+    int columns = (width + tile - 1) / tile;
+    int rows = (height + tile - 1) / tile;
+    while (max_tiles != 0 && static_cast<std::size_t>(columns) * rows > max_tiles) {
+        tile *= 2;
+        columns = (width + tile - 1) / tile;
+        rows = (height + tile - 1) / tile;
+    }
+    m_width = width;
+    m_height = height;
+    m_tile = tile;
+    m_columns = columns;
+    m_rows = rows;
+    m_bytes_per_pixel = bytes_per_pixel;
+    m_hashed = false;
+    m_stamps.assign(static_cast<std::size_t>(columns) * rows, 0);
+    m_hashes.assign(m_stamps.size(), 0);
+
+    std::uint64_t state = 0x6C697275;
+    m_row_keys.resize(tile);
+    for (auto& key : m_row_keys) {
+        key = splitmix64(state);
+    }
+    m_word_keys.resize(tile * bytes_per_pixel / 8 + 8);
+    for (auto& key : m_word_keys) {
+        key = splitmix64(state);
+    }
+}
+
+void TileTracker::update(const unsigned char* pixels, long long frame, bool invert) {
+    std::vector<std::uint64_t> hashes(m_stamps.size(), 0);
+    const std::size_t row_bytes = m_width * m_bytes_per_pixel;
+    const std::size_t tile_bytes = m_tile * m_bytes_per_pixel;
+    for (int row = 0; row < m_height; ++row) {
+        const unsigned char* line = pixels + (invert ? m_height - 1 - row : row) * row_bytes;
+        const std::uint64_t row_key = m_row_keys[row % m_tile];
+        std::uint64_t* tile_hashes = hashes.data() + (row / m_tile) * m_columns;
+        for (int column = 0; column < m_columns; ++column) {
+            const std::size_t start = column * tile_bytes;
+            const std::size_t length = std::min(tile_bytes, row_bytes - start);
+            tile_hashes[column] += row_key * hash_row(line + start, length, m_word_keys.data());
+        }
+    }
+    for (std::size_t i = 0; i < hashes.size(); ++i) {
+        if (!m_hashed || hashes[i] != m_hashes[i]) {
+            m_stamps[i] = static_cast<std::uint64_t>(frame);
+        }
+    }
+    m_hashes.swap(hashes);
+    m_hashed = true;
+    m_frame = frame;
+}
+
+void TileTracker::mark_all(long long frame) {
+    std::fill(m_stamps.begin(), m_stamps.end(), static_cast<std::uint64_t>(frame));
+    m_hashed = false;
+    m_frame = frame;
+}
+
+void TileTracker::encode(unsigned char* table) const {
+    const std::uint32_t header[4] = {static_cast<std::uint32_t>(m_tile),
+                                     static_cast<std::uint32_t>(m_width),
+                                     static_cast<std::uint32_t>(m_height), 0};
+    const std::uint64_t frame = static_cast<std::uint64_t>(m_frame);
+    std::memcpy(table, header, sizeof(header));
+    std::memcpy(table + sizeof(header), &frame, sizeof(frame));
+    std::memcpy(table + HEADER_SIZE, m_stamps.data(), m_stamps.size() * sizeof(std::uint64_t));
+}
@@ -0,0 +1,91 @@
+/**
+ * Dirty-tile tracking of sent frames
+ *
+ * Hashes every frame sent from CPU pixels in square tiles and stamps each
+ * tile with the last frame that changed it. The Spout backend publishes the
+ * resulting tile table after the metadata record in the sender's memory
+ * buffer; the layout and hash are documented in liru/tiles.py.
+ */
+
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+/**
+ * Tile hashes and change stamps of one sender's frames.
+ */
+class TileTracker {
+public:
+    /** Tile width and height in pixels, before any doubling. */
+    static constexpr int TILE_SIZE = 64;
+
+    /** Size of the table header in bytes. */
+    static constexpr std::size_t HEADER_SIZE = 24;
+
+    /**
+     * Get the size of a table of a number of tiles.
+     */
+    static constexpr std::size_t table_size(std::size_t tiles) { return HEADER_SIZE + tiles * 8; }
+
+    /**
+     * Get the number of 64x64 tiles of a frame.
+     */
+    static std::size_t tiles(int width, int height);
+
+    /**
+     * Set up for frames of a size, forgetting earlier hashes.
+     *
+     * The next frame marks every tile. Stamps of earlier frames are kept
+     * only while the tile grid stays the same.
+     *
+     * @param width Frame width in pixels
+     * @param height Frame height in pixels
+     * @param bytes_per_pixel Size of a pixel of the frames
+     * @param max_tiles Most tiles the table may hold; the tile size doubles
+     *                  until the grid fits
+     */
+    void reset(int width, int height, std::size_t bytes_per_pixel, std::size_t max_tiles);
+
+    /**
+     * Hash a frame and stamp its changed tiles with its number.
+     *
+     * @param pixels Frame of the size given to reset(), rows top to bottom
+     * @param frame Its frame number
+     * @param invert Whether the frame is published flipped, so its rows are
+     *               hashed bottom to top
+     */
+    void update(const unsigned char* pixels, long long frame, bool invert);
+
+    /**
+     * Stamp every tile, for a frame that was not hashed.
+     */
+    void mark_all(long long frame);
+
+    /**
+     * Encode the table.
+     *
+     * @param table Destination of table_size(columns * rows) bytes
+     */
+    void encode(unsigned char* table) const;
+
+    /**
+     * Get the size of the encoded table in bytes.
+     */
+    std::size_t size() const { return table_size(m_stamps.size()); }
+
+private:
+    int m_width = 0;
+    int m_height = 0;
+    int m_tile = TILE_SIZE;
+    int m_columns = 0;
+    int m_rows = 0;
+    std::size_t m_bytes_per_pixel = 0;
+    long long m_frame = 0;
+    bool m_hashed = false;
+    std::vector<std::uint64_t> m_row_keys;
+    std::vector<std::uint64_t> m_word_keys;
+    std::vector<std::uint64_t> m_hashes;
+    std::vector<std::uint64_t> m_stamps;
+};
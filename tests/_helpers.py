@@ -0,0 +1,12 @@
+"""Helpers shared by the test modules."""
+
+
+def solid_frame(value: int, size: int) -> bytes:
+    """Get ``size`` bytes of frame pixels that all hold ``value`` modulo 256."""
+    return bytes([value % 256]) * size
+
+
+# Frame size of the ``sender`` fixture
+SENDER_WIDTH = 8
+SENDER_HEIGHT = 4
+SENDER_FRAME_BYTES = SENDER_WIDTH * SENDER_HEIGHT * 4
@@ -1,6 +1,12 @@
 """Pytest configuration and fixtures."""
 
+from collections.abc import Iterator
+from pathlib import Path
+
 import pytest
+from _helpers import SENDER_HEIGHT, SENDER_WIDTH
+
+import liru
 
 
 @pytest.fixture
@@ -25,3 +31,18 @@ def texture_height() -> int:
 def texture_id() -> int:
     """Fixture for mock OpenGL texture ID."""
     return 42
+
+
+@pytest.fixture(autouse=True)
+def shm_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture isolating shared-memory backend segments per test."""
+    monkeypatch.setenv("LIRU_SHM_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(params=[True, False], ids=["frame-sync", "polled"])
+def sender(request: pytest.FixtureRequest, sender_name: str) -> Iterator[liru.Sender]:
+    """Fixture for a small shm sender, with and without frame sync."""
+    with liru.Sender(sender_name, SENDER_WIDTH, SENDER_HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync(request.param)
+        yield sender
@@ -0,0 +1,192 @@
+"""Tests for asyncio frame consumption (Receiver.next_frame, Receiver.frames)."""
+
+import asyncio
+import types
+
+import pytest
+from _helpers import SENDER_FRAME_BYTES, SENDER_HEIGHT, SENDER_WIDTH, solid_frame
+
+import liru
+from liru import backends
+
+
+async def _send_later(sender: liru.Sender, values: range, delay: float = 0.01) -> None:
+    for value in values:
+        await asyncio.sleep(delay)
+        sender.send_buffer(solid_frame(value, SENDER_FRAME_BYTES))
+
+
+def test_next_frame(sender: liru.Sender) -> None:
+    """Test next_frame() returns the next published frame as a copy."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+
+    async def main() -> liru.Frame:
+        task = asyncio.create_task(_send_later(sender, range(7, 8)))
+        frame = await receiver.next_frame(timeout=5)
+        await task
+        return frame
+
+    frame = asyncio.run(main())
+    assert frame.frame_number == 1
+    assert frame.data.shape == (SENDER_HEIGHT, SENDER_WIDTH, 4)
+    assert frame.data.readonly
+    assert frame.data.tobytes() == solid_frame(7, SENDER_FRAME_BYTES)
+
+
+def test_next_frame_pending(sender: liru.Sender) -> None:
+    """Test a frame published before awaiting is returned at once."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(solid_frame(3, SENDER_FRAME_BYTES))
+    frame = asyncio.run(receiver.next_frame(timeout=5))
+    assert frame.data.tobytes() == solid_frame(3, SENDER_FRAME_BYTES)
+
+
+def test_next_frame_timeout(sender: liru.Sender) -> None:
+    """Test next_frame() raises TimeoutError when no frame arrives."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    with pytest.raises(TimeoutError):
+        asyncio.run(receiver.next_frame(timeout=0.05))
+
+
+def test_frames_in_order(sender: liru.Sender) -> None:
+    """Test async iteration yields every frame when the consumer keeps up."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+
+    async def main() -> list[int]:
+        task = asyncio.create_task(_send_later(sender, range(1, 6)))
+        numbers = []
+        async with receiver.frames(queue_size=8) as frames:
+            async for frame in frames:
+                numbers.append(frame.data.tobytes()[0])
+                if len(numbers) == 5:
+                    break
+        await task
+        return numbers
+
+    assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+
+def test_frames_drop_oldest(sender: liru.Sender) -> None:
+    """Test a lagging consumer keeps only the newest queue_size frames."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+
+    async def main() -> tuple[list[int], int]:
+        async with receiver.frames(queue_size=2) as frames:
+            await _send_later(sender, range(1, 6), delay=0.03)
+            await asyncio.sleep(0.1)  # Let the watcher receive the last frame
+            first = await anext(frames)
+            second = await anext(frames)
+            return [first.frame_number, second.frame_number], frames.dropped
+
+    numbers, dropped = asyncio.run(main())
+    assert numbers == [4, 5]
+    assert dropped == 3
+
+
+def test_frames_latest_only(sender: liru.Sender) -> None:
+    """Test queue_size=1 yields the latest frame."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+
+    async def main() -> int:
+        async with receiver.frames() as frames:
+            await _send_later(sender, range(1, 4), delay=0.03)
+            await asyncio.sleep(0.1)
+            frame = await anext(frames)
+            return frame.data.tobytes()[0]
+
+    assert asyncio.run(main()) == 3
+
+
+def test_close_ends_iteration(sender: liru.Sender) -> None:
+    """Test closing a stream ends a pending iteration."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+
+    async def main() -> list[liru.Frame]:
+        frames = receiver.frames()
+        received = []
+
+        async def consume() -> None:
+            async for frame in frames:
+                received.append(frame)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        frames.close()
+        await asyncio.wait_for(task, 5)
+        assert frames.closed
+        return received
+
+    assert asyncio.run(main()) == []
+
+
+def test_invalid_queue_size(sender: liru.Sender) -> None:
+    """Test queue sizes below one are rejected."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    with pytest.raises(ValueError, match="Queue size"):
+        receiver.frames(queue_size=0)
+
+
+def test_frames_unsupported_backend(monkeypatch: pytest.MonkeyPatch, sender: liru.Sender) -> None:
+    """Test backends without a frame signal hook refuse frame streams."""
+    shm = backends.get_backend("shm")
+
+    class ContextBoundReceiver(shm.ReceiverWrapper):  # type: ignore[misc,name-defined]
+        frame_signal = None
+
+    monkeypatch.setattr(backends, "_LOADERS", dict(backends._LOADERS))
+    bound = types.SimpleNamespace(
+        NAME="bound", SenderWrapper=shm.SenderWrapper, ReceiverWrapper=ContextBoundReceiver
+    )
+    backends.register_backend("bound", lambda: bound)  # type: ignore[arg-type,return-value]
+
+    receiver = liru.Receiver(sender.name, backend="bound")
+    with pytest.raises(RuntimeError, match="does not support frame streams"):
+        receiver.frames()
+    with pytest.raises(RuntimeError, match="does not support frame streams"):
+        asyncio.run(receiver.next_frame(timeout=5))
+
+
+def test_frames_retry_after_resize(monkeypatch: pytest.MonkeyPatch, sender_name: str) -> None:
+    """Test a sender resized between the size check and the receive is received at its new size."""
+    shm = backends.get_backend("shm")
+    senders = [liru.Sender(sender_name, SENDER_WIDTH, SENDER_HEIGHT, backend="shm")]
+
+    class ResizedReceiver(shm.ReceiverWrapper):  # type: ignore[misc,name-defined]
+        def receive_into(self, buffer: memoryview) -> tuple[int, int]:
+            if len(senders) == 1:  # Resize once, just before the first receive
+                senders[0].release()
+                senders.append(
+                    liru.Sender(sender_name, 2 * SENDER_WIDTH, SENDER_HEIGHT, backend="shm")
+                )
+                senders[1].send_buffer(solid_frame(5, 2 * SENDER_FRAME_BYTES))
+            return super().receive_into(buffer)
+
+    monkeypatch.setattr(backends, "_LOADERS", dict(backends._LOADERS))
+    resized = types.SimpleNamespace(
+        NAME="resized", SenderWrapper=shm.SenderWrapper, ReceiverWrapper=ResizedReceiver
+    )
+    backends.register_backend("resized", lambda: resized)  # type: ignore[arg-type,return-value]
+
+    try:
+        receiver = liru.Receiver(sender_name, backend="resized")
+        senders[0].send_buffer(solid_frame(1, SENDER_FRAME_BYTES))
+        frame = asyncio.run(receiver.next_frame(timeout=5))
+        assert frame.data.shape == (SENDER_HEIGHT, 2 * SENDER_WIDTH, 4)
+        assert frame.data.tobytes() == solid_frame(5, 2 * SENDER_FRAME_BYTES)
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_many_streams_one_thread(sender: liru.Sender) -> None:
+    """Test hundreds of concurrent consumers all receive the frame."""
+    receivers = [liru.Receiver(sender.name, backend="shm") for _ in range(200)]
+
+    async def main() -> list[liru.Frame]:
+        waits = [asyncio.create_task(r.next_frame(timeout=10)) for r in receivers]
+        await asyncio.sleep(0.05)
+        sender.send_buffer(solid_frame(9, SENDER_FRAME_BYTES))
+        return await asyncio.gather(*waits)
+
+    frames = asyncio.run(main())
+    assert all(frame.data.tobytes() == solid_frame(9, SENDER_FRAME_BYTES) for frame in frames)
@@ -0,0 +1,66 @@
+"""Tests for the transport backend registry."""
+
+import types
+
+import pytest
+
+import liru
+from liru import backends
+
+
+def test_available_backends_includes_shm() -> None:
+    """Test the shared-memory backend is always available."""
+    assert "shm" in liru.available_backends()
+
+
+def test_get_backend_unknown() -> None:
+    """Test unknown backend names are rejected."""
+    with pytest.raises(ValueError, match="Unknown backend"):
+        backends.get_backend("nope")
+
+
+def test_sender_unknown_backend(sender_name: str) -> None:
+    """Test Sender rejects unknown backend names."""
+    with pytest.raises(ValueError, match="Unknown backend"):
+        liru.Sender(sender_name, 64, 64, backend="nope")
+
+
+def test_default_backend_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test LIRU_BACKEND selects the default backend."""
+    monkeypatch.setenv("LIRU_BACKEND", "shm")
+    assert liru.default_backend() == "shm"
+
+    with liru.Sender("EnvSender", 64, 64) as sender:
+        assert sender.backend == "shm"
+
+
+def test_register_backend(monkeypatch: pytest.MonkeyPatch, sender_name: str) -> None:
+    """Test third-party backends can be registered and selected."""
+    monkeypatch.setattr(backends, "_LOADERS", dict(backends._LOADERS))
+    shm = backends.get_backend("shm")
+    custom = types.SimpleNamespace(
+        NAME="custom", SenderWrapper=shm.SenderWrapper, ReceiverWrapper=shm.ReceiverWrapper
+    )
+    backends.register_backend("custom", lambda: custom)  # type: ignore[arg-type,return-value]
+
+    with liru.Sender(sender_name, 64, 64, backend="custom") as sender:
+        assert sender.backend == "custom"
+
+
+def test_register_backend_empty_name() -> None:
+    """Test backends cannot be registered without a name."""
+    with pytest.raises(ValueError, match="Backend name cannot be empty"):
+        backends.register_backend("", lambda: backends.get_backend("shm"))
+
+
+def test_unavailable_backend_not_listed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test backends whose loader fails are not reported as available."""
+    monkeypatch.setattr(backends, "_LOADERS", dict(backends._LOADERS))
+
+    def fail() -> backends.Backend:
+        raise ImportError("missing driver")
+
+    backends.register_backend("broken", fail)
+    assert "broken" not in liru.available_backends()
+    with pytest.raises(RuntimeError, match="missing driver"):
+        liru.Receiver(backend="broken")
@@ -0,0 +1,197 @@
+"""Benchmarks (pytest-benchmark).
+
+Compare groups with ``pytest tests/test_benchmarks.py --benchmark-group-by=group``;
+pass ``--benchmark-disable`` to only check they run.
+"""
+
+import threading
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import pytest
+
+import liru
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+WIDTH = 256
+HEIGHT = 256
+FRAMES_PER_THREAD = 50
+
+
+@pytest.fixture
+def senders(request: pytest.FixtureRequest, sender_name: str) -> Iterator[list[liru.Sender]]:
+    """Fixture creating one shm sender per benchmark thread."""
+    count: int = request.param
+    created = [
+        liru.Sender(f"{sender_name}{i}", WIDTH, HEIGHT, slots=2, backend="shm")
+        for i in range(count)
+    ]
+    yield created
+    for sender in created:
+        sender.release()
+
+
+@pytest.mark.benchmark(group="sender-threads")
+@pytest.mark.parametrize("senders", [1, 2, 4, 8], indirect=True, ids=lambda n: f"{n}-threads")
+def test_sender_thread_scaling(benchmark: "BenchmarkFixture", senders: list[liru.Sender]) -> None:
+    """Benchmark many senders, one per thread, in one process.
+
+    Each round sends FRAMES_PER_THREAD frames from every thread. On a
+    free-threaded build with enough cores the round time stays flat as
+    threads are added; with the GIL it grows with the thread count.
+    """
+    frame = bytes(WIDTH * HEIGHT * 4)
+
+    def send_all(sender: liru.Sender) -> None:
+        for _ in range(FRAMES_PER_THREAD):
+            sender.send_buffer(frame)
+
+    def round_() -> None:
+        threads = [threading.Thread(target=send_all, args=(s,)) for s in senders]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    benchmark.extra_info["frames"] = FRAMES_PER_THREAD * len(senders)
+    benchmark.pedantic(round_, rounds=5, warmup_rounds=1)
+
+
+@pytest.mark.benchmark(group="sender-listing")
+@pytest.mark.parametrize("cached", [False, True], ids=["get_sender_list", "directory"])
+def test_sender_listing(benchmark: "BenchmarkFixture", sender_name: str, cached: bool) -> None:
+    """Benchmark listing 16 senders per frame, uncached and from a SenderDirectory."""
+    created = [liru.Sender(f"{sender_name}{i}", 16, 16, backend="shm") for i in range(16)]
+    receiver = liru.Receiver(backend="shm")
+    try:
+        with liru.SenderDirectory("shm", interval=1.0) as directory:
+            listing = directory.names if cached else receiver.get_sender_list
+            names = benchmark(listing)
+            assert len(names) == len(created)
+    finally:
+        for sender in created:
+            sender.release()
+
+
+@pytest.mark.benchmark(group="multi-source-receive")
+@pytest.mark.parametrize("grouped", [False, True], ids=["receivers", "group"])
+def test_multi_source_receive(
+    benchmark: "BenchmarkFixture", sender_name: str, grouped: bool
+) -> None:
+    """Benchmark one tick over 16 senders of which 2 have a new frame."""
+    created = [liru.Sender(f"{sender_name}{i}", 16, 16, backend="shm") for i in range(16)]
+    frame = bytes(16 * 16 * 4)
+    buffers = [bytearray(len(frame)) for _ in created]
+    try:
+        with liru.ReceiverGroup([s.name for s in created], backend="shm") as group:
+
+            def tick() -> int:
+                created[3].send_buffer(frame)
+                created[11].send_buffer(frame)
+                if grouped:
+                    return len(group.poll_into(buffers)) // 3
+                received = 0
+                for receiver, buffer in zip(group, buffers, strict=True):
+                    if receiver.is_updated():
+                        receiver.receive_into(buffer)
+                        received += 1
+                return received
+
+            assert benchmark(tick) == 2
+    finally:
+        for sender in created:
+            sender.release()
+
+
+@pytest.mark.benchmark(group="multi-output-send")
+@pytest.mark.parametrize("grouped", [False, True], ids=["senders", "group"])
+def test_multi_output_send(benchmark: "BenchmarkFixture", sender_name: str, grouped: bool) -> None:
+    """Benchmark publishing one frame on each of 24 outputs."""
+    created = [liru.Sender(f"{sender_name}{i}", 16, 16, backend="shm") for i in range(24)]
+    frames = [bytes(16 * 16 * 4)] * len(created)
+    group = liru.SenderGroup(created)
+    try:
+
+        def batch() -> None:
+            if grouped:
+                assert group.send(frames).all_sent
+                return
+            for sender, frame in zip(created, frames, strict=True):
+                sender.send_buffer(frame)
+
+        benchmark(batch)
+    finally:
+        for sender in created:
+            sender.release()
+
+
+FIRST_FRAME_WIDTH = 1920
+FIRST_FRAME_HEIGHT = 1080
+
+
+@pytest.mark.benchmark(group="first-send")
+@pytest.mark.parametrize("state", ["cold", "warmup", "steady"])
+def test_first_send(benchmark: "BenchmarkFixture", sender_name: str, state: str) -> None:
+    """Benchmark the first 1080p send of a new sender against the steady state.
+
+    Each round creates a sender and times its first frame, after warmup()
+    for "warmup"; "steady" times a frame after ten others. A warmed-up
+    first send costs the same as a steady one; a cold one pays for the
+    setup (page faults on the shm backend).
+    """
+    frame = bytes(FIRST_FRAME_WIDTH * FIRST_FRAME_HEIGHT * 4)
+
+    def setup() -> tuple[tuple[liru.Sender], dict[str, object]]:
+        sender = liru.Sender(
+            sender_name,
+            FIRST_FRAME_WIDTH,
+            FIRST_FRAME_HEIGHT,
+            slots=2,
+            backend="shm",
+            warmup=state == "warmup",
+        )
+        if state == "steady":
+            for _ in range(10):
+                sender.send_buffer(frame)
+        return (sender,), {}
+
+    def send(sender: liru.Sender) -> None:
+        assert sender.send_buffer(frame)
+
+    benchmark.pedantic(send, setup=setup, teardown=lambda sender: sender.release(), rounds=10)
+
+
+@pytest.mark.benchmark(group="first-receive")
+@pytest.mark.parametrize("state", ["cold", "connect", "steady"])
+def test_first_receive(benchmark: "BenchmarkFixture", sender_name: str, state: str) -> None:
+    """Benchmark the first 1080p receive of a new receiver against the steady state.
+
+    Each round creates a receiver and times its first frame, after
+    connect() for "connect"; "steady" times a frame after ten others.
+    """
+    size = FIRST_FRAME_WIDTH * FIRST_FRAME_HEIGHT * 4
+    frame = bytes(size)
+    buffer = bytearray(size)
+    with liru.Sender(
+        sender_name, FIRST_FRAME_WIDTH, FIRST_FRAME_HEIGHT, slots=2, backend="shm", warmup=True
+    ) as sender:
+        sender.send_buffer(frame)
+        sender.send_buffer(frame)
+
+        def setup() -> tuple[tuple[liru.Receiver], dict[str, object]]:
+            receiver = liru.Receiver(
+                sender_name, backend="shm", connect_timeout=1.0 if state == "connect" else None
+            )
+            if state == "steady":
+                for _ in range(10):
+                    receiver.receive_into(buffer)
+            return (receiver,), {}
+
+        def receive(receiver: liru.Receiver) -> None:
+            receiver.receive_into(buffer)
+
+        benchmark.pedantic(receive, setup=setup, rounds=10)
@@ -0,0 +1,227 @@
+"""Tests for bridging senders over sockets (liru.bridge)."""
+
+import socket
+import time
+
+import pytest
+
+import liru
+from liru.bridge import (
+    BRIDGE_VERSION,
+    DATAGRAM_HEADER,
+    DATAGRAM_MAGIC,
+    MESSAGE_HEADER,
+    MESSAGE_MAGIC,
+    MESSAGE_PREFIX,
+    Exporter,
+    Importer,
+)
+from liru.frame import pack_metadata
+
+WIDTH = 64
+HEIGHT = 32
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+
+def _frame(value: int, width: int = WIDTH, height: int = HEIGHT) -> bytes:
+    return bytes((value + i) % 251 for i in range(width * height * 4))
+
+
+def _wait_for(end: Exporter | Importer, frames: int) -> None:
+    deadline = time.monotonic() + 5
+    while end.stats().frames < frames:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_tcp_round_trip(sender_name: str) -> None:
+    """Test captured frames arrive with their payload and size changes over TCP."""
+    with Importer("Imported", ("127.0.0.1", 0), backend="shm") as importer:
+        assert importer.sender is None
+        with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+            receiver = liru.Receiver(sender_name, backend="shm")
+            with Exporter(receiver, importer.address) as exporter:
+                for value in range(1, 4):
+                    sender.send_buffer(_frame(value), payload=b"cue%d" % value)
+                    _wait_for(importer, value)
+                sender.resize(8, 4)
+                sender.send_buffer(_frame(9, 8, 4))
+                _wait_for(importer, 4)
+                _wait_for(exporter, 4)  # May count after the importer published
+
+                stats = exporter.stats()
+                assert (stats.frames, stats.dropped, stats.queue_depth) == (4, 0, 0)
+                assert stats.connected
+                assert stats.fps > 0
+            assert not receiver.capturing
+
+        stats = importer.stats()
+        assert (stats.frames, stats.dropped, stats.bytes) == (4, 0, exporter.stats().bytes)
+        assert importer.remote_metadata.frame == 4
+
+        imported = liru.Receiver("Imported", backend="shm")
+        target = bytearray(8 * 4 * 4)
+        assert imported.receive_into(target) == (8, 4)
+        assert target == _frame(9, 8, 4)
+        assert importer.sender is not None
+        assert importer.sender.generation == 1
+
+
+def test_udp_compressed_fragments(sender_name: str) -> None:
+    """Test compressed frames split over many datagrams are reassembled."""
+    with Importer("Imported", ("127.0.0.1", 0), protocol="udp", backend="shm") as importer:
+        with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+            receiver = liru.Receiver(sender_name, backend="shm")
+            with Exporter(
+                receiver,
+                importer.address,
+                protocol="udp",
+                compression="zlib",
+                datagram_size=512,
+            ) as exporter:
+                sender.send_buffer(_frame(5), payload=b"take 2")
+                _wait_for(importer, 1)
+                assert exporter.stats().bytes < FRAME_BYTES
+
+        imported = liru.Receiver("Imported", backend="shm")
+        target = bytearray(FRAME_BYTES)
+        imported.receive_into(target)
+        assert target == _frame(5)
+        assert imported.metadata.payload == b"take 2"
+
+
+def _datagrams(sequence: int, pixels: bytes, width: int = WIDTH) -> list[bytes]:
+    """Split a hand-built message into two datagrams, the second half on its own."""
+    message = bytearray(MESSAGE_PREFIX)
+    height = len(pixels) // (width * 4)
+    MESSAGE_HEADER.pack_into(
+        message,
+        0,
+        MESSAGE_MAGIC,
+        BRIDGE_VERSION,
+        0,
+        width,
+        height,
+        liru.PixelFormat.RGBA8,
+        7,
+        sequence,
+        len(pixels),
+    )
+    pack_metadata(memoryview(message)[MESSAGE_HEADER.size :], sequence, 0, b"")
+    message += pixels
+    half = MESSAGE_PREFIX + len(pixels) // 2
+    return [
+        DATAGRAM_HEADER.pack(DATAGRAM_MAGIC, 7, sequence, offset, len(message)) + part
+        for offset, part in ((0, message[:half]), (half, message[half:]))
+    ]
+
+
+def test_udp_rejects_duplicates_and_invalid_headers() -> None:
+    """Test a duplicated fragment cannot stand in for a lost one, and bad headers allocate nothing."""
+    with (
+        Importer(
+            "Imported", ("127.0.0.1", 0), protocol="udp", backend="shm", max_frame_bytes=FRAME_BYTES
+        ) as importer,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock,
+    ):
+        sock.connect(importer.address)
+        first, _ = _datagrams(1, _frame(1))
+        sock.send(first)
+        sock.send(first)  # The second half never comes
+
+        oversized = _datagrams(2, _frame(2) * 2, WIDTH * 2)
+        for datagram in oversized:
+            sock.send(datagram)
+
+        head, tail = _datagrams(3, _frame(3))
+        sock.send(tail)  # Before the first fragment: the frame is lost
+        sock.send(head)
+
+        for datagram in _datagrams(4, _frame(4)):
+            sock.send(datagram)
+            sock.send(datagram)
+        _wait_for(importer, 1)
+        time.sleep(0.05)
+        stats = importer.stats()
+        assert (stats.frames, stats.dropped) == (1, 0)  # The first frame seen starts the count
+        assert importer.remote_metadata.frame == 4
+
+        imported = liru.Receiver("Imported", backend="shm")
+        target = bytearray(FRAME_BYTES)
+        imported.receive_into(target)
+        assert target == _frame(4)
+
+
+def test_latest_frame_wins(sender_name: str) -> None:
+    """Test a full queue drops its oldest frame, or the new one without latest_wins."""
+
+    def frame(value: int) -> liru.Frame:
+        return liru.Frame(memoryview(_frame(value)).cast("B", (HEIGHT, WIDTH, 4)), value)
+
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with Importer("Imported", ("127.0.0.1", 0), backend="shm") as importer:
+        with Exporter(receiver, importer.address, queue_size=1, capture=False) as exporter:
+            assert exporter.write(frame(1))
+            _wait_for(importer, 1)
+            with exporter._cond:  # Hold the sending thread back
+                assert exporter.write(frame(2))
+                assert exporter.write(frame(3))
+                assert exporter.write(frame(4))
+                assert exporter.stats().queue_depth == 1
+            _wait_for(importer, 2)
+            assert exporter.stats().dropped == 2
+            assert importer.stats().dropped == 2  # Seen as gaps in the sequence
+
+            imported = liru.Receiver("Imported", backend="shm")
+            target = bytearray(FRAME_BYTES)
+            imported.receive_into(target)
+            assert target == _frame(4)
+
+        with Exporter(
+            receiver, importer.address, queue_size=1, latest_wins=False, capture=False
+        ) as exporter:
+            with exporter._cond:
+                assert exporter.write(frame(5))
+                assert not exporter.write(frame(6))
+            _wait_for(importer, 3)
+            imported.receive_into(target)
+            assert target == _frame(5)
+    with pytest.raises(RuntimeError, match="closed"):
+        exporter.write(frame(7))
+
+
+def test_drops_frames_while_disconnected(sender_name: str) -> None:
+    """Test frames are dropped and counted when no importer listens."""
+    with Importer("Imported", ("127.0.0.1", 0), backend="shm") as importer:
+        address = importer.address
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with Exporter(receiver, address, capture=False) as exporter:
+        exporter.write(liru.Frame(memoryview(_frame(1)).cast("B", (HEIGHT, WIDTH, 4)), 1))
+        deadline = time.monotonic() + 5
+        while exporter.stats().dropped < 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+        stats = exporter.stats()
+        assert (stats.frames, stats.connected) == (0, False)
+
+
+def test_invalid_arguments(sender_name: str) -> None:
+    """Test invalid options are rejected."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    address = ("127.0.0.1", 9)
+    with pytest.raises(ValueError, match="Unknown protocol"):
+        Exporter(receiver, address, protocol="sctp")
+    with pytest.raises(ValueError, match="Unknown compression"):
+        Exporter(receiver, address, compression="lzma")
+    with pytest.raises(ValueError, match="Queue size"):
+        Exporter(receiver, address, queue_size=0)
+    with pytest.raises(ValueError, match="Datagram size"):
+        Exporter(receiver, address, datagram_size=100)
+    with pytest.raises(ValueError, match="must be positive"):
+        Exporter(receiver, address, fps=0)
+    with pytest.raises(ValueError, match="cannot be empty"):
+        Importer("")
+    with pytest.raises(ValueError, match="Worker count"):
+        Importer("Imported", workers=0)
+    with pytest.raises(ValueError, match="Frame size limit"):
+        Importer("Imported", max_frame_bytes=0)
@@ -0,0 +1,117 @@
+"""Tests for CPU pixel-buffer send and receive."""
+
+import array
+from collections.abc import Iterator
+
+import pytest
+
+import liru
+
+WIDTH = 16
+HEIGHT = 8
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+
+@pytest.fixture
+def sender(sender_name: str) -> Iterator[liru.Sender]:
+    """Fixture for a shared-memory sender that is released after the test."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        yield sender
+
+
+def test_send_receive_bytearray(sender: liru.Sender) -> None:
+    """Test bytes-like objects round-trip through the shared frame."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    frame = bytes(range(256)) * (FRAME_BYTES // 256)
+    out = bytearray(FRAME_BYTES)
+
+    sender.send_buffer(frame)
+    assert receiver.receive_into(out) == (WIDTH, HEIGHT)
+    assert out == frame
+
+
+def test_send_receive_memoryview(sender: liru.Sender) -> None:
+    """Test memoryviews are accepted on both sides."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    out = bytearray(FRAME_BYTES)
+
+    sender.send_buffer(memoryview(b"\x05" * FRAME_BYTES))
+    receiver.receive_into(memoryview(out))
+    assert out == b"\x05" * FRAME_BYTES
+
+
+def test_send_receive_numpy(sender: liru.Sender) -> None:
+    """Test NumPy arrays shaped (height, width, 4) round-trip."""
+    np = pytest.importorskip("numpy")
+    receiver = liru.Receiver(sender.name, backend="shm")
+    frame = np.arange(FRAME_BYTES, dtype=np.uint32).astype(np.uint8).reshape(HEIGHT, WIDTH, 4)
+    out = np.zeros_like(frame)
+
+    sender.send_buffer(frame)
+    receiver.receive_into(out)
+    np.testing.assert_array_equal(out, frame)
+
+
+def test_numpy_wrong_shape(sender: liru.Sender) -> None:
+    """Test arrays with the right size but wrong shape are rejected."""
+    np = pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="shape"):
+        sender.send_buffer(np.zeros((WIDTH, HEIGHT, 4), dtype=np.uint8))
+
+
+def test_numpy_non_contiguous(sender: liru.Sender) -> None:
+    """Test strided views are rejected instead of copied."""
+    np = pytest.importorskip("numpy")
+    frame = np.zeros((HEIGHT, WIDTH * 2, 4), dtype=np.uint8)[:, ::2]
+    with pytest.raises(ValueError, match="C-contiguous"):
+        sender.send_buffer(frame)
+
+
+def test_wide_items_rejected(sender: liru.Sender) -> None:
+    """Test buffers with multi-byte items are rejected."""
+    with pytest.raises(ValueError, match="1-byte items"):
+        sender.send_buffer(array.array("I", [0]) * (WIDTH * HEIGHT))
+
+
+def test_wrong_size_rejected(sender: liru.Sender) -> None:
+    """Test buffers of the wrong size are rejected."""
+    with pytest.raises(ValueError, match=f"expected {FRAME_BYTES}"):
+        sender.send_buffer(b"\0" * (FRAME_BYTES - 1))
+
+
+def test_not_a_buffer(sender: liru.Sender) -> None:
+    """Test objects without the buffer protocol are rejected."""
+    with pytest.raises(TypeError, match="buffer-protocol"):
+        sender.send_buffer([0] * FRAME_BYTES)  # type: ignore[arg-type]
+
+
+def test_receive_into_read_only(sender: liru.Sender) -> None:
+    """Test read-only buffers cannot be received into."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(b"\0" * FRAME_BYTES)
+    with pytest.raises(ValueError, match="read-only"):
+        receiver.receive_into(b"\0" * FRAME_BYTES)
+
+
+def test_receive_into_not_connected() -> None:
+    """Test receiving without a sender raises RuntimeError."""
+    receiver = liru.Receiver("Missing", backend="shm")
+    with pytest.raises(RuntimeError, match="Not connected"):
+        receiver.receive_into(bytearray(FRAME_BYTES))
+
+
+def test_send_buffer_after_release(sender_name: str) -> None:
+    """Test sending a buffer after release raises RuntimeError."""
+    sender = liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm")
+    sender.release()
+    with pytest.raises(RuntimeError, match="Sender has been released"):
+        sender.send_buffer(b"\0" * FRAME_BYTES)
+
+
+def test_send_buffer_updates_metrics(sender: liru.Sender) -> None:
+    """Test buffer sends feed the FPS and latency metrics."""
+    frame = b"\0" * FRAME_BYTES
+    sender.send_buffer(frame)
+    sender.send_buffer(frame)
+    assert sender.get_fps() > 0.0
+    assert sender.last_send_time_ms >= 0.0
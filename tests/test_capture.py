@@ -0,0 +1,116 @@
+"""Tests for background capture (Receiver.start_capture)."""
+
+import queue
+import sys
+import time
+
+import pytest
+from _helpers import SENDER_FRAME_BYTES, SENDER_HEIGHT, SENDER_WIDTH, solid_frame
+
+import liru
+
+
+def test_capture_callback(sender: liru.Sender, sender_name: str) -> None:
+    """Test the callback receives every frame sent while it keeps up."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    frames: queue.Queue[liru.Frame] = queue.Queue()
+    receiver.start_capture(frames.put)
+    try:
+        assert receiver.capturing
+        for value in range(1, 4):
+            sender.send_buffer(solid_frame(value, SENDER_FRAME_BYTES))
+            frame = frames.get(timeout=5)
+            assert frame.frame_number == value
+            assert frame.data.shape == (SENDER_HEIGHT, SENDER_WIDTH, 4)
+            assert frame.data.readonly
+            assert frame.data.tobytes() == solid_frame(value, SENDER_FRAME_BYTES)
+    finally:
+        receiver.stop_capture()
+    assert not receiver.capturing
+
+
+def test_capture_into_queue_keeps_latest(sender: liru.Sender, sender_name: str) -> None:
+    """Test a full queue drops its oldest frame."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    frames: queue.Queue[liru.Frame] = queue.Queue(maxsize=1)
+    receiver.start_capture(frames)
+    try:
+        for value in range(1, 6):
+            sender.send_buffer(solid_frame(value, SENDER_FRAME_BYTES))
+            # Let the capture thread deliver this frame before the next one
+            deadline = time.monotonic() + 5
+            while not any(frame.frame_number == value for frame in list(frames.queue)):
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+        assert frames.qsize() == 1
+        assert frames.get_nowait().frame_number == 5
+    finally:
+        receiver.stop_capture()
+
+
+def test_no_frames_after_stop(sender: liru.Sender, sender_name: str) -> None:
+    """Test stop_capture() waits for the thread so no frames follow it."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    frames: queue.Queue[liru.Frame] = queue.Queue()
+    receiver.start_capture(frames)
+    sender.send_buffer(solid_frame(1, SENDER_FRAME_BYTES))
+    frames.get(timeout=5)
+    receiver.stop_capture()
+    sender.send_buffer(solid_frame(2, SENDER_FRAME_BYTES))
+    assert frames.empty()
+    receiver.stop_capture()  # No-op when stopped
+
+
+def test_callback_error_keeps_capturing(
+    sender: liru.Sender, sender_name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test callback exceptions are reported and capture continues."""
+    reported: list[BaseException | None] = []
+    monkeypatch.setattr(sys, "unraisablehook", lambda args: reported.append(args.exc_value))
+    frames: queue.Queue[liru.Frame] = queue.Queue()
+
+    def on_frame(frame: liru.Frame) -> None:
+        if frame.frame_number == 1:
+            raise ValueError("boom")
+        frames.put(frame)
+
+    receiver = liru.Receiver(sender_name, backend="shm")
+    receiver.start_capture(on_frame)
+    try:
+        sender.send_buffer(solid_frame(1, SENDER_FRAME_BYTES))
+        # Frame 2 is only sent once frame 1 has been handled
+        deadline = time.monotonic() + 5
+        while not reported:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+        sender.send_buffer(solid_frame(2, SENDER_FRAME_BYTES))
+        assert frames.get(timeout=5).frame_number == 2
+        assert receiver.capturing
+    finally:
+        receiver.stop_capture()
+    assert len(reported) == 1
+    assert isinstance(reported[0], ValueError)
+
+
+def test_capture_already_running(sender: liru.Sender, sender_name: str) -> None:
+    """Test starting a second capture raises RuntimeError."""
+    with liru.Receiver(sender_name, backend="shm") as receiver:
+        receiver.start_capture(lambda frame: None)
+        with pytest.raises(RuntimeError, match="already running"):
+            receiver.start_capture(lambda frame: None)
+    assert not receiver.capturing
+
+
+def test_capture_invalid_target(sender: liru.Sender, sender_name: str) -> None:
+    """Test targets that are neither callable nor a queue raise TypeError."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with pytest.raises(TypeError, match="callable or a queue.Queue"):
+        receiver.start_capture(42)  # type: ignore[arg-type]
+    assert not receiver.capturing
+
+
+def test_capture_without_sender() -> None:
+    """Test capture needs a selected sender."""
+    receiver = liru.Receiver(backend="shm")
+    with pytest.raises(RuntimeError, match="No sender selected"):
+        receiver.start_capture(lambda frame: None)
@@ -0,0 +1,146 @@
+"""Tests for the cached sender directory (liru.SenderDirectory)."""
+
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+
+import liru
+from liru.backends import shm
+
+WIDTH = 8
+HEIGHT = 8
+
+
+def _wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_lists_existing_senders(sender_name: str) -> None:
+    """Test the first scan indexes existing senders with their header info."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm"):
+        with liru.SenderDirectory("shm") as directory:
+            assert sender_name in directory
+            assert len(directory) == 1
+            assert list(directory) == [sender_name]
+            assert directory.names() == (sender_name,)
+            info = directory[sender_name]
+            assert info == directory.get(sender_name)
+            assert (info.width, info.height) == (WIDTH, HEIGHT)
+            assert info.format == shm.FORMAT_RGBA8
+            assert info.owner_pid == os.getpid()
+            assert info.frame == 0
+            assert directory.get("Missing") is None
+            with pytest.raises(KeyError):
+                directory["Missing"]
+
+
+def test_callbacks_fire_on_changes(sender_name: str) -> None:
+    """Test added and removed callbacks fire from the background thread."""
+    added: list[str] = []
+    removed: list[str] = []
+    with liru.SenderDirectory(
+        "shm",
+        interval=0.01,
+        on_added=lambda s: added.append(s.name),
+        on_removed=lambda s: removed.append(s.name),
+    ) as directory:
+        assert directory.names() == ()
+        sender = liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm")
+        assert _wait_until(lambda: sender_name in directory)
+        assert added == [sender_name]
+        sender.release()
+        assert _wait_until(lambda: sender_name not in directory)
+        assert removed == [sender_name]
+
+
+def test_refresh_tracks_frames_and_resize(sender_name: str) -> None:
+    """Test refresh() picks up new frames and reports a resized sender."""
+    resized: list[liru.SenderInfo] = []
+    with liru.SenderDirectory("shm", interval=60, on_resized=resized.append) as directory:
+        with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+            directory.refresh()
+            before = directory[sender_name]
+            sender.send_buffer(bytes(WIDTH * HEIGHT * 4))
+            directory.refresh()
+            after = directory[sender_name]
+            assert after.frame == 1
+            assert after.last_update >= before.last_update
+            directory.refresh()
+            assert directory[sender_name] is after  # Unchanged entries are kept
+
+        with liru.Sender(sender_name, WIDTH * 2, HEIGHT, backend="shm"):
+            directory.refresh()
+            assert [(info.width, info.height) for info in resized] == [(WIDTH * 2, HEIGHT)]
+
+
+def test_callback_errors_are_reported(sender_name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a raising callback goes to sys.unraisablehook and scanning continues."""
+    reported: list[BaseException | None] = []
+    monkeypatch.setattr(sys, "unraisablehook", lambda args: reported.append(args.exc_value))
+
+    def explode(info: liru.SenderInfo) -> None:
+        raise ValueError(info.name)
+
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm"):
+        with liru.SenderDirectory("shm", on_added=explode) as directory:
+            assert sender_name in directory
+    assert [str(e) for e in reported] == [sender_name]
+
+
+def test_close_stops_thread() -> None:
+    """Test close() stops the refresh thread and keeps the snapshot."""
+    directory = liru.SenderDirectory("shm", interval=0.01)
+    assert directory.running
+    directory.close()
+    assert not directory.running
+    assert not directory._thread.is_alive()
+    assert directory.names() == ()
+
+
+def test_dropped_directory_stops() -> None:
+    """Test the refresh thread exits once the directory is garbage collected."""
+    directory = liru.SenderDirectory("shm", interval=0.01)
+    thread = directory._thread
+    del directory
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_invalid_interval() -> None:
+    """Test a non-positive interval raises ValueError."""
+    with pytest.raises(ValueError, match="Interval must be positive"):
+        liru.SenderDirectory("shm", interval=0)
+
+
+def test_lookup_is_thread_safe(sender_name: str) -> None:
+    """Test lookups from other threads always see a consistent snapshot."""
+    errors: list[BaseException] = []
+    stop = threading.Event()
+    with liru.SenderDirectory("shm", interval=0.001) as directory:
+
+        def read() -> None:
+            try:
+                while not stop.is_set():
+                    names = directory.names()
+                    for name in names:
+                        directory.get(name)
+            except BaseException as e:  # noqa: BLE001
+                errors.append(e)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for i in range(5):
+            with liru.Sender(f"{sender_name}{i}", WIDTH, HEIGHT, backend="shm"):
+                directory.refresh()
+        stop.set()
+        reader.join()
+    assert errors == []
@@ -0,0 +1,144 @@
+"""Tests for pixel formats (Sender(format=...) and Receiver.format)."""
+
+import queue
+import struct
+import sys
+from array import array
+
+import pytest
+
+import liru
+from liru.formats import check_format
+
+WIDTH = 8
+HEIGHT = 4
+PIXELS = WIDTH * HEIGHT
+
+
+def test_pixel_format_layouts() -> None:
+    """Test each format's component type and pixel size."""
+    layouts = {
+        fmt: (fmt.item_format, fmt.components, fmt.bytes_per_pixel) for fmt in liru.PixelFormat
+    }
+    assert layouts == {
+        liru.PixelFormat.RGBA32F: ("f", 4, 16),
+        liru.PixelFormat.RGBA16F: ("e", 4, 8),
+        liru.PixelFormat.RGB10A2: ("I", 1, 4),
+        liru.PixelFormat.RGBA8: ("B", 4, 4),
+        liru.PixelFormat.R8: ("B", 1, 1),
+        liru.PixelFormat.BGRA8: ("B", 4, 4),
+    }
+    assert check_format(61) is liru.PixelFormat.R8
+    with pytest.raises(ValueError, match="Unsupported pixel format: 11"):
+        check_format(11)
+
+
+def test_r8_round_trip(sender_name: str) -> None:
+    """Test single-channel frames arrive with one byte per pixel."""
+    frame = bytes(range(PIXELS))
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.R8
+    ) as sender:
+        assert sender.format is liru.PixelFormat.R8
+        with pytest.raises(ValueError, match=r"expected 32 \(8x4 R8\)"):
+            sender.send_buffer(bytes(PIXELS * 4))
+        assert sender.send_buffer(frame)
+
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert receiver.format is liru.PixelFormat.R8
+        target = bytearray(PIXELS)
+        assert receiver.receive_into(target) == (WIDTH, HEIGHT)
+        assert bytes(target) == frame
+        with pytest.raises(ValueError, match="expected 32"):
+            receiver.receive_into(bytearray(PIXELS * 4))
+
+        with receiver.acquire_frame() as lease:
+            assert lease.data.shape == (HEIGHT, WIDTH, 1)
+            assert lease.data.tobytes() == frame
+
+
+def test_float_round_trip(sender_name: str) -> None:
+    """Test RGBA32F frames accept float items and are viewed as floats."""
+    frame = array("f", (i / 4 for i in range(PIXELS * 4)))
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGBA32F
+    ) as sender:
+        assert sender.send_buffer(frame)
+        with pytest.raises(ValueError, match="1-byte or 4-byte items"):
+            sender.send_buffer(array("d", bytes(PIXELS * 16)))
+
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = array("f", bytes(PIXELS * 16))
+        receiver.receive_into(target)
+        assert target == frame
+        with receiver.acquire_frame() as lease:
+            assert lease.data.format == "f"
+            assert lease.data.shape == (HEIGHT, WIDTH, 4)
+            assert lease.data[1, 0, 2] == frame[WIDTH * 4 + 2]
+
+
+def test_rgb10a2_packs_one_word_per_pixel(sender_name: str) -> None:
+    """Test 10-bit frames are one packed uint32 per pixel."""
+    word = 1023 | (512 << 10) | (1 << 20) | (3 << 30)
+    frame = struct.pack(f"<{PIXELS}I", *([word] * PIXELS))
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGB10A2
+    ) as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with receiver.acquire_frame() as lease:
+            assert lease.data.shape == (HEIGHT, WIDTH, 1)
+            assert lease.data[HEIGHT - 1, WIDTH - 1, 0] == word
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="Half-float views need Python 3.12")
+def test_half_float_view(sender_name: str) -> None:
+    """Test RGBA16F frames are viewed as half floats."""
+    frame = struct.pack(f"<{PIXELS * 4}e", *([0.5] * PIXELS * 4))
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGBA16F
+    ) as sender:
+        sender.send_buffer(frame)
+        with liru.Receiver(sender_name, backend="shm").acquire_frame() as lease:
+            assert (lease.data.format, lease.data[0, 0, 3]) == ("e", 0.5)
+
+
+def test_format_is_published(sender_name: str) -> None:
+    """Test the format survives a resize and is listed by the directory."""
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.BGRA8
+    ) as sender:
+        sender.resize(WIDTH * 2, HEIGHT)
+        assert sender.format is liru.PixelFormat.BGRA8
+        assert sender.send_buffer(bytes(PIXELS * 8))
+        with liru.SenderDirectory("shm") as directory:
+            assert directory[sender_name].format == liru.PixelFormat.BGRA8
+
+
+def test_invalid_format(sender_name: str) -> None:
+    """Test a sender rejects formats liru cannot carry."""
+    with pytest.raises(ValueError, match="Unsupported pixel format: 0"):
+        liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", format=0)
+
+
+def test_pool_and_capture_use_sender_format(sender_name: str) -> None:
+    """Test pooled buffers and captured frames take the sender's format."""
+    frame = bytes(range(PIXELS))
+    pool = liru.FramePool()
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.R8
+    ) as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        frames: queue.Queue[liru.Frame] = queue.Queue()
+        receiver.start_capture(frames.put)
+        try:
+            sender.send_buffer(frame)
+            captured = frames.get(timeout=5)
+            assert captured.data.shape == (HEIGHT, WIDTH, 1)
+            assert captured.data.tobytes() == frame
+        finally:
+            receiver.stop_capture()
+
+        with receiver.receive_into(pool) as pooled:
+            assert pooled.data.shape == (HEIGHT, WIDTH, 1)
+            assert pooled.data.tobytes() == frame
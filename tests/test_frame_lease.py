@@ -0,0 +1,132 @@
+"""Tests for borrowed zero-copy frames (Receiver.acquire_frame)."""
+
+import sys
+import types
+from collections.abc import Iterator
+
+import pytest
+
+import liru
+from liru import backends
+
+WIDTH = 8
+HEIGHT = 4
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+# Linux and Windows locks conflict within one process; lockf fallbacks do not
+in_process_fencing = pytest.mark.skipif(
+    not (sys.platform.startswith("linux") or sys.platform == "win32"),
+    reason="Slot locks only conflict between processes on this platform",
+)
+
+
+@pytest.fixture
+def sender(sender_name: str) -> Iterator[liru.Sender]:
+    """Fixture for a shared-memory sender that is released after the test."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        yield sender
+
+
+def test_acquire_frame_view(sender: liru.Sender) -> None:
+    """Test the borrowed view has the frame's shape, content and number."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(b"\x01" * FRAME_BYTES)
+    sender.send_buffer(b"\x02" * FRAME_BYTES)
+
+    with receiver.acquire_frame() as frame:
+        assert frame.frame_number == 2
+        assert (frame.width, frame.height) == (WIDTH, HEIGHT)
+        assert frame.data.shape == (HEIGHT, WIDTH, 4)
+        assert frame.data.readonly
+        assert frame.data.tobytes() == b"\x02" * FRAME_BYTES
+    assert frame.released
+    assert not receiver.is_updated()
+
+
+def test_acquire_frame_numpy(sender: liru.Sender) -> None:
+    """Test NumPy can wrap the borrowed view without copying."""
+    np = pytest.importorskip("numpy")
+    receiver = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(np.full((HEIGHT, WIDTH, 4), 9, dtype=np.uint8))
+
+    with receiver.acquire_frame() as frame:
+        pixels = np.asarray(frame.data)
+        assert pixels.shape == (HEIGHT, WIDTH, 4)
+        assert not pixels.flags.writeable
+        assert int(pixels.sum()) == 9 * FRAME_BYTES
+        del pixels
+
+
+def test_data_invalid_after_release(sender: liru.Sender) -> None:
+    """Test the view cannot be used after the frame is released."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(b"\0" * FRAME_BYTES)
+
+    frame = receiver.acquire_frame()
+    frame.release()
+    frame.release()  # Idempotent
+    with pytest.raises(RuntimeError, match="Frame has been released"):
+        _ = frame.data
+
+
+@in_process_fencing
+def test_lease_fences_writer(sender: liru.Sender) -> None:
+    """Test the sender cannot overwrite a borrowed frame."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    assert sender.send_buffer(b"\x01" * FRAME_BYTES)
+
+    with receiver.acquire_frame() as frame:
+        assert not sender.send_buffer(b"\x02" * FRAME_BYTES)
+        assert frame.data.tobytes() == b"\x01" * FRAME_BYTES
+    assert sender.send_buffer(b"\x03" * FRAME_BYTES)
+
+
+@in_process_fencing
+def test_concurrent_leases(sender: liru.Sender) -> None:
+    """Test several receivers can borrow the same frame at once."""
+    first = liru.Receiver(sender.name, backend="shm")
+    second = liru.Receiver(sender.name, backend="shm")
+    sender.send_buffer(b"\x04" * FRAME_BYTES)
+
+    with first.acquire_frame() as a, second.acquire_frame() as b:
+        assert a.frame_number == b.frame_number == 1
+        assert not sender.send_buffer(b"\x05" * FRAME_BYTES)
+    assert sender.send_buffer(b"\x05" * FRAME_BYTES)
+
+
+def test_acquire_before_first_frame(sender: liru.Sender) -> None:
+    """Test acquiring before anything was sent raises RuntimeError."""
+    receiver = liru.Receiver(sender.name, backend="shm")
+    with pytest.raises(RuntimeError, match="No frame has been sent yet"):
+        receiver.acquire_frame()
+
+
+def test_acquire_without_sender() -> None:
+    """Test acquiring without a sender raises RuntimeError."""
+    with pytest.raises(RuntimeError, match="not available"):
+        liru.Receiver("Missing", backend="shm").acquire_frame()
+
+
+def test_staging_fallback(monkeypatch: pytest.MonkeyPatch, sender: liru.Sender) -> None:
+    """Test backends without shared CPU frames lend a staging copy."""
+    shm = backends.get_backend("shm")
+
+    class CopyingReceiver(shm.ReceiverWrapper):  # type: ignore[misc,name-defined]
+        acquire_frame = None
+
+    monkeypatch.setattr(backends, "_LOADERS", dict(backends._LOADERS))
+    copying = types.SimpleNamespace(
+        NAME="copying", SenderWrapper=shm.SenderWrapper, ReceiverWrapper=CopyingReceiver
+    )
+    backends.register_backend("copying", lambda: copying)  # type: ignore[arg-type,return-value]
+
+    receiver = liru.Receiver(sender.name, backend="copying")
+    sender.send_buffer(b"\x06" * FRAME_BYTES)
+    first = receiver.acquire_frame()
+    sender.send_buffer(b"\x07" * FRAME_BYTES)
+    with receiver.acquire_frame() as second:
+        # The first lease keeps its own buffer
+        assert first.data.tobytes() == b"\x06" * FRAME_BYTES
+        assert second.data.tobytes() == b"\x07" * FRAME_BYTES
+        assert second.frame_number == 2
+    first.release()
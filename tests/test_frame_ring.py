@@ -0,0 +1,179 @@
+"""Tests for the N-slot frame ring (Sender(..., slots=N))."""
+
+import multiprocessing
+import os
+import sys
+import threading
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import pytest
+from _helpers import solid_frame
+
+import liru
+from liru.backends import MAX_SLOTS, shm
+
+WIDTH = 32
+HEIGHT = 16
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+# Linux and Windows locks conflict within one process; lockf fallbacks do not
+in_process_fencing = pytest.mark.skipif(
+    not (sys.platform.startswith("linux") or sys.platform == "win32"),
+    reason="Slot locks only conflict between processes on this platform",
+)
+
+
+def test_slots_property(sender_name: str) -> None:
+    """Test slot count is stored and defaults to one."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        assert sender.slots == 1
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        assert sender.slots == 3
+        info = shm.read_segment_info(sender_name)
+        assert info is not None
+        assert info.slots == 3
+
+
+@pytest.mark.parametrize("slots", [0, -1, MAX_SLOTS + 1])
+def test_invalid_slot_count(sender_name: str, slots: int) -> None:
+    """Test out-of-range slot counts raise ValueError."""
+    with pytest.raises(ValueError, match="Slot count"):
+        liru.Sender(sender_name, WIDTH, HEIGHT, slots=slots, backend="shm")
+
+
+def test_slots_are_page_aligned(sender_name: str) -> None:
+    """Test each slot starts on its own page after the header."""
+    with liru.Sender(sender_name, 10, 10, slots=4, backend="shm"):
+        size = os.path.getsize(shm.segment_path(sender_name))
+        assert shm.slot_stride(400) == 4096
+        assert size == shm.HEADER_SIZE + 4 * 4096
+
+
+def test_receiver_reads_newest_frame(sender_name: str) -> None:
+    """Test receivers get the most recent frame whichever slot holds it."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(FRAME_BYTES)
+        for value in range(1, 8):
+            assert sender.send_buffer(solid_frame(value, FRAME_BYTES))
+            assert receiver.is_updated()
+            receiver.receive_into(out)
+            assert out == solid_frame(value, FRAME_BYTES)
+            assert not receiver.is_updated()
+        info = shm.read_segment_info(sender_name)
+        assert info is not None
+        assert info.frame == 7
+
+
+def test_acquire_newest_frame(sender_name: str) -> None:
+    """Test acquire_frame() lends the newest slot with its frame number."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=2, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        for value in range(1, 5):
+            sender.send_buffer(solid_frame(value, FRAME_BYTES))
+        with receiver.acquire_frame() as frame:
+            assert frame.frame_number == 4
+            assert frame.data.tobytes() == solid_frame(4, FRAME_BYTES)
+
+
+@in_process_fencing
+def test_sender_writes_around_borrowed_slot(sender_name: str) -> None:
+    """Test a borrowed frame stays intact while the sender keeps publishing."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        reader = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(FRAME_BYTES)
+        sender.send_buffer(solid_frame(1, FRAME_BYTES))
+        with receiver.acquire_frame() as frame:
+            for value in range(2, 10):
+                assert sender.send_buffer(solid_frame(value, FRAME_BYTES))
+                reader.receive_into(out)
+                assert out == solid_frame(value, FRAME_BYTES)
+            assert frame.data.tobytes() == solid_frame(1, FRAME_BYTES)
+
+
+@in_process_fencing
+def test_two_slots_drop_when_borrowed(sender_name: str) -> None:
+    """Test two slots allow one more frame while the latest is borrowed."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=2, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        sender.send_buffer(solid_frame(1, FRAME_BYTES))
+        with receiver.acquire_frame():
+            assert sender.send_buffer(solid_frame(2, FRAME_BYTES))
+            assert not sender.send_buffer(solid_frame(3, FRAME_BYTES))
+        assert sender.send_buffer(solid_frame(4, FRAME_BYTES))
+
+
+def test_threaded_stress_no_torn_frames(sender_name: str) -> None:
+    """Test a fast sender and slow receivers never observe a torn frame."""
+    frames = 2000
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        sender.send_buffer(solid_frame(0, FRAME_BYTES))
+        errors: list[str] = []
+
+        def consume() -> None:
+            receiver = liru.Receiver(sender_name, backend="shm")
+            out = bytearray(FRAME_BYTES)
+            last = 0
+            while not stop.is_set():
+                receiver.receive_into(out)
+                if out.count(out[0]) != FRAME_BYTES:
+                    errors.append("torn copy")
+                with receiver.acquire_frame() as frame:
+                    data = frame.data.tobytes()
+                    if data.count(data[0]) != FRAME_BYTES:
+                        errors.append("torn lease")
+                    if frame.frame_number < last:
+                        errors.append("frame number went backwards")
+                    last = frame.frame_number
+
+        stop = threading.Event()
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        for thread in consumers:
+            thread.start()
+        try:
+            for value in range(1, frames + 1):
+                sender.send_buffer(solid_frame(value, FRAME_BYTES))
+        finally:
+            stop.set()
+            for thread in consumers:
+                thread.join(30)
+        assert errors == []
+
+
+def _produce(shm_dir: str, name: str, frames: int, ready: Event, done: Event) -> None:
+    os.environ["LIRU_SHM_DIR"] = shm_dir
+    with liru.Sender(name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        sender.send_buffer(solid_frame(0, FRAME_BYTES))
+        ready.set()
+        for value in range(1, frames + 1):
+            sender.send_buffer(solid_frame(value, FRAME_BYTES))
+        done.wait(30)
+
+
+@pytest.mark.slow
+def test_cross_process_stress(shm_dir: Path, sender_name: str) -> None:
+    """Test a sender in another process never tears frames seen by a receiver."""
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    done = ctx.Event()
+    proc = ctx.Process(target=_produce, args=(str(shm_dir), sender_name, 5000, ready, done))
+    proc.start()
+    try:
+        assert ready.wait(30)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(FRAME_BYTES)
+        last = 0
+        while last < 5001:
+            receiver.receive_into(out)
+            assert out.count(out[0]) == FRAME_BYTES
+            with receiver.acquire_frame() as frame:
+                data = frame.data.tobytes()
+                assert data.count(data[0]) == FRAME_BYTES
+                assert frame.frame_number >= last
+                last = frame.frame_number
+    finally:
+        done.set()
+        proc.join(30)
+    assert proc.exitcode == 0
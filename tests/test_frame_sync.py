@@ -0,0 +1,150 @@
+"""Tests for frame-sync waits (Sender.enable_frame_sync, Receiver.wait_for_frame)."""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import pytest
+
+import liru
+from liru.backends import _futex, shm
+
+WIDTH = 8
+HEIGHT = 8
+FRAME = bytes(WIDTH * HEIGHT * 4)
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Futex wake-ups are Linux-only"
+)
+
+
+def test_enable_frame_sync(sender_name: str) -> None:
+    """Test frame sync is opt-in and recorded in the segment header."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        assert not sender.frame_sync
+        sender.enable_frame_sync()
+        assert sender.frame_sync
+        path = Path(shm.segment_path(sender_name))
+        assert int.from_bytes(path.read_bytes()[8:12], "little") & shm.FLAG_FRAME_SYNC
+        sender.enable_frame_sync(False)
+        assert not sender.frame_sync
+
+
+def test_enable_frame_sync_after_release(sender_name: str) -> None:
+    """Test enabling frame sync on a released sender raises."""
+    sender = liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm")
+    sender.release()
+    with pytest.raises(RuntimeError, match="released"):
+        sender.enable_frame_sync()
+
+
+def test_wait_returns_pending_frame(sender_name: str) -> None:
+    """Test a frame sent before waiting is reported at once."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        sender.send_buffer(FRAME)
+        assert receiver.wait_for_frame(timeout=0)
+        receiver.receive_into(bytearray(FRAME))
+        assert not receiver.wait_for_frame(timeout=0)
+
+
+def test_wait_times_out(sender_name: str) -> None:
+    """Test wait_for_frame() returns False after the timeout."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        receiver = liru.Receiver(sender_name, backend="shm")
+        start = time.monotonic()
+        assert not receiver.wait_for_frame(timeout=0.05)
+        assert time.monotonic() - start >= 0.045
+
+
+def test_negative_timeout(sender_name: str) -> None:
+    """Test negative timeouts are rejected."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with pytest.raises(ValueError, match="negative"):
+        receiver.wait_for_frame(timeout=-1)
+
+
+def test_wait_for_missing_sender(sender_name: str) -> None:
+    """Test waiting for a sender that does not exist times out."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    assert not receiver.wait_for_frame(timeout=0.01)
+
+
+@pytest.mark.parametrize("frame_sync", [True, False])
+def test_wait_wakes_on_send(sender_name: str, frame_sync: bool) -> None:
+    """Test a waiting receiver wakes when a frame is sent, with or without sync."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync(frame_sync)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        timer = threading.Timer(0.05, sender.send_buffer, args=(FRAME,))
+        timer.start()
+        try:
+            start = time.monotonic()
+            assert receiver.wait_for_frame(timeout=5)
+            assert time.monotonic() - start < 2
+        finally:
+            timer.join()
+
+
+def test_wait_wakes_several_receivers(sender_name: str) -> None:
+    """Test one frame wakes every waiting receiver."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        results: list[bool] = []
+
+        def wait() -> None:
+            results.append(liru.Receiver(sender_name, backend="shm").wait_for_frame(5))
+
+        threads = [threading.Thread(target=wait) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        sender.send_buffer(FRAME)
+        for thread in threads:
+            thread.join(10)
+        assert results == [True] * 4
+
+
+@linux_only
+def test_wait_does_not_spin(sender_name: str) -> None:
+    """Test an idle wait sleeps in the kernel rather than burning CPU."""
+    assert _futex.AVAILABLE
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        receiver = liru.Receiver(sender_name, backend="shm")
+        cpu = time.thread_time()
+        assert not receiver.wait_for_frame(timeout=0.3)
+        assert time.thread_time() - cpu < 0.05
+
+
+def _send_later(shm_dir: str, name: str, ready: Event, go: Event) -> None:
+    os.environ["LIRU_SHM_DIR"] = shm_dir
+    with liru.Sender(name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        ready.set()
+        go.wait(30)
+        time.sleep(0.05)
+        sender.send_buffer(FRAME)
+        time.sleep(0.5)  # Keep the segment alive while the parent wakes
+
+
+def test_cross_process_wake(shm_dir: Path, sender_name: str) -> None:
+    """Test a sender in another process wakes a waiting receiver."""
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    go = ctx.Event()
+    proc = ctx.Process(target=_send_later, args=(str(shm_dir), sender_name, ready, go))
+    proc.start()
+    try:
+        assert ready.wait(30)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        go.set()
+        assert receiver.wait_for_frame(timeout=10)
+    finally:
+        proc.join(30)
+    assert proc.exitcode == 0
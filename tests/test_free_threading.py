@@ -0,0 +1,141 @@
+"""Multi-threaded stress tests (thread safety, free-threaded CPython)."""
+
+import sys
+import sysconfig
+import threading
+from collections.abc import Callable
+
+import pytest
+from _helpers import solid_frame
+
+import liru
+from liru.backends import shm
+
+WIDTH = 32
+HEIGHT = 16
+FRAME_BYTES = WIDTH * HEIGHT * 4
+THREADS = 8
+
+free_threaded_only = pytest.mark.skipif(
+    not sysconfig.get_config_var("Py_GIL_DISABLED"), reason="Needs a free-threaded build"
+)
+
+
+def _run_threads(target: Callable[[int], None], count: int = THREADS) -> list[BaseException]:
+    """Start count threads on target(index) together and collect their errors."""
+    errors: list[BaseException] = []
+    barrier = threading.Barrier(count)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    return errors
+
+
+@free_threaded_only
+def test_import_keeps_gil_disabled() -> None:
+    """Test importing liru does not re-enable the GIL."""
+    import liru.backends.shm  # noqa: F401
+
+    assert not sys._is_gil_enabled()
+
+
+def test_sender_per_thread(sender_name: str) -> None:
+    """Test one sender per thread, each read back intact by its own receiver."""
+
+    def run(index: int) -> None:
+        name = f"{sender_name}{index}"
+        with liru.Sender(name, WIDTH, HEIGHT, slots=2, backend="shm") as sender:
+            receiver = liru.Receiver(name, backend="shm")
+            out = bytearray(FRAME_BYTES)
+            for value in range(1, 300):
+                assert sender.send_buffer(solid_frame(index + value, FRAME_BYTES))
+                receiver.receive_into(out)
+                assert out == solid_frame(index + value, FRAME_BYTES)
+            info = shm.read_segment_info(name)
+            assert info is not None
+            assert info.frame == 299
+
+    assert _run_threads(run) == []
+
+
+def test_shared_sender_counts_every_frame(sender_name: str) -> None:
+    """Test concurrent sends on one sender publish each frame exactly once."""
+    sent = [0] * THREADS
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+
+        def run(index: int) -> None:
+            for _ in range(500):
+                sent[index] += sender.send_buffer(solid_frame(index, FRAME_BYTES))
+
+        assert _run_threads(run) == []
+        info = shm.read_segment_info(sender_name)
+        assert info is not None
+        assert info.frame == sum(sent) == THREADS * 500
+
+
+def test_shared_receiver_never_tears(sender_name: str) -> None:
+    """Test threads sharing one receiver each copy whole frames."""
+    stop = threading.Event()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        sender.send_buffer(solid_frame(0, FRAME_BYTES))
+        receiver = liru.Receiver(sender_name, backend="shm")
+
+        def produce() -> None:
+            value = 1
+            while not stop.is_set():
+                sender.send_buffer(solid_frame(value, FRAME_BYTES))
+                value += 1
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+
+        def run(index: int) -> None:
+            out = bytearray(FRAME_BYTES)
+            for _ in range(300):
+                receiver.receive_into(out)
+                assert out.count(out[0]) == FRAME_BYTES
+                receiver.is_updated()
+                assert receiver.width == WIDTH
+
+        try:
+            assert _run_threads(run) == []
+        finally:
+            stop.set()
+            producer.join(30)
+
+
+def test_release_during_sends(sender_name: str) -> None:
+    """Test release() racing sends leaves every send finished or refused."""
+    sender = liru.Sender(sender_name, WIDTH, HEIGHT, slots=2, backend="shm")
+    started = threading.Barrier(THREADS + 1)
+    refused: list[str] = []
+
+    def run(index: int) -> None:
+        started.wait()
+        while True:
+            try:
+                sender.send_buffer(solid_frame(index, FRAME_BYTES))
+            except RuntimeError as e:
+                refused.append(str(e))
+                return
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    sender.release()
+    for thread in threads:
+        thread.join(30)
+    assert len(refused) == THREADS
+    assert all("released" in message for message in refused)
+    assert shm.read_segment_info(sender_name) is None
@@ -0,0 +1,231 @@
+"""Tests for batched receive (liru.ReceiverGroup)."""
+
+from array import array
+
+import pytest
+
+import liru
+
+WIDTH = 8
+HEIGHT = 4
+FRAME_SIZE = WIDTH * HEIGHT * 4
+
+
+def _senders(sender_name: str, count: int) -> list[liru.Sender]:
+    return [liru.Sender(f"{sender_name}{i}", WIDTH, HEIGHT, backend="shm") for i in range(count)]
+
+
+def test_poll_into_receives_only_updated_members(sender_name: str) -> None:
+    """Test poll_into() copies the updated members and reports only them."""
+    senders = _senders(sender_name, 3)
+    try:
+        with liru.ReceiverGroup([s.name for s in senders], backend="shm") as group:
+            buffers = [bytearray(FRAME_SIZE) for _ in group]
+            assert len(group.poll_into(buffers)) == 0
+
+            senders[0].send_buffer(bytes([1]) * FRAME_SIZE)
+            senders[2].send_buffer(bytes([3]) * FRAME_SIZE)
+            updates = group.poll_into(buffers)
+            assert updates.tolist() == [0, WIDTH, HEIGHT, 2, WIDTH, HEIGHT]
+            assert buffers[0] == bytes([1]) * FRAME_SIZE
+            assert buffers[1] == bytes(FRAME_SIZE)
+            assert buffers[2] == bytes([3]) * FRAME_SIZE
+            assert group[2].metadata.frame == 1
+
+            # Received frames are not reported again
+            assert len(group.poll_into(buffers)) == 0
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_poll_into_skips_none_and_closed_members(sender_name: str) -> None:
+    """Test None buffers and closed senders are left out of the result."""
+    senders = _senders(sender_name, 2)
+    with liru.ReceiverGroup([s.name for s in senders], backend="shm") as group:
+        buffers: list[bytearray | None] = [None, bytearray(FRAME_SIZE)]
+        senders[0].send_buffer(bytes(FRAME_SIZE))
+        senders[1].send_buffer(bytes(FRAME_SIZE))
+        assert group.poll_into(buffers).tolist() == [1, WIDTH, HEIGHT]
+
+        for sender in senders:
+            sender.release()
+        assert len(group.poll_into([bytearray(FRAME_SIZE)] * 2)) == 0
+
+
+def test_poll_into_skips_mismatched_buffer(sender_name: str) -> None:
+    """Test a member whose buffer does not match its sender is left out."""
+    senders = _senders(sender_name, 2)
+    try:
+        with liru.ReceiverGroup([s.name for s in senders], backend="shm") as group:
+            for sender in senders:
+                sender.send_buffer(bytes(FRAME_SIZE))
+            updates = group.poll_into([bytearray(FRAME_SIZE // 2), bytearray(FRAME_SIZE)])
+            assert updates.tolist() == [1, WIDTH, HEIGHT]
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_poll_argument_errors(sender_name: str) -> None:
+    """Test the targets must match the members one to one."""
+    senders = _senders(sender_name, 2)
+    try:
+        with liru.ReceiverGroup([s.name for s in senders], backend="shm") as group:
+            senders[0].send_buffer(bytes(FRAME_SIZE))
+            with pytest.raises(ValueError, match="Expected 2 buffers"):
+                group.poll_into([bytearray(FRAME_SIZE)])
+            with pytest.raises(TypeError):
+                group.poll_into([object(), None])  # type: ignore[list-item]
+            with pytest.raises(ValueError, match="Expected 2 texture IDs"):
+                group.poll([1])
+            with pytest.raises(RuntimeError, match="GPU backend"):
+                group.poll([1, 2])
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_members_are_receivers(sender_name: str) -> None:
+    """Test members are ordinary receivers in the given order."""
+    names = [f"{sender_name}{i}" for i in range(3)]
+    with liru.ReceiverGroup(iter(names), backend="shm") as group:
+        assert len(group) == 3
+        assert group.sender_names == names
+        assert all(isinstance(r, liru.Receiver) for r in group)
+        assert group[1] is group.receivers[1]
+        assert group.backend == "shm"
+        assert repr(group) == "ReceiverGroup(backend='shm', receivers=3)"
+
+
+def test_invalid_sender_names() -> None:
+    """Test empty groups and empty names are rejected."""
+    with pytest.raises(ValueError, match="at least one"):
+        liru.ReceiverGroup([], backend="shm")
+    with pytest.raises(ValueError, match="cannot be empty"):
+        liru.ReceiverGroup(["Source", ""], backend="shm")
+
+
+def test_groups_take_buffers_of_the_member_format(sender_name: str) -> None:
+    """Test float frames of RGBA32F members go through both groups, checked per member."""
+    senders = [
+        liru.Sender(f"{sender_name}{i}", WIDTH, HEIGHT, backend="shm", format=fmt)
+        for i, fmt in enumerate([liru.PixelFormat.RGBA32F, liru.PixelFormat.RGBA8])
+    ]
+    try:
+        frame = array("f", (i / 4 for i in range(WIDTH * HEIGHT * 4)))
+        result = liru.SenderGroup(senders).send([frame, bytes(FRAME_SIZE)])
+        assert result.all_sent
+        with pytest.raises(ValueError, match="1-byte items"):
+            liru.SenderGroup(senders).send([None, frame])
+
+        with liru.ReceiverGroup([s.name for s in senders], backend="shm") as group:
+            target = array("f", bytes(len(frame) * 4))
+            assert group.poll_into([target, None]).tolist() == [0, WIDTH, HEIGHT]
+            assert target == frame
+            with pytest.raises(ValueError, match="read-only"):
+                group.poll_into([bytes(len(frame) * 4), None])
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+@pytest.mark.gpu
+def test_spout_poll_reports_every_frame(sender_name: str) -> None:
+    """Test the Spout group reports each frame sent at a fixed size."""
+    if "spout" not in liru.available_backends():
+        pytest.skip("Needs the Spout backend")
+    moderngl = pytest.importorskip("moderngl")
+    ctx = moderngl.create_standalone_context()
+    try:
+        source = ctx.texture((WIDTH, HEIGHT), 4)
+        target = ctx.texture((WIDTH, HEIGHT), 4)
+        with (
+            liru.Sender(sender_name, WIDTH, HEIGHT, backend="spout") as sender,
+            liru.ReceiverGroup([sender_name], backend="spout") as group,
+        ):
+            for value in range(1, 6):
+                source.write(bytes([value]) * FRAME_SIZE)
+                sender.send_texture(source.glo)
+                assert group.poll([target.glo]).tolist() == [0, WIDTH, HEIGHT]
+                assert target.read() == bytes([value]) * FRAME_SIZE
+
+            buffer = bytearray(FRAME_SIZE)
+            for value in range(6, 11):
+                sender.send_buffer(bytes([value]) * FRAME_SIZE)
+                assert group.poll_into([buffer]).tolist() == [0, WIDTH, HEIGHT]
+                assert buffer == bytes([value]) * FRAME_SIZE
+    finally:
+        ctx.release()
+
+
+def test_sender_group_publishes_every_member(sender_name: str) -> None:
+    """Test send() publishes each member's buffer with shared metadata."""
+    senders = _senders(sender_name, 3)
+    try:
+        group = liru.SenderGroup(senders)
+        with liru.ReceiverGroup([s.name for s in senders], backend="shm") as receivers:
+            frames = [bytes([i + 1]) * FRAME_SIZE for i in range(3)]
+            result = group.send(frames, timestamp_ns=1234, payload=b"tc")
+            assert result.sent == 0b111
+            assert result.all_sent
+            assert result.failed() == []
+            assert len(result.member_ms) == 3
+            assert all(ms > 0 for ms in result.member_ms)
+            assert result.total_ms >= sum(result.member_ms)
+
+            buffers = [bytearray(FRAME_SIZE) for _ in receivers]
+            assert len(receivers.poll_into(buffers)) == 9
+            assert buffers == [bytearray(frame) for frame in frames]
+            assert {r.metadata.timestamp_ns for r in receivers} == {1234}
+            assert {r.metadata.payload for r in receivers} == {b"tc"}
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_sender_group_reports_failures_in_bitmask(sender_name: str) -> None:
+    """Test failing and skipped members are reported instead of raised."""
+    senders = _senders(sender_name, 4)
+    try:
+        group = liru.SenderGroup(senders)
+        senders[1].release()
+        frame = bytes(FRAME_SIZE)
+        result = group.send([frame, frame, bytes(FRAME_SIZE // 2), None])
+        assert result.sent == 0b0001
+        assert result.ok(0)
+        assert not result.ok(1)
+        assert result.failed() == [1, 2, 3]
+        assert not result.all_sent
+        assert result.member_ms[3] == 0.0
+
+        # Textures need a GPU backend
+        assert group.send([1, frame, 0, None]).failed() == [0, 1, 2, 3]
+    finally:
+        for sender in senders:
+            sender.release()
+
+
+def test_sender_group_errors(sender_name: str) -> None:
+    """Test invalid groups and batches raise."""
+    senders = _senders(sender_name, 2)
+    try:
+        with pytest.raises(ValueError, match="at least one"):
+            liru.SenderGroup([])
+        group = liru.SenderGroup(iter(senders))
+        assert len(group) == 2
+        assert list(group) == senders
+        assert group[1] is senders[1]
+        assert repr(group) == "SenderGroup(backend='shm', senders=2)"
+        with pytest.raises(ValueError, match="Expected 2 frames"):
+            group.send([None])
+        with pytest.raises(ValueError, match="Payload"):
+            group.send([None, None], payload=bytes(300))
+        with pytest.raises(ValueError, match="Timestamp"):
+            group.send([None, None], timestamp_ns=-1)
+        senders[0].release()
+        with pytest.raises(RuntimeError, match="released"):
+            liru.SenderGroup(senders)
+    finally:
+        for sender in senders:
+            sender.release()
@@ -0,0 +1,101 @@
+"""Tests for per-frame metadata (frame number, timestamp, payload)."""
+
+import queue
+import time
+
+import pytest
+
+import liru
+from liru.frame import MAX_PAYLOAD, METADATA_SIZE, pack_metadata, unpack_metadata
+
+WIDTH = 8
+HEIGHT = 8
+FRAME = bytes(WIDTH * HEIGHT * 4)
+
+
+def test_record_round_trip() -> None:
+    """Test a metadata record packs and unpacks unchanged."""
+    record = bytearray(METADATA_SIZE)
+    pack_metadata(record, 7, 123456789, b"scene-4")
+    assert unpack_metadata(record) == liru.FrameMetadata(7, 123456789, b"scene-4")
+
+
+def test_receive_into_returns_metadata(sender_name: str) -> None:
+    """Test receivers see the frame number, timestamp and payload of each frame."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert receiver.metadata == liru.FrameMetadata(0, 0, b"")
+
+        sender.send_buffer(FRAME, timestamp_ns=1000, payload=b"01:00:00:00")
+        receiver.receive_into(bytearray(len(FRAME)))
+        assert receiver.metadata == liru.FrameMetadata(1, 1000, b"01:00:00:00")
+
+        sender.send_buffer(FRAME, payload=bytearray(b"x" * MAX_PAYLOAD))
+        receiver.receive_into(bytearray(len(FRAME)))
+        assert receiver.metadata.frame == 2
+        assert receiver.metadata.payload == b"x" * MAX_PAYLOAD
+
+
+def test_default_timestamp_measures_age(sender_name: str) -> None:
+    """Test frames without a timestamp are stamped at send time."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        before = time.perf_counter_ns()
+        sender.send_buffer(FRAME)
+        with receiver.acquire_frame() as frame:
+            metadata = frame.metadata
+        assert before <= metadata.timestamp_ns <= time.perf_counter_ns()
+        assert metadata.frame == frame.frame_number == 1
+        assert metadata.age_ms() >= 0.0
+        assert metadata.age_ms(metadata.timestamp_ns + 2_500_000) == 2.5
+
+
+def test_repeated_frame_has_same_number(sender_name: str) -> None:
+    """Test receiving twice without a new send reports the same frame."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=2, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(len(FRAME))
+        sender.send_buffer(FRAME, payload=b"a")
+        receiver.receive_into(out)
+        first = receiver.metadata
+        receiver.receive_into(out)
+        assert receiver.metadata == first
+        sender.send_buffer(FRAME, payload=b"b")
+        receiver.receive_into(out)
+        assert receiver.metadata.frame == first.frame + 1
+        assert receiver.metadata.payload == b"b"
+
+
+def test_metadata_reaches_capture(sender_name: str) -> None:
+    """Test captured frames carry their metadata."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        with liru.Receiver(sender_name, backend="shm") as receiver:
+            frames: queue.Queue[liru.Frame] = queue.Queue()
+            receiver.start_capture(frames)
+            deadline = time.monotonic() + 5
+            frame = None
+            while frame is None and time.monotonic() < deadline:
+                sender.send_buffer(FRAME, payload=b"cap")
+                try:
+                    frame = frames.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            assert frame is not None
+            assert frame.metadata.payload == b"cap"
+            assert frame.metadata.frame == frame.frame_number
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"payload": bytes(MAX_PAYLOAD + 1)}, "Payload is 233 bytes"),
+        ({"timestamp_ns": 0}, "Timestamp must be positive"),
+        ({"timestamp_ns": -5}, "Timestamp must be positive"),
+    ],
+)
+def test_invalid_metadata(sender_name: str, kwargs: dict[str, int | bytes], message: str) -> None:
+    """Test oversized payloads and non-positive timestamps raise ValueError."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        with pytest.raises(ValueError, match=message):
+            sender.send_buffer(FRAME, **kwargs)  # type: ignore[arg-type]
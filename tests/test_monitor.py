@@ -0,0 +1,142 @@
+"""Tests for shared stats blocks (publish_stats, liru.monitor)."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import liru
+from liru import monitor
+from liru.stats import ROLE_SENDER, STATS_BLOCK_SIZE, write_stats_block
+
+WIDTH = 8
+HEIGHT = 8
+FRAME = bytes(WIDTH * HEIGHT * 4)
+
+
+def test_no_block_by_default(sender_name: str) -> None:
+    """Test senders and receivers publish nothing unless asked to."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        with liru.Receiver(sender_name, backend="shm") as receiver:
+            assert sender.stats_block is None
+            assert receiver.stats_block is None
+            assert monitor.list_stats_blocks() == []
+
+
+def test_env_enables_publishing(sender_name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test LIRU_PUBLISH_STATS turns publishing on by default."""
+    monkeypatch.setenv(monitor.PUBLISH_ENV, "1")
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        assert sender.stats_block is not None
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", publish_stats=False) as sender:
+        assert sender.stats_block is None
+
+
+def test_sender_block_counters(sender_name: str) -> None:
+    """Test a sender block identifies the sender and follows its sends."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", publish_stats=True) as sender:
+        (path,) = monitor.list_stats_blocks()
+        block = monitor.StatsBlock.open(path)
+        assert block is not None
+        with block:
+            record = block.read()
+            assert record.role == "sender"
+            assert record.pid == os.getpid()
+            assert record.name == sender_name
+            assert (record.width, record.height) == (WIDTH, HEIGHT)
+            assert record.frames == 0
+
+            for _ in range(5):
+                sender.send_buffer(FRAME)
+            record = block.read()
+            stats = sender.stats()
+            assert record.frames == stats.frames == 5
+            assert record.dropped == 0
+            assert record.last_latency_ms == sender.last_send_time_ms
+            assert record.peak_latency_ms >= record.last_latency_ms
+            assert record.last_frame_ns >= record.created_ns
+            assert record.fps > 0
+
+
+def test_receiver_block_counts_dropped(sender_name: str) -> None:
+    """Test a receiver block counts frames it never saw."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        with liru.Receiver(sender_name, backend="shm", publish_stats=True) as receiver:
+            assert receiver.stats_block is not None
+            out = bytearray(len(FRAME))
+            sender.send_buffer(FRAME)
+            receiver.receive_into(out)
+            for _ in range(3):
+                sender.send_buffer(FRAME)
+            receiver.receive_into(out)
+            record = receiver.stats_block.read()
+            assert record.role == "receiver"
+            assert record.name == sender_name
+            assert record.frames == 2
+            assert record.dropped == 2
+
+
+def test_peak_latency_is_kept() -> None:
+    """Test the block keeps the largest latency ever published."""
+    with monitor.StatsBlock.create(ROLE_SENDER, "Peak") as block:
+        for latency in (1.0, 5.0, 2.0):
+            write_stats_block(block.buffer, 1, 0, latency, 60.0, 4, 4)
+        record = block.read()
+        assert record.last_latency_ms == 2.0
+        assert record.peak_latency_ms == 5.0
+
+
+def test_block_removed_on_release(sender_name: str) -> None:
+    """Test releasing the sender removes its block."""
+    sender = liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", publish_stats=True)
+    assert sender.stats_block is not None
+    path = sender.stats_block.path
+    assert os.path.exists(path)
+    sender.release()
+    assert sender.stats_block is None
+    assert not os.path.exists(path)
+    assert monitor.list_stats_blocks() == []
+
+
+def test_closed_block_read_raises() -> None:
+    """Test reading a closed block raises ValueError."""
+    block = monitor.StatsBlock.create(ROLE_SENDER, "Closed")
+    block.close()
+    assert block.closed
+    with pytest.raises(ValueError, match="closed"):
+        block.read()
+
+
+def test_monitor_in_other_process(sender_name: str) -> None:
+    """Test another process reads the counters without attaching to the sender."""
+    script = (
+        "from liru import monitor\n"
+        "for block in monitor.open_stats_blocks():\n"
+        "    record = block.read()\n"
+        "    print(record.role, record.name, record.frames)\n"
+        "    block.close()\n"
+    )
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", publish_stats=True) as sender:
+        for _ in range(3):
+            sender.send_buffer(FRAME)
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+    assert output.split() == ["sender", sender_name, "3"]
+
+
+def test_numpy_view(sender_name: str) -> None:
+    """Test the NumPy structured view aliases the live block."""
+    np = pytest.importorskip("numpy")
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", publish_stats=True) as sender:
+        assert sender.stats_block is not None
+        view = sender.stats_block.view()
+        assert view.dtype.itemsize == STATS_BLOCK_SIZE
+        assert view["magic"][0] == b"LSTB"
+        sender.send_buffer(FRAME)
+        sender.send_buffer(FRAME)
+        assert view["frames"][0] == 2
+        assert view["width"][0] == WIDTH
+        assert np.isclose(view["last_latency_ms"][0], sender.last_send_time_ms)
+        del view
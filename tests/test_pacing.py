@@ -0,0 +1,88 @@
+"""Tests for sender frame pacing (Sender.pace, liru.pacing)."""
+
+import time
+
+import pytest
+
+import liru
+from liru.pacing import FramePacer
+
+FPS = 100.0
+PERIOD_S = 1.0 / FPS
+
+
+def test_pace_holds_cadence(sender_name: str) -> None:
+    """Test pace() holds the target rate without drifting."""
+    with liru.Sender(sender_name, 8, 8, backend="shm", target_fps=FPS) as sender:
+        frame = bytes(8 * 8 * 4)
+        assert sender.pace()  # Starts the cadence
+        start = time.perf_counter()
+        frames = 20
+        for _ in range(frames):
+            sender.pace()
+            sender.send_buffer(frame)
+        elapsed = time.perf_counter() - start
+        # Deadlines are on a grid, so the total never drifts past a period
+        assert frames * PERIOD_S - 0.001 <= elapsed < (frames + 1) * PERIOD_S + 0.02
+        assert sender.target_fps == FPS
+
+
+def test_pace_reports_missed_deadlines(sender_name: str) -> None:
+    """Test a late pace() counts a miss and restarts the cadence."""
+    with liru.Sender(sender_name, 8, 8, backend="shm", target_fps=FPS) as sender:
+        sender.pace()
+        time.sleep(3 * PERIOD_S)
+        assert not sender.pace()
+        assert sender.missed_deadlines == 1
+
+        # Restarted from the late call: the next frame waits a full period
+        start = time.perf_counter()
+        assert sender.pace()
+        assert time.perf_counter() - start >= PERIOD_S - 0.001
+
+
+def test_pace_without_target_fps(sender_name: str) -> None:
+    """Test pace() returns at once without a target and can be switched on."""
+    with liru.Sender(sender_name, 8, 8, backend="shm") as sender:
+        assert sender.target_fps is None
+        assert sender.pace()
+        assert sender.pace()
+        assert sender.missed_deadlines == 0
+
+        sender.target_fps = FPS
+        assert sender.target_fps == FPS
+        sender.pace()
+        time.sleep(3 * PERIOD_S)
+        sender.pace()
+        sender.target_fps = None  # Misses of the old pacer are kept
+        assert sender.missed_deadlines == 1
+        assert sender.pace()
+
+
+def test_invalid_target_fps(sender_name: str) -> None:
+    """Test target_fps must be positive."""
+    with pytest.raises(ValueError, match="Target FPS"):
+        liru.Sender(sender_name, 8, 8, backend="shm", target_fps=0)
+    with liru.Sender(sender_name, 8, 8, backend="shm") as sender:
+        with pytest.raises(ValueError, match="Target FPS"):
+            sender.target_fps = -60.0
+
+
+def test_pace_after_release(sender_name: str) -> None:
+    """Test pace() on a released sender raises."""
+    sender = liru.Sender(sender_name, 8, 8, backend="shm", target_fps=FPS)
+    sender.release()
+    with pytest.raises(RuntimeError, match="released"):
+        sender.pace()
+
+
+def test_frame_pacer_reset() -> None:
+    """Test reset() restarts the cadence without waiting."""
+    pacer = FramePacer(FPS)
+    assert pacer.get_fps() == FPS
+    assert pacer.wait()
+    pacer.reset()
+    start = time.perf_counter()
+    assert pacer.wait()
+    assert time.perf_counter() - start < PERIOD_S / 2
+    assert pacer.get_missed() == 0
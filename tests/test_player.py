@@ -0,0 +1,138 @@
+"""Tests for playing recordings back (liru.Player)."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import liru
+
+WIDTH = 16
+HEIGHT = 8
+PERIOD_NS = 20_000_000  # Recorded 50 fps
+
+
+def _record(
+    path: Path,
+    sizes: list[tuple[int, int]],
+    fmt: int = liru.PixelFormat.RGBA8,
+    period_ns: int = PERIOD_NS,
+) -> None:
+    """Write a recording of frames filled with their position."""
+    receiver = liru.Receiver("Unused", backend="shm")
+    with liru.Recorder(receiver, path, capture=False) as recorder:
+        for index, (width, height) in enumerate(sizes):
+            size = width * height * liru.PixelFormat(fmt).bytes_per_pixel
+            data = memoryview(bytes([index]) * size)
+            metadata = liru.FrameMetadata(index + 1, (index + 1) * period_ns, b"cue%d" % index)
+            shape = (height, width, liru.PixelFormat(fmt).components)
+            frame = liru.Frame(data.cast("B", shape), index + 1, None, metadata, fmt)
+            assert recorder.write(frame)
+
+
+def test_plays_frames_with_payloads(sender_name: str, tmp_path: Path) -> None:
+    """Test every frame is published with its recorded payload, then playback stops."""
+    path = tmp_path / "show.liru"
+    _record(path, [(WIDTH, HEIGHT)] * 3)
+    with liru.Player(path, sender_name, backend="shm") as player:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = bytearray(WIDTH * HEIGHT * 4)
+        for index in range(3):
+            assert player.step()
+            receiver.receive_into(target)
+            assert target == bytes([index]) * len(target)
+            assert receiver.metadata.payload == b"cue%d" % index
+            assert receiver.metadata.frame == index + 1
+        assert not player.step()
+        assert player.position == player.frames == 3
+
+
+def test_follows_recorded_timestamps(sender_name: str, tmp_path: Path) -> None:
+    """Test frames keep their recorded spacing, and a fixed rate overrides it."""
+    path = tmp_path / "timed.liru"
+    _record(path, [(WIDTH, HEIGHT)] * 5)
+    with liru.Player(path, sender_name, backend="shm") as player:
+        start = time.perf_counter()
+        assert player.play() == 5
+        assert time.perf_counter() - start >= 4 * PERIOD_NS / 1e9 * 0.95
+
+    with liru.Player(path, sender_name, backend="shm", fps=500) as player:
+        start = time.perf_counter()
+        assert player.play() == 5
+        assert time.perf_counter() - start < 4 * PERIOD_NS / 1e9
+
+
+def test_stop_and_close_end_a_long_wait(sender_name: str, tmp_path: Path) -> None:
+    """Test stop() and close() cut short the wait for a frame recorded far ahead."""
+    path = tmp_path / "gap.liru"
+    _record(path, [(WIDTH, HEIGHT)] * 2, period_ns=30_000_000_000)
+    with liru.Player(path, sender_name, backend="shm") as player:
+        sent: list[int] = []
+        thread = threading.Thread(target=lambda: sent.append(player.play()))
+        thread.start()
+        time.sleep(0.2)  # First frame sent, waiting 30 s for the second
+        player.stop()
+        thread.join(2.0)
+        assert not thread.is_alive()
+        assert sent == [1]
+        assert player.position == 1  # The second frame is still to come
+
+        thread = threading.Thread(target=player.step)
+        thread.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        player.close()
+        assert time.perf_counter() - start < 2.0
+        thread.join(2.0)
+        assert not thread.is_alive()
+
+
+def test_loop_and_seek(sender_name: str, tmp_path: Path) -> None:
+    """Test looping wraps to the first frame and seeking moves the position."""
+    path = tmp_path / "loop.liru"
+    _record(path, [(WIDTH, HEIGHT)] * 3)
+    with liru.Player(path, sender_name, backend="shm", fps=1000, loop=True) as player:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = bytearray(WIDTH * HEIGHT * 4)
+        assert player.play(7) == 7
+        receiver.receive_into(target)
+        assert target[0] == 0  # Frames 0, 1, 2, 0, 1, 2, 0
+        assert player.position == 1
+
+        player.seek(-1)
+        assert player.step()
+        receiver.receive_into(target)
+        assert target[0] == 2
+        with pytest.raises(IndexError):
+            player.seek(3)
+
+
+def test_follows_size_and_format_changes(sender_name: str, tmp_path: Path) -> None:
+    """Test the sender is resized, and recreated for another format."""
+    path = tmp_path / "sizes.liru"
+    _record(path, [(WIDTH, HEIGHT), (4, 2)])
+    with liru.Player(path, sender_name, backend="shm", fps=1000) as player:
+        player.play()
+        assert (player.sender.width, player.sender.height) == (4, 2)
+        assert player.sender.generation == 1
+
+    path = tmp_path / "r8.liru"
+    _record(path, [(WIDTH, HEIGHT)], liru.PixelFormat.R8)
+    with liru.Player(path, sender_name, backend="shm") as player:
+        assert player.sender.format == liru.PixelFormat.R8
+        player.step()
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert receiver.receive_into(bytearray(WIDTH * HEIGHT)) == (WIDTH, HEIGHT)
+
+
+def test_invalid_arguments(sender_name: str, tmp_path: Path) -> None:
+    """Test empty recordings and invalid options are rejected."""
+    path = tmp_path / "empty.liru"
+    _record(path, [])
+    with pytest.raises(ValueError, match="has no frames"):
+        liru.Player(path, sender_name, backend="shm")
+    with pytest.raises(ValueError, match="must be positive"):
+        liru.Player(path, sender_name, backend="shm", fps=0)
+    with pytest.raises(ValueError, match="cannot be negative"):
+        liru.Player(path, sender_name, backend="shm", readahead=-1)
@@ -0,0 +1,141 @@
+"""Tests for FramePool and receiving into pooled targets."""
+
+import mmap
+import sys
+
+import pytest
+
+import liru
+from liru.backends import _futex
+
+WIDTH = 64
+HEIGHT = 32
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+
+def test_pool_reuses_buffers() -> None:
+    """Test a released buffer is handed out again for the same size."""
+    pool = liru.FramePool()
+    first = pool.acquire(WIDTH, HEIGHT)
+    assert first.data.shape == (HEIGHT, WIDTH, 4)
+    address = _futex.buffer_address(first.data)
+    assert address % mmap.PAGESIZE == 0
+    first.release()
+    first.release()  # Idempotent
+
+    with pool.acquire(WIDTH, HEIGHT) as second:
+        assert _futex.buffer_address(second.data) == address
+        with pool.acquire(WIDTH, HEIGHT) as third:
+            assert _futex.buffer_address(third.data) != address
+    with pool.acquire(WIDTH * 2, HEIGHT):
+        pass
+
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 3, 0)
+    assert (stats.in_use, stats.bytes_in_use) == (0, 0)
+    assert (stats.pooled, stats.bytes_pooled) == (3, 4 * FRAME_BYTES)
+
+    pool.clear()
+    assert pool.stats().pooled == 0
+    assert pool.stats().evictions == 3
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs Python 3.12")
+def test_pooled_buffer_protocol() -> None:
+    """Test a pooled buffer exposes its pixels through the buffer protocol."""
+    with liru.FramePool().acquire(WIDTH, HEIGHT) as buffer:
+        view = memoryview(buffer)
+        assert (view.shape, view.readonly) == ((HEIGHT, WIDTH, 4), False)
+        view[0, 0, 0] = 255
+        assert buffer.data[0, 0, 0] == 255
+        view.release()
+
+
+def test_pool_evicts_least_recently_released() -> None:
+    """Test pooled buffers over the byte budget are freed oldest first."""
+    pool = liru.FramePool(max_bytes=2 * FRAME_BYTES)
+    small = pool.acquire(WIDTH, HEIGHT)
+    other = pool.acquire(HEIGHT, WIDTH)
+    small.release()
+    other.release()
+    assert pool.stats().pooled == 2
+
+    # Needs the whole budget: both pooled buffers go, the oldest first
+    with pool.acquire(WIDTH * 2, HEIGHT):
+        stats = pool.stats()
+        assert (stats.pooled, stats.evictions) == (0, 2)
+        assert stats.bytes_in_use == 2 * FRAME_BYTES
+    stats = pool.stats()
+    assert (stats.pooled, stats.bytes_pooled) == (1, 2 * FRAME_BYTES)
+
+    with pytest.raises(ValueError, match="negative"):
+        liru.FramePool(max_bytes=-1)
+    with pytest.raises(ValueError, match="Invalid dimensions"):
+        pool.acquire(0, HEIGHT)
+    with pytest.raises(ValueError, match="Unsupported pixel format"):
+        pool.acquire(WIDTH, HEIGHT, format=11)
+
+
+def test_pool_textures() -> None:
+    """Test textures come from the factory, are reused and go to the deleter."""
+    created: list[tuple[int, int, int]] = []
+    deleted: list[int] = []
+
+    def factory(width: int, height: int, fmt: int) -> int:
+        created.append((width, height, fmt))
+        return len(created)
+
+    with pytest.raises(RuntimeError, match="texture_factory"):
+        liru.FramePool().acquire_texture(WIDTH, HEIGHT)
+
+    with liru.FramePool(texture_factory=factory, texture_deleter=deleted.append) as pool:
+        with pool.acquire_texture(WIDTH, HEIGHT) as texture:
+            assert texture.texture_id == 1
+        with pool.acquire_texture(WIDTH, HEIGHT) as texture:
+            assert texture.texture_id == 1
+        assert created == [(WIDTH, HEIGHT, liru.backends.shm.FORMAT_RGBA8)]
+        with pytest.raises(RuntimeError, match="PooledTexture has been released"):
+            _ = texture.texture_id
+        with pool.acquire(WIDTH, HEIGHT):
+            pass  # Buffers and textures of one size are pooled apart
+        assert pool.stats().pooled == 2
+    assert deleted == [1]
+
+    def failing(width: int, height: int, fmt: int) -> int:
+        raise OSError("out of video memory")
+
+    pool = liru.FramePool(texture_factory=failing)
+    with pytest.raises(RuntimeError, match="out of video memory"):
+        pool.acquire_texture(WIDTH, HEIGHT)
+    assert pool.stats().in_use == 0
+
+
+def test_receive_into_pool_follows_resize(sender_name: str) -> None:
+    """Test receive_into(pool) hands out a buffer of the sender's current size."""
+    pool = liru.FramePool()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        frame = bytes(range(256)) * (FRAME_BYTES // 256)
+        sender.send_buffer(frame)
+        with receiver.receive_into(pool) as buffer:
+            assert isinstance(buffer, liru.PooledBuffer)
+            assert bytes(buffer.data) == frame
+
+        sender.resize(WIDTH * 2, HEIGHT)
+        sender.send_buffer(b"\x07" * FRAME_BYTES * 2)
+        buffer = receiver.receive_into(pool)
+        assert (buffer.width, buffer.height) == (WIDTH * 2, HEIGHT)
+        assert bytes(buffer.data) == b"\x07" * FRAME_BYTES * 2
+        buffer.release()
+        with pytest.raises(RuntimeError, match="PooledBuffer has been released"):
+            _ = buffer.data
+
+        sender.resize(WIDTH, HEIGHT)
+        sender.send_buffer(frame)
+        with receiver.receive_into(pool) as buffer:
+            assert bytes(buffer.data) == frame
+    assert pool.stats().hits == 1
+
+    with pytest.raises(RuntimeError, match="Not connected"):
+        liru.Receiver(sender_name, backend="shm").receive_into(pool)
+    assert pool.stats().in_use == 0
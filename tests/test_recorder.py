@@ -0,0 +1,126 @@
+"""Tests for recording frames to disk (liru.Recorder, liru.Recording)."""
+
+import time
+from pathlib import Path
+
+import pytest
+from _helpers import solid_frame
+
+import liru
+from liru.recorder import ALIGNMENT, INDEX_SUFFIX
+
+WIDTH = 40
+HEIGHT = 20
+FRAME_BYTES = WIDTH * HEIGHT * 4
+
+
+def _wait_for(recorder: liru.Recorder, frames: int) -> None:
+    deadline = time.monotonic() + 5
+    while recorder.stats().frames < frames:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_records_captured_frames(sender_name: str, tmp_path: Path) -> None:
+    """Test captured frames, their metadata and a resize land in the recording."""
+    path = tmp_path / "show.liru"
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.enable_frame_sync()
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with liru.Recorder(receiver, path) as recorder:
+            for value in range(1, 4):
+                sender.send_buffer(
+                    solid_frame(value, FRAME_BYTES), timestamp_ns=value * 1000, payload=b"cue"
+                )
+                _wait_for(recorder, value)
+            sender.resize(8, 4)
+            sender.send_buffer(solid_frame(9, 8 * 4 * 4))
+            _wait_for(recorder, 4)
+        assert not receiver.capturing
+
+    stats = recorder.stats()
+    assert (stats.frames, stats.dropped, stats.backlog_frames) == (4, 0, 0)
+    assert stats.bytes_written % ALIGNMENT == 0
+
+    with liru.Recording(path) as recording:
+        assert len(recording) == 4
+        entry = recording.entry(1)
+        assert (entry.frame, entry.timestamp_ns, entry.size) == (2, 2000, FRAME_BYTES)
+        assert entry.offset % ALIGNMENT == 0
+        assert recording.metadata(1) == liru.FrameMetadata(2, 2000, b"cue")
+        assert recording.pixels(2).tobytes() == solid_frame(3, FRAME_BYTES)
+        with recording.frame(-1) as frame:
+            assert (frame.width, frame.height, frame.format) == (8, 4, liru.PixelFormat.RGBA8)
+            assert frame.data.tobytes() == solid_frame(9, 8 * 4 * 4)
+        with pytest.raises(IndexError):
+            recording.entry(4)
+
+
+def test_chunks_and_large_frames(sender_name: str, tmp_path: Path) -> None:
+    """Test frames coalesce into chunks and frames larger than a chunk are written directly."""
+    path = tmp_path / "chunks.liru"
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with liru.Recorder(receiver, path, chunk_size=ALIGNMENT * 4, capture=False) as recorder:
+            for value in range(1, 6):
+                sender.send_buffer(solid_frame(value, FRAME_BYTES))
+                with receiver.acquire_frame() as borrowed:
+                    frame = liru.Frame(
+                        memoryview(bytes(borrowed.data.cast("B"))).cast("B", (HEIGHT, WIDTH, 4)),
+                        borrowed.frame_number,
+                        None,
+                        borrowed.metadata,
+                    )
+                assert recorder.write(frame)
+            recorder.write(
+                liru.Frame(
+                    memoryview(solid_frame(7, 128 * 64 * 4)).cast("B", (64, 128, 4)), 6, None, None
+                )
+            )
+
+    with liru.Recording(path) as recording:
+        assert [recording.entry(i).frame for i in range(len(recording))] == [1, 2, 3, 4, 5, 6]
+        assert recording.pixels(4).tobytes() == solid_frame(5, FRAME_BYTES)
+        assert recording.pixels(5).tobytes() == solid_frame(7, 128 * 64 * 4)
+    assert path.stat().st_size % ALIGNMENT == 0
+
+
+def test_backlog_drops_without_blocking(sender_name: str, tmp_path: Path) -> None:
+    """Test frames past the backlog limit are dropped with a warning, not queued."""
+    path = tmp_path / "behind.liru"
+    frame = liru.Frame(memoryview(solid_frame(1, FRAME_BYTES)).cast("B", (HEIGHT, WIDTH, 4)), 1)
+    receiver = liru.Receiver(sender_name, backend="shm")
+    recorder = liru.Recorder(receiver, path, max_backlog_bytes=FRAME_BYTES, capture=False)
+    with recorder._cond:  # Hold the writer back
+        assert recorder.write(frame)
+        with pytest.warns(RuntimeWarning, match="1 frames .* behind"):
+            assert not recorder.write(frame)
+        assert not recorder.write(frame)  # Warned once until the queue drains
+        stats = recorder.stats()
+        assert (stats.backlog_frames, stats.backlog_bytes, stats.dropped) == (1, FRAME_BYTES, 2)
+    recorder.close()
+    assert recorder.stats().frames == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        recorder.write(frame)
+
+
+def test_invalid_arguments(sender_name: str, tmp_path: Path) -> None:
+    """Test invalid limits and foreign files are rejected."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with pytest.raises(ValueError, match="multiple of 4096"):
+        liru.Recorder(receiver, tmp_path / "x.liru", chunk_size=1000)
+    with pytest.raises(ValueError, match="must be positive"):
+        liru.Recorder(receiver, tmp_path / "x.liru", max_backlog_bytes=0)
+
+    path = tmp_path / "foreign.liru"
+    path.write_bytes(bytes(ALIGNMENT))
+    Path(f"{path}{INDEX_SUFFIX}").write_bytes(bytes(64))
+    with pytest.raises(ValueError, match="not a liru recording"):
+        liru.Recording(path)
+
+    Path(f"{path}{INDEX_SUFFIX}").write_bytes(b"")
+    with pytest.raises(ValueError, match="not a liru recording"):
+        liru.Recording(path)  # Empty index
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="not a liru recording"):
+        liru.Recording(path)  # Empty container
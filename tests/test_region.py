@@ -0,0 +1,103 @@
+"""Tests for region and scaled receives (receive_into(region=..., scale=...))."""
+
+import pytest
+
+import liru
+
+np = pytest.importorskip("numpy")
+
+WIDTH = 24
+HEIGHT = 12
+
+
+def _frame() -> "np.ndarray":
+    rng = np.random.default_rng(11)
+    return rng.integers(0, 256, size=(HEIGHT, WIDTH, 4), dtype=np.uint8)
+
+
+def _box_mean(frame: "np.ndarray", factor: int) -> "np.ndarray":
+    height, width, channels = frame.shape
+    blocks = frame.reshape(height // factor, factor, width // factor, factor, channels)
+    sums = blocks.astype(np.uint32).sum(axis=(1, 3))
+    return ((sums + factor * factor // 2) // (factor * factor)).astype(np.uint8)
+
+
+def test_region_copies_sub_rectangle(sender_name: str) -> None:
+    """Test a region arrives cropped, flipped and swapped like the whole frame would."""
+    frame = _frame()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty((5, 7, 4), dtype=np.uint8)
+
+        assert receiver.receive_into(target, region=(3, 2, 7, 5)) == (7, 5)
+        assert np.array_equal(target, frame[2:7, 3:10])
+
+        receiver.receive_into(target, region=(3, 2, 7, 5), transfer=liru.Transfer.INVERT)
+        assert np.array_equal(target, frame[2:7, 3:10][::-1])
+
+        receiver.receive_into(target, region=(3, 2, 7, 5), transfer=liru.Transfer.SWAP_RB)
+        assert np.array_equal(target, frame[2:7, 3:10][..., [2, 1, 0, 3]])
+
+        rows = np.empty((4, WIDTH, 4), dtype=np.uint8)
+        receiver.receive_into(rows, region=(0, 8, WIDTH, 4))
+        assert np.array_equal(rows, frame[8:])
+
+
+def test_scale_averages_boxes(sender_name: str) -> None:
+    """Test shrinking by whole factors is the rounded mean of each box."""
+    frame = _frame()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+
+        thumbnail = np.empty((HEIGHT // 6, WIDTH // 6, 4), dtype=np.uint8)
+        assert receiver.receive_into(thumbnail, scale=(WIDTH // 6, HEIGHT // 6)) == (4, 2)
+        assert np.array_equal(thumbnail, _box_mean(frame, 6))
+
+        crop = np.empty((2, 3, 4), dtype=np.uint8)
+        receiver.receive_into(crop, region=(6, 4, 6, 4), scale=(3, 2))
+        assert np.array_equal(crop, _box_mean(frame[4:8, 6:12], 2))
+
+        with receiver.receive_into(liru.FramePool(), scale=(5, 3)) as pooled:
+            assert pooled.data.shape == (3, 5, 4)
+            # Boxes of 4 or 5 columns and 4 rows, starting where i * 24 // 5 does
+            assert pooled.data[0, 1, 0] == round(frame[0:4, 4:9, 0].mean())
+
+
+def test_scale_float_frames(sender_name: str) -> None:
+    """Test float frames are averaged without rounding."""
+    frame = np.arange(HEIGHT * WIDTH * 4, dtype=np.float32).reshape(HEIGHT, WIDTH, 4)
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGBA32F
+    ) as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty((HEIGHT // 2, WIDTH // 2, 4), dtype=np.float32)
+        receiver.receive_into(target, scale=(WIDTH // 2, HEIGHT // 2))
+        expected = frame.reshape(HEIGHT // 2, 2, WIDTH // 2, 2, 4).mean(axis=(1, 3))
+        assert np.allclose(target, expected)
+
+
+def test_invalid_region_and_scale(sender_name: str) -> None:
+    """Test regions outside the frame, enlargements and mismatched buffers are rejected."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(_frame())
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with pytest.raises(ValueError, match=r"outside the 24x12 frame"):
+            receiver.receive_into(bytearray(64), region=(20, 0, 8, 2))
+        with pytest.raises(ValueError, match="can only shrink"):
+            receiver.receive_into(bytearray(WIDTH * HEIGHT * 16), scale=(WIDTH * 2, HEIGHT * 2))
+        with pytest.raises(ValueError, match="expected 32"):
+            receiver.receive_into(bytearray(WIDTH * HEIGHT * 4), scale=(4, 2))
+        with pytest.raises(ValueError, match=r"\(x, y, width, height\)"):
+            receiver.receive_into(bytearray(16), region=(0, 0, 2))  # type: ignore[arg-type]
+
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGB10A2
+    ) as sender:
+        sender.send_buffer(bytes(WIDTH * HEIGHT * 4))
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with pytest.raises(ValueError, match="packed RGB10A2"):
+            receiver.receive_into(bytearray(32), scale=(4, 2))
+        assert receiver.receive_into(bytearray(32), region=(0, 0, 4, 2)) == (4, 2)
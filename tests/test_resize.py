@@ -0,0 +1,164 @@
+"""Tests for resizing a sender in place (Sender.resize, generation)."""
+
+import threading
+
+import pytest
+
+import liru
+from liru.backends import shm
+
+
+def test_resize_keeps_receivers(sender_name: str) -> None:
+    """Test receivers follow a resize without selecting the sender again."""
+    with liru.Sender(sender_name, 16, 8, slots=2, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm", connect_timeout=1.0)
+        sender.send_buffer(bytes(16 * 8 * 4))
+        receiver.receive_into(bytearray(16 * 8 * 4))
+        assert sender.generation == receiver.generation == 0
+
+        sender.resize(32, 24)
+        assert (sender.width, sender.height, sender.generation) == (32, 24, 1)
+        assert (receiver.width, receiver.height, receiver.generation) == (32, 24, 1)
+        assert receiver.active_sender == sender_name
+        assert not receiver.is_updated()  # Nothing sent at the new size yet
+        assert shm.list_senders() == [sender_name]
+
+        with pytest.raises(ValueError, match="expected 3072"):
+            sender.send_buffer(bytes(16 * 8 * 4))
+        frame = b"\x7f" * (32 * 24 * 4)
+        assert sender.send_buffer(frame)
+        assert receiver.is_updated()
+        buffer = bytearray(len(frame))
+        assert receiver.receive_into(buffer) == (32, 24)
+        assert buffer == frame
+        assert receiver.metadata.frame == 2  # Frame numbers carry on
+
+
+def test_receive_after_resize_before_new_frame(sender_name: str) -> None:
+    """Test a receive between a resize and the next frame finds no frame, not a blank one."""
+    with liru.Sender(sender_name, 16, 8, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        sender.send_buffer(b"\x7f" * (16 * 8 * 4))
+        receiver.receive_into(bytearray(16 * 8 * 4))
+
+        sender.resize(8, 4)
+        buffer = bytearray(b"\x55" * (8 * 4 * 4))
+        with pytest.raises(RuntimeError, match="No frame has been sent yet"):
+            receiver.receive_into(buffer)
+        assert buffer == b"\x55" * len(buffer)
+        with pytest.raises(RuntimeError, match="No frame has been sent yet"):
+            receiver.acquire_frame()
+
+        sender.send_buffer(b"\x01" * len(buffer))
+        assert receiver.receive_into(buffer) == (8, 4)
+        assert buffer == b"\x01" * len(buffer)
+
+
+def test_resize_same_size_and_errors(sender_name: str) -> None:
+    """Test resizing to the current size is a no-op and bad calls raise."""
+    sender = liru.Sender(sender_name, 16, 8, backend="shm")
+    sender.resize(16, 8)
+    assert sender.generation == 0
+    with pytest.raises(ValueError, match="Invalid dimensions"):
+        sender.resize(0, 8)
+    sender.release()
+    with pytest.raises(RuntimeError, match="released"):
+        sender.resize(32, 16)
+
+
+def test_resize_keeps_frame_sync(sender_name: str) -> None:
+    """Test a receiver waiting across a resize wakes on the next frame."""
+    with liru.Sender(sender_name, 16, 8, backend="shm") as sender:
+        sender.enable_frame_sync()
+        receiver = liru.Receiver(sender_name, backend="shm")
+        woke = threading.Event()
+
+        def wait() -> None:
+            if receiver.wait_for_frame(timeout=5.0):
+                woke.set()
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        sender.resize(8, 8)
+        assert sender.frame_sync
+        sender.send_buffer(bytes(8 * 8 * 4))
+        waiter.join()
+        assert woke.is_set()
+        assert receiver.generation == 1
+
+
+def test_borrowed_frame_survives_resize(sender_name: str) -> None:
+    """Test a frame borrowed before a resize stays readable."""
+    with liru.Sender(sender_name, 4, 4, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        sender.send_buffer(b"\x01" * (4 * 4 * 4))
+        frame = receiver.acquire_frame()
+        sender.resize(8, 8)
+        assert bytes(frame.data) == b"\x01" * (4 * 4 * 4)
+        frame.release()
+
+        sender.send_buffer(b"\x02" * (8 * 8 * 4))
+        with receiver.acquire_frame() as frame:
+            assert frame.data.shape == (8, 8, 4)
+
+
+def test_resize_to_another_format_keeps_options(sender_name: str) -> None:
+    """Test a format change recreates the sender in place with its options."""
+    pytest.importorskip("numpy")  # Dirty tiles on shm
+    sender = liru.Sender(
+        sender_name,
+        16,
+        8,
+        slots=3,
+        backend="shm",
+        publish_stats=True,
+        target_fps=50,
+        dirty_tiles=True,
+    )
+    try:
+        sender.enable_frame_sync()
+        stats_block = sender.stats_block
+        sender.resize(8, 4, format=liru.PixelFormat.R8)
+
+        assert (sender.name, sender.width, sender.height) == (sender_name, 8, 4)
+        assert sender.format == liru.PixelFormat.R8
+        assert (sender.slots, sender.target_fps) == (3, 50)
+        assert sender.frame_sync
+        assert sender.stats_block is stats_block
+        sender.send_buffer(bytes(8 * 4))
+        assert sender.changed_tiles is not None
+        with liru.Receiver(sender_name, backend="shm") as receiver:
+            with receiver.acquire_frame() as frame:
+                assert frame.format == liru.PixelFormat.R8
+    finally:
+        sender.release()
+
+
+def test_resize_to_another_format_restores_on_failure(
+    sender_name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a failed format change leaves the sender working in the old format."""
+    sender = liru.Sender(sender_name, 8, 4, backend="shm")
+    try:
+        sender.enable_frame_sync()
+        create = shm.SenderWrapper
+        calls = []
+
+        def failing(*args: object) -> object:
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("Out of shared memory")
+            return create(*args)
+
+        monkeypatch.setattr(sender, "_impl_class", failing)
+        with pytest.raises(RuntimeError, match="Out of shared memory"):
+            sender.resize(16, 8, format=liru.PixelFormat.R8)
+
+        assert (sender.width, sender.height, sender.format) == (8, 4, liru.PixelFormat.RGBA8)
+        assert sender.frame_sync
+        sender.send_buffer(bytes(8 * 4 * 4))
+        with liru.Receiver(sender_name, backend="shm") as receiver:
+            with receiver.acquire_frame() as frame:
+                assert frame.data.shape[:2] == (4, 8)
+    finally:
+        sender.release()
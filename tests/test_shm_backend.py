@@ -0,0 +1,153 @@
+"""Tests for the shared-memory backend."""
+
+import multiprocessing
+import os
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import pytest
+
+import liru
+from liru.backends import shm
+
+
+def _frame(width: int, height: int, value: int) -> bytes:
+    return bytes([value]) * (width * height * shm.BYTES_PER_PIXEL)
+
+
+def test_segment_created_and_removed(shm_dir: Path, sender_name: str) -> None:
+    """Test the sender creates its segment and removes it on release."""
+    sender = liru.Sender(sender_name, 64, 32, backend="shm")
+    path = Path(shm.segment_path(sender_name))
+    assert path.parent == shm_dir
+    assert path.stat().st_size == shm.HEADER_SIZE + shm.slot_stride(64 * 32 * shm.BYTES_PER_PIXEL)
+
+    sender.release()
+    assert not path.exists()
+
+
+def test_segment_header(sender_name: str) -> None:
+    """Test the header publishes size, format and owner."""
+    with liru.Sender(sender_name, 64, 32, backend="shm"):
+        info = shm.read_segment_info(sender_name)
+        assert info is not None
+        assert (info.width, info.height) == (64, 32)
+        assert info.format == shm.FORMAT_RGBA8
+        assert info.owner_pid == os.getpid()
+        assert info.frame == 0
+
+
+def test_sender_name_with_separators() -> None:
+    """Test sender names are not interpreted as paths."""
+    name = "Studio A/Program Out"
+    with liru.Sender(name, 16, 16, backend="shm"):
+        assert name in liru.Receiver(backend="shm").get_sender_list()
+
+
+def test_duplicate_sender_name_rejected(sender_name: str) -> None:
+    """Test a live sender name cannot be taken twice."""
+    with liru.Sender(sender_name, 16, 16, backend="shm"):
+        with pytest.raises(RuntimeError, match="already exists"):
+            liru.Sender(sender_name, 16, 16, backend="shm")
+
+
+def test_stale_segment_replaced(sender_name: str) -> None:
+    """Test a segment left behind by a closed sender is replaced."""
+    path = Path(shm.segment_path(sender_name))
+    path.write_bytes(b"\0" * shm.HEADER_SIZE)
+
+    with liru.Sender(sender_name, 16, 16, backend="shm") as sender:
+        assert sender.width == 16
+
+
+def test_sender_list(sender_name: str) -> None:
+    """Test live senders are listed and released ones are not."""
+    receiver = liru.Receiver(backend="shm")
+    assert receiver.get_sender_list() == []
+
+    with liru.Sender(sender_name, 16, 16, backend="shm"):
+        assert receiver.get_sender_list() == [sender_name]
+    assert receiver.get_sender_list() == []
+
+
+def test_receiver_queries_dimensions(sender_name: str) -> None:
+    """Test receiver dimensions are known before the first frame."""
+    with liru.Sender(sender_name, 64, 32, backend="shm"):
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert (receiver.width, receiver.height) == (64, 32)
+        assert not receiver.is_updated()
+
+
+def test_frame_round_trip(sender_name: str) -> None:
+    """Test frames written by the sender are read by the receiver."""
+    with liru.Sender(sender_name, 8, 4, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(8 * 4 * shm.BYTES_PER_PIXEL)
+
+        sender.send_buffer(_frame(8, 4, 7))
+        assert receiver.is_updated()
+        assert receiver.receive_into(out) == (8, 4)
+        assert out == _frame(8, 4, 7)
+        assert not receiver.is_updated()
+        assert shm.read_segment_info(sender_name).frame == 1  # type: ignore[union-attr]
+
+
+def test_receive_before_first_frame(sender_name: str) -> None:
+    """Test receiving before anything was sent raises and leaves the buffer alone."""
+    with liru.Sender(sender_name, 8, 4, backend="shm"):
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(b"\x55" * (8 * 4 * shm.BYTES_PER_PIXEL))
+        with pytest.raises(RuntimeError, match="No frame has been sent yet"):
+            receiver.receive_into(out)
+        assert out == b"\x55" * len(out)
+        assert not receiver.is_updated()
+
+
+def test_receiver_reconnects_after_sender_restart(sender_name: str) -> None:
+    """Test a receiver follows a sender that is released and recreated."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    with liru.Sender(sender_name, 8, 8, backend="shm"):
+        assert receiver.width == 8
+    assert not receiver.is_updated()
+
+    with liru.Sender(sender_name, 16, 8, backend="shm") as sender:
+        sender.send_buffer(_frame(16, 8, 1))
+        assert receiver.is_updated()
+        assert receiver.width == 16
+
+
+def test_texture_calls_need_gpu_backend(sender_name: str, texture_id: int) -> None:
+    """Test texture IDs are rejected by the CPU-only backend."""
+    with liru.Sender(sender_name, 8, 8, backend="shm") as sender:
+        with pytest.raises(RuntimeError, match="GPU backend"):
+            sender.send_texture(texture_id)
+        with pytest.raises(RuntimeError, match="GPU backend"):
+            liru.Receiver(sender_name, backend="shm").receive_texture(texture_id)
+
+
+def _write_frames(shm_dir: str, name: str, ready: Event, done: Event) -> None:
+    os.environ["LIRU_SHM_DIR"] = shm_dir
+    with liru.Sender(name, 8, 8, backend="shm") as sender:
+        sender.send_buffer(_frame(8, 8, 42))
+        ready.set()
+        done.wait(30)  # Keep the segment alive until the parent has read it
+
+
+def test_cross_process_frame(shm_dir: Path, sender_name: str) -> None:
+    """Test a frame written in another process is visible to the receiver."""
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    done = ctx.Event()
+    proc = ctx.Process(target=_write_frames, args=(str(shm_dir), sender_name, ready, done))
+    proc.start()
+    try:
+        assert ready.wait(30)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(8 * 8 * shm.BYTES_PER_PIXEL)
+        assert receiver.is_updated()
+        receiver.receive_into(out)
+        assert out == _frame(8, 8, 42)
+    finally:
+        done.set()
+        proc.join(30)
+    assert proc.exitcode == 0
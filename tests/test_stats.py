@@ -0,0 +1,119 @@
+"""Tests for windowed frame statistics (Sender.stats, Receiver.stats)."""
+
+import sys
+
+import pytest
+
+import liru
+from liru.stats import STATS_WINDOW, StatsWindow
+
+WIDTH = 8
+HEIGHT = 8
+FRAME = bytes(WIDTH * HEIGHT * 4)
+
+
+def test_empty_window() -> None:
+    """Test statistics before any frame are all zero."""
+    stats = StatsWindow().snapshot()
+    assert stats == liru.FrameStats(0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0)
+
+
+def test_percentiles_and_jitter() -> None:
+    """Test latency percentiles, jitter and FPS over known timings."""
+    window = StatsWindow()
+    for i in range(100):
+        # 10ms apart, except every tenth interval which is 30ms
+        window.record(i * 0.01 + (i // 10) * 0.02, float(i + 1))
+    stats = window.snapshot(deadline_ms=20.0)
+    assert stats.frames == stats.window == 100
+    assert stats.latency_mean_ms == pytest.approx(50.5)
+    assert stats.latency_p50_ms == 50.0
+    assert stats.latency_p95_ms == 95.0
+    assert stats.latency_p99_ms == 99.0
+    assert stats.deadline_misses == 9
+    assert stats.fps == pytest.approx(99 / 1.17)
+    # Nine 30ms and ninety 10ms intervals
+    mean = (9 * 30 + 90 * 10) / 99
+    expected = ((9 * (30 - mean) ** 2 + 90 * (10 - mean) ** 2) / 99) ** 0.5
+    assert stats.jitter_ms == pytest.approx(expected)
+
+
+def test_no_deadline_counts_no_misses() -> None:
+    """Test deadline misses are only counted against a deadline."""
+    window = StatsWindow()
+    for i in range(10):
+        window.record(i * 1.0, 1.0)
+    assert window.snapshot().deadline_misses == 0
+    assert window.snapshot(deadline_ms=500.0).deadline_misses == 9
+
+
+def test_window_keeps_newest_frames() -> None:
+    """Test the window covers only the newest STATS_WINDOW frames."""
+    window = StatsWindow()
+    for i in range(STATS_WINDOW + 50):
+        window.record(i * 0.001, 1.0 if i < 50 else 2.0)
+    window.record_dropped(3)
+    stats = window.snapshot()
+    assert stats.frames == STATS_WINDOW + 50
+    assert stats.window == STATS_WINDOW
+    assert stats.latency_mean_ms == 2.0
+    assert stats.fps == pytest.approx(1000.0)
+    assert stats.dropped == 3
+
+
+def test_sender_stats(sender_name: str) -> None:
+    """Test sender statistics count sends and report windowed FPS."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        assert sender.stats().frames == 0
+        for _ in range(20):
+            sender.send_buffer(FRAME)
+        stats = sender.stats()
+        assert isinstance(stats, liru.FrameStats)
+        assert stats.frames == stats.window == 20
+        assert stats.fps > 0
+        assert stats.fps == pytest.approx(sender.get_fps(), rel=0.01)
+        assert 0 < stats.latency_p50_ms <= stats.latency_p95_ms <= stats.latency_p99_ms
+        assert stats.dropped == 0
+
+
+@pytest.mark.skipif(
+    not (sys.platform.startswith("linux") or sys.platform == "win32"),
+    reason="Slot locks only conflict between processes on this platform",
+)
+def test_sender_counts_dropped_frames(sender_name: str) -> None:
+    """Test frames dropped because every slot is borrowed are counted."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        sender.send_buffer(FRAME)
+        with receiver.acquire_frame():
+            assert not sender.send_buffer(FRAME)
+        stats = sender.stats()
+        assert stats.frames == 1
+        assert stats.dropped == 1
+
+
+def test_receiver_counts_skipped_frames(sender_name: str) -> None:
+    """Test frames published between two receives count as dropped."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        out = bytearray(len(FRAME))
+        sender.send_buffer(FRAME)
+        receiver.receive_into(out)
+        for _ in range(3):
+            sender.send_buffer(FRAME)
+        with receiver.acquire_frame():
+            pass
+        stats = receiver.stats()
+        assert stats.frames == 2
+        assert stats.dropped == 2
+
+
+@pytest.mark.parametrize("deadline_ms", [0.0, -16.7])
+def test_invalid_deadline(sender_name: str, deadline_ms: float) -> None:
+    """Test non-positive deadlines raise ValueError."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        with pytest.raises(ValueError, match="Deadline must be positive"):
+            sender.stats(deadline_ms=deadline_ms)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        with pytest.raises(ValueError, match="Deadline must be positive"):
+            receiver.stats(deadline_ms=deadline_ms)
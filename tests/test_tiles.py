@@ -0,0 +1,96 @@
+"""Tests for dirty-tile tracking (Sender(dirty_tiles=True), Receiver.changed_tiles())."""
+
+import pytest
+
+import liru
+from liru.tiles import DirtyTiles, dirty_tiles
+
+np = pytest.importorskip("numpy")
+
+WIDTH = 200  # Four tile columns, the last 8 pixels wide
+HEIGHT = 100  # Two tile rows
+
+
+def _frame() -> "np.ndarray":
+    rng = np.random.default_rng(22)
+    return rng.integers(0, 256, size=(HEIGHT, WIDTH, 4), dtype=np.uint8)
+
+
+def test_changed_tiles_accumulate_skipped_frames(sender_name: str) -> None:
+    """Test changed tiles cover every frame sent since the last receive."""
+    frame = _frame()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", dirty_tiles=True) as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        tiles = receiver.changed_tiles()
+        assert tiles is not None
+        assert (tiles.columns, tiles.rows, tiles.dirty_count) == (4, 2, 8)
+        receiver.receive_into(np.empty_like(frame))
+
+        sender.send_buffer(frame)
+        assert receiver.changed_tiles().dirty_count == 0  # type: ignore[union-attr]
+
+        frame[70, 199] ^= 1  # Bottom right tile
+        sender.send_buffer(frame)
+        frame[3, 64] ^= 1  # Second tile of the top row
+        sender.send_buffer(frame)
+        tiles = receiver.changed_tiles()
+        assert tiles is not None
+        assert tiles.is_dirty(1, 0)
+        assert tiles.is_dirty(3, 1)
+        assert tiles.regions() == [(64, 0, 64, 64), (192, 64, 8, 36)]
+
+        # The sender only reports what its last frame changed
+        assert sender.changed_tiles.regions() == [(64, 0, 64, 64)]  # type: ignore[union-attr]
+
+        receiver.receive_into(np.empty_like(frame))
+        assert receiver.changed_tiles().dirty_count == 0  # type: ignore[union-attr]
+
+
+def test_flipped_frames_hash_as_published(sender_name: str) -> None:
+    """Test tiles of an inverted send are counted from the top of the published frame."""
+    frame = _frame()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", dirty_tiles=True) as sender:
+        sender.send_buffer(frame, transfer=liru.Transfer.INVERT)
+        frame[0, 0] ^= 1  # Bottom left once flipped
+        sender.send_buffer(frame, transfer=liru.Transfer.INVERT)
+        assert sender.changed_tiles.regions() == [(0, 64, 64, 36)]  # type: ignore[union-attr]
+
+
+def test_resize_marks_every_tile(sender_name: str) -> None:
+    """Test the first frame after a resize changes every tile of the new grid."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", dirty_tiles=True) as sender:
+        sender.send_buffer(_frame())
+        sender.resize(64, 64)
+        sender.send_buffer(bytes(64 * 64 * 4))
+        receiver = liru.Receiver(sender_name, backend="shm")
+        tiles = receiver.changed_tiles()
+        assert tiles is not None
+        assert (tiles.width, tiles.height, tiles.dirty_count) == (64, 64, 1)
+        assert tiles.regions() == [(0, 0, 64, 64)]
+
+
+def test_untracked_sender(sender_name: str) -> None:
+    """Test senders without dirty tiles report None."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(_frame())
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert receiver.changed_tiles() is None
+        assert sender.changed_tiles is None
+
+
+def test_dirty_tiles_table() -> None:
+    """Test decoding a tile table by hand."""
+    table = bytearray(24 + 3 * 8)
+    table[:24] = (64).to_bytes(4, "little") + (150).to_bytes(4, "little") + bytes(8)
+    table[16:24] = (9).to_bytes(8, "little")
+    table[24:] = b"".join(n.to_bytes(8, "little") for n in (9, 4, 8))
+
+    assert dirty_tiles(table) == DirtyTiles(9, 64, 150, 0, b"")  # Zero height: no tiles
+    table[8:12] = (10).to_bytes(4, "little")
+    assert dirty_tiles(table) == DirtyTiles(9, 64, 150, 10, b"\x01")
+    assert dirty_tiles(table, since=4).regions() == [  # type: ignore[union-attr]
+        (0, 0, 64, 10),
+        (128, 0, 22, 10),
+    ]
+    assert dirty_tiles(bytes(24)) is None
@@ -0,0 +1,104 @@
+"""Tests for transfer transforms (liru.Transfer) on the shm backend."""
+
+import pytest
+
+import liru
+from liru.transfer import check_transfer
+
+np = pytest.importorskip("numpy")
+
+WIDTH = 8
+HEIGHT = 4
+
+
+def _frame() -> "np.ndarray":
+    rng = np.random.default_rng(7)
+    frame = rng.integers(0, 256, size=(HEIGHT, WIDTH, 4), dtype=np.uint8)
+    frame[0, 0, 3] = 0  # One transparent pixel
+    return frame
+
+
+def _premultiplied(frame: "np.ndarray") -> "np.ndarray":
+    alpha = frame[..., 3:].astype(np.uint32)
+    color = (frame[..., :3] * alpha + 127) // 255
+    return np.concatenate([color, frame[..., 3:]], axis=2).astype(np.uint8)
+
+
+def test_send_applies_transfer(sender_name: str) -> None:
+    """Test a sender publishes the flipped, swapped frame without touching its buffer."""
+    frame = _frame()
+    original = frame.copy()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty_like(frame)
+
+        sender.send_buffer(frame, transfer=liru.Transfer.INVERT)
+        receiver.receive_into(target)
+        assert np.array_equal(target, frame[::-1])
+
+        sender.send_buffer(frame, transfer=liru.Transfer.INVERT | liru.Transfer.SWAP_RB)
+        receiver.receive_into(target)
+        assert np.array_equal(target, frame[::-1][..., [2, 1, 0, 3]])
+        assert np.array_equal(frame, original)
+
+
+def test_receive_applies_transfer(sender_name: str) -> None:
+    """Test a receiver converts alpha and swaps channels in its copy."""
+    frame = _frame()
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(frame)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty_like(frame)
+
+        receiver.receive_into(target, transfer=liru.Transfer.PREMULTIPLY | liru.Transfer.SWAP_RB)
+        assert np.array_equal(target, _premultiplied(frame)[..., [2, 1, 0, 3]])
+
+        with receiver.receive_into(liru.FramePool(), transfer=liru.Transfer.INVERT) as pooled:
+            assert np.array_equal(np.asarray(pooled.data), frame[::-1])
+
+
+def test_unpremultiply_round_trip(sender_name: str) -> None:
+    """Test unpremultiplying restores opaque pixels and zeroes transparent ones."""
+    frame = _frame()
+    frame[1:, :, 3] = 255
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm") as sender:
+        sender.send_buffer(frame, transfer=liru.Transfer.PREMULTIPLY)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty_like(frame)
+        receiver.receive_into(target, transfer=liru.Transfer.UNPREMULTIPLY)
+        assert np.array_equal(target[1:], frame[1:])
+        assert not target[0, 0, :3].any()
+
+
+def test_float_premultiply(sender_name: str) -> None:
+    """Test alpha conversion of float frames."""
+    frame = np.full((HEIGHT, WIDTH, 4), 0.5, dtype=np.float32)
+    frame[..., 3] = 0.25
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.RGBA32F
+    ) as sender:
+        sender.send_buffer(frame, transfer=liru.Transfer.PREMULTIPLY)
+        receiver = liru.Receiver(sender_name, backend="shm")
+        target = np.empty_like(frame)
+        receiver.receive_into(target)
+        assert np.allclose(target[..., :3], 0.125)
+        receiver.receive_into(target, transfer=liru.Transfer.UNPREMULTIPLY)
+        assert np.allclose(target, frame)
+
+
+def test_invalid_transfer(sender_name: str) -> None:
+    """Test transfers that cannot be applied are rejected."""
+    with pytest.raises(ValueError, match="premultiply and unpremultiply"):
+        check_transfer(liru.Transfer.PREMULTIPLY | liru.Transfer.UNPREMULTIPLY, 28)
+    with pytest.raises(ValueError, match="Unknown transfer flags: 16"):
+        check_transfer(16, 28)
+    with pytest.raises(ValueError, match="can only invert"):
+        check_transfer(liru.Transfer.SWAP_RB, 28, texture=True)
+    assert check_transfer(1, 0, texture=True) is liru.Transfer.INVERT
+
+    with liru.Sender(
+        sender_name, WIDTH, HEIGHT, backend="shm", format=liru.PixelFormat.R8
+    ) as sender:
+        with pytest.raises(ValueError, match="not R8"):
+            sender.send_buffer(bytes(WIDTH * HEIGHT), transfer=liru.Transfer.SWAP_RB)
+        assert sender.send_buffer(bytes(WIDTH * HEIGHT), transfer=liru.Transfer.INVERT)
@@ -0,0 +1,86 @@
+"""Tests for warm-up ahead of the first frame (Sender.warmup, Receiver.connect)."""
+
+import threading
+import time
+
+import pytest
+
+import liru
+
+WIDTH = 64
+HEIGHT = 32
+
+
+def test_sender_warmup_publishes_nothing(sender_name: str) -> None:
+    """Test warmup() makes the sender visible without publishing a frame."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=3, backend="shm") as sender:
+        sender.warmup()
+        sender.warmup()  # Idempotent
+        receiver = liru.Receiver(sender_name, backend="shm")
+        assert (receiver.width, receiver.height) == (WIDTH, HEIGHT)
+        assert not receiver.is_updated()
+
+        frame = bytes(range(256)) * (WIDTH * HEIGHT * 4 // 256)
+        assert sender.send_buffer(frame)
+        buffer = bytearray(len(frame))
+        receiver.receive_into(buffer)
+        assert buffer == frame
+        assert receiver.metadata.frame == 1
+
+
+def test_sender_warmup_keeps_sent_frames(sender_name: str) -> None:
+    """Test warming up after sending leaves the published frame intact."""
+    with liru.Sender(sender_name, WIDTH, HEIGHT, slots=2, backend="shm") as sender:
+        frame = b"\xff" * (WIDTH * HEIGHT * 4)
+        sender.send_buffer(frame)
+        sender.warmup()
+        buffer = bytearray(len(frame))
+        liru.Receiver(sender_name, backend="shm").receive_into(buffer)
+        assert buffer == frame
+
+
+def test_sender_eager_warmup(sender_name: str) -> None:
+    """Test Sender(warmup=True) warms up in the constructor and released senders refuse."""
+    sender = liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm", warmup=True)
+    assert sender.send_buffer(bytes(WIDTH * HEIGHT * 4))
+    sender.release()
+    with pytest.raises(RuntimeError, match="released"):
+        sender.warmup()
+
+
+def test_receiver_connect(sender_name: str) -> None:
+    """Test connect() waits for a sender that starts later."""
+    receiver = liru.Receiver(sender_name, backend="shm")
+    assert not receiver.connect(timeout=0.01)
+    assert receiver.width == 0
+
+    senders: list[liru.Sender] = []
+    timer = threading.Timer(
+        0.05, lambda: senders.append(liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm"))
+    )
+    timer.start()
+    try:
+        start = time.monotonic()
+        assert receiver.connect(timeout=5.0)
+        assert time.monotonic() - start < 2.0
+        assert (receiver.width, receiver.height) == (WIDTH, HEIGHT)
+        assert receiver.connect(timeout=0)  # Already connected
+        assert receiver.metadata.frame == 0  # Nothing received
+    finally:
+        timer.join()
+        for sender in senders:
+            sender.release()
+
+
+def test_receiver_connect_errors(sender_name: str) -> None:
+    """Test connect() argument checks and Receiver(connect_timeout=...) timing out."""
+    with pytest.raises(ValueError, match="negative"):
+        liru.Receiver(sender_name, backend="shm").connect(timeout=-1.0)
+    with pytest.raises(RuntimeError, match="No sender selected"):
+        liru.Receiver(backend="shm").connect(timeout=0)
+    with pytest.raises(TimeoutError, match=sender_name):
+        liru.Receiver(sender_name, backend="shm", connect_timeout=0.01)
+
+    with liru.Sender(sender_name, WIDTH, HEIGHT, backend="shm"):
+        receiver = liru.Receiver(sender_name, backend="shm", connect_timeout=1.0)
+        assert receiver.width == WIDTH